@@ -1,14 +1,16 @@
 """
 Store Ops Main App - Clean Version v2
 """
+import time
 import streamlit as st
-from datetime import datetime
-import pandas as pd
-import numpy as np
-import sys
-import os
+
+from src.utils.boot_perf import init_boot_perf, record_import_time, render_boot_perf_sidebar
+from src.utils.query_ledger import begin_query_ledger
+init_boot_perf()
+begin_query_ledger()
 
 # Essential UI and Logic Imports
+# (pandas/storage_supabase 등 무거운 모듈은 로그인 이후, 페이지 모듈은 선택된 페이지만 import)
 
 from src.bootstrap import bootstrap
 bootstrap(page_title="Store Ops")
@@ -88,9 +90,8 @@ def _diagnose_supabase_connection():
     except Exception as e:
         st.error(f"Error: {e}")
 
-# Data Storage and Analytics Imports
-from src.storage_supabase import load_csv, create_backup
-from src.ui_helpers import render_page_header, render_section_divider
+from src.ui.page_registry import build_sidebar_menu, render_page
+record_import_time(time.perf_counter())
 
 # ============================================
 # 사이드바 프리미엄 CSS 주입 함수
@@ -394,8 +395,8 @@ def inject_sidebar_premium_css():
     # DOM 계층: 사이드바 CSS (rerun마다 실행)
     inject_dom(css_content, "sidebar")
 
-# 나머지 CSS는 별도 스타일 블록으로
-st.markdown("""
+# 나머지 CSS는 별도 스타일 블록으로 (DOM 계층: rerun마다, 번들 가능 시 로더만 출력)
+inject_dom("""
 <style>
     /* 디자인 고도화: 컬러 시스템 및 애니메이션 */
     :root {
@@ -643,7 +644,7 @@ st.markdown("""
         border-radius: 12px !important;
     }
 </style>
-""", unsafe_allow_html=True)
+""", "app_global")
 
 # Material Icons 폰트 강제 적용 JavaScript - 정확한 타겟팅
 st.markdown("""
@@ -855,52 +856,8 @@ if st.session_state.get("theme", "light") == "dark":
     inject_theme("<style>.main { background-color: #020617 !important; color: #e5e7eb !important; }</style>", "dark_mode_override")
 
 # Sidebar Navigation
-# 메뉴 구조 정의
-menu = {
-    "🏠 홈": [("홈", "홈")],
-    "✍ 입력": {
-        "main": [("데이터 입력센터", "입력 허브")],
-        "sub": [
-            ("오늘 마감", "일일 입력(통합)"),
-            ("매출·방문자", "매출 등록"),
-            ("판매량", "판매량 등록"),
-            ("월간 정산", "실제정산"),
-            ("목표(비용)", "목표 비용구조"),
-            ("목표(매출)", "목표 매출구조"),
-            ("QSC 체크", "건강검진 실시")
-        ]
-    },
-    "📊 분석": {
-        "main": [("데이터 분석센터", "분석 허브")],
-        "sub": [
-            ("매출", "매출 관리"),
-            ("판매·메뉴", "판매 관리"),
-            ("원가", "비용 분석"),
-            ("QSC 요약", "검진 결과 요약"),
-            ("QSC 히스토리", "검진 히스토리"),
-            ("하락 원인", "매출 하락 원인 찾기")
-        ]
-    },
-    "🎯 전략": {
-        "main": [("데이터 전략센터", "가게 전략 센터")],
-        "sub": [
-            ("메뉴 구성", "메뉴 등록"),
-            ("메뉴 수익", "메뉴 수익 구조 설계실"),
-            ("재료 구조", "재료 등록"),
-            ("수익 구조", "수익 구조 설계실"),
-            ("레시피", "레시피 등록")
-        ]
-    },
-    "🛠 운영": [
-        ("직원 연락망", "직원 연락망"),
-        ("협력사 연락망", "협력사 연락망"),
-        ("게시판", "게시판")
-    ],
-    "🧪 테스트": [
-        ("화면테스트", "화면테스트"),
-        ("화면테스트2", "화면테스트2")
-    ]
-}
+# 메뉴 구조 정의 (src/ui/page_registry.PAGES 단일 정의)
+menu = build_sidebar_menu()
 
 def render_expanded_sidebar(menu):
     """펼친 상태 사이드바 렌더링 (구조만 담당, CSS는 전역 주입)"""
@@ -957,6 +914,7 @@ def render_expanded_sidebar(menu):
         logout()
         st.rerun()
     if st.button("🔄 캐시 클리어"): 
+        from src.storage_supabase import load_csv
         load_csv.clear()
         st.rerun()
     st.markdown('</div>', unsafe_allow_html=True)
@@ -979,117 +937,7 @@ page = st.session_state.get("current_page", "홈")
 if st.session_state.get("_show_supabase_diagnosis", False):
     _diagnose_supabase_connection()
 
-if page == "홈":
-    from ui_pages.home_page_v0 import render_home
-    render_home()
-elif page == "오늘의 전략 실행":
-    from ui_pages.strategy.mission_detail import render_mission_detail
-    render_mission_detail()
-elif page == "입력 허브":
-    from ui_pages.input.input_hub import render_input_hub_v3
-    render_input_hub_v3()
-elif page == "분석 허브":
-    from ui_pages.analysis.analysis_hub import render_analysis_hub
-    render_analysis_hub()
-elif page == "일일 입력(통합)":
-    from ui_pages.daily_input_hub import render_daily_input_hub
-    render_daily_input_hub()
-elif page == "매출 등록":
-    from ui_pages.sales_entry import render_sales_entry
-    render_sales_entry()
-elif page == "분석총평":
-    from ui_pages.analysis.analysis_summary import render_analysis_summary
-    render_analysis_summary()
-elif page == "매출 관리":
-    from ui_pages.analysis.sales_analysis import render_sales_analysis
-    render_sales_analysis()
-elif page == "메뉴 입력":
-    from ui_pages.input.menu_input import render_menu_input_page
-    render_menu_input_page()
-elif page == "재료 입력":
-    from ui_pages.input.ingredient_input import render_ingredient_input_page
-    render_ingredient_input_page()
-elif page == "재고 입력":
-    from ui_pages.input.inventory_input import render_inventory_input_page
-    render_inventory_input_page()
-elif page == "원가 파악":
-    from ui_pages.cost_overview import render_cost_overview
-    render_cost_overview()
-elif page == "가게 전략 센터":
-    from ui_pages.design_lab.design_hub import render_design_hub
-    render_design_hub()
-elif page == "메뉴 등록":
-    from ui_pages.menu_management import render_menu_management
-    render_menu_management()
-elif page == "재료 등록":
-    from ui_pages.ingredient_management import render_ingredient_management
-    render_ingredient_management()
-elif page == "실제정산":
-    from ui_pages.settlement_actual import render_settlement_actual
-    render_settlement_actual()
-elif page == "판매 관리":
-    from ui_pages.analysis.sales_analysis import render_sales_analysis
-    render_sales_analysis()
-elif page == "판매량 등록":
-    from ui_pages.sales_volume_entry import render_sales_volume_entry
-    render_sales_volume_entry()
-elif page == "건강검진 실시":
-    from ui_pages.health_check.health_check_page import render_health_check_page
-    render_health_check_page()
-elif page == "검진 결과 요약":
-    from ui_pages.health_check.health_check_result import render_health_check_result
-    render_health_check_result()
-elif page == "검진 히스토리":
-    from ui_pages.health_check.health_check_history import render_health_check_history
-    render_health_check_history()
-elif page == "매출 하락 원인 찾기":
-    from ui_pages.diagnostics.sales_drop_oneclick import render_sales_drop_oneclick
-    render_sales_drop_oneclick()
-elif page == "메뉴 수익 구조 설계실":
-    from ui_pages.menu_profit_design_lab import render_menu_profit_design_lab
-    render_menu_profit_design_lab()
-elif page == "수익 구조 설계실":
-    from ui_pages.revenue_structure_design_lab import render_revenue_structure_design_lab
-    render_revenue_structure_design_lab()
-elif page == "레시피 등록":
-    from ui_pages.recipe_management import render_recipe_management
-    render_recipe_management()
-elif page == "목표 비용구조":
-    from ui_pages.target_cost_structure import render_target_cost_structure
-    render_target_cost_structure()
-elif page == "목표 매출구조":
-    from ui_pages.target_sales_structure import render_target_sales_structure
-    render_target_sales_structure()
-elif page == "직원 연락망":
-    from ui_pages.staff_contacts import render_staff_contacts
-    render_staff_contacts()
-elif page == "협력사 연락망":
-    from ui_pages.vendor_contacts import render_vendor_contacts
-    render_vendor_contacts()
-elif page == "주간 리포트":
-    from ui_pages.weekly_report import render_weekly_report
-    render_weekly_report()
-elif page == "재료 사용량 집계":
-    from ui_pages.ingredient_usage_summary import render_ingredient_usage_summary
-    render_ingredient_usage_summary()
-elif page == "재고 분석":
-    from ui_pages.analysis.inventory_analysis import render_inventory_analysis
-    render_inventory_analysis()
-elif page == "비용 분석":
-    from ui_pages.analysis.cost_analysis import render_cost_analysis
-    render_cost_analysis()
-elif page == "실제정산 분석":
-    from ui_pages.analysis.settlement_analysis import render_settlement_analysis
-    render_settlement_analysis()
-elif page == "게시판":
-    from ui_pages.board import render_board
-    render_board()
-elif page == "화면테스트":
-    from ui_pages.design_test.header_unified_test import render_header_unified_test
-    render_header_unified_test()
-elif page == "화면테스트2":
-    from ui_pages.design_test.header_unified_test2 import render_header_unified_test2
-    render_header_unified_test2()
+render_page(page)
 
 # ============================================
 # CAUSE OS 푸터 (모든 페이지 하단에 공통 적용)
@@ -1097,6 +945,9 @@ elif page == "화면테스트2":
 from src.ui.footer import render_cause_os_footer
 render_cause_os_footer()
 
+# DEV 패널 (dev_mode에서만 표시, 페이지 렌더 이후라 이번 rerun 쿼리 원장 포함)
+render_boot_perf_sidebar()
+
 # ============================================
 # 최종 안전핀 CSS (모든 CSS 주입 후 마지막에 주입)
 # ============================================
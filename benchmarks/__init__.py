@@ -0,0 +1,12 @@
+"""
+오프라인 벤치마크 (Supabase 없이 저장소/분석 핫패스 측정)
+
+- synthetic_store: 규모별 가상 매장 데이터 생성
+- fake_supabase: 프로세스 내 Supabase 클라이언트 대역 (table()/rpc(), 호출 지연 주입)
+- harness: 가짜 클라이언트 설치 + 호출/지연/메모리 측정
+- scenarios: 측정 시나리오 (load_csv, save_daily_close, HOME 스냅샷, 스코어카드, 가게 상태, 분석 계산)
+- run: CLI (결과를 benchmarks/baselines/*.json 기준선과 비교)
+
+사용:
+    python -m benchmarks.run --scale small
+"""
@@ -0,0 +1,610 @@
+"""
+프로세스 내 Supabase 클라이언트 대역 (오프라인 벤치마크용)
+
+- supabase-py 쿼리 빌더 표면: table()/from_() → select/insert/upsert/update/delete
+  + eq/neq/gt/gte/lt/lte/in_/is_/like/ilike + order/limit/range/single/maybe_single → execute()
+- rpc(fn, params).execute(): RPC_HANDLERS 에 등록된 함수 실행 (미등록 함수는 빈 결과)
+- 뷰(v_daily_sales_*)는 조회 시 기반 테이블에서 계산
+- 호출마다 LatencyModel 지연(기본 + 행당 전송 비용 + 지터)을 time.sleep 으로 주입하고 CallRecord 기록
+"""
+import copy
+import fnmatch
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+
+# upsert 기본 충돌 키 (on_conflict 미지정 시, DB 유니크 제약과 동일)
+UNIQUE_KEYS = {
+    "daily_close": ("store_id", "date"),
+    "sales": ("store_id", "date"),
+    "naver_visitors": ("store_id", "date"),
+    "daily_sales_items": ("store_id", "date", "menu_id"),
+    "daily_sales_items_overrides": ("store_id", "sale_date", "menu_id"),
+    "inventory": ("store_id", "ingredient_id"),
+    "targets": ("store_id", "year", "month"),
+    "actual_settlement": ("store_id", "year", "month"),
+    "actual_settlement_items": ("store_id", "year", "month", "template_id"),
+    "home_snapshots": ("store_id", "year", "month"),
+    "menu_portfolio_state": ("store_id", "menu_id"),
+    "ingredient_structure_state": ("store_id", "ingredient_id"),
+    "design_routine_log": ("store_id", "routine_type", "period_key"),
+    "sales_change_point_state": ("store_id",),
+    "health_check_answers": ("session_id", "question_code"),
+    "health_check_results": ("session_id", "category"),
+}
+
+
+@dataclass
+class LatencyModel:
+    """호출 1회 지연 = base_ms + 행 수 × per_row_us + U(0, jitter_ms)"""
+    base_ms: float = 0.0
+    per_row_us: float = 0.0
+    jitter_ms: float = 0.0
+    seed: int = 0
+    _rng: random.Random = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        self._rng = random.Random(self.seed)
+
+    def delay_ms(self, rows: int) -> float:
+        jitter = self._rng.uniform(0, self.jitter_ms) if self.jitter_ms > 0 else 0.0
+        return self.base_ms + rows * self.per_row_us / 1000.0 + jitter
+
+
+@dataclass
+class CallRecord:
+    kind: str      # select | insert | upsert | update | delete | rpc
+    table: str
+    shape: str     # kind + table + 필터 컬럼 (값 제외)
+    rows: int
+    ms: float      # 주입 지연 + 대역 처리 시간
+
+
+class FakeResponse:
+    def __init__(self, data, count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+
+class FakeAPIError(Exception):
+    """PostgREST 오류 대역 (예: single() 결과가 1건이 아님)"""
+
+
+# ---------- 값 비교 ----------
+
+def _coerce(row_value, filter_value):
+    if row_value is None or filter_value is None:
+        return row_value, filter_value
+    if isinstance(row_value, bool) or isinstance(filter_value, bool):
+        if isinstance(filter_value, str):
+            filter_value = filter_value.lower() == "true"
+        return bool(row_value), bool(filter_value)
+    if isinstance(row_value, (int, float)) and not isinstance(filter_value, (int, float)):
+        try:
+            return row_value, float(filter_value)
+        except (TypeError, ValueError):
+            return str(row_value), str(filter_value)
+    if isinstance(filter_value, (int, float)) and not isinstance(row_value, (int, float)):
+        try:
+            return float(row_value), filter_value
+        except (TypeError, ValueError):
+            return str(row_value), str(filter_value)
+    if hasattr(filter_value, "isoformat"):
+        filter_value = filter_value.isoformat()
+    return row_value, filter_value
+
+
+def _compare(op: str, row_value, value) -> bool:
+    if op.startswith("not."):
+        return not _compare(op[4:], row_value, value)
+    if op == "is":
+        target = None if str(value).lower() == "null" else str(value).lower() == "true"
+        return row_value is target if target is None else bool(row_value) == target
+    if op == "in":
+        return any(_compare("eq", row_value, v) for v in value)
+    if op in ("like", "ilike"):
+        if row_value is None:
+            return False
+        pattern = str(value).replace("%", "*")
+        text = str(row_value)
+        if op == "ilike":
+            pattern, text = pattern.lower(), text.lower()
+        return fnmatch.fnmatchcase(text, pattern)
+    if row_value is None:
+        return op == "neq" and value is not None
+    a, b = _coerce(row_value, value)
+    try:
+        return {
+            "eq": a == b, "neq": a != b, "gt": a > b, "gte": a >= b, "lt": a < b, "lte": a <= b,
+        }[op]
+    except TypeError:
+        return False
+
+
+def _split_top(text: str) -> List[str]:
+    """최상위 쉼표로 분리 (괄호 안 쉼표는 유지)"""
+    parts, depth, start = [], 0, 0
+    for i, ch in enumerate(text):
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return [p.strip() for p in parts if p.strip()]
+
+
+def _parse_logic(text: str) -> List[tuple]:
+    """PostgREST 논리 트리 "a.eq.1,and(b.gt.2,c.lt.3)" → [(op, column, value) | ("and"/"or", None, [...])]"""
+    out = []
+    for part in _split_top(text):
+        for group in ("and", "or"):
+            if part.startswith(f"{group}(") and part.endswith(")"):
+                out.append((group, None, _parse_logic(part[len(group) + 1:-1])))
+                break
+        else:
+            column, rest = part.split(".", 1)
+            negate = rest.startswith("not.")
+            if negate:
+                rest = rest[4:]
+            op, value = rest.split(".", 1)
+            out.append((("not." if negate else "") + op, column, value))
+    return out
+
+
+def _match_logic(group: str, conditions: List[tuple], row: Dict) -> bool:
+    results = (
+        _match_logic(op, value, row) if op in ("and", "or") else _compare(op, row.get(column), value)
+        for op, column, value in conditions
+    )
+    return any(results) if group == "or" else all(results)
+
+
+def _project(row: Dict, columns: str) -> Dict:
+    if columns.strip() in ("*", ""):
+        return dict(row)
+    out = {}
+    for col in columns.split(","):
+        col = col.strip()
+        if not col or "(" in col:
+            continue  # 임베디드 리소스는 미지원 (현재 코드베이스 미사용)
+        if col == "*":
+            out.update(row)
+        else:
+            out[col] = row.get(col)
+    return out
+
+
+# ---------- DB ----------
+
+class FakeDatabase:
+    """테이블 저장소 + 호출 기록"""
+
+    def __init__(self, tables: Dict[str, List[Dict]], latency: Optional[LatencyModel] = None):
+        self.tables: Dict[str, List[Dict]] = copy.deepcopy(tables)
+        self.latency = latency or LatencyModel()
+        self.calls: List[CallRecord] = []
+        self._lock = threading.Lock()
+
+    def rows(self, table: str) -> List[Dict]:
+        view = VIEWS.get(table)
+        if view is not None:
+            return view(self)
+        return self.tables.setdefault(table, [])
+
+    def record(self, kind: str, table: str, shape: str, rows: int, started: float) -> None:
+        delay = self.latency.delay_ms(rows)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+        ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self.calls.append(CallRecord(kind, table, shape, rows, ms))
+
+    def reset_calls(self) -> None:
+        with self._lock:
+            self.calls = []
+
+    def call_summary(self) -> Dict:
+        """호출 수 / 행 수 / DB 시간 + 테이블별·형태별 호출 수"""
+        with self._lock:
+            calls = list(self.calls)
+        by_table: Dict[str, int] = {}
+        by_shape: Dict[str, int] = {}
+        for c in calls:
+            by_table[c.table] = by_table.get(c.table, 0) + 1
+            by_shape[c.shape] = by_shape.get(c.shape, 0) + 1
+        return {
+            "calls": len(calls),
+            "rows": sum(c.rows for c in calls),
+            "db_ms": round(sum(c.ms for c in calls), 2),
+            "by_table": dict(sorted(by_table.items(), key=lambda kv: -kv[1])),
+            "repeated_shapes": {s: n for s, n in sorted(by_shape.items(), key=lambda kv: -kv[1]) if n > 1},
+        }
+
+
+# ---------- 쿼리 빌더 ----------
+
+class FakeNotFilter:
+    """query.not_.is_(...) 처럼 다음 필터 1개를 부정"""
+
+    def __init__(self, query: "FakeQuery"):
+        self._query = query
+
+    def eq(self, column, value):
+        return self._query._filter("not.eq", column, value)
+
+    def in_(self, column, values):
+        return self._query._filter("not.in", column, list(values))
+
+    def is_(self, column, value):
+        return self._query._filter("not.is", column, value)
+
+
+class FakeQuery:
+    def __init__(self, db: FakeDatabase, table: str):
+        self._db = db
+        self._table = table
+        self._kind = "select"
+        self._columns = "*"
+        self._count: Optional[str] = None
+        self._payload = None
+        self._on_conflict: Optional[str] = None
+        self._filters: List[tuple] = []
+        self._orders: List[tuple] = []
+        self._limit: Optional[int] = None
+        self._offset = 0
+        self._single: Optional[str] = None
+
+    # 동작
+    def select(self, *columns, count: Optional[str] = None, **kwargs):
+        self._columns = ",".join(columns) if columns else "*"
+        self._count = count
+        return self
+
+    def insert(self, payload, **kwargs):
+        self._kind, self._payload = "insert", payload
+        return self
+
+    def upsert(self, payload, on_conflict: Optional[str] = None, **kwargs):
+        self._kind, self._payload, self._on_conflict = "upsert", payload, on_conflict
+        return self
+
+    def update(self, payload, **kwargs):
+        self._kind, self._payload = "update", payload
+        return self
+
+    def delete(self, **kwargs):
+        self._kind = "delete"
+        return self
+
+    # 필터
+    def _filter(self, op: str, column: str, value):
+        self._filters.append((op, column, value))
+        return self
+
+    def eq(self, column, value):
+        return self._filter("eq", column, value)
+
+    def neq(self, column, value):
+        return self._filter("neq", column, value)
+
+    def gt(self, column, value):
+        return self._filter("gt", column, value)
+
+    def gte(self, column, value):
+        return self._filter("gte", column, value)
+
+    def lt(self, column, value):
+        return self._filter("lt", column, value)
+
+    def lte(self, column, value):
+        return self._filter("lte", column, value)
+
+    def in_(self, column, values):
+        return self._filter("in", column, list(values))
+
+    def is_(self, column, value):
+        return self._filter("is", column, value)
+
+    def or_(self, filters: str, **kwargs):
+        return self._filter("or", "or", _parse_logic(filters))
+
+    def like(self, column, pattern):
+        return self._filter("like", column, pattern)
+
+    def ilike(self, column, pattern):
+        return self._filter("ilike", column, pattern)
+
+    @property
+    def not_(self) -> "FakeNotFilter":
+        return FakeNotFilter(self)
+
+    # 정렬/범위
+    def order(self, column, desc: bool = False, **kwargs):
+        self._orders.append((column, desc))
+        return self
+
+    def limit(self, n: int, **kwargs):
+        self._limit = int(n)
+        return self
+
+    def range(self, start: int, end: int, **kwargs):
+        self._offset, self._limit = int(start), int(end) - int(start) + 1
+        return self
+
+    def single(self):
+        self._single = "single"
+        return self
+
+    def maybe_single(self):
+        self._single = "maybe"
+        return self
+
+    # 실행
+    @property
+    def shape(self) -> str:
+        cols = sorted({f"{col}={op}" for op, col, _ in self._filters})
+        return f"{self._kind} {self._table}" + ("?" + "&".join(cols) if cols else "")
+
+    def _match(self, row: Dict) -> bool:
+        return all(
+            _match_logic("or", value, row) if op == "or" else _compare(op, row.get(col), value)
+            for op, col, value in self._filters
+        )
+
+    def execute(self) -> FakeResponse:
+        started = time.perf_counter()
+        handler = getattr(self, f"_exec_{self._kind}")
+        data, count = handler()
+        self._db.record(self._kind, self._table, self.shape, len(data) if isinstance(data, list) else 1, started)
+        if self._single:
+            if len(data) == 1:
+                data = data[0]
+            elif self._single == "maybe" and not data:
+                return None  # supabase-py maybe_single(): 결과 없으면 None
+            else:
+                raise FakeAPIError(f"single() expected 1 row, got {len(data)}")
+        return FakeResponse(data, count)
+
+    def _exec_select(self):
+        matched = [row for row in self._db.rows(self._table) if self._match(row)]
+        count = len(matched) if self._count else None
+        for column, desc in reversed(self._orders):
+            matched.sort(key=lambda r: (r.get(column) is None, r.get(column)), reverse=desc)
+        if self._offset:
+            matched = matched[self._offset:]
+        if self._limit is not None:
+            matched = matched[: self._limit]
+        return [_project(row, self._columns) for row in matched], count
+
+    def _exec_insert(self):
+        payload = self._payload if isinstance(self._payload, list) else [self._payload]
+        table = self._db.rows(self._table)
+        inserted = [_new_row(item) for item in payload]
+        table.extend(inserted)
+        return [dict(r) for r in inserted], None
+
+    def _exec_upsert(self):
+        payload = self._payload if isinstance(self._payload, list) else [self._payload]
+        keys = tuple(k.strip() for k in self._on_conflict.split(",")) if self._on_conflict \
+            else UNIQUE_KEYS.get(self._table, ("id",))
+        table = self._db.rows(self._table)
+        index = {tuple(str(r.get(k)) for k in keys): r for r in table}
+        out = []
+        for item in payload:
+            key = tuple(str(item.get(k)) for k in keys)
+            existing = index.get(key) if all(item.get(k) is not None for k in keys) else None
+            if existing is not None:
+                existing.update(item)
+                existing["updated_at"] = _now()
+                out.append(dict(existing))
+            else:
+                row = _new_row(item)
+                table.append(row)
+                index[key] = row
+                out.append(dict(row))
+        return out, None
+
+    def _exec_update(self):
+        out = []
+        for row in self._db.rows(self._table):
+            if self._match(row):
+                row.update(self._payload)
+                row["updated_at"] = _now()  # sql/store_watermarks.sql 트리거와 동일
+                out.append(dict(row))
+        return out, None
+
+    def _exec_delete(self):
+        table = self._db.rows(self._table)
+        kept, removed = [], []
+        for row in table:
+            (removed if self._match(row) else kept).append(row)
+        table[:] = kept
+        return removed, None
+
+
+def _now() -> str:
+    return datetime.now().isoformat()
+
+
+def _new_row(item: Dict) -> Dict:
+    row = dict(item)
+    row.setdefault("id", str(uuid.uuid4()))
+    row.setdefault("created_at", _now())
+    row.setdefault("updated_at", row["created_at"])
+    return row
+
+
+# ---------- 뷰 ----------
+
+def _view_daily_sales_official(db: FakeDatabase) -> List[Dict]:
+    return [
+        {"store_id": r["store_id"], "date": r["date"], "total_sales": r["total_sales"],
+         "card_sales": r["card_sales"], "cash_sales": r["cash_sales"], "visitors": r.get("visitors"),
+         "memo": r.get("memo"), "is_official": True, "source": "daily_close"}
+        for r in db.tables.get("daily_close", []) if r.get("total_sales") is not None
+    ]
+
+
+def _view_daily_sales_best_available(db: FakeDatabase) -> List[Dict]:
+    close = {(r["store_id"], r["date"]): r for r in db.tables.get("daily_close", [])}
+    sales = {(r["store_id"], r["date"]): r for r in db.tables.get("sales", [])}
+    visitors = {(r["store_id"], r["date"]): r for r in db.tables.get("naver_visitors", [])}
+    out = []
+    for key in sorted(set(close) | set(sales)):
+        dc, s = close.get(key), sales.get(key)
+        src = dc or s
+        out.append({
+            "store_id": key[0], "date": key[1],
+            "total_sales": src.get("total_sales") or 0, "card_sales": src.get("card_sales") or 0,
+            "cash_sales": src.get("cash_sales") or 0,
+            "visitors": (dc or {}).get("visitors") or (visitors.get(key) or {}).get("visitors") or 0,
+            "memo": (dc or {}).get("memo"), "is_official": dc is not None,
+            "source": "daily_close" if dc is not None else "sales",
+        })
+    return out
+
+
+def _view_daily_sales_items_effective(db: FakeDatabase) -> List[Dict]:
+    overrides = {(r["store_id"], r["sale_date"], r["menu_id"]): r for r in db.tables.get("daily_sales_items_overrides", [])}
+    out = []
+    for r in db.tables.get("daily_sales_items", []):
+        key = (r["store_id"], r["date"], r["menu_id"])
+        ovr = overrides.pop(key, None)
+        qty = ovr["qty"] if ovr is not None else r.get("qty") or 0
+        if qty > 0:
+            out.append({"store_id": key[0], "date": key[1], "menu_id": key[2], "qty": qty,
+                        "source_type": "override" if ovr is not None else "base",
+                        "override_updated_at": (ovr or {}).get("updated_at"),
+                        "base_created_at": r.get("created_at"), "base_updated_at": r.get("updated_at")})
+    for (store_id, sale_date, menu_id), ovr in overrides.items():
+        if (ovr.get("qty") or 0) > 0:
+            out.append({"store_id": store_id, "date": sale_date, "menu_id": menu_id, "qty": ovr["qty"],
+                        "source_type": "override", "override_updated_at": ovr.get("updated_at"),
+                        "base_created_at": None, "base_updated_at": None})
+    return out
+
+
+VIEWS: Dict[str, Callable[[FakeDatabase], List[Dict]]] = {
+    "v_daily_sales_official": _view_daily_sales_official,
+    "v_daily_sales_best_available": _view_daily_sales_best_available,
+    "v_daily_sales_items_effective": _view_daily_sales_items_effective,
+}
+
+
+# ---------- RPC ----------
+
+def _rpc_save_daily_close_transaction(db: FakeDatabase, p: Dict):
+    """sql/save_daily_close_transaction.sql 과 동일한 저장 순서"""
+    store_id, day = p["p_store_id"], p["p_date"]
+    client = FakeSupabaseClient(db, record=False)
+    client.table("daily_close").upsert({
+        "store_id": store_id, "date": day, "card_sales": p["p_card_sales"], "cash_sales": p["p_cash_sales"],
+        "total_sales": p["p_total_sales"], "visitors": p["p_visitors"],
+        "out_of_stock": p.get("p_out_of_stock", False), "complaint": p.get("p_complaint", False),
+        "group_customer": p.get("p_group_customer", False), "staff_issue": p.get("p_staff_issue", False),
+        "memo": p.get("p_memo"), "sales_items": p.get("p_sales_items"),
+    }).execute()
+    if p["p_total_sales"] > 0:
+        client.table("sales").upsert({"store_id": store_id, "date": day, "card_sales": p["p_card_sales"],
+                                      "cash_sales": p["p_cash_sales"], "total_sales": p["p_total_sales"]}).execute()
+    if p["p_visitors"] > 0:
+        client.table("naver_visitors").upsert({"store_id": store_id, "date": day, "visitors": p["p_visitors"]}).execute()
+    items = p.get("p_sales_items") or []
+    if items:
+        client.table("daily_sales_items").delete().eq("store_id", store_id).eq("date", day).execute()
+        menu_ids = {m["name"]: m["id"] for m in db.tables.get("menu_master", []) if m["store_id"] == store_id}
+        rows = [{"store_id": store_id, "date": day, "menu_id": menu_ids[i["menu_name"]], "qty": int(i["quantity"])}
+                for i in items if int(i["quantity"]) > 0 and i["menu_name"] in menu_ids]
+        if rows:
+            client.table("daily_sales_items").insert(rows).execute()
+    return None
+
+
+def _rpc_get_store_watermarks(db: FakeDatabase, p: Dict):
+    """sql/store_watermarks.sql: 테이블별 (행 수, max(updated_at))"""
+    out = []
+    for table in p.get("p_tables") or []:
+        rows = [r for r in db.tables.get(table, []) if str(r.get("store_id")) == str(p["p_store_id"])]
+        stamps = [r.get("updated_at") for r in rows if r.get("updated_at")]
+        out.append({"table_name": table, "row_count": len(rows), "max_updated_at": max(stamps) if stamps else None})
+    return out
+
+
+def _rpc_finalize_health_session_transaction(db: FakeDatabase, p: Dict):
+    """sql/finalize_health_session_transaction.sql: 결과 일괄 upsert + 세션 완료"""
+    store_id, session_id = p["p_store_id"], p["p_session_id"]
+    client = FakeSupabaseClient(db, record=False)
+    now = datetime.utcnow().isoformat() + "Z"
+    rows = [{**r, "store_id": store_id, "session_id": session_id, "updated_at": now} for r in p.get("p_results") or []]
+    if rows:
+        client.table("health_check_results").upsert(rows, on_conflict="store_id,session_id,category").execute()
+    update = {"completed_at": p["p_completed_at"], "overall_score": p["p_overall_score"],
+              "overall_grade": p["p_overall_grade"], "main_bottleneck": p["p_main_bottleneck"]}
+    if p.get("p_diagnosis") is not None:
+        update["diagnosis_json"] = p["p_diagnosis"]
+    client.table("health_check_sessions").update(update).eq("id", session_id).eq("store_id", store_id).execute()
+    return None
+
+
+RPC_HANDLERS: Dict[str, Callable[[FakeDatabase, Dict], object]] = {
+    "save_daily_close_transaction": _rpc_save_daily_close_transaction,
+    "get_store_watermarks": _rpc_get_store_watermarks,
+    "finalize_health_session_transaction": _rpc_finalize_health_session_transaction,
+}
+
+
+class FakeRpc:
+    def __init__(self, db: FakeDatabase, fn: str, params: Optional[Dict]):
+        self._db, self._fn, self._params = db, fn, params or {}
+
+    def execute(self) -> FakeResponse:
+        started = time.perf_counter()
+        handler = RPC_HANDLERS.get(self._fn)
+        data = handler(self._db, self._params) if handler else []
+        self._db.record("rpc", f"rpc:{self._fn}", f"rpc {self._fn}", len(data) if isinstance(data, list) else 1, started)
+        return FakeResponse(data)
+
+
+# ---------- 클라이언트 ----------
+
+class _FakeAuth:
+    def get_session(self):
+        return None
+
+    def get_user(self, *args, **kwargs):
+        return None
+
+
+class _UnrecordedDatabase:
+    """RPC 내부 쿼리용 (호출 기록/지연 없이 같은 테이블 사용)"""
+
+    def __init__(self, db: FakeDatabase):
+        self.tables = db.tables
+        self.rows = db.rows
+
+    def record(self, *args, **kwargs):
+        pass
+
+
+class FakeSupabaseClient:
+    """supabase.Client 대역 (table/from_/rpc/auth)"""
+
+    def __init__(self, db: FakeDatabase, record: bool = True):
+        self._db = db if record else _UnrecordedDatabase(db)
+        self.auth = _FakeAuth()
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self._db, name)
+
+    from_ = table
+
+    def rpc(self, fn: str, params: Optional[Dict] = None, **kwargs) -> FakeRpc:
+        return FakeRpc(self._db, fn, params)
@@ -0,0 +1,184 @@
+"""
+벤치마크 실행 환경
+
+- configure_streamlit(): Streamlit bare 모드 설정 (벤치마크 전용 secrets, 로그 억제)
+  → 실제 .streamlit/secrets.toml 은 읽지 않으므로 운영 Supabase에 접속할 일이 없음
+- install_fake_backend(): src.auth 클라이언트/매장 함수를 FakeSupabaseClient로 교체
+  (이미 import된 모듈이 `from src.auth import ...` 로 바인딩한 참조까지 교체, 한 번에 1개만 활성)
+- reset_caches(): st.cache_data / st.cache_resource / session_state / 엔진 캐시 / 공유 캐시 갱신 기록 (+ 영구 캐시) 초기화 (cold 측정용)
+- measure(): 호출 수/행 수/DB 시간/앱 시간/피크 메모리 측정
+"""
+import gc
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.fake_supabase import FakeDatabase, FakeSupabaseClient, LatencyModel
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+_BENCH_SECRETS = "[app]\ndev_mode = false\n"
+_PATCH_MODULE_PREFIXES = ("src", "ui_pages", "core", "benchmarks")
+_CLIENT_FUNCS = ("get_supabase_client", "get_read_client", "get_anon_client", "get_service_client", "get_auth_client")
+
+_configured = False
+
+
+def configure_streamlit() -> None:
+    """Streamlit bare 모드 준비 (프로세스당 1회)"""
+    global _configured
+    if _configured:
+        return
+    from streamlit import config
+
+    secrets_dir = tempfile.mkdtemp(prefix="ps_bench_")
+    secrets_path = os.path.join(secrets_dir, "secrets.toml")
+    with open(secrets_path, "w", encoding="utf-8") as f:
+        f.write(_BENCH_SECRETS)
+    config.set_option("secrets.files", [secrets_path])
+
+    # bare 모드 경고(ScriptRunContext/캐시 저장소)와 앱 INFO 로그는 측정 잡음
+    logging.disable(logging.WARNING)
+    _configured = True
+
+
+class FakeBackend:
+    """설치된 가짜 백엔드 (DB + 클라이언트 + 교체 기록)"""
+
+    def __init__(self, db: FakeDatabase, client: FakeSupabaseClient, store_id: str):
+        self.db = db
+        self.client = client
+        self.store_id = store_id
+        self._restore: List[tuple] = []
+
+    def uninstall(self) -> None:
+        global _active
+        for module, name, original in reversed(self._restore):
+            setattr(module, name, original)
+        self._restore = []
+        if _active is self:
+            _active = None
+
+
+# 교체 함수는 현재 설치된 백엔드를 참조 (설치 중 import된 모듈이 바인딩해도 다음 설치에서 그대로 동작)
+_active: Optional[FakeBackend] = None
+
+
+def _fake_client(*args, **kwargs):
+    return _active.client if _active else None
+
+
+def _fake_store_id():
+    return _active.store_id if _active else None
+
+
+def _fake_client_mode():
+    return "auth"
+
+
+def _fake_dev_mode():
+    return False
+
+
+def install_fake_backend(tables: Dict[str, List[Dict]], latency: Optional[LatencyModel] = None,
+                         store_id: Optional[str] = None) -> FakeBackend:
+    """
+    가짜 Supabase 설치
+
+    Args:
+        tables: synthetic_store.generate_store() 결과 (깊은 복사 후 사용)
+        latency: 호출 지연 모델
+        store_id: 현재 매장 (기본: stores 첫 행)
+    """
+    global _active
+    configure_streamlit()
+    import src.auth as auth
+
+    db = FakeDatabase(tables, latency)
+    backend = FakeBackend(db, FakeSupabaseClient(db), store_id or tables["stores"][0]["id"])
+    if _active is not None:
+        _active.uninstall()
+    _active = backend
+
+    replacements = {getattr(auth, name): _fake_client for name in _CLIENT_FUNCS if hasattr(auth, name)}
+    replacements[auth.get_current_store_id] = _fake_store_id
+    replacements[auth.get_read_client_mode] = _fake_client_mode
+    replacements[auth.is_dev_mode] = _fake_dev_mode
+
+    for module in list(sys.modules.values()):
+        module_name = getattr(module, "__name__", "") or ""
+        if not module_name.startswith(_PATCH_MODULE_PREFIXES):
+            continue
+        for name, value in list(vars(module).items()):
+            try:
+                replacement = replacements.get(value)
+            except TypeError:
+                continue  # 해시 불가 값
+            if replacement is not None:
+                backend._restore.append((module, name, value))
+                setattr(module, name, replacement)
+    return backend
+
+
+def reset_caches(disk: bool = False) -> None:
+    """cold 측정용 캐시 초기화 (disk=True면 영구 캐시 계층도 비움)"""
+    import streamlit as st
+    from src.utils.disk_cache import get_persistent_cache, invalidate_watermarks
+
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    try:
+        for key in list(st.session_state.keys()):
+            del st.session_state[key]
+    except Exception:
+        pass
+    invalidate_watermarks()
+    from src.engine.cache import get_cache_backend
+    from src.utils.single_flight import clear_shared_caches
+    get_cache_backend().clear()
+    clear_shared_caches()
+    if disk:
+        cache = get_persistent_cache()
+        if cache is not None:
+            cache.clear()
+    gc.collect()
+
+
+def measure(db: FakeDatabase, fn: Callable[[], object], track_memory: bool = False) -> Dict:
+    """
+    fn 1회 실행 측정
+
+    Returns:
+        wall_ms, db_ms(주입 지연 + 대역 처리), app_ms(= wall - db), calls, rows, by_table, repeated_shapes
+        (+ peak_kb: track_memory=True일 때 tracemalloc 피크)
+    """
+    db.reset_calls()
+    if track_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        fn()
+    finally:
+        wall_ms = (time.perf_counter() - start) * 1000
+        peak = tracemalloc.get_traced_memory()[1] if track_memory else None
+        if track_memory:
+            tracemalloc.stop()
+    summary = db.call_summary()
+    result = {
+        "wall_ms": round(wall_ms, 2),
+        "db_ms": summary["db_ms"],
+        "app_ms": round(max(0.0, wall_ms - summary["db_ms"]), 2),
+        "calls": summary["calls"],
+        "rows": summary["rows"],
+        "by_table": summary["by_table"],
+        "repeated_shapes": summary["repeated_shapes"],
+    }
+    if peak is not None:
+        result["peak_kb"] = round(peak / 1024, 1)
+    return result
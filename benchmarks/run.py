@@ -0,0 +1,189 @@
+"""
+오프라인 벤치마크 실행
+
+- 시나리오별 cold(캐시 비움) / warm(같은 캐시로 재실행) 측정 + cold 피크 메모리
+- --disk-cache: 영구 캐시 계층(src.utils.disk_cache)을 켜고 restart(메모리 캐시만 비움) 단계 추가 측정
+- 결과: 호출 수 / 행 수 / DB 시간(주입 지연 포함) / 앱 시간 / 벽시계 시간
+- 기준선: benchmarks/baselines/{scale}.json
+  --update-baseline 으로 기록, 기본은 기준선과 비교
+  (호출 수 증가 = 실패, 앱 시간 증가는 --tolerance 배율과 20ms를 모두 넘을 때 실패)
+
+사용:
+    python -m benchmarks.run --scale small
+    python -m benchmarks.run --scale medium --latency-ms 25 --per-row-us 2 --scenario load_csv
+    python -m benchmarks.run --scale small --update-baseline
+    python -m benchmarks.run --scale small --disk-cache
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+from datetime import date, datetime
+from typing import Dict, List
+
+from benchmarks.harness import ROOT, configure_streamlit, install_fake_backend, measure, reset_caches
+from benchmarks.fake_supabase import LatencyModel
+from benchmarks.synthetic_store import SCALES, generate_store, table_sizes
+
+BASELINE_DIR = os.path.join(ROOT, "benchmarks", "baselines")
+
+
+def run_scenario(scenario, tables: Dict, latency: LatencyModel, today: date, disk_cache: bool = False) -> Dict:
+    """시나리오 1개 측정 (cold / warm / [restart] / 메모리)"""
+    def fresh():
+        reset_caches(disk=disk_cache)
+        return install_fake_backend(tables, latency)
+
+    restart = None
+    backend = fresh()
+    try:
+        cold = measure(backend.db, lambda: scenario.fn(backend.store_id, today))
+        if scenario.mutates:
+            backend.uninstall()
+            backend = fresh()
+        warm = measure(backend.db, lambda: scenario.fn(backend.store_id, today))
+        if disk_cache and not scenario.mutates:
+            # 프로세스 재시작 흉내: 메모리 캐시만 비우고 디스크 캐시는 유지
+            reset_caches()
+            restart = measure(backend.db, lambda: scenario.fn(backend.store_id, today))
+    finally:
+        backend.uninstall()
+
+    # 메모리는 지연 없이 별도 측정 (tracemalloc 오버헤드가 시간 측정에 섞이지 않도록)
+    backend = fresh()
+    backend.db.latency = LatencyModel()
+    try:
+        memory = measure(backend.db, lambda: scenario.fn(backend.store_id, today), track_memory=True)
+    finally:
+        backend.uninstall()
+
+    result = {"description": scenario.description, "cold": cold, "warm": warm, "peak_kb": memory["peak_kb"]}
+    if restart is not None:
+        result["restart"] = restart
+    return result
+
+
+# 앱 시간 회귀로 보는 최소 증가폭 (ms)
+APP_MS_FLOOR = 20.0
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """기준선 대비 회귀 목록"""
+    problems = []
+    for name, result in results.items():
+        base = baseline.get("scenarios", {}).get(name)
+        if not base:
+            continue
+        for phase in ("cold", "warm"):
+            now, before = result[phase], base[phase]
+            if now["calls"] > before["calls"]:
+                problems.append(f"{name}/{phase}: calls {before['calls']} → {now['calls']}")
+            # 배율만 보면 수 ms 단위 지터(2.2 → 8.8ms)도 회귀로 잡히므로 절대 하한을 함께 적용
+            if now["app_ms"] - before["app_ms"] > max(before["app_ms"] * (tolerance - 1), APP_MS_FLOOR):
+                problems.append(f"{name}/{phase}: app_ms {before['app_ms']:.1f} → {now['app_ms']:.1f}")
+    return problems
+
+
+def _print_row(name: str, result: Dict, base: Dict = None) -> None:
+    def fmt(phase):
+        r = result[phase]
+        delta = ""
+        if base:
+            b = base[phase]
+            delta = f" (Δcalls {r['calls'] - b['calls']:+d}, Δapp {r['app_ms'] - b['app_ms']:+.0f}ms)"
+        return f"{r['calls']:>4} calls {r['rows']:>7} rows {r['db_ms']:>8.1f} db {r['app_ms']:>8.1f} app{delta}"
+    print(f"{name:<22} cold {fmt('cold')}")
+    print(f"{'':<22} warm {fmt('warm')}   peak {result['peak_kb']:.0f}KB")
+    if "restart" in result:
+        r = result["restart"]
+        print(f"{'':<22} rest {r['calls']:>4} calls {r['rows']:>7} rows {r['db_ms']:>8.1f} db {r['app_ms']:>8.1f} app")
+    repeated = {s: n for s, n in result["cold"]["repeated_shapes"].items() if n >= 5}
+    for shape, n in repeated.items():
+        print(f"{'':<22}   N+1? {shape} ×{n}")
+
+
+def _write_json(path: str, payload: Dict) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    os.replace(tmp_path, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오프라인 벤치마크 (가짜 Supabase + 가상 매장)")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--scenario", action="append", help="실행할 시나리오 (반복 가능, 기본: 전체)")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="호출당 기본 지연")
+    parser.add_argument("--per-row-us", type=float, default=1.0, help="행당 전송 지연 (µs)")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="호출당 지연 지터 상한")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--tolerance", type=float, default=1.5, help="앱 시간 회귀 허용 배율")
+    parser.add_argument("--update-baseline", action="store_true", help="결과를 기준선으로 저장")
+    parser.add_argument("--output", help="결과 JSON 경로 (선택)")
+    parser.add_argument("--disk-cache", action="store_true", help="영구 캐시 계층을 임시 디렉터리로 켜고 restart 단계 측정")
+    args = parser.parse_args()
+    if args.disk_cache and args.update_baseline:
+        parser.error("--disk-cache 결과는 기준선으로 저장하지 않습니다")
+    if args.disk_cache:
+        os.environ["PS_DISK_CACHE_DIR"] = tempfile.mkdtemp(prefix="ps_bench_disk_")
+
+    configure_streamlit()
+    from benchmarks.scenarios import SCENARIOS
+    from src.utils.time_utils import today_kst
+
+    names = args.scenario or list(SCENARIOS)
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario: {', '.join(unknown)} (available: {', '.join(SCENARIOS)})")
+
+    # 앱 함수가 내부적으로 today_kst()를 쓰므로 데이터도 KST 오늘 기준으로 생성
+    today = today_kst()
+    tables = generate_store(args.scale, seed=args.seed, today=today)
+    latency = LatencyModel(args.latency_ms, args.per_row_us, args.jitter_ms, args.seed)
+
+    baseline_path = os.path.join(BASELINE_DIR, f"{args.scale}.json")
+    baseline = {}
+    if os.path.exists(baseline_path) and not args.update_baseline:
+        with open(baseline_path, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    print(f"scale={args.scale} latency={args.latency_ms}ms+{args.per_row_us}µs/row rows={sum(table_sizes(tables).values())}")
+    results = {}
+    for name in names:
+        results[name] = run_scenario(SCENARIOS[name], tables, latency, today, args.disk_cache)
+        _print_row(name, results[name], baseline.get("scenarios", {}).get(name))
+
+    payload = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "scale": args.scale,
+        "seed": args.seed,
+        "latency": {"base_ms": args.latency_ms, "per_row_us": args.per_row_us, "jitter_ms": args.jitter_ms},
+        "disk_cache": args.disk_cache,
+        "tables": table_sizes(tables),
+        "scenarios": results,
+    }
+    if args.output:
+        _write_json(args.output, payload)
+    if args.update_baseline:
+        _write_json(baseline_path, payload)
+        print(f"\n기준선 저장: {os.path.relpath(baseline_path, ROOT)}")
+        return
+
+    # --disk-cache 는 워터마크 RPC가 추가되므로 Δ만 출력하고 회귀 판정은 하지 않음
+    if baseline and not args.disk_cache:
+        problems = compare(results, baseline, args.tolerance)
+        if problems:
+            print("\n기준선 대비 회귀:")
+            for p in problems:
+                print(f"  - {p}")
+            sys.exit(1)
+        print("\n기준선 대비 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+벤치마크 시나리오
+
+각 시나리오는 (store_id, today)를 받아 앱의 실제 함수를 호출한다 (화면 렌더링 제외).
+mutates=True 시나리오는 데이터를 바꾸므로 측정마다 새 가짜 DB에서 실행한다.
+"""
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Callable, Dict
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    description: str
+    fn: Callable[[str, date], object]
+    mutates: bool = False
+
+
+SCENARIOS: Dict[str, Scenario] = {}
+
+
+def scenario(name: str, description: str, mutates: bool = False):
+    def decorator(fn):
+        SCENARIOS[name] = Scenario(name, description, fn, mutates)
+        return fn
+    return decorator
+
+
+def _prev_month(today: date):
+    first = today.replace(day=1) - timedelta(days=1)
+    return first.year, first.month
+
+
+@scenario("load_csv", "load_csv 주요 테이블 6종 (최근 90일 + 마스터)")
+def load_csv_tables(store_id: str, today: date):
+    from src.storage_supabase import load_csv
+    for filename in ("daily_close.csv", "daily_sales_items.csv", "menu_master.csv",
+                     "ingredient_master.csv", "recipes.csv", "inventory.csv"):
+        load_csv(filename, store_id=store_id)
+
+
+@scenario("load_stampede", "동시 세션 8개가 캐시 만료 직후 같은 데이터 요청 (load_csv 2종 + 매출 SSOT, store_id 명시/생략 섞음)")
+def load_stampede(store_id: str, today: date):
+    import threading
+    from src.storage_supabase import load_best_available_daily_sales, load_csv, load_monthly_sales_total
+    start = (today - timedelta(days=30)).isoformat()
+
+    def session(i: int):
+        explicit = {"store_id": store_id} if i % 2 else {}
+        load_csv("daily_close.csv", **explicit)
+        load_csv("ingredient_master.csv", **explicit)
+        load_best_available_daily_sales(start_date=start, end_date=today.isoformat(), **explicit)
+        load_monthly_sales_total(store_id, today.year, today.month)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+@scenario("save_daily_close", "오늘 마감 저장 (판매 15개 메뉴, 재고 자동 차감 포함)", mutates=True)
+def save_daily_close(store_id: str, today: date):
+    from src.storage_supabase import load_csv, save_daily_close as save
+    menus = load_csv("menu_master.csv", store_id=store_id)
+    sales_items = [(name, 3) for name in menus["메뉴명"].head(15)]
+    save(today, "", 1_000_000, 200_000, 1_200_000, 80, sales_items, {"품절": False}, None)
+
+
+@scenario("home_snapshot", "HOME 스냅샷 계산 (이번 달)")
+def home_snapshot(store_id: str, today: date):
+    from src.home.home_snapshot import compute_home_snapshot
+    compute_home_snapshot(store_id, today.year, today.month, today)
+
+
+@scenario("routine_status", "루틴 상태: 오늘 마감 / 스트릭 / 이번 주·이번 달 마감일 (마감 캘린더)")
+def routine_status(store_id: str, today: date):
+    from src.home.close_calendar import get_close_calendar
+    calendar = get_close_calendar(store_id, today)
+    calendar.closed_today, calendar.streak, calendar.closed_this_week, calendar.month_stats()
+
+
+@scenario("health_profile", "건강검진 판독 + 전략 프로필 + 분석 요약 (최신 완료 세션, 공용 캐시)")
+def health_profile(store_id: str, today: date):
+    from src.health_check.health_cache import get_latest_completed_session
+    from src.health_check.profile import load_latest_health_profile
+    from src.home.home_data import load_latest_health_diag
+    load_latest_health_diag(store_id)
+    load_latest_health_profile(store_id, lookback_days=60)
+    get_latest_completed_session(store_id)
+
+
+@scenario("health_finalize", "건강검진 완료: 새 세션 + 답변 일괄 저장 + finalize (점수/플래그/판독 저장)", mutates=True)
+def health_finalize(store_id: str, today: date):
+    from src.health_check.questions_bank import QUESTIONS
+    from src.health_check.storage import create_health_session, finalize_health_session, upsert_health_answers_batch
+    session_id, _ = create_health_session(store_id)
+    raws = ("yes", "maybe", "no")
+    answers = [
+        {"category": category, "question_code": q["code"], "raw_value": raws[i % 3]}
+        for category, questions in QUESTIONS.items() for i, q in enumerate(questions)
+    ]
+    upsert_health_answers_batch(store_id, session_id, answers)
+    finalize_health_session(store_id, session_id)
+
+
+@scenario("scorecard", "PDF 스코어카드 데이터 수집 (지난 달)")
+def scorecard(store_id: str, today: date):
+    from src.pdf_scorecard_mvp import gather_scorecard_mvp_data
+    year, month = _prev_month(today)
+    gather_scorecard_mvp_data(store_id, year, month)
+
+
+@scenario("store_state", "가게 상태 분류 (이번 달)")
+def store_state(store_id: str, today: date):
+    from ui_pages.strategy.store_state import classify_store_state
+    classify_store_state(store_id, today.year, today.month)
+
+
+@scenario("analysis_sales", "매출 분석 손익 엔진 (이번 달)")
+def analysis_sales(store_id: str, today: date):
+    from ui_pages.analysis.sales_pnl_engine import sales_pnl_engine
+    sales_pnl_engine(store_id, today.year, today.month, today, 0, 0, 0, 0, 0, 0)
+
+
+@scenario("analysis_menu", "월별 요약(6개월) + 메뉴별 판매 집계(30일)")
+def analysis_menu(store_id: str, today: date):
+    from ui_pages.dashboard.metrics import compute_menu_sales_summary, compute_monthly_summary
+    compute_monthly_summary(store_id, today - timedelta(days=180), today, 0, 0)
+    compute_menu_sales_summary(store_id, today - timedelta(days=30), today, 0, 0, 0)
+
+
+@scenario("analysis_cost", "비용 분석: 5대 비용 + 전월 대비 + 매출 수준 20단계 시뮬레이션 + What-if 격자 (지난 달)")
+def analysis_cost(store_id: str, today: date):
+    from src.design.what_if import load_cost_model, load_profit_surface
+    from src.storage_supabase import load_expense_structure, load_monthly_sales_total
+    from ui_pages.analysis.cost_analysis import _costs_by_sales_levels, _load_five_core_costs, _prev_month_category_totals
+    year, month = _prev_month(today)
+    monthly_sales = load_monthly_sales_total(store_id, year, month)
+    expense_df = load_expense_structure(year, month, store_id)
+    five_core_costs = _load_five_core_costs(store_id, year, month, monthly_sales)
+    _prev_month_category_totals(store_id, year, month)
+    _costs_by_sales_levels([monthly_sales * step / 10 for step in range(1, 21)], five_core_costs, expense_df)
+    model = load_cost_model(store_id, year, month)
+    surface = load_profit_surface(store_id, year, month, model.break_even or monthly_sales, model=model)
+    for price_change in surface.price_changes:
+        for cost_change in surface.cost_rate_changes:
+            surface.lookup(monthly_sales, price_change, cost_change)
+
+
+@scenario("expense_trend", "비용구조 12개월 추이: 기간 조회 1회 + 월 × 카테고리 피벗")
+def expense_trend(store_id: str, today: date):
+    from src.storage_supabase import load_expense_structure_pivot
+    year, month = _prev_month(today)
+    start_year, start_month = (year, month - 11) if month > 11 else (year - 1, month + 1)
+    load_expense_structure_pivot(start_year, start_month, year, month, store_id)
+
+
+@scenario("ingredient_structure", "재료 구조 설계실: 재료별 사용금액 + 집중도 + 고위험 재료")
+def ingredient_structure(store_id: str, today: date):
+    from ui_pages.design_lab.ingredient_structure_helpers import (
+        calculate_cost_concentration,
+        calculate_ingredient_usage_cost,
+        identify_high_risk_ingredients,
+    )
+    usage_df = calculate_ingredient_usage_cost(store_id)
+    calculate_cost_concentration(usage_df)
+    identify_high_risk_ingredients(usage_df)
+
+
+@scenario("analysis_settlement", "실제정산 분석: 스코어카드 + 6개월 추이 (지난 달)")
+def analysis_settlement(store_id: str, today: date):
+    from ui_pages.analysis.settlement_analysis import _settlement_scorecard, _trend_data
+    year, month = _prev_month(today)
+    _settlement_scorecard(store_id, year, month)
+    _trend_data(store_id, year, month, 6)
+
+
+@scenario("engine_sales_drop", "헤드리스 매출 하락 분석 (src.engine, 명시적 클라이언트 · 엔진 캐시 미사용)")
+def engine_sales_drop(store_id: str, today: date):
+    from src.auth import get_read_client
+    from src.engine.sales_drop import _analyze_sales_drop
+    _analyze_sales_drop.uncached(get_read_client(), store_id, 14, "week", today, today)
@@ -0,0 +1,246 @@
+"""
+가상 매장 데이터 생성기
+
+- 규모(SCALES)별 메뉴/재료/레시피/재고 + 1~3년치 daily_close / daily_sales_items
+- 파생 동기화 테이블(sales, naver_visitors), 목표/비용구조/정산 항목, 건강검진 세션까지 생성
+- 같은 (scale, seed, today)면 항상 같은 데이터 (random.Random 고정 시드)
+- 반환 형식: {테이블명: [행 dict, ...]} (FakeSupabase에 그대로 적재)
+"""
+import random
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from src.utils.time_utils import today_kst
+
+
+@dataclass(frozen=True)
+class StoreScale:
+    menus: int
+    ingredients: int
+    years: int
+    recipe_items: tuple = (3, 8)       # 메뉴당 재료 수 범위
+    menu_share: float = 0.4            # 하루 판매되는 메뉴 비율
+    base_daily_sales: int = 1_200_000  # 평일 기준 일매출 (원)
+
+
+SCALES: Dict[str, StoreScale] = {
+    "small": StoreScale(menus=20, ingredients=40, years=1),
+    "medium": StoreScale(menus=60, ingredients=120, years=2),
+    "large": StoreScale(menus=150, ingredients=300, years=3, base_daily_sales=3_000_000),
+}
+
+# 요일별 매출 배율 (월~일)
+_WEEKDAY_FACTOR = [0.85, 0.9, 0.95, 1.0, 1.25, 1.45, 1.2]
+
+MENU_CATEGORIES = ["대표", "주력", "보조", "미끼", "음료"]
+INGREDIENT_CATEGORIES = ["육류", "채소", "수산", "양념", "유제품", "기타"]
+UNITS = [("g", "kg", 1000.0), ("ml", "L", 1000.0), ("개", "박스", 10.0)]
+
+FIXED_EXPENSES = [("임차료", "월세", 3_500_000), ("인건비", "직원 급여", 9_000_000), ("공과금", "전기/가스/수도", 900_000)]
+VARIABLE_EXPENSES = [("재료비", "식자재", 32.0), ("부가세&카드수수료", "카드수수료", 9.0)]
+
+
+def _ids(rng: random.Random):
+    """시드 고정 UUID 생성기"""
+    while True:
+        yield str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _ts(d: date) -> str:
+    return datetime(d.year, d.month, d.day, 23, 0).isoformat() + "+09:00"
+
+
+def _months_between(start: date, end: date) -> List[tuple]:
+    months = []
+    y, m = start.year, start.month
+    while (y, m) <= (end.year, end.month):
+        months.append((y, m))
+        y, m = (y + 1, 1) if m == 12 else (y, m + 1)
+    return months
+
+
+def generate_store(scale: str = "small", seed: int = 42, today: Optional[date] = None,
+                   store_id: Optional[str] = None) -> Dict[str, List[Dict]]:
+    """
+    가상 매장 1개 생성
+
+    Args:
+        scale: SCALES 키 (small/medium/large)
+        seed: 난수 시드
+        today: 기준일 (기본: KST 오늘, 데이터는 어제까지)
+        store_id: 매장 ID (기본: 시드 기반 UUID)
+
+    Returns:
+        {테이블명: 행 리스트}
+    """
+    spec = SCALES[scale]
+    rng = random.Random(seed)
+    new_id = _ids(rng)
+    today = today or today_kst()
+    store_id = store_id or next(new_id)
+    start = today - timedelta(days=365 * spec.years)
+    created = _ts(start)
+
+    tables: Dict[str, List[Dict]] = {"stores": [{"id": store_id, "name": f"벤치마크 매장 ({scale})", "created_at": created}]}
+
+    # 메뉴 / 재료 / 레시피 / 재고
+    menus = []
+    for i in range(spec.menus):
+        menus.append({
+            "id": next(new_id), "store_id": store_id, "name": f"메뉴{i + 1:03d}",
+            "price": rng.randrange(6_000, 28_000, 500),
+            "category": MENU_CATEGORIES[i % len(MENU_CATEGORIES)],
+            "cooking_method": None, "is_core": i < max(1, spec.menus // 10),
+            "created_at": created, "updated_at": created,
+        })
+    ingredients = []
+    for i in range(spec.ingredients):
+        unit, order_unit, rate = UNITS[i % len(UNITS)]
+        unit_cost = round(rng.uniform(2, 40), 2) if unit != "개" else float(rng.randrange(100, 3_000, 50))
+        ingredients.append({
+            "id": next(new_id), "store_id": store_id, "name": f"재료{i + 1:03d}",
+            "unit": unit, "unit_cost": unit_cost, "order_unit": order_unit, "conversion_rate": rate,
+            "category": INGREDIENT_CATEGORIES[i % len(INGREDIENT_CATEGORIES)], "status": "사용중",
+            "created_at": created, "updated_at": created,
+        })
+    recipes = []
+    for menu in menus:
+        for ing in rng.sample(ingredients, rng.randint(*spec.recipe_items)):
+            qty = round(rng.uniform(10, 250), 1) if ing["unit"] != "개" else float(rng.randint(1, 3))
+            recipes.append({"id": next(new_id), "store_id": store_id, "menu_id": menu["id"],
+                            "ingredient_id": ing["id"], "qty": qty, "created_at": created})
+    inventory = [
+        {"id": next(new_id), "store_id": store_id, "ingredient_id": ing["id"],
+         "on_hand": float(rng.randint(500, 20_000)), "safety_stock": float(rng.randint(200, 3_000)),
+         "created_at": created, "updated_at": created}
+        for ing in ingredients
+    ]
+    tables.update(menu_master=menus, ingredients=ingredients, recipes=recipes, inventory=inventory)
+
+    # 일별 마감 / 판매 (마감 누락일 약 5%)
+    daily_close, sales, visitors_rows, items = [], [], [], []
+    menu_weights = [rng.paretovariate(1.5) for _ in menus]
+    day = start
+    while day < today:
+        if rng.random() < 0.95:
+            trend = 1.0 + 0.1 * ((day - start).days / max(1, 365 * spec.years))
+            total = int(spec.base_daily_sales * _WEEKDAY_FACTOR[day.weekday()] * trend * rng.uniform(0.8, 1.2)) // 100 * 100
+            card = int(total * rng.uniform(0.8, 0.95)) // 100 * 100
+            visitors = max(1, int(total / rng.uniform(14_000, 19_000)))
+            ds, ts = day.isoformat(), _ts(day)
+            daily_close.append({
+                "id": next(new_id), "store_id": store_id, "date": ds,
+                "card_sales": card, "cash_sales": total - card, "total_sales": total, "visitors": visitors,
+                "out_of_stock": rng.random() < 0.05, "complaint": rng.random() < 0.03,
+                "group_customer": rng.random() < 0.1, "staff_issue": rng.random() < 0.02,
+                "memo": "단체 예약" if rng.random() < 0.05 else None, "sales_items": None,
+                "created_at": ts, "updated_at": ts,
+            })
+            sales.append({"id": next(new_id), "store_id": store_id, "date": ds, "card_sales": card,
+                          "cash_sales": total - card, "total_sales": total, "created_at": ts, "updated_at": ts})
+            visitors_rows.append({"id": next(new_id), "store_id": store_id, "date": ds, "visitors": visitors,
+                                  "created_at": ts, "updated_at": ts})
+            sold = rng.choices(range(len(menus)), weights=menu_weights, k=max(1, int(len(menus) * spec.menu_share)))
+            for idx in sorted(set(sold)):
+                items.append({"id": next(new_id), "store_id": store_id, "date": ds, "menu_id": menus[idx]["id"],
+                              "qty": rng.randint(1, 25), "created_at": ts, "updated_at": ts})
+        day += timedelta(days=1)
+    tables.update(daily_close=daily_close, sales=sales, naver_visitors=visitors_rows,
+                  daily_sales_items=items, daily_sales_items_overrides=[])
+
+    # 월별 목표 / 비용구조 / 정산 (최근 2개월은 draft)
+    months = _months_between(start, today)
+    targets, expenses, settlement, settlement_items = [], [], [], []
+    templates = []
+    for order, (category, item_name, _) in enumerate(FIXED_EXPENSES + VARIABLE_EXPENSES):
+        templates.append({
+            "id": next(new_id), "store_id": store_id, "category": category, "item_name": item_name,
+            "item_type": "fixed" if order < len(FIXED_EXPENSES) else "variable",
+            "is_recurring": True, "recurring_value": None, "sort_order": order, "is_active": True,
+            "created_at": created, "updated_at": created,
+        })
+    monthly_sales: Dict[tuple, int] = {}
+    for row in daily_close:
+        key = (int(row["date"][:4]), int(row["date"][5:7]))
+        monthly_sales[key] = monthly_sales.get(key, 0) + row["total_sales"]
+
+    for i, (y, m) in enumerate(months):
+        month_sales = monthly_sales.get((y, m), 0)
+        targets.append({
+            "id": next(new_id), "store_id": store_id, "year": y, "month": m,
+            "target_sales": int(spec.base_daily_sales * 30 * 1.1), "target_cost_rate": 32.0,
+            "target_labor_rate": 25.0, "target_rent_rate": 10.0, "target_other_rate": 8.0,
+            "target_profit_rate": 15.0, "created_at": created, "updated_at": created,
+        })
+        for category, item_name, amount in FIXED_EXPENSES:
+            expenses.append({"id": next(new_id), "store_id": store_id, "year": y, "month": m,
+                             "category": category, "item_name": item_name,
+                             "amount": int(amount * rng.uniform(0.95, 1.05)), "notes": None,
+                             "created_at": created, "updated_at": created})
+        for category, item_name, rate in VARIABLE_EXPENSES:
+            expenses.append({"id": next(new_id), "store_id": store_id, "year": y, "month": m,
+                             "category": category, "item_name": item_name, "amount": rate, "notes": None,
+                             "created_at": created, "updated_at": created})
+
+        if i >= len(months) - 2 or month_sales == 0:
+            continue
+        cost = int(month_sales * 0.41 + sum(a for _, _, a in FIXED_EXPENSES))
+        settlement.append({"id": next(new_id), "store_id": store_id, "year": y, "month": m,
+                           "actual_sales": month_sales, "actual_cost": cost,
+                           "actual_profit": month_sales - cost,
+                           "profit_margin": round((month_sales - cost) / month_sales * 100, 2),
+                           "created_at": created, "updated_at": created})
+        for template, (_, _, value) in zip(templates, FIXED_EXPENSES + VARIABLE_EXPENSES):
+            is_rate = template["item_type"] == "variable"
+            settlement_items.append({
+                "id": next(new_id), "store_id": store_id, "year": y, "month": m, "template_id": template["id"],
+                "amount": None if is_rate else int(value * rng.uniform(0.95, 1.05)),
+                "percent": value if is_rate else None, "status": "final",
+                "created_at": created, "updated_at": created,
+            })
+    tables.update(targets=targets, expense_structure=expenses, actual_settlement=settlement,
+                  cost_item_templates=templates, actual_settlement_items=settlement_items)
+
+    tables.update(_health_check(store_id, rng, new_id, start, today))
+    return tables
+
+
+def _health_check(store_id: str, rng: random.Random, new_id, start: date, today: date) -> Dict[str, List[Dict]]:
+    """분기별 완료된 건강검진 세션 + 답변 + 카테고리 결과"""
+    from src.health_check.questions_bank import QUESTIONS
+    from src.health_check.scoring import score_from_raw
+
+    sessions, answers, results = [], [], []
+    day = start + timedelta(days=30)
+    while day < today:
+        session_id = next(new_id)
+        ts = _ts(day)
+        category_scores = {}
+        for category, questions in QUESTIONS.items():
+            scores = []
+            for q in questions:
+                raw = rng.choices(["yes", "maybe", "no"], weights=[5, 3, 2])[0]
+                score = score_from_raw(raw)
+                scores.append(score)
+                answers.append({"id": next(new_id), "session_id": session_id, "store_id": store_id,
+                                "category": category, "question_code": q["code"], "raw_value": raw,
+                                "score": score, "memo": None, "updated_at": ts})
+            avg = round(sum(scores) / len(scores) / 3 * 100, 1)
+            category_scores[category] = avg
+            results.append({"id": next(new_id), "session_id": session_id, "store_id": store_id,
+                            "category": category, "score_avg": avg,
+                            "risk_level": "high" if avg < 40 else ("medium" if avg < 70 else "low"),
+                            "strength_flags": [], "risk_flags": [], "structure_summary": None, "updated_at": ts})
+        overall = round(sum(category_scores.values()) / len(category_scores), 1)
+        sessions.append({"id": session_id, "store_id": store_id, "started_at": ts, "completed_at": ts,
+                         "overall_score": overall, "overall_grade": "B" if overall >= 60 else "C",
+                         "main_bottleneck": min(category_scores, key=category_scores.get),
+                         "coach_summary": None, "diagnosis_json": None, "created_at": ts})
+        day += timedelta(days=90)
+    return {"health_check_sessions": sessions, "health_check_answers": answers, "health_check_results": results}
+
+
+def table_sizes(tables: Dict[str, List[Dict]]) -> Dict[str, int]:
+    return {name: len(rows) for name, rows in sorted(tables.items())}
@@ -0,0 +1,107 @@
+"""
+매출 하락 변화점 감지 (증분 CUSUM)
+
+- 매장별 감지기 상태를 sales_change_point_state에 저장, daily_close 저장 시 1일씩 갱신 (O(1))
+- 입력: 요일별 기준선 대비 상대편차 x = 매출 / 기준선 - 1
+- 하방 CUSUM: S = max(0, S - x - k), S > h 이면 하락 감지
+- 하락 시작일 = S가 0에서 올라가기 시작한 날, 하락 폭 = 구간 평균 편차(%)
+- 과거 날짜 수정(정정)이 들어오면 최근 이력으로 상태를 재구성
+- 감지 계산은 src.engine.change_point (Streamlit 없음), 여기는 저장/조회
+"""
+from __future__ import annotations
+
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Optional
+
+import streamlit as st
+
+from src.engine.change_point import (  # noqa: F401 (기존 import 경로 유지)
+    REBUILD_DAYS,
+    STATE_VERSION,
+    TABLE_NAME,
+    _to_date,
+    build_state,
+    summarize_state,
+    update_state,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _load_close_history(supabase, store_id: str, end: date):
+    start = end - timedelta(days=REBUILD_DAYS)
+    result = supabase.table("daily_close")\
+        .select("date,total_sales")\
+        .eq("store_id", store_id)\
+        .gte("date", start.isoformat())\
+        .execute()
+    return [(row.get("date"), row.get("total_sales")) for row in (result.data or [])]
+
+
+def update_change_point_state(supabase, store_id: str, day, total_sales) -> Optional[Dict]:
+    """
+    daily_close 저장 직후 호출: 상태 1건 읽기 → 증분 갱신 → upsert
+
+    - 새 날짜(last_date 이후): 하루치만 반영
+    - 과거 날짜 정정 또는 상태 없음: 최근 REBUILD_DAYS 이력으로 재구성
+
+    Returns:
+        summarize_state 결과 (실패 시 None, 마감 저장에는 영향 없음)
+    """
+    day = _to_date(day)
+    if not supabase or not store_id or day is None:
+        return None
+    try:
+        result = supabase.table(TABLE_NAME)\
+            .select("state,last_date")\
+            .eq("store_id", store_id)\
+            .limit(1)\
+            .execute()
+        row = result.data[0] if result.data else None
+        state = (row or {}).get("state") or None
+        last_date = _to_date((row or {}).get("last_date"))
+
+        if state and state.get("version") == STATE_VERSION and last_date and day > last_date:
+            state = update_state(state, day, total_sales)
+        else:
+            history = _load_close_history(supabase, store_id, max(day, last_date or day))
+            state = build_state(history)
+
+        summary = summarize_state(state)
+        supabase.table(TABLE_NAME).upsert({
+            "store_id": store_id,
+            "last_date": state.get("last_date"),
+            "state": state,
+            "alarm": summary["alarm"],
+            "drop_start_date": summary["drop_start_date"].isoformat() if summary["drop_start_date"] else None,
+            "drop_magnitude_pct": summary["drop_magnitude_pct"],
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }, on_conflict="store_id").execute()
+        return summary
+    except Exception as e:
+        logger.warning(f"update_change_point_state failed ({store_id}, {day}): {e}")
+        return None
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_change_point_summary(store_id: str, v_close: int) -> Optional[Dict]:
+    from src.auth import get_read_client
+    from src.engine.sources import load_change_point_summary
+    return load_change_point_summary(get_read_client(), store_id)
+
+
+def get_change_point_summary(store_id: str) -> Optional[Dict]:
+    """
+    저장된 감지 상태 요약 (상태 없음/조회 실패 시 None)
+
+    daily_close 버전 토큰을 캐시 키에 포함해 마감 저장 직후 갱신된다.
+    """
+    if not store_id:
+        return None
+    try:
+        from src.utils.cache_tokens import get_data_version
+        return _load_change_point_summary(store_id, get_data_version("daily_close"))
+    except Exception as e:
+        logger.warning(f"get_change_point_summary failed ({store_id}): {e}")
+        return None
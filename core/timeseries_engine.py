@@ -0,0 +1,71 @@
+"""
+일별 지표 시계열 엔진 (rolling-window 공용)
+- DailySeries(누적합 시계열)는 src.engine.timeseries (Streamlit 없음), 여기는 Streamlit 캐시 로더
+- 사용처: core.sales_drop_engine, src.strategy.strategy_monitor,
+  ui_pages.strategy.mission_effects, ui_pages.diagnostics.sales_drop_oneclick
+
+한 화면에서 여러 분석이 같은 기간을 요청해도 기본 구간(오늘 기준 DEFAULT_LOOKBACK_DAYS일)
+안이면 매장당 1회만 조회합니다.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Tuple
+
+import streamlit as st
+
+from src.engine.timeseries import (  # noqa: F401 (기존 import 경로 유지)
+    DEFAULT_LOOKBACK_DAYS,
+    KST,
+    METRIC_QUANTITY,
+    METRIC_SALES,
+    METRIC_VISITORS,
+    DailySeries,
+    shared_window,
+)
+
+
+# ============================================
+# 로더 (Streamlit 캐시)
+# ============================================
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _build_series(store_id: str, start: date, end: date, include_quantity: bool, versions: Tuple[int, ...]) -> DailySeries:
+    from src.auth import get_read_client
+    from src.engine.sources import load_quantity_frame
+    from src.storage_supabase import load_best_available_daily_sales
+
+    # 일별 매출은 SSOT 로더 (영구 캐시 계층 경유), 판매량은 엔진 로더
+    sales_df = load_best_available_daily_sales(
+        store_id=store_id,
+        start_date=start.isoformat(),
+        end_date=end.isoformat(),
+    )
+    qty_df = load_quantity_frame(get_read_client(), store_id, start, end) if include_quantity else None
+    return DailySeries(store_id, start, end, sales_df, qty_df)
+
+
+def _data_versions(include_quantity: bool) -> Tuple[int, ...]:
+    """시계열이 읽는 데이터 버전 토큰 (best-available = 매출 + 마감 + 방문자, 판매량 포함 시 daily_sales_items)"""
+    names = ("sales", "daily_close", "visitors") + (("daily_sales_items",) if include_quantity else ())
+    try:
+        from src.utils.cache_tokens import get_data_version
+        return tuple(get_data_version(name) for name in names)
+    except Exception:
+        return (0,) * len(names)
+
+
+def get_daily_series(store_id: str, start, end, include_quantity: bool = False) -> DailySeries:
+    """
+    매장 일별 시계열 조회
+
+    요청 구간이 공용 구간(오늘 - DEFAULT_LOOKBACK_DAYS ~ 오늘) 안이면 공용 구간 전체를 1회 로드해
+    재사용하고, 벗어나면 요청 구간만 로드합니다.
+
+    Args:
+        store_id: 매장 ID
+        start, end: 필요한 구간 (date 또는 YYYY-MM-DD)
+        include_quantity: 메뉴 판매량(qty) 포함 여부
+    """
+    start, end = shared_window(start, end, datetime.now(KST).date())
+    return _build_series(store_id, start, end, include_quantity, _data_versions(include_quantity))
@@ -0,0 +1,127 @@
+"""
+페이지 import 예산 검사 (CI용)
+
+- 앱 셸(로그인 전 import) + 페이지별 모듈을 각각 새 프로세스에서 cold import
+- 시간은 src/utils/boot_perf.init_boot_perf / record_import_time 으로 측정
+- 앱 셸은 pandas/storage_supabase를 끌어오면 실패 (로그인 이후로 지연되어야 함)
+- 페이지는 ui_pages._legacy 를 끌어오면 실패 (보관용 패키지, 런타임 로드 금지)
+- 예산(src/ui/page_registry.PageSpec.import_budget_ms) 초과 페이지가 있으면 exit 1
+
+사용:
+    python scripts/check_page_import_budget.py [--page 홈] [--shell-budget-ms 1500] [--scale 1.0]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from src.ui.page_registry import PAGES  # noqa: E402
+
+# 앱 셸: app.py가 로그인 체크 전에 import 하는 모듈
+SHELL_MODULES = [
+    "src.bootstrap",
+    "src.ui.theme_manager",
+    "src.auth",
+    "src.ui.css_manager",
+    "src.ui.page_registry",
+]
+SHELL_FORBIDDEN = ["pandas", "numpy", "src.storage_supabase"]
+PAGE_FORBIDDEN = ["ui_pages._legacy"]
+
+# 자식 프로세스: baseline(streamlit + 앱 셸) 로드 후 대상 모듈 import 시간 측정
+_CHILD = r"""
+import importlib, json, sys, time
+sys.path.insert(0, {root!r})
+import streamlit
+from src.utils.boot_perf import init_boot_perf, record_import_time, get_boot_perf_data
+for name in {baseline!r}:
+    importlib.import_module(name)
+init_boot_perf()
+for name in {targets!r}:
+    importlib.import_module(name)
+record_import_time(time.perf_counter())
+print(json.dumps({{
+    "ms": get_boot_perf_data()["IMPORT_TOTAL_MS"],
+    "loaded": [m for m in {forbidden!r} if any(k == m or k.startswith(m + ".") for k in sys.modules)],
+}}))
+"""
+
+
+# 페이지 모듈은 import 시 bootstrap()이 st.secrets를 읽음 → secrets.toml 없는 CI에서는 최소 설정 사용
+_CI_SECRETS = "[app]\ndev_mode = false\n"
+
+
+def _work_dir() -> str:
+    if os.path.exists(os.path.join(ROOT, ".streamlit", "secrets.toml")):
+        return ROOT
+    work_dir = tempfile.mkdtemp(prefix="page_import_budget_")
+    os.makedirs(os.path.join(work_dir, ".streamlit"), exist_ok=True)
+    with open(os.path.join(work_dir, ".streamlit", "secrets.toml"), "w", encoding="utf-8") as f:
+        f.write(_CI_SECRETS)
+    return work_dir
+
+
+_WORK_DIR = None
+
+
+def measure(targets, baseline=(), forbidden=()):
+    global _WORK_DIR
+    if _WORK_DIR is None:
+        _WORK_DIR = _work_dir()
+    code = _CHILD.format(root=ROOT, baseline=list(baseline), targets=list(targets), forbidden=list(forbidden))
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=_WORK_DIR)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "import failed")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="페이지 import 예산 검사")
+    parser.add_argument("--page", action="append", help="검사할 페이지 key (반복 가능, 기본: 전체)")
+    parser.add_argument("--shell-budget-ms", type=float, default=1500.0, help="앱 셸 import 예산")
+    parser.add_argument("--scale", type=float, default=1.0, help="예산 배율 (느린 CI 러너 보정)")
+    args = parser.parse_args()
+
+    failures = []
+
+    shell = measure(SHELL_MODULES, forbidden=SHELL_FORBIDDEN)
+    shell_budget = args.shell_budget_ms * args.scale
+    ok = shell["ms"] <= shell_budget and not shell["loaded"]
+    print(f"{'OK ' if ok else 'FAIL'} [shell] {shell['ms']:.0f}ms / {shell_budget:.0f}ms"
+          + (f" (로그인 전 로드됨: {', '.join(shell['loaded'])})" if shell["loaded"] else ""))
+    if not ok:
+        failures.append("shell")
+
+    seen = set()
+    for spec in PAGES:
+        if args.page and spec.key not in args.page:
+            continue
+        if spec.module in seen:
+            continue
+        seen.add(spec.module)
+        budget = spec.import_budget_ms * args.scale
+        try:
+            result = measure([spec.module], baseline=SHELL_MODULES, forbidden=PAGE_FORBIDDEN)
+        except RuntimeError as e:
+            print(f"FAIL [{spec.key}] {spec.module}: {e}")
+            failures.append(spec.key)
+            continue
+        ok = result["ms"] <= budget and not result["loaded"]
+        print(f"{'OK ' if ok else 'FAIL'} [{spec.key}] {spec.module}: {result['ms']:.0f}ms / {budget:.0f}ms"
+              + (f" (로드됨: {', '.join(result['loaded'])})" if result["loaded"] else ""))
+        if not ok:
+            failures.append(spec.key)
+
+    if failures:
+        print(f"\n예산 초과/실패 {len(failures)}건: {', '.join(failures)}")
+        sys.exit(1)
+    print("\n모든 페이지 import 예산 통과")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+-- ============================================
+-- 건강검진 완료 트랜잭션 저장 함수 (src/health_check/storage.py finalize_health_session)
+-- ============================================
+-- 카테고리별 결과(health_check_results) 일괄 upsert + 세션 완료/점수/판독 결과 업데이트를
+-- 한 번의 호출로 원자적으로 저장 (실패 시 자동 롤백 → 결과만 있고 세션은 미완료인 상태가 생기지 않음)
+-- 점수/플래그/판독 계산은 앱에서 (scoring.compute_session_results_from_answers, diagnose_health_check)
+-- SECURITY INVOKER: RLS 그대로 적용
+-- ============================================
+
+CREATE OR REPLACE FUNCTION finalize_health_session_transaction(
+    p_store_id UUID,
+    p_session_id UUID,
+    p_results JSONB,
+    p_completed_at TIMESTAMPTZ,
+    p_overall_score NUMERIC,
+    p_overall_grade TEXT,
+    p_main_bottleneck TEXT,
+    p_diagnosis JSONB DEFAULT NULL
+)
+RETURNS void
+LANGUAGE plpgsql
+SECURITY INVOKER
+AS $$
+BEGIN
+    -- 1. 카테고리별 결과 일괄 upsert
+    -- p_results: [{"category", "score_avg", "risk_level", "strength_flags", "risk_flags", "structure_summary"}, ...]
+    IF p_results IS NOT NULL
+       AND jsonb_typeof(p_results) = 'array'
+       AND jsonb_array_length(p_results) > 0 THEN
+        INSERT INTO health_check_results (
+            store_id, session_id, category, score_avg, risk_level,
+            strength_flags, risk_flags, structure_summary, updated_at
+        )
+        SELECT
+            p_store_id, p_session_id, r.category, r.score_avg, r.risk_level,
+            COALESCE(r.strength_flags, '[]'::JSONB), COALESCE(r.risk_flags, '[]'::JSONB),
+            r.structure_summary, NOW()
+        FROM jsonb_to_recordset(p_results) AS r(
+            category TEXT,
+            score_avg NUMERIC,
+            risk_level TEXT,
+            strength_flags JSONB,
+            risk_flags JSONB,
+            structure_summary TEXT
+        )
+        ON CONFLICT (store_id, session_id, category) DO UPDATE SET
+            score_avg = EXCLUDED.score_avg,
+            risk_level = EXCLUDED.risk_level,
+            strength_flags = EXCLUDED.strength_flags,
+            risk_flags = EXCLUDED.risk_flags,
+            structure_summary = EXCLUDED.structure_summary,
+            updated_at = NOW();
+    END IF;
+
+    -- 2. 세션 완료 처리 (판독 결과가 없으면 기존 값 유지)
+    UPDATE health_check_sessions SET
+        completed_at = p_completed_at,
+        overall_score = p_overall_score,
+        overall_grade = p_overall_grade,
+        main_bottleneck = p_main_bottleneck,
+        diagnosis_json = COALESCE(p_diagnosis, diagnosis_json)
+    WHERE id = p_session_id
+      AND store_id = p_store_id;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION finalize_health_session_transaction(UUID, UUID, JSONB, TIMESTAMPTZ, NUMERIC, TEXT, TEXT, JSONB) TO authenticated;
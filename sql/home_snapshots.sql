@@ -0,0 +1,49 @@
+-- ============================================
+-- HOME 스냅샷 테이블 (매장별 사전 계산 읽기 모델)
+-- ============================================
+-- HOME 진입 시 필요한 KPI/존 입력값을 매장당 1행(payload JSONB)으로 저장
+-- save_daily_close / save_sales / 정산 저장 시 재계산, HOME은 1회 조회
+-- version: 저장 시각(ms) 기반 버전 스탬프, payload NULL = 무효화(다음 조회 시 재계산)
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS home_snapshots (
+    store_id UUID PRIMARY KEY REFERENCES stores(id) ON DELETE CASCADE,
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    as_of_date DATE NOT NULL,  -- 계산 기준일 (어제 매출/스트릭 기준, 날짜가 바뀌면 재계산)
+    schema_version INTEGER NOT NULL DEFAULT 1,
+    version BIGINT NOT NULL DEFAULT 0,
+    payload JSONB,
+    computed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- RLS 활성화
+ALTER TABLE home_snapshots ENABLE ROW LEVEL SECURITY;
+
+-- RLS 정책: 자신의 store_id 스냅샷만 조회/저장 가능
+CREATE POLICY "Users can view their own store home snapshot"
+    ON home_snapshots FOR SELECT
+    USING (
+        store_id IN (
+            SELECT store_id FROM user_profiles
+            WHERE id = auth.uid()
+        )
+    );
+
+CREATE POLICY "Users can insert their own store home snapshot"
+    ON home_snapshots FOR INSERT
+    WITH CHECK (
+        store_id IN (
+            SELECT store_id FROM user_profiles
+            WHERE id = auth.uid()
+        )
+    );
+
+CREATE POLICY "Users can update their own store home snapshot"
+    ON home_snapshots FOR UPDATE
+    USING (
+        store_id IN (
+            SELECT store_id FROM user_profiles
+            WHERE id = auth.uid()
+        )
+    );
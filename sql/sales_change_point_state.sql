@@ -0,0 +1,52 @@
+-- ============================================
+-- 매출 하락 변화점 감지 상태 테이블
+-- ============================================
+-- 매장별 온라인 CUSUM 감지기 상태 (daily_close 저장 시 1일씩 증분 갱신)
+-- 매출 하락 원인 찾기 / 알림에서 현재 하락 시작일·폭을 바로 조회
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS sales_change_point_state (
+    store_id UUID PRIMARY KEY REFERENCES stores(id) ON DELETE CASCADE,
+    last_date DATE,  -- 마지막으로 반영한 영업일
+    state JSONB NOT NULL DEFAULT '{}'::jsonb,  -- 요일별 기준선, CUSUM 누적값 등 감지기 내부 상태
+    alarm BOOLEAN NOT NULL DEFAULT FALSE,  -- 하락 감지 여부
+    drop_start_date DATE,  -- 현재 하락 구간 시작일 (감지 중일 때)
+    drop_magnitude_pct NUMERIC,  -- 하락 구간 평균 변화율 (%, 음수)
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- 알림 대상 조회용
+CREATE INDEX IF NOT EXISTS idx_sales_change_point_state_alarm
+    ON sales_change_point_state(alarm)
+    WHERE alarm = TRUE;
+
+-- RLS 활성화
+ALTER TABLE sales_change_point_state ENABLE ROW LEVEL SECURITY;
+
+-- RLS 정책: 자신의 store_id 상태만 조회/저장 가능
+CREATE POLICY "Users can view their own store change point state"
+    ON sales_change_point_state FOR SELECT
+    USING (
+        store_id IN (
+            SELECT store_id FROM user_profiles
+            WHERE id = auth.uid()
+        )
+    );
+
+CREATE POLICY "Users can insert their own store change point state"
+    ON sales_change_point_state FOR INSERT
+    WITH CHECK (
+        store_id IN (
+            SELECT store_id FROM user_profiles
+            WHERE id = auth.uid()
+        )
+    );
+
+CREATE POLICY "Users can update their own store change point state"
+    ON sales_change_point_state FOR UPDATE
+    USING (
+        store_id IN (
+            SELECT store_id FROM user_profiles
+            WHERE id = auth.uid()
+        )
+    );
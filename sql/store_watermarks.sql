@@ -0,0 +1,68 @@
+-- ============================================
+-- 영구 캐시 워터마크 (src/utils/disk_cache.py)
+-- ============================================
+-- 1) updated_at 자동 갱신 트리거: 수정(UPDATE/UPSERT)도 워터마크에 반영되도록
+-- 2) get_store_watermarks: 매장의 테이블별 (행 수, max(updated_at))를 1회 호출로 조회
+--    → 캐시 저장 시점과 같으면 디스크 캐시 사용, 다르면 다시 로드
+-- 행 수를 함께 비교하므로 삭제도 감지됨
+-- SECURITY INVOKER: RLS 그대로 적용 (자기 매장 데이터만 집계)
+-- ============================================
+
+CREATE OR REPLACE FUNCTION set_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    t TEXT;
+BEGIN
+    FOREACH t IN ARRAY ARRAY[
+        'sales', 'naver_visitors', 'menu_master', 'ingredients', 'inventory', 'targets',
+        'daily_close', 'daily_sales_items', 'expense_structure',
+        'suppliers', 'ingredient_suppliers', 'orders'
+    ]
+    LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS trigger_set_updated_at ON %I', t);
+        EXECUTE format(
+            'CREATE TRIGGER trigger_set_updated_at BEFORE UPDATE ON %I FOR EACH ROW EXECUTE FUNCTION set_updated_at()',
+            t
+        );
+    END LOOP;
+END $$;
+-- daily_sales_items_overrides 는 기존 트리거(update_daily_sales_items_overrides_updated_at) 사용
+
+
+CREATE OR REPLACE FUNCTION get_store_watermarks(
+    p_store_id UUID,
+    p_tables TEXT[]
+)
+RETURNS TABLE(table_name TEXT, row_count BIGINT, max_updated_at TIMESTAMPTZ)
+LANGUAGE plpgsql
+STABLE
+SECURITY INVOKER
+AS $$
+DECLARE
+    t TEXT;
+BEGIN
+    FOREACH t IN ARRAY p_tables
+    LOOP
+        -- 허용 목록 밖의 이름은 무시 (동적 SQL 보호)
+        IF t = ANY (ARRAY[
+            'sales', 'naver_visitors', 'menu_master', 'ingredients', 'inventory', 'targets',
+            'daily_close', 'daily_sales_items', 'daily_sales_items_overrides', 'expense_structure',
+            'suppliers', 'ingredient_suppliers', 'orders'
+        ]) THEN
+            RETURN QUERY EXECUTE format(
+                'SELECT %L::TEXT, COUNT(*), MAX(updated_at) FROM %I WHERE store_id = $1',
+                t, t
+            ) USING p_store_id;
+        END IF;
+    END LOOP;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION get_store_watermarks(UUID, TEXT[]) TO authenticated;
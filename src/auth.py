@@ -15,6 +15,8 @@ except ImportError:
     SUPABASE_AVAILABLE = False
     from typing import Optional
 
+from src.utils.query_telemetry import instrument_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -61,6 +63,7 @@ def get_anon_client() -> Optional[Client]:
         
         # 클라이언트 생성 (토큰 설정 없음)
         client = create_client(url, anon_key)
+        instrument_client(client)  # 쿼리 텔레메트리 (상시)
         logger.info("get_anon_client: 익명 클라이언트 생성 성공 (캐시됨)")
         return client
         
@@ -141,6 +144,7 @@ def get_service_client() -> Optional[Client]:
         
         # 클라이언트 생성
         client = create_client(url, service_role_key)
+        instrument_client(client)  # 쿼리 텔레메트리 (상시)
         logger.info("get_service_client: Service Role 클라이언트 생성 성공 (DEV MODE, 캐시됨)")
         return client
         
@@ -338,6 +342,8 @@ def get_auth_client(reset_session_on_fail: bool = True) -> Client:
         logger.info(f"get_auth_client: 캐시 키 (url={url[:20]}..., key={anon_key[:10]}..., mode=auth, token_hash={access_token_hash})")
         
         client = create_client(url, anon_key)
+        
+        instrument_client(client)  # 쿼리 텔레메트리 (상시)
         logger.info("get_auth_client: 클라이언트 생성 성공 (캐시됨)")
     except Exception as e:
         logger.error(f"get_auth_client: 클라이언트 생성 실패 - {repr(e)}")
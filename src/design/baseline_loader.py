@@ -9,16 +9,13 @@ from zoneinfo import ZoneInfo
 from calendar import monthrange
 from typing import Any
 
-import pandas as pd
 import streamlit as st
 
 from src.storage_supabase import (
     load_csv,
     load_monthly_sales_total,
     load_best_available_daily_sales,
-    get_fixed_costs,
-    get_variable_cost_ratio,
-    load_expense_structure,
+    load_cost_structure,
 )
 from src.analytics import calculate_menu_cost
 
@@ -81,24 +78,22 @@ def load_baseline_structure(store_id: str, year: int, month: int) -> dict[str, A
     forecast_sales = _forecast_monthly_sales(store_id, year, month)
 
     # 비용
-    fixed_costs = get_fixed_costs(store_id, year, month) or 0.0
-    variable_ratio = get_variable_cost_ratio(store_id, year, month) or 0.0
+    structure = load_cost_structure(store_id, year, month)
+    fixed_costs = structure.fixed_costs
+    variable_ratio = structure.variable_ratio
+    # structure.break_even(SSOT)은 변동비율 0이면 0(미입력 취급)이지만,
+    # 설계 기준안은 변동비 없는 구조도 그대로 쓰므로 고정비 = 손익분기 매출로 둠
     break_even = 0.0
     if variable_ratio is not None and variable_ratio < 1.0 and fixed_costs > 0:
         break_even = fixed_costs / (1.0 - variable_ratio)
 
     # 인건비율·원가율 (expense / 원가 분석)
     labor_cost_ratio = None
-    try:
-        exp_df = load_expense_structure(year, month, store_id=store_id)
-        if isinstance(exp_df, pd.DataFrame) and not exp_df.empty:
-            labor_row = exp_df[exp_df["category"] == "인건비"]
-            labor_total = float(labor_row["amount"].sum()) if not labor_row.empty else 0
-            total_sales = monthly_sales or forecast_sales or 1
-            if total_sales > 0:
-                labor_cost_ratio = labor_total / total_sales
-    except Exception:
-        pass
+    if structure.category_totals:
+        labor_total = structure.category_totals.get("인건비", 0.0)
+        total_sales = monthly_sales or forecast_sales or 1
+        if total_sales > 0:
+            labor_cost_ratio = labor_total / total_sales
 
     avg_cost_rate = None
     try:
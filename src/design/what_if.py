@@ -0,0 +1,61 @@
+"""
+What-if 시뮬레이터 로더 (Streamlit)
+
+비용 구조는 load_cost_structure (매장, 연/월, 비용 버전당 1회)의 CostModel을 그대로 쓰고,
+시나리오 격자(ProfitSurface)도 같은 키로 캐시 → 슬라이더/입력 변경 rerun은 메모리 조회만
+계산은 src.engine.what_if (순수 함수)
+"""
+from __future__ import annotations
+
+from typing import Tuple
+
+import streamlit as st
+
+from src.engine.what_if import CostModel, ProfitSurface, evaluate_grid, sales_grid
+from src.storage_supabase import load_cost_structure
+from src.utils.cache_tokens import get_data_version
+
+# 기본 시나리오 축 (가격/원가율 변화, %)
+PRICE_CHANGES: Tuple[float, ...] = tuple(float(x) for x in range(-20, 21, 5))
+COST_RATE_CHANGES: Tuple[float, ...] = tuple(float(x) for x in range(-20, 21, 5))
+
+
+def load_cost_model(store_id: str, year: int, month: int) -> CostModel:
+    """비용 구조 모델 조회 (load_cost_structure 결과 재사용, 매장 없으면 빈 모델)"""
+    if not store_id:
+        return CostModel()
+    return load_cost_structure(store_id, year, month).model
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_surface(
+    _model: CostModel,
+    model_key: tuple,
+    center_sales: float,
+    price_changes: Tuple[float, ...],
+    cost_rate_changes: Tuple[float, ...],
+) -> ProfitSurface:
+    return evaluate_grid(_model, sales_grid(center_sales), price_changes, cost_rate_changes)
+
+
+def load_profit_surface(
+    store_id: str,
+    year: int,
+    month: int,
+    center_sales: float,
+    model: CostModel = None,
+    price_changes: Tuple[float, ...] = PRICE_CHANGES,
+    cost_rate_changes: Tuple[float, ...] = COST_RATE_CHANGES,
+) -> ProfitSurface:
+    """
+    매출 수준(center ±50%, 41단계) × 가격 변화 × 원가율 변화 손익 격자
+
+    model: 레버를 반영한 모델 (없으면 저장된 비용 구조)
+    """
+    model = model or load_cost_model(store_id, year, month)
+    model_key = (
+        store_id, year, month,
+        get_data_version("cost"), get_data_version("expense_structure"),
+        model.fixed_costs, model.variable_ratio,
+    )
+    return _cached_surface(model, model_key, float(center_sales), tuple(price_changes), tuple(cost_rate_changes))
@@ -0,0 +1,7 @@
+"""
+헤드리스 계산 엔진 (Streamlit 없음)
+
+- 순수 함수: 명시적 입력(store_id, 구간, DataFrame/시계열)만 사용, 세션 상태 미사용
+- sources: 명시적 Supabase 클라이언트 로더 / cache: 교체 가능한 memoize 백엔드
+- Streamlit 화면은 기존 st.cache_data 함수(core.sales_drop_engine 등)가 얇은 어댑터로 호출
+"""
@@ -0,0 +1,211 @@
+"""
+엔진 캐시 백엔드 (교체 가능)
+
+- src.engine 함수는 st.cache_data 대신 여기 등록된 백엔드로 memoize
+- 기본: 프로세스 내 MemoryCache (LRU + TTL)
+- 워커/배치: set_cache_backend(DiskCache(경로)) 로 프로세스 간 공유, NullCache 로 끌 수 있음
+- 키: (네임스페이스, 인자) sha1. `_` 로 시작하는 인자는 키에서 제외 (st.cache_data 와 같은 규칙)
+- 데이터 변경 반영은 호출자가 넘기는 version 인자로 (src.utils.cache_tokens 와 같은 방식)
+"""
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Any, Callable, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 300
+
+
+class CacheBackend:
+    """캐시 백엔드 인터페이스"""
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """(적중 여부, 값)"""
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class NullCache(CacheBackend):
+    """캐시 없음 (항상 재계산)"""
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        return False, None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+
+class MemoryCache(CacheBackend):
+    """프로세스 내 LRU + TTL (스레드 안전)"""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._items: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return False, None
+            expires_at, value = item
+            if expires_at and expires_at < time.time():
+                del self._items[key]
+                return False, None
+            self._items.move_to_end(key)
+            return True, value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.time() + ttl if ttl else 0.0
+        with self._lock:
+            self._items[key] = (expires_at, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+class DiskCache(CacheBackend):
+    """
+    디렉터리 pickle 캐시 (프로세스 간 공유)
+
+    파일 1개 = 항목 1개 ({key}.pkl, 내용은 (만료 시각, 값)). 쓰기는 임시 파일 → os.replace 로 원자적.
+    읽기/쓰기 실패는 캐시 미스로 처리 (계산에는 영향 없음).
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                expires_at, value = pickle.load(f)
+        except FileNotFoundError:
+            return False, None
+        except Exception as e:
+            logger.warning(f"DiskCache read failed ({key}): {e}")
+            return False, None
+        if expires_at and expires_at < time.time():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return False, None
+        return True, value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.time() + ttl if ttl else 0.0
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((expires_at, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except Exception as e:
+            logger.warning(f"DiskCache write failed ({key}): {e}")
+
+    def clear(self) -> None:
+        for name in os.listdir(self.directory):
+            if name.endswith(".pkl"):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+
+_backend: CacheBackend = MemoryCache()
+
+
+def get_cache_backend() -> CacheBackend:
+    return _backend
+
+
+def set_cache_backend(backend: Optional[CacheBackend]) -> CacheBackend:
+    """엔진 캐시 백엔드 교체 (None이면 NullCache). 이전 백엔드 반환"""
+    global _backend
+    previous = _backend
+    _backend = backend or NullCache()
+    return previous
+
+
+# ============================================
+# 키 / memoize
+# ============================================
+
+def _normalize(value: Any) -> Any:
+    """캐시 키용 정규화 (repr가 실행마다 같도록)"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, pd.DataFrame):
+        digest = hashlib.sha1(pd.util.hash_pandas_object(value, index=True).values.tobytes()).hexdigest()
+        return ("DataFrame", tuple(value.columns), digest)
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _normalize(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_normalize(v) for v in value]
+        return tuple(sorted(items, key=repr)) if isinstance(value, (set, frozenset)) else tuple(items)
+    return value
+
+
+def make_key(namespace: str, *parts: Any) -> str:
+    raw = repr((namespace, _normalize(parts)))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def memoize(namespace: str, ttl: Optional[float] = DEFAULT_TTL) -> Callable:
+    """
+    엔진 함수 memoize (현재 백엔드 사용)
+
+    - `_` 로 시작하는 인자(클라이언트 등)는 키에서 제외
+    - None 결과는 저장하지 않음 (일시 실패가 고정되지 않도록)
+    - 래퍼.uncached 로 원본 호출 가능
+    """
+    def decorator(fn: Callable) -> Callable:
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            parts = tuple((k, v) for k, v in bound.arguments.items() if not k.startswith("_"))
+            key = make_key(namespace, *parts)
+            backend = _backend
+            hit, value = backend.get(key)
+            if hit:
+                return value
+            value = fn(*args, **kwargs)
+            if value is not None:
+                backend.set(key, value, ttl)
+            return value
+
+        wrapper.uncached = fn
+        return wrapper
+    return decorator
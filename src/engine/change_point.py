@@ -0,0 +1,156 @@
+"""
+매출 하락 변화점 감지 (증분 CUSUM, 순수 계산)
+
+- 입력: 요일별 기준선 대비 상대편차 x = 매출 / 기준선 - 1
+- 하방 CUSUM: S = max(0, S - x - k), S > h 이면 하락 감지
+- 하락 시작일 = S가 0에서 올라가기 시작한 날, 하락 폭 = 구간 평균 편차(%)
+- 상태 저장/갱신(I/O)은 core.change_point
+"""
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+TABLE_NAME = "sales_change_point_state"
+STATE_VERSION = 1
+
+CUSUM_K = 0.05           # 허용 편차 (기준선 대비 5% 이내 하락은 누적하지 않음)
+CUSUM_H = 0.5            # 감지 임계값 (예: -15% 하락이 5일 누적)
+BASELINE_ALPHA = 0.25    # 평상시 기준선 EWMA 가중치
+RUN_ALPHA = 0.05         # 하락 누적 중 기준선 가중치 (하락이 기준선에 흡수되지 않도록)
+WARMUP_DAYS = 7          # 기준선 학습 기간 (이 기간에는 감지하지 않음)
+MIN_WEEKDAY_OBS = 2      # 요일 기준선 사용 최소 관측 수 (미만이면 전체 기준선)
+REBASE_DAYS = 28         # 이 기간 이상 감지가 지속되면 새 수준으로 인정하고 재시작
+REBUILD_DAYS = 120       # 상태 재구성 시 읽는 이력 기간
+
+
+def _to_date(value) -> Optional[date]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+def new_state() -> Dict:
+    """빈 감지기 상태"""
+    return {
+        "version": STATE_VERSION,
+        "last_date": None,
+        "n": 0,
+        "level": None,
+        "weekday_level": [None] * 7,
+        "weekday_count": [0] * 7,
+        "cusum": 0.0,
+        "run_start": None,
+        "run_len": 0,
+        "run_dev_sum": 0.0,
+        "alarm": False,
+        "alarm_days": 0,
+    }
+
+
+def _ewma(prev: Optional[float], value: float, alpha: float) -> float:
+    return value if prev is None else prev + alpha * (value - prev)
+
+
+def _reset_run(state: Dict) -> None:
+    state["cusum"] = 0.0
+    state["run_start"] = None
+    state["run_len"] = 0
+    state["run_dev_sum"] = 0.0
+    state["alarm"] = False
+    state["alarm_days"] = 0
+
+
+def update_state(state: Optional[Dict], day, total_sales) -> Dict:
+    """
+    감지기 상태에 하루 매출 반영 (새 dict 반환)
+
+    Args:
+        state: 기존 상태 (None이면 새로 시작)
+        day: 영업일 (last_date 이후 날짜여야 함)
+        total_sales: 해당일 총매출 (0/None은 휴무로 보고 건너뜀)
+    """
+    state = dict(state) if state else new_state()
+    state["weekday_level"] = list(state.get("weekday_level") or [None] * 7)
+    state["weekday_count"] = list(state.get("weekday_count") or [0] * 7)
+    day = _to_date(day)
+    if day is None:
+        return state
+
+    state["last_date"] = day.isoformat()
+    try:
+        value = float(total_sales or 0)
+    except (TypeError, ValueError):
+        value = 0.0
+    if value <= 0:
+        return state
+
+    weekday = day.weekday()
+    expected = state["weekday_level"][weekday]
+    if state["weekday_count"][weekday] < MIN_WEEKDAY_OBS:
+        expected = state["level"]
+
+    if state["n"] >= WARMUP_DAYS and expected:
+        x = value / expected - 1.0
+        prev_cusum = state["cusum"]
+        cusum = max(0.0, prev_cusum - x - CUSUM_K)
+        if cusum > 0:
+            if prev_cusum <= 0:
+                state["run_start"] = day.isoformat()
+                state["run_len"] = 0
+                state["run_dev_sum"] = 0.0
+            state["run_len"] += 1
+            state["run_dev_sum"] += x
+            state["cusum"] = cusum
+            state["alarm"] = cusum > CUSUM_H
+            state["alarm_days"] = state["alarm_days"] + 1 if state["alarm"] else 0
+        else:
+            _reset_run(state)
+
+    # 하락 누적 중에는 기준선을 천천히 따라가고, 감지가 오래 지속되면 새 수준으로 인정
+    alpha = RUN_ALPHA if state["cusum"] > 0 else BASELINE_ALPHA
+    if state["alarm_days"] >= REBASE_DAYS:
+        _reset_run(state)
+        alpha = 1.0
+    state["level"] = _ewma(state["level"], value, alpha)
+    state["weekday_level"][weekday] = _ewma(state["weekday_level"][weekday], value, alpha)
+    state["weekday_count"][weekday] += 1
+    state["n"] += 1
+    return state
+
+
+def build_state(rows: Iterable[Tuple[object, object]]) -> Dict:
+    """(날짜, 매출) 이력으로 상태 재구성 (날짜 오름차순 정렬 후 순차 반영)"""
+    parsed = [(d, v) for d, v in ((_to_date(d), v) for d, v in rows) if d is not None]
+    state = new_state()
+    for day, value in sorted(parsed, key=lambda r: r[0]):
+        state = update_state(state, day, value)
+    return state
+
+
+def summarize_state(state: Optional[Dict]) -> Dict:
+    """
+    감지 결과 요약
+
+    Returns:
+        {"alarm": bool, "drop_start_date": date | None, "drop_magnitude_pct": float | None,
+         "run_days": int, "cusum": float, "last_date": date | None}
+    """
+    state = state or new_state()
+    run_len = int(state.get("run_len") or 0)
+    in_run = float(state.get("cusum") or 0.0) > 0 and run_len > 0
+    return {
+        "alarm": bool(state.get("alarm")),
+        "drop_start_date": _to_date(state.get("run_start")) if in_run else None,
+        "drop_magnitude_pct": round(state["run_dev_sum"] / run_len * 100, 1) if in_run else None,
+        "run_days": run_len if in_run else 0,
+        "cusum": round(float(state.get("cusum") or 0.0), 4),
+        "last_date": _to_date(state.get("last_date")),
+    }
@@ -0,0 +1,131 @@
+"""
+월 비용 구조 (고정비 / 변동비율 / 손익분기점) 순수 계산
+
+CostStructure: (매장, 연/월) 비용 데이터를 한 번 읽어 만든 결과 묶음
+- 합계: 정산 확정(final) 월은 실제정산 항목 값 우선, 없거나 0이면 expense_structure
+- 카테고리 합계 / What-if CostModel / 손익 예시표(example_table)
+Streamlit 로더는 src.storage_supabase.load_cost_structure (get_fixed_costs 등은 그 결과의 뷰)
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from src.engine.what_if import FIXED_CATEGORIES, VARIABLE_CATEGORIES, CostModel
+
+# 손익 예시표 매출 배수 (손익분기점 대비)
+EXAMPLE_SALES_FACTORS = (0.8, 1.0, 1.2, 1.5)
+
+
+def settlement_totals(templates: Iterable[Dict], saved_items: Iterable[Dict]) -> Tuple[float, float]:
+    """
+    실제정산 (고정비 합계(원), 변동비율 합계(%))
+
+    활성 템플릿별 저장 값: 비율만 있으면 rate 항목, 그 외(금액/둘 다/없음)는 amount 항목
+    고정비 = 고정비 카테고리 amount 항목 합계, 변동비율 = 변동비 카테고리 rate 항목 합계
+    """
+    saved_by_template = {s.get('template_id'): s for s in saved_items if s.get('template_id')}
+    fixed_total = 0.0
+    rate_total = 0.0
+    for template in templates:
+        category = template.get('category')
+        if not template.get('is_active', True) or not category:
+            continue
+        saved = saved_by_template.get(template.get('id'), {})
+        amount = saved.get('amount')
+        percent = saved.get('percent')
+        has_amount = amount is not None and float(amount or 0) > 0
+        has_percent = percent is not None and float(percent or 0) > 0
+        if has_percent and not has_amount:
+            if category in VARIABLE_CATEGORIES:
+                rate_total += float(percent or 0.0)
+        elif category in FIXED_CATEGORIES:
+            fixed_total += float(int(amount or 0))
+    return fixed_total, rate_total
+
+
+@dataclass(frozen=True)
+class CostStructure:
+    """
+    월 비용 구조
+
+    status: 정산 상태 ('final' | 'draft'), model: 손익 계산용 합계 + 카테고리 내역 (CostModel)
+    category_totals: expense_structure 카테고리별 amount 합계 (고정비 원, 변동비 %, 행이 없으면 빈 dict)
+    """
+    year: int
+    month: int
+    status: str = 'draft'
+    model: CostModel = field(default_factory=CostModel)
+    category_totals: Dict[str, float] = field(default_factory=dict)
+
+    @classmethod
+    def build(
+        cls,
+        year: int,
+        month: int,
+        expense_df: Optional[pd.DataFrame],
+        status: str = 'draft',
+        saved_items: Iterable[Dict] = (),
+        templates: Iterable[Dict] = (),
+    ) -> "CostStructure":
+        """
+        조회 결과로 생성
+
+        status: 정산 상태, saved_items / templates: 해당 월 actual_settlement_items / 활성 cost_item_templates
+        (확정 월일 때만 사용)
+        """
+        fixed_costs = variable_pct = 0.0
+        if status == 'final':
+            try:
+                fixed_costs, variable_pct = settlement_totals(templates or [], saved_items or [])
+            except (TypeError, ValueError):
+                fixed_costs = variable_pct = 0.0
+
+        # 정산 값이 없으면 expense_structure 합계 (행 단위 합산, 기존 SSOT 함수와 같은 값)
+        category_totals: Dict[str, float] = {}
+        if expense_df is not None and not expense_df.empty and {'category', 'amount'}.issubset(expense_df.columns):
+            amounts = pd.to_numeric(expense_df['amount'], errors='coerce').fillna(0)
+            sums = amounts.groupby(expense_df['category']).sum()
+            category_totals = {str(cat): float(value) for cat, value in sums.items()}
+            if fixed_costs <= 0:
+                fixed_costs = float(amounts[expense_df['category'].isin(FIXED_CATEGORIES)].sum())
+            if variable_pct <= 0:
+                variable_pct = float(amounts[expense_df['category'].isin(VARIABLE_CATEGORIES)].sum())
+
+        model = CostModel.from_expense_frame(expense_df, fixed_costs=fixed_costs, variable_ratio=variable_pct / 100.0)
+        return cls(year=int(year), month=int(month), status=status, model=model, category_totals=category_totals)
+
+    @property
+    def fixed_costs(self) -> float:
+        return float(self.model.fixed_costs)
+
+    @property
+    def variable_ratio(self) -> float:
+        return float(self.model.variable_ratio)
+
+    @property
+    def break_even(self) -> float:
+        """손익분기점 매출 (고정비 > 0, 0 < 변동비율 < 1 일 때만, 아니면 0)"""
+        return float(self.model.break_even)
+
+    @property
+    def source(self) -> str:
+        """'actual' (정산 확정) | 'target' (비용 구조 입력됨) | 'none'"""
+        if self.status == 'final':
+            return 'actual'
+        return 'target' if (self.fixed_costs > 0 or self.variable_ratio > 0) else 'none'
+
+    def example_table(self, factors: Tuple[float, ...] = EXAMPLE_SALES_FACTORS) -> Optional[List[Dict]]:
+        """손익분기점 배수별 [{"sales", "profit", "margin"}] (손익분기점 없으면 None)"""
+        break_even = self.break_even
+        if break_even <= 0:
+            return None
+        rows = []
+        for factor in factors:
+            sales = max(int(break_even * factor), 0)
+            if sales > 0:
+                profit = sales - self.fixed_costs - (sales * self.variable_ratio)
+                rows.append({"sales": sales, "profit": int(profit), "margin": round(profit / sales * 100, 1)})
+        return rows
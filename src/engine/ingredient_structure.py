@@ -0,0 +1,145 @@
+"""
+재료 원가 구조 (순수 계산, 벡터화)
+
+compute_ingredient_usage: 재료 × 레시피 × 메뉴 판매량을 한 번의 조인으로 재료별 사용금액 계산
+cost_concentration / flag_high_risk: 사용금액 표 기반 집중도, 고위험 재료
+Streamlit 화면은 ui_pages.design_lab.ingredient_structure_helpers (st.cache_data 어댑터)를 사용
+"""
+from __future__ import annotations
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+USAGE_COLUMNS = ['재료명', '총_사용금액', '원가_비중_%', '연결_메뉴_수', '연결_메뉴_목록']
+RISK_COLUMNS = USAGE_COLUMNS + ['위험_사유']
+
+
+def empty_usage() -> pd.DataFrame:
+    return pd.DataFrame(columns=USAGE_COLUMNS)
+
+
+def menu_quantities(sales_df: Optional[pd.DataFrame]) -> pd.Series:
+    """메뉴별 판매수량 합계 (메뉴명 → 수량)"""
+    if sales_df is None or sales_df.empty or '메뉴명' not in sales_df.columns or '판매수량' not in sales_df.columns:
+        return pd.Series(dtype=float)
+    qty = pd.to_numeric(sales_df['판매수량'], errors='coerce').fillna(0)
+    return qty.groupby(sales_df['메뉴명']).sum()
+
+
+def compute_ingredient_usage(
+    ingredient_df: pd.DataFrame,
+    recipe_df: pd.DataFrame,
+    sales_df: Optional[pd.DataFrame],
+) -> pd.DataFrame:
+    """
+    재료별 사용금액 (I/O 없음)
+
+    사용금액 = Σ(메뉴 판매수량 × 레시피 사용량) × 단가
+    판매 기록이 없는 메뉴는 판매수량 1로 계산 (레시피 구조만 반영)
+
+    Returns:
+        USAGE_COLUMNS, 총_사용금액 내림차순
+    """
+    if ingredient_df is None or ingredient_df.empty or recipe_df is None or recipe_df.empty:
+        return empty_usage()
+    if '재료명' not in ingredient_df.columns or not {'메뉴명', '재료명'}.issubset(recipe_df.columns):
+        return empty_usage()
+
+    # 단가 > 0 인 재료만 (같은 이름이 여러 번이면 마지막 행)
+    unit_cost = pd.to_numeric(ingredient_df.get('단가', 0), errors='coerce').fillna(0)
+    costs = pd.Series(unit_cost.to_numpy(dtype=float), index=ingredient_df['재료명'].to_numpy())
+    costs = costs[~costs.index.duplicated(keep='last')]
+    costs = costs[costs > 0]
+    if costs.empty:
+        return empty_usage()
+
+    recipes = recipe_df[recipe_df['재료명'].isin(costs.index)]
+    if recipes.empty:
+        return empty_usage()
+
+    usage_qty = pd.to_numeric(recipes['사용량'], errors='coerce').fillna(0) if '사용량' in recipes.columns else 0.0
+    sold = recipes['메뉴명'].map(menu_quantities(sales_df)).fillna(1).to_numpy(dtype=float)
+    line_cost = sold * np.asarray(usage_qty, dtype=float) * recipes['재료명'].map(costs).to_numpy(dtype=float)
+
+    lines = pd.DataFrame({
+        '재료명': recipes['재료명'].to_numpy(),
+        '메뉴명': recipes['메뉴명'].to_numpy(),
+        '총_사용금액': line_cost,
+    })
+    # 연결 메뉴 목록: (재료, 메뉴) 중복 제거 후 한 번 순회 (그룹별 Python agg 회피)
+    menus: Dict[str, list] = {}
+    pairs = lines[['재료명', '메뉴명']].drop_duplicates()
+    for name, menu in zip(pairs['재료명'].to_numpy(), pairs['메뉴명'].astype(str).to_numpy()):
+        menus.setdefault(name, []).append(menu)
+
+    result = lines.groupby('재료명', sort=False)[['총_사용금액']].sum()
+    result['연결_메뉴_수'] = result.index.map(lambda name: len(menus[name]))
+    result['연결_메뉴_목록'] = result.index.map(lambda name: ', '.join(menus[name]))
+    result = result[result['총_사용금액'] > 0]
+    if result.empty:
+        return empty_usage()
+
+    total = result['총_사용금액'].sum()
+    result['원가_비중_%'] = (result['총_사용금액'] / total * 100).round(2) if total > 0 else 0.0
+    result = result.rename_axis('재료명').reset_index()
+    return result.sort_values('총_사용금액', ascending=False, kind='stable').reset_index(drop=True)[USAGE_COLUMNS]
+
+
+def cost_concentration(usage_df: pd.DataFrame) -> Tuple[float, float]:
+    """원가 집중도 (TOP3 %, TOP5 %), usage_df는 총_사용금액 내림차순"""
+    if usage_df is None or usage_df.empty:
+        return 0.0, 0.0
+    amounts = usage_df['총_사용금액'].to_numpy(dtype=float)
+    total = amounts.sum()
+    if total <= 0:
+        return 0.0, 0.0
+    return float(amounts[:3].sum() / total * 100), float(amounts[:5].sum() / total * 100)
+
+
+def flag_high_risk(usage_df: pd.DataFrame, cost_threshold: float = 20.0, menu_threshold: int = 3) -> pd.DataFrame:
+    """
+    고위험 재료: 누적 원가가 상위 cost_threshold% 안에 드는 재료 중 연결 메뉴 수 >= menu_threshold
+
+    Returns:
+        RISK_COLUMNS (위험_사유 포함)
+    """
+    if usage_df is None or usage_df.empty:
+        return pd.DataFrame(columns=RISK_COLUMNS)
+
+    amounts = usage_df['총_사용금액'].to_numpy(dtype=float)
+    threshold_cost = amounts.sum() * (cost_threshold / 100.0)
+    # 누적합이 기준을 처음 넘는 지점까지 (사용금액이 양수라 누적합은 단조 증가)
+    within = np.cumsum(amounts) <= threshold_cost
+    within &= np.logical_and.accumulate(within)
+
+    high_risk = usage_df[within & (usage_df['연결_메뉴_수'].to_numpy() >= menu_threshold)].copy()
+    if high_risk.empty:
+        return pd.DataFrame(columns=RISK_COLUMNS)
+
+    share = high_risk['원가_비중_%'].astype(float)
+    menus = high_risk['연결_메뉴_수']
+    share_reason = pd.Series(np.where(share >= cost_threshold, '원가 비중 ' + share.map('{:.1f}%'.format), ''), index=high_risk.index)
+    menu_reason = pd.Series(np.where(menus >= menu_threshold, '연결 메뉴 ' + menus.astype(str) + '개', ''), index=high_risk.index)
+    reasons = (share_reason + ' / ' + menu_reason).str.strip(' /')
+    high_risk['위험_사유'] = reasons.where(reasons != '', '기타')
+    return high_risk
+
+
+def compute_ingredient_structure(
+    ingredient_df: pd.DataFrame,
+    recipe_df: pd.DataFrame,
+    sales_df: Optional[pd.DataFrame],
+    cost_threshold: float = 20.0,
+    menu_threshold: int = 3,
+) -> Dict:
+    """사용금액 / 집중도 / 고위험 재료를 한 번에 계산"""
+    usage = compute_ingredient_usage(ingredient_df, recipe_df, sales_df)
+    top3, top5 = cost_concentration(usage)
+    return {
+        "usage": usage,
+        "top3_concentration": top3,
+        "top5_concentration": top5,
+        "high_risk": flag_high_risk(usage, cost_threshold, menu_threshold),
+    }
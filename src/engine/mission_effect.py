@@ -0,0 +1,197 @@
+"""
+전략 미션 효과 평가 (순수 계산)
+
+compute_mission_effect: 완료일 전 7일 vs 완료 후 최대 7일 (일별 시계열만으로 계산)
+evaluate_mission_effect: 명시적 클라이언트로 시계열을 읽고 엔진 캐시로 memoize (워커/배치용)
+Streamlit 화면은 src.strategy.strategy_monitor.evaluate_mission_effect (st.cache_data 어댑터)을 사용
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from src.engine.cache import memoize
+from src.engine.timeseries import KST, DailySeries, shared_window
+
+
+def parse_completed_date(completed_at, now: Optional[datetime] = None) -> date:
+    """미션 completed_at (ISO 문자열/YYYY-MM-DD/datetime) → KST 날짜 (파싱 실패 시 now)"""
+    now = now or datetime.now(KST)
+    if isinstance(completed_at, str):
+        try:
+            if 'T' in completed_at:
+                parsed = datetime.fromisoformat(completed_at.replace('Z', '+00:00'))
+            else:
+                parsed = datetime.strptime(completed_at, '%Y-%m-%d')
+                parsed = parsed.replace(tzinfo=KST)
+        except Exception:
+            parsed = now
+    else:
+        parsed = completed_at
+
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=KST)
+    else:
+        parsed = parsed.astimezone(KST)
+    return parsed.date()
+
+
+def mission_windows(completed_date: date, today: date) -> Tuple[int, date, date, date, date]:
+    """
+    평가 구간
+
+    Returns:
+        (after_days, baseline_start, baseline_end, after_start, after_end)
+        after_days: 완료 후 경과일 (최대 7, 3일 미만이면 평가 보류)
+    """
+    after_days = min((today - completed_date).days, 7)
+    baseline_start = completed_date - timedelta(days=7)
+    baseline_end = completed_date - timedelta(days=1)
+    after_start = completed_date + timedelta(days=1)
+    after_end = completed_date + timedelta(days=after_days)
+    return after_days, baseline_start, baseline_end, after_start, after_end
+
+
+def _insufficient(comment: str, after_days: int) -> Dict:
+    return {
+        "result_type": "data_insufficient",
+        "coach_comment": comment,
+        "baseline": {},
+        "after": {},
+        "delta": {},
+        "after_days": after_days,
+    }
+
+
+def compute_mission_effect(series: Optional[DailySeries], completed_date: date, today: date) -> Dict:
+    """
+    미션 효과 평가 (I/O 없음)
+
+    Args:
+        series: 완료일 7일 전(여유 2일 포함) ~ 평가 종료일을 포함하는 일별 시계열
+                (after_days < 3 이면 사용하지 않으므로 None 가능)
+        completed_date: 미션 완료일 (KST)
+        today: 기준일
+
+    Returns:
+        src.strategy.strategy_monitor.evaluate_mission_effect 와 같은 구조
+    """
+    after_days, baseline_start, baseline_end, after_start, after_end = mission_windows(completed_date, today)
+    if after_days < 3:
+        return _insufficient("아직 7일이 지나지 않았어요. 데이터가 더 쌓이면 자동으로 평가합니다.", after_days)
+
+    if series is None or series.empty:
+        return _insufficient("데이터가 부족하여 평가할 수 없습니다.", 0)
+
+    # Baseline vs After 비교
+    comparison = series.compare(baseline_start, baseline_end, after_start, after_end)
+    if comparison is None:
+        return _insufficient("비교 데이터가 부족합니다.", 0)
+
+    delta = comparison["delta"]
+    result_type, coach_comment = classify_result(
+        delta["sales_delta_pct"], delta["visitors_delta_pct"], delta["avgp_delta_pct"], after_days
+    )
+    return {
+        "result_type": result_type,
+        "coach_comment": coach_comment,
+        "baseline": dict(comparison["baseline"]),
+        "after": dict(comparison["recent"]),
+        "delta": {
+            "sales_delta_pct": delta["sales_delta_pct"],
+            "visitors_delta_pct": delta["visitors_delta_pct"],
+            "avgp_delta_pct": delta["avgp_delta_pct"],
+        },
+        "after_days": after_days,
+    }
+
+
+@memoize("mission_effect", ttl=300)
+def evaluate_mission_effect(
+    _client,
+    mission: Dict,
+    store_id: str,
+    today: Optional[date] = None,
+    version: int = 0,
+) -> Optional[Dict]:
+    """
+    미션 효과 평가 (Streamlit 없이 실행)
+
+    Args:
+        _client: Supabase 클라이언트 (캐시 키 제외)
+        mission: 미션 dict (completed_at 포함)
+        store_id: 매장 ID
+        today: 기준일 (없으면 KST 오늘)
+        version: 데이터 버전 (바뀌면 캐시 무효화)
+    """
+    from src.engine.sources import build_daily_series
+
+    if not mission or not store_id or not mission.get("completed_at"):
+        return None
+    try:
+        today = today or datetime.now(KST).date()
+        completed_date = parse_completed_date(mission["completed_at"])
+        after_days, baseline_start, _, _, after_end = mission_windows(completed_date, today)
+        series = None
+        if after_days >= 3:
+            start, end = shared_window(baseline_start - timedelta(days=2), after_end, today)
+            series = build_daily_series(_client, store_id, start, end)
+        return compute_mission_effect(series, completed_date, today)
+    except Exception:
+        return None
+
+
+def classify_result(sales_delta: float, visitors_delta: float, avgp_delta: float, after_days: int) -> tuple:
+    """
+    결과 타입 분류 및 코치 코멘트 생성
+
+    Returns:
+        (result_type, coach_comment)
+    """
+    # improved: 매출 ↑ AND (방문자 ↑ OR 객단가 ↑)
+    if sales_delta > 5 and (visitors_delta > 5 or avgp_delta > 5):
+        comment = "매출이 개선되었습니다."
+        if visitors_delta > 5:
+            comment += " 네이버방문자 증가가 기여했습니다."
+        if avgp_delta > 5:
+            comment += " 객단가 개선이 기여했습니다."
+        return "improved", comment
+
+    # worsened: 매출 ↓ AND (방문자 ↓ OR 객단가 ↓)
+    if sales_delta < -5 and (visitors_delta < -5 or avgp_delta < -5):
+        comment = "매출이 더 감소했습니다."
+        if visitors_delta < -5:
+            comment += " 네이버방문자 감소가 원인일 수 있습니다."
+        if avgp_delta < -5:
+            comment += " 객단가 하락이 원인일 수 있습니다."
+        comment += " 상위 구조 문제 가능성이 커졌습니다."
+        return "worsened", comment
+
+    # no_change: 매출 변화 ±5% 이내
+    if abs(sales_delta) <= 5:
+        if after_days < 7:
+            comment = f"({after_days}일 기준) 변화가 미미합니다. 구조 변화가 아직 숫자에 반영되지 않았을 수 있습니다."
+        else:
+            comment = "변화가 미미합니다. 현재 전략의 효과가 제한적일 수 있습니다."
+        return "no_change", comment
+
+    # 기타: 혼재된 결과
+    if sales_delta > 5:
+        if visitors_delta < -5:
+            comment = "매출은 증가했지만 네이버방문자가 감소했습니다. 객단가 상승이 기여했을 수 있습니다."
+        elif avgp_delta < -5:
+            comment = "매출은 증가했지만 객단가가 하락했습니다. 방문자 증가가 기여했을 수 있습니다."
+        else:
+            comment = "매출이 개선되었습니다."
+        return "improved", comment
+
+    if sales_delta < -5:
+        if visitors_delta > 5:
+            comment = "매출은 감소했지만 네이버방문자는 증가했습니다. 객단가 하락이 원인일 수 있습니다."
+        elif avgp_delta > 5:
+            comment = "매출은 감소했지만 객단가는 상승했습니다. 방문자 감소가 원인일 수 있습니다."
+        else:
+            comment = "매출이 더 감소했습니다. 상위 구조 문제 가능성이 커졌습니다."
+        return "worsened", comment
+
+    return "no_change", "변화가 미미합니다."
@@ -0,0 +1,327 @@
+"""
+매출 하락 원인 분석 (순수 계산)
+- 언제부터 떨어졌나?
+- 무엇이 떨어졌나?
+- 어디를 고치나?
+
+compute_sales_drop: 입력(시계열, 메뉴 판매량, 감지 요약)만으로 계산
+analyze_sales_drop: 명시적 클라이언트로 입력을 읽고 엔진 캐시로 memoize (워커/배치/벤치마크용)
+  - 조회 실패는 캐시하지 않음 (빈 결과로 돌려주되 다음 호출에서 다시 시도)
+Streamlit 화면은 core.sales_drop_engine.analyze_sales_drop (st.cache_data 어댑터)을 사용
+"""
+from __future__ import annotations
+
+import logging
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from src.engine.cache import memoize
+from src.engine.timeseries import KST, METRIC_SALES, DailySeries, shared_window
+
+logger = logging.getLogger(__name__)
+
+
+def sales_drop_windows(period_days: int, compare_type: str, base_date: date) -> Tuple[date, date, date, date]:
+    """
+    비교 구간 (baseline_start, baseline_end, recent_start, recent_end)
+
+    compare_type "week"(전주 대비) / "month"(전월 대비, 간단화) 모두 직전 같은 길이 구간
+    """
+    recent_end = base_date
+    recent_start = base_date - timedelta(days=period_days - 1)
+    baseline_end = recent_start - timedelta(days=1)
+    baseline_start = baseline_end - timedelta(days=period_days - 1)
+    return baseline_start, baseline_end, recent_start, recent_end
+
+
+def empty_result() -> Dict:
+    """빈 결과 반환"""
+    return {
+        "summary": {
+            "sales_delta_pct": 0.0,
+            "visitors_delta_pct": 0.0,
+            "avgp_delta_pct": 0.0,
+            "quantity_delta_pct": 0.0,
+            "drop_start_date": None,
+            "recent_trend": "데이터 부족",
+            "change_point": None,
+        },
+        "metrics": {
+            "recent": {},
+            "baseline": {},
+            "delta": {},
+        },
+        "menu_changes": [],
+        "primary_cause": None,
+        "confidence": 0,
+        "evidence": [],
+    }
+
+
+def compute_sales_drop(
+    series: DailySeries,
+    period_days: int,
+    compare_type: str,
+    base_date: date,
+    baseline_menu_qty: Dict[str, float],
+    recent_menu_qty: Dict[str, float],
+    change_point: Optional[Dict] = None,
+) -> Dict:
+    """
+    매출 하락 원인 분석 (I/O 없음)
+
+    Args:
+        series: 판매량 포함 일별 시계열 (baseline 시작 이전 2일 ~ base_date 포함)
+        period_days: 분석 기간 (7/14/30)
+        compare_type: 비교 방식 ("week" | "month")
+        base_date: 기준 날짜
+        baseline_menu_qty / recent_menu_qty: 구간별 메뉴 판매량 {메뉴명: 수량}
+        change_point: 증분 CUSUM 감지 요약 (core.change_point, 없으면 None)
+
+    Returns:
+        core.sales_drop_engine.analyze_sales_drop 와 같은 구조
+    """
+    if series is None or series.empty:
+        return empty_result()
+
+    baseline_start, baseline_end, recent_start, recent_end = sales_drop_windows(period_days, compare_type, base_date)
+    comparison = series.compare(baseline_start, baseline_end, recent_start, recent_end)
+    if comparison is None:
+        return empty_result()
+
+    baseline = comparison["baseline"]
+    recent = comparison["recent"]
+
+    # 판매량 계산 (daily_sales_items 기반)
+    quantity_delta_pct = series.daily_quantity_delta_pct(
+        baseline_start, baseline_end, recent_start, recent_end
+    )
+
+    # 변화율 계산
+    sales_delta_pct = comparison["delta"]["sales_delta_pct"]
+    visitors_delta_pct = comparison["delta"]["visitors_delta_pct"]
+    avgp_delta_pct = comparison["delta"]["avgp_delta_pct"]
+
+    # 하락 시작일 추정 (감지기가 분석 기간 안에서 하락을 잡고 있으면 감지기 시작일 우선)
+    drop_start_date = _estimate_drop_start_date(series, baseline["sales_avg"], recent_start, recent_end)
+    cp_start = (change_point or {}).get("drop_start_date")
+    if cp_start and baseline_start <= cp_start <= recent_end:
+        drop_start_date = cp_start
+
+    # 최근 추세
+    recent_trend = _calculate_recent_trend(series, recent_start, recent_end)
+
+    # 메뉴 변화 분석
+    menu_changes = menu_top5_changes(baseline_menu_qty, recent_menu_qty)
+
+    # 원인 분류
+    primary_cause, confidence, evidence = classify_primary_cause(
+        sales_delta_pct,
+        visitors_delta_pct,
+        avgp_delta_pct,
+        quantity_delta_pct,
+        menu_changes
+    )
+
+    return {
+        "summary": {
+            "sales_delta_pct": sales_delta_pct,
+            "visitors_delta_pct": visitors_delta_pct,
+            "avgp_delta_pct": avgp_delta_pct,
+            "quantity_delta_pct": quantity_delta_pct,
+            "drop_start_date": drop_start_date,
+            "recent_trend": recent_trend,
+            "change_point": change_point,
+        },
+        "metrics": {
+            "recent": {
+                "sales_avg": recent["sales_avg"],
+                "visitors_avg": recent["visitors_avg"],
+                "avgp": recent["avgp"],
+            },
+            "baseline": {
+                "sales_avg": baseline["sales_avg"],
+                "visitors_avg": baseline["visitors_avg"],
+                "avgp": baseline["avgp"],
+            },
+            "delta": {
+                "sales_delta_pct": sales_delta_pct,
+                "visitors_delta_pct": visitors_delta_pct,
+                "avgp_delta_pct": avgp_delta_pct,
+                "quantity_delta_pct": quantity_delta_pct,
+            },
+        },
+        "menu_changes": menu_changes,
+        "primary_cause": primary_cause,
+        "confidence": confidence,
+        "evidence": evidence,
+    }
+
+
+def analyze_sales_drop(
+    _client,
+    store_id: str,
+    period_days: int,
+    compare_type: str,
+    base_date: Optional[date] = None,
+    today: Optional[date] = None,
+    version: int = 0,
+) -> Dict:
+    """
+    매출 하락 원인 분석 (Streamlit 없이 실행)
+
+    Args:
+        _client: Supabase 클라이언트 (캐시 키 제외)
+        store_id: 매장 ID
+        period_days / compare_type / base_date: compute_sales_drop 참고 (base_date 없으면 today)
+        today: 공용 시계열 구간 기준일 (없으면 KST 오늘)
+        version: 데이터 버전 (바뀌면 캐시 무효화)
+    """
+    result = _analyze_sales_drop(_client, store_id, period_days, compare_type, base_date, today, version)
+    return result if result is not None else empty_result()
+
+
+@memoize("sales_drop", ttl=300)
+def _analyze_sales_drop(
+    _client,
+    store_id: str,
+    period_days: int,
+    compare_type: str,
+    base_date: Optional[date] = None,
+    today: Optional[date] = None,
+    version: int = 0,
+) -> Optional[Dict]:
+    """analyze_sales_drop 본체 - 조회 실패 시 None (memoize는 None을 저장하지 않음)"""
+    from src.engine.sources import build_daily_series, load_change_point_summary, load_menu_quantities
+
+    if not store_id:
+        return empty_result()
+    try:
+        today = today or datetime.now(KST).date()
+        base_date = base_date or today
+        baseline_start, baseline_end, recent_start, recent_end = sales_drop_windows(period_days, compare_type, base_date)
+        start, end = shared_window(baseline_start - timedelta(days=2), recent_end, today)
+        series = build_daily_series(_client, store_id, start, end, include_quantity=True)
+        return compute_sales_drop(
+            series, period_days, compare_type, base_date,
+            load_menu_quantities(_client, store_id, baseline_start, baseline_end),
+            load_menu_quantities(_client, store_id, recent_start, recent_end),
+            load_change_point_summary(_client, store_id),
+        )
+    except Exception as e:
+        logger.warning(f"analyze_sales_drop failed ({store_id}): {e}")
+        return None
+
+
+def _estimate_drop_start_date(series: DailySeries, baseline_avg: float, recent_start: date, recent_end: date) -> Optional[date]:
+    """하락 시작일 추정"""
+    try:
+        # 3일 평균이 baseline 아래(5% 하락 기준)인 가장 최근 날짜
+        threshold = baseline_avg * 0.95
+        found = series.latest_window_below(METRIC_SALES, recent_start, recent_end, threshold, days=3)
+        return found or recent_start
+    except Exception:
+        return None
+
+
+def _calculate_recent_trend(series: DailySeries, recent_start: date, recent_end: date) -> str:
+    """최근 추세 계산"""
+    try:
+        if series.count(recent_start, recent_end) < 3:
+            return "데이터 부족"
+
+        # 최근 구간 처음 3일 vs 마지막 3일
+        first_avg, second_avg = series.head_tail_means(METRIC_SALES, recent_start, recent_end, k=3)
+        first_avg = first_avg or 0
+        second_avg = second_avg or 0
+
+        if second_avg > first_avg * 1.05:
+            return "회복 중"
+        elif second_avg < first_avg * 0.95:
+            return "추가 하락"
+        else:
+            return "정체"
+    except Exception:
+        return "데이터 부족"
+
+
+def menu_top5_changes(baseline_menu_qty: Dict[str, float], recent_menu_qty: Dict[str, float]) -> List[Dict]:
+    """상위 메뉴(Top5) 판매량 변화"""
+    baseline_top5 = sorted(baseline_menu_qty.items(), key=lambda x: x[1], reverse=True)[:5]
+    recent_top5 = sorted(recent_menu_qty.items(), key=lambda x: x[1], reverse=True)[:5]
+
+    baseline_dict = {name: qty for name, qty in baseline_top5}
+    baseline_rank = {name: idx + 1 for idx, (name, _) in enumerate(baseline_top5)}
+
+    changes = []
+    for idx, (menu_name, recent_qty) in enumerate(recent_top5):
+        baseline_qty = baseline_dict.get(menu_name, 0)
+        rank_change = baseline_rank.get(menu_name, 999) - (idx + 1)
+        qty_delta_pct = ((recent_qty - baseline_qty) / baseline_qty * 100) if baseline_qty > 0 else 0
+        changes.append({
+            "menu_name": menu_name,
+            "qty_delta_pct": qty_delta_pct,
+            "sales_delta_pct": qty_delta_pct,  # 간단화: 판매량 변화 = 매출 변화
+            "rank_change": rank_change,
+        })
+    return changes
+
+
+def classify_primary_cause(
+    sales_delta: float,
+    visitors_delta: float,
+    avgp_delta: float,
+    quantity_delta: float,
+    menu_changes: List[Dict]
+) -> Tuple[str, int, List[str]]:
+    """
+    원인 분류
+
+    Returns:
+        (primary_cause, confidence, evidence)
+    """
+    evidence = []
+    confidence = 0
+
+    # A. 유입 문제 (traffic)
+    if visitors_delta < -10:
+        evidence.append(f"네이버방문자 {visitors_delta:.1f}%")
+        confidence += 40
+
+    # B. 메뉴 문제 (menu)
+    if quantity_delta < -10:
+        evidence.append(f"총 판매량 {quantity_delta:.1f}%")
+        confidence += 30
+
+    # 상위 메뉴 급락
+    top3_drops = [m for m in menu_changes[:3] if m.get("qty_delta_pct", 0) < -15]
+    if len(top3_drops) >= 2:
+        evidence.append(f"상위 메뉴 {len(top3_drops)}개 급락")
+        confidence += 20
+
+    # C. 가격/구조 문제 (price)
+    if avgp_delta < -5:
+        evidence.append(f"객단가 {avgp_delta:.1f}%")
+        confidence += 25
+
+    # D. 원가 구조 문제 (cost) - 간단 판단
+    if sales_delta < -10 and avgp_delta > 0 and visitors_delta > -5:
+        # 매출은 하락했는데 객단가는 유지/상승, 방문자는 큰 변화 없음
+        # → 원가 상승 가능성
+        evidence.append("객단가 유지 중 원가 상승 가능")
+        confidence += 15
+
+    # E. 생존선 문제 (structure) - design_state 기반 판단 필요
+    # 여기서는 간단히 판단하지 않음 (외부에서 design_state와 결합)
+
+    # 우선순위 결정
+    if visitors_delta < -15:
+        return "traffic", min(confidence, 100), evidence
+    elif quantity_delta < -15 or len(top3_drops) >= 2:
+        return "menu", min(confidence, 100), evidence
+    elif avgp_delta < -8:
+        return "price", min(confidence, 100), evidence
+    elif sales_delta < -10 and avgp_delta > 0:
+        return "cost", min(confidence, 100), evidence
+    else:
+        return "structure", min(confidence, 100), evidence
@@ -0,0 +1,106 @@
+"""
+엔진 입력 로더 (명시적 Supabase 클라이언트, Streamlit 없음)
+
+- 세션/현재 매장에 의존하지 않음: client, store_id, 구간을 모두 인자로 받음
+- Streamlit 화면에서는 기존 캐시 로더(core.timeseries_engine 등)가 get_read_client()로 호출
+- 실패 시 빈 결과 (엔진은 빈 입력을 "데이터 부족"으로 처리)
+"""
+from __future__ import annotations
+
+import logging
+from datetime import date
+from typing import Dict, Optional
+
+import pandas as pd
+
+from src.engine.change_point import TABLE_NAME, summarize_state
+from src.engine.timeseries import METRIC_QUANTITY, DailySeries
+
+logger = logging.getLogger(__name__)
+
+
+def load_best_available_sales(client, store_id: str, start: date, end: date) -> pd.DataFrame:
+    """일별 매출 (v_daily_sales_best_available, daily_close 우선)"""
+    if not client or not store_id:
+        return pd.DataFrame()
+    try:
+        result = client.table("v_daily_sales_best_available")\
+            .select("*")\
+            .eq("store_id", store_id)\
+            .gte("date", start.isoformat())\
+            .lte("date", end.isoformat())\
+            .order("date", desc=False)\
+            .execute()
+        return pd.DataFrame(result.data or [])
+    except Exception as e:
+        logger.warning(f"load_best_available_sales failed ({store_id}): {e}")
+        return pd.DataFrame()
+
+
+def load_quantity_frame(client, store_id: str, start: date, end: date) -> pd.DataFrame:
+    """메뉴 판매량 일별 행 (v_daily_sales_items_effective, 1회 조회)"""
+    empty = pd.DataFrame(columns=["date", METRIC_QUANTITY])
+    if not client or not store_id:
+        return empty
+    try:
+        result = client.table("v_daily_sales_items_effective")\
+            .select("date, qty")\
+            .eq("store_id", store_id)\
+            .gte("date", start.isoformat())\
+            .lte("date", end.isoformat())\
+            .execute()
+        if not result.data:
+            return empty
+        df = pd.DataFrame(result.data)
+        df[METRIC_QUANTITY] = pd.to_numeric(df[METRIC_QUANTITY], errors="coerce").fillna(0)
+        return df
+    except Exception as e:
+        logger.warning(f"Failed to load daily quantity: {e}")
+        return empty
+
+
+def build_daily_series(client, store_id: str, start: date, end: date, include_quantity: bool = False) -> DailySeries:
+    """[start, end] 일별 시계열 (판매량은 선택)"""
+    sales_df = load_best_available_sales(client, store_id, start, end)
+    qty_df = load_quantity_frame(client, store_id, start, end) if include_quantity else None
+    return DailySeries(store_id, start, end, sales_df, qty_df)
+
+
+def load_menu_quantities(client, store_id: str, start: date, end: date) -> Dict[str, float]:
+    """구간 메뉴별 판매량 합계 {메뉴명: 수량}"""
+    if not client or not store_id:
+        return {}
+    try:
+        result = client.table("v_daily_sales_items_effective")\
+            .select("menu_name, qty, total_sales")\
+            .eq("store_id", store_id)\
+            .gte("date", start.isoformat())\
+            .lte("date", end.isoformat())\
+            .execute()
+    except Exception as e:
+        logger.warning(f"load_menu_quantities failed ({store_id}): {e}")
+        return {}
+    totals: Dict[str, float] = {}
+    for row in result.data or []:
+        menu_name = row.get("menu_name", "")
+        if menu_name:
+            totals[menu_name] = totals.get(menu_name, 0) + (row.get("qty", 0) or 0)
+    return totals
+
+
+def load_change_point_summary(client, store_id: str) -> Optional[Dict]:
+    """저장된 매출 하락 감지 상태 요약 (없음/실패 시 None)"""
+    if not client or not store_id:
+        return None
+    try:
+        result = client.table(TABLE_NAME)\
+            .select("state")\
+            .eq("store_id", store_id)\
+            .limit(1)\
+            .execute()
+    except Exception as e:
+        logger.warning(f"load_change_point_summary failed ({store_id}): {e}")
+        return None
+    if not result.data:
+        return None
+    return summarize_state(result.data[0].get("state"))
@@ -0,0 +1,458 @@
+"""
+가게 상태 분류 v1 (순수 계산)
+- 가게 상태를 4가지로 분류: survival / recovery / restructure / growth
+- 입력은 StoreStateInputs (값만 보관, I/O 없음)
+  · Streamlit 화면: StrategyContext 에서 from_context()로 생성 (ui_pages.strategy.store_state 어댑터)
+  · 워커/배치: 손익분기점/예상매출/14일 평균/설계 상태를 직접 채워 생성
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class StoreStateInputs:
+    """가게 상태 분류 입력"""
+    break_even: float = 0.0
+    projected_sales_30d: float = 0.0
+    recent_14d_avg: Optional[float] = None
+    previous_14d_avg: Optional[float] = None
+    has_sales: bool = False
+    design_state: Dict = field(default_factory=dict)
+    notes: Tuple[str, ...] = ()  # from_context 로드 오류 (debug.notes 로 전달)
+
+    @classmethod
+    def from_context(cls, ctx) -> "StoreStateInputs":
+        """
+        StrategyContext(또는 같은 속성을 가진 객체)에서 생성
+
+        항목별로 로드 실패를 격리: 실패한 항목은 기본값(점수 50 처리) + notes 기록
+        """
+        values: Dict = {}
+        notes = []
+
+        def load(label: str, fn):
+            try:
+                fn()
+            except Exception as e:
+                notes.append(f"{label} 로드 오류: {str(e)}")
+
+        def sales():
+            values["recent_14d_avg"], values["previous_14d_avg"] = ctx.sales_window_means(recent_days=14)
+            values["has_sales"] = not ctx.series.empty
+
+        load("손익분기점", lambda: values.update(break_even=ctx.break_even))
+        load("예상 매출", lambda: values.update(projected_sales_30d=ctx.projected_sales_30d))
+        load("일별 매출", sales)
+        load("설계 상태", lambda: values.update(design_state=ctx.design_state or {}))
+        return cls(notes=tuple(notes), **values)
+
+
+def compute_store_state(inputs: StoreStateInputs, year: int, month: int) -> Dict:
+    """
+    가게 상태 분류
+
+    Returns:
+        ui_pages.strategy.store_state.classify_store_state 와 같은 구조
+    """
+    debug = {
+        "inputs_used": [],
+        "notes": list(inputs.notes)
+    }
+
+    try:
+        # 1. Revenue Score 계산
+        revenue_score, revenue_signals, revenue_evidence = _calculate_revenue_score(inputs, debug)
+
+        # 2. Sales Score 계산
+        sales_score, sales_signals, sales_evidence = _calculate_sales_score(inputs, debug)
+
+        # 3. Menu Score 계산 (설계 상태 기반)
+        menu_score, menu_signals, menu_evidence = _calculate_menu_score(inputs, debug)
+
+        # 4. Ingredient Score 계산 (설계 상태 기반)
+        ingredient_score, ingredient_signals, ingredient_evidence = _calculate_ingredient_score(inputs, debug)
+
+        # 5. Overall Score 계산
+        overall_score = (
+            revenue_score * 0.40 +
+            sales_score * 0.30 +
+            menu_score * 0.15 +
+            ingredient_score * 0.15
+        )
+
+        # 6. 상태 분류
+        state_code, state_label, primary_reason = _classify_state(
+            revenue_score, sales_score, menu_score, ingredient_score,
+            inputs, debug
+        )
+
+        return {
+            "period": {"year": year, "month": month},
+            "state": {"code": state_code, "label": state_label},
+            "scores": {
+                "sales": round(sales_score, 1),
+                "menu": round(menu_score, 1),
+                "ingredient": round(ingredient_score, 1),
+                "revenue": round(revenue_score, 1),
+                "overall": round(overall_score, 1),
+            },
+            "signals": revenue_signals + sales_signals + menu_signals + ingredient_signals,
+            "primary_reason": primary_reason,
+            "evidence": revenue_evidence + sales_evidence + menu_evidence + ingredient_evidence,
+            "debug": debug,
+        }
+    except Exception as e:
+        debug["notes"].append(f"분류 중 오류: {str(e)}")
+        return empty_state(year, month, debug)
+
+
+def empty_state(year: int, month: int, debug: Optional[Dict] = None) -> Dict:
+    """빈 상태 반환"""
+    if debug is None:
+        debug = {"inputs_used": [], "notes": ["데이터 부족"]}
+
+    return {
+        "period": {"year": year, "month": month},
+        "state": {"code": "unknown", "label": "상태 미확인"},
+        "scores": {
+            "sales": 50.0,
+            "menu": 50.0,
+            "ingredient": 50.0,
+            "revenue": 50.0,
+            "overall": 50.0,
+        },
+        "signals": [{"key": "data_insufficient", "status": "warn", "value": "데이터 부족", "note": ""}],
+        "primary_reason": "데이터가 부족하여 상태를 분류할 수 없습니다.",
+        "evidence": [],
+        "debug": debug,
+    }
+
+
+def _calculate_revenue_score(inputs: StoreStateInputs, debug: Dict) -> tuple:
+    """
+    Revenue Score 계산 (0-100)
+
+    Returns:
+        (score, signals, evidence)
+    """
+    try:
+        debug["inputs_used"].append("revenue_score")
+
+        # 손익분기점 계산
+        break_even = inputs.break_even
+        if break_even <= 0:
+            debug["notes"].append("손익분기점 계산 실패")
+            return 50.0, [], []
+
+        # 예상 매출 계산 (월 누적 / 경과일수 * 30)
+        expected_sales = inputs.projected_sales_30d
+
+        # 비율 계산
+        ratio = (expected_sales / break_even) if break_even > 0 else 0.0
+
+        # 점수 계산
+        if ratio < 0.95:
+            # risk: 20~35
+            score = max(20, min(35, 20 + (ratio - 0.8) * 75))  # 0.8~0.95 구간
+        elif ratio < 1.05:
+            # warn: 40~60
+            score = 40 + (ratio - 0.95) * 200  # 0.95~1.05 구간
+        else:
+            # ok: 70~90
+            score = min(90, 70 + (ratio - 1.05) * 200)  # 1.05 이상
+
+        # Signals
+        signals = []
+        if ratio < 0.95:
+            signals.append({
+                "key": "break_even_gap",
+                "status": "risk",
+                "value": f"{ratio*100:.0f}%",
+                "note": "예상매출이 손익분기점보다 낮습니다"
+            })
+        elif ratio < 1.05:
+            signals.append({
+                "key": "break_even_near",
+                "status": "warn",
+                "value": f"{ratio*100:.0f}%",
+                "note": "손익분기점 근접"
+            })
+        else:
+            signals.append({
+                "key": "break_even_safe",
+                "status": "ok",
+                "value": f"{ratio*100:.0f}%",
+                "note": "손익분기점 여유"
+            })
+
+        # Evidence
+        evidence = [
+            {
+                "title": "손익분기점",
+                "value": f"{break_even:,.0f}원",
+                "delta": None,
+                "note": ""
+            },
+            {
+                "title": "예상 매출",
+                "value": f"{expected_sales:,.0f}원",
+                "delta": None,
+                "note": f"대비 {ratio*100:.0f}%"
+            }
+        ]
+
+        return score, signals, evidence
+    except Exception as e:
+        debug["notes"].append(f"Revenue score 계산 오류: {str(e)}")
+        return 50.0, [], []
+
+
+def _calculate_sales_score(inputs: StoreStateInputs, debug: Dict) -> tuple:
+    """
+    Sales Score 계산 (0-100)
+    최근 14일 전주 대비 하락 신호 사용
+    """
+    try:
+        debug["inputs_used"].append("sales_score")
+
+        # 최근 14일 vs 직전 14일 평균 (공용 일별 시계열)
+        recent_avg, compare_avg = inputs.recent_14d_avg, inputs.previous_14d_avg
+
+        if recent_avg is None or compare_avg is None:
+            if not inputs.has_sales:
+                debug["notes"].append("매출 데이터 없음")
+            else:
+                debug["notes"].append("비교 구간 데이터 부족")
+            return 50.0, [], []
+
+        if compare_avg <= 0:
+            debug["notes"].append("비교 구간 매출 0")
+            return 50.0, [], []
+
+        # 변화율
+        change_pct = ((recent_avg - compare_avg) / compare_avg * 100)
+
+        # 점수 계산
+        if change_pct < -15:
+            # 하락 강함: 20~40
+            score = max(20, min(40, 40 + (change_pct + 15) * 1.33))
+        elif change_pct < -5:
+            # 하락 보통: 40~60
+            score = 40 + (change_pct + 15) * 2
+        elif change_pct < 5:
+            # 안정: 60~80
+            score = 60 + change_pct * 2
+        else:
+            # 상승: 80~90
+            score = min(90, 80 + (change_pct - 5) * 0.5)
+
+        # Signals
+        signals = []
+        if change_pct < -15:
+            signals.append({
+                "key": "sales_drop_severe",
+                "status": "risk",
+                "value": f"{change_pct:.1f}%",
+                "note": "매출 급락"
+            })
+        elif change_pct < -5:
+            signals.append({
+                "key": "sales_drop_moderate",
+                "status": "warn",
+                "value": f"{change_pct:.1f}%",
+                "note": "매출 하락"
+            })
+        elif change_pct >= 5:
+            signals.append({
+                "key": "sales_growth",
+                "status": "ok",
+                "value": f"+{change_pct:.1f}%",
+                "note": "매출 상승"
+            })
+        else:
+            signals.append({
+                "key": "sales_stable",
+                "status": "ok",
+                "value": f"{change_pct:.1f}%",
+                "note": "매출 안정"
+            })
+
+        # Evidence
+        evidence = [
+            {
+                "title": "최근 14일 평균",
+                "value": f"{recent_avg:,.0f}원",
+                "delta": f"{change_pct:+.1f}%",
+                "note": "전주 대비"
+            }
+        ]
+
+        return score, signals, evidence
+    except Exception as e:
+        debug["notes"].append(f"Sales score 계산 오류: {str(e)}")
+        return 50.0, [], []
+
+
+def _calculate_menu_score(inputs: StoreStateInputs, debug: Dict) -> tuple:
+    """
+    Menu Score 계산 (0-100)
+    설계 상태 기반
+    """
+    try:
+        debug["inputs_used"].append("menu_score")
+
+        design_state = inputs.design_state
+        menu_portfolio_state = design_state.get("menu_portfolio", {})
+        menu_profit_state = design_state.get("menu_profit", {})
+
+        # 포트폴리오 점수와 수익 점수 평균
+        portfolio_score = menu_portfolio_state.get("score", 50)
+        profit_score = menu_profit_state.get("score", 50)
+        menu_score = (portfolio_score + profit_score) / 2
+
+        # Signals
+        signals = []
+        portfolio_signals = menu_portfolio_state.get("signals", [])
+        profit_signals = menu_profit_state.get("signals", [])
+
+        for sig in portfolio_signals[:2]:  # 최대 2개
+            signals.append({
+                "key": f"menu_portfolio_{sig}",
+                "status": menu_portfolio_state.get("status", "safe"),
+                "value": sig,
+                "note": ""
+            })
+
+        for sig in profit_signals[:2]:  # 최대 2개
+            signals.append({
+                "key": f"menu_profit_{sig}",
+                "status": menu_profit_state.get("status", "safe"),
+                "value": sig,
+                "note": ""
+            })
+
+        # Evidence
+        evidence = [
+            {
+                "title": "메뉴 포트폴리오 점수",
+                "value": f"{portfolio_score:.0f}점",
+                "delta": None,
+                "note": menu_portfolio_state.get("status", "safe")
+            },
+            {
+                "title": "메뉴 수익 구조 점수",
+                "value": f"{profit_score:.0f}점",
+                "delta": None,
+                "note": menu_profit_state.get("status", "safe")
+            }
+        ]
+
+        return menu_score, signals, evidence
+    except Exception as e:
+        debug["notes"].append(f"Menu score 계산 오류: {str(e)}")
+        return 50.0, [], []
+
+
+def _calculate_ingredient_score(inputs: StoreStateInputs, debug: Dict) -> tuple:
+    """
+    Ingredient Score 계산 (0-100)
+    설계 상태 기반
+    """
+    try:
+        debug["inputs_used"].append("ingredient_score")
+
+        design_state = inputs.design_state
+        ingredient_state = design_state.get("ingredient_structure", {})
+
+        ingredient_score = ingredient_state.get("score", 50)
+
+        # Signals
+        signals = []
+        ingredient_signals = ingredient_state.get("signals", [])
+        for sig in ingredient_signals[:3]:  # 최대 3개
+            signals.append({
+                "key": f"ingredient_{sig}",
+                "status": ingredient_state.get("status", "safe"),
+                "value": sig,
+                "note": ""
+            })
+
+        # Evidence
+        evidence = [
+            {
+                "title": "재료 구조 점수",
+                "value": f"{ingredient_score:.0f}점",
+                "delta": None,
+                "note": ingredient_state.get("status", "safe")
+            }
+        ]
+
+        return ingredient_score, signals, evidence
+    except Exception as e:
+        debug["notes"].append(f"Ingredient score 계산 오류: {str(e)}")
+        return 50.0, [], []
+
+
+def _classify_state(
+    revenue_score: float,
+    sales_score: float,
+    menu_score: float,
+    ingredient_score: float,
+    inputs: StoreStateInputs,
+    debug: Dict
+) -> tuple:
+    """
+    상태 분류
+
+    Returns:
+        (state_code, state_label, primary_reason)
+    """
+    try:
+        # 손익분기점 정보 재확인 (survival 판단용)
+        break_even = inputs.break_even
+        expected_sales = inputs.projected_sales_30d
+
+        ratio = (expected_sales / break_even) if break_even > 0 else 1.0
+
+        # 1. Survival
+        if (break_even > 0 and expected_sales > 0 and expected_sales < break_even) or revenue_score <= 35:
+            return (
+                "survival",
+                "생존선 복구",
+                f"예상 매출({expected_sales:,.0f}원)이 손익분기점({break_even:,.0f}원)보다 낮습니다."
+            )
+
+        # 2. Recovery
+        if sales_score <= 45:
+            return (
+                "recovery",
+                "회복 모드",
+                f"매출이 하락 중입니다(점수 {sales_score:.0f}점). 회복이 필요합니다."
+            )
+
+        # 3. Restructure
+        if (menu_score < 40 or ingredient_score < 40) and sales_score >= 50:
+            if menu_score < 40:
+                return (
+                    "restructure",
+                    "구조 개편",
+                    f"메뉴 구조 점수가 낮습니다({menu_score:.0f}점). 구조 개편이 필요합니다."
+                )
+            else:
+                return (
+                    "restructure",
+                    "구조 개편",
+                    f"재료 구조 점수가 낮습니다({ingredient_score:.0f}점). 구조 개편이 필요합니다."
+                )
+
+        # 4. Growth
+        return (
+            "growth",
+            "성장 최적화",
+            "전반적으로 안정적인 상태입니다. 성장 최적화에 집중할 수 있습니다."
+        )
+    except Exception as e:
+        debug["notes"].append(f"상태 분류 오류: {str(e)}")
+        return "unknown", "상태 미확인", "상태 분류 중 오류가 발생했습니다."
@@ -0,0 +1,256 @@
+"""
+일별 지표 시계열 (순수 계산, Streamlit 없음)
+
+- 매장별 일별 지표(매출, 방문자, 판매량)를 누적합(prefix sum)으로 보관
+- 구간 평균/합계/비교/이동평균/하락 시작점 질의는 O(1) (이동평균은 O(구간 길이))
+- 로드/캐시는 호출 측 담당: core.timeseries_engine (Streamlit), src.engine.sources (명시적 클라이언트)
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+
+KST = ZoneInfo("Asia/Seoul")
+
+# 공용 조회 구간 (오늘 기준 과거 N일). 요청 구간이 이 안이면 같은 시계열을 재사용
+DEFAULT_LOOKBACK_DAYS = 120
+
+METRIC_SALES = "total_sales"
+METRIC_VISITORS = "visitors"
+METRIC_QUANTITY = "qty"
+
+
+def _to_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return pd.to_datetime(value).date()
+
+
+class _Track:
+    """한 지표의 (정렬된 날짜, 값) + 누적합/누적개수 (NaN은 개수에서 제외)"""
+
+    __slots__ = ("ords", "values", "csum", "ccnt")
+
+    def __init__(self, ords: np.ndarray, values: np.ndarray):
+        self.ords = ords
+        self.values = values
+        valid = ~np.isnan(values)
+        self.csum = np.concatenate([[0.0], np.cumsum(np.where(valid, values, 0.0))])
+        self.ccnt = np.concatenate([[0], np.cumsum(valid.astype(np.int64))])
+
+    def span(self, start: date, end: date) -> Tuple[int, int]:
+        """[start, end] 구간의 행 인덱스 범위 [i0, i1)"""
+        i0 = int(np.searchsorted(self.ords, start.toordinal(), side="left"))
+        i1 = int(np.searchsorted(self.ords, end.toordinal(), side="right"))
+        return i0, max(i0, i1)
+
+    def rows_sum(self, i0: int, i1: int) -> float:
+        return float(self.csum[i1] - self.csum[i0])
+
+    def rows_count(self, i0: int, i1: int) -> int:
+        return int(self.ccnt[i1] - self.ccnt[i0])
+
+    def rows_mean(self, i0: int, i1: int) -> Optional[float]:
+        n = self.rows_count(i0, i1)
+        return self.rows_sum(i0, i1) / n if n > 0 else None
+
+
+def _empty_track() -> _Track:
+    return _Track(np.array([], dtype=np.int64), np.array([], dtype=float))
+
+
+def _pct(new: float, base: float) -> float:
+    return ((new - base) / base * 100) if base and base > 0 else 0
+
+
+class DailySeries:
+    """
+    매장 일별 지표 시계열 (불변)
+
+    - frame: 원본 일별 매출 DataFrame (date는 datetime.date, 날짜순)
+    - 지표: total_sales, visitors (일별 매출 행 기준), qty (메뉴 판매량 일합계, 선택)
+    """
+
+    def __init__(self, store_id: str, start: date, end: date, sales_df: pd.DataFrame, qty_df: Optional[pd.DataFrame] = None):
+        self.store_id = store_id
+        self.start = start
+        self.end = end
+        self.has_quantity = qty_df is not None
+
+        if sales_df is None or sales_df.empty or "date" not in sales_df.columns:
+            self.frame = pd.DataFrame(columns=["date", METRIC_SALES, METRIC_VISITORS])
+        else:
+            df = sales_df.copy()
+            df["date"] = pd.to_datetime(df["date"]).dt.date
+            self.frame = df.sort_values("date").reset_index(drop=True)
+
+        ords = np.array([d.toordinal() for d in self.frame["date"]], dtype=np.int64)
+        self._tracks: Dict[str, _Track] = {}
+        for metric in (METRIC_SALES, METRIC_VISITORS):
+            if metric in self.frame.columns:
+                values = pd.to_numeric(self.frame[metric], errors="coerce").to_numpy(dtype=float)
+                self._tracks[metric] = _Track(ords, values)
+            else:
+                self._tracks[metric] = _Track(ords, np.full(len(ords), np.nan))
+
+        if qty_df is not None and not qty_df.empty:
+            q = qty_df.copy()
+            q["date"] = pd.to_datetime(q["date"]).dt.date
+            daily = q.groupby("date")[METRIC_QUANTITY].sum().sort_index()
+            q_ords = np.array([d.toordinal() for d in daily.index], dtype=np.int64)
+            self._tracks[METRIC_QUANTITY] = _Track(q_ords, daily.to_numpy(dtype=float))
+        else:
+            self._tracks[METRIC_QUANTITY] = _empty_track()
+
+    @property
+    def empty(self) -> bool:
+        return self.frame.empty
+
+    def covers(self, start: date, end: date) -> bool:
+        return self.start <= start and end <= self.end
+
+    # ---------- 구간 질의 (O(1)) ----------
+
+    def count(self, start: date, end: date) -> int:
+        """구간 내 일별 매출 행 수"""
+        i0, i1 = self._tracks[METRIC_SALES].span(start, end)
+        return i1 - i0
+
+    def mean(self, metric: str, start: date, end: date) -> Optional[float]:
+        """구간 평균 (값이 있는 행 기준, 없으면 None)"""
+        track = self._tracks[metric]
+        return track.rows_mean(*track.span(start, end))
+
+    def total(self, metric: str, start: date, end: date) -> float:
+        """구간 합계"""
+        track = self._tracks[metric]
+        return track.rows_sum(*track.span(start, end))
+
+    def window_metrics(self, start: date, end: date) -> Dict:
+        """구간 평균 매출/방문자/객단가 (객단가 = 평균 매출 / 평균 방문자)"""
+        sales = self.mean(METRIC_SALES, start, end) or 0
+        visitors = self.mean(METRIC_VISITORS, start, end) or 0
+        return {
+            "sales_avg": sales,
+            "visitors_avg": visitors,
+            "avgp": (sales / visitors) if visitors > 0 else 0,
+        }
+
+    def compare(self, base_start: date, base_end: date, recent_start: date, recent_end: date) -> Optional[Dict]:
+        """
+        두 구간 비교 (baseline vs recent)
+
+        Returns:
+            {"baseline": {...}, "recent": {...}, "delta": {...}} 또는 None (어느 한쪽 데이터 없음)
+        """
+        if self.count(base_start, base_end) == 0 or self.count(recent_start, recent_end) == 0:
+            return None
+        baseline = self.window_metrics(base_start, base_end)
+        recent = self.window_metrics(recent_start, recent_end)
+        return {
+            "baseline": baseline,
+            "recent": recent,
+            "delta": {
+                "sales_delta_pct": _pct(recent["sales_avg"], baseline["sales_avg"]),
+                "visitors_delta_pct": _pct(recent["visitors_avg"], baseline["visitors_avg"]),
+                "avgp_delta_pct": _pct(recent["avgp"], baseline["avgp"]),
+            },
+        }
+
+    def daily_quantity_delta_pct(self, base_start: date, base_end: date, recent_start: date, recent_end: date) -> float:
+        """일평균 판매량 변화율 (달력 일수 기준)"""
+        base_days = (base_end - base_start).days + 1
+        recent_days = (recent_end - recent_start).days + 1
+        base_avg = self.total(METRIC_QUANTITY, base_start, base_end) / base_days if base_days > 0 else 0
+        recent_avg = self.total(METRIC_QUANTITY, recent_start, recent_end) / recent_days if recent_days > 0 else 0
+        return _pct(recent_avg, base_avg)
+
+    # ---------- 행 기준 질의 ----------
+
+    def slice(self, start: date, end: date) -> pd.DataFrame:
+        """구간 원본 행 (복사본)"""
+        i0, i1 = self._tracks[METRIC_SALES].span(start, end)
+        return self.frame.iloc[i0:i1].copy()
+
+    def head_tail_means(self, metric: str, start: date, end: date, k: int = 3) -> Tuple[Optional[float], Optional[float]]:
+        """구간 첫 k행 평균, 마지막 k행 평균"""
+        track = self._tracks[metric]
+        i0, i1 = track.span(start, end)
+        return track.rows_mean(i0, min(i1, i0 + k)), track.rows_mean(max(i0, i1 - k), i1)
+
+    def last_two_blocks(self, metric: str, start: date, end: date, k: int = 3) -> Tuple[Optional[float], Optional[float]]:
+        """구간 마지막 k행 직전 k행 평균, 마지막 k행 평균"""
+        track = self._tracks[metric]
+        i0, i1 = track.span(start, end)
+        return track.rows_mean(max(i0, i1 - 2 * k), max(i0, i1 - k)), track.rows_mean(max(i0, i1 - k), i1)
+
+    def rolling_rows_mean(self, metric: str, start: date, end: date, k: int = 3) -> np.ndarray:
+        """구간 내 행 기준 이동평균 (min_periods=1, 구간 밖 행은 포함하지 않음)"""
+        track = self._tracks[metric]
+        i0, i1 = track.span(start, end)
+        if i1 <= i0:
+            return np.array([], dtype=float)
+        idx = np.arange(i0, i1)
+        lo = np.maximum(i0, idx - k + 1)
+        cnt = track.ccnt[idx + 1] - track.ccnt[lo]
+        total = track.csum[idx + 1] - track.csum[lo]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(cnt > 0, total / np.maximum(cnt, 1), np.nan)
+
+    def rolling_days_mean(self, metric: str, start: date, end: date, days: int = 3) -> np.ndarray:
+        """구간 내 각 행 날짜 d에 대해 [d-days+1, d] 달력 구간 평균 (전체 시계열 기준)"""
+        track = self._tracks[metric]
+        i0, i1 = track.span(start, end)
+        if i1 <= i0:
+            return np.array([], dtype=float)
+        idx = np.arange(i0, i1)
+        lo = np.searchsorted(track.ords, track.ords[idx] - (days - 1), side="left")
+        cnt = track.ccnt[idx + 1] - track.ccnt[lo]
+        total = track.csum[idx + 1] - track.csum[lo]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(cnt > 0, total / np.maximum(cnt, 1), np.nan)
+
+    def dates(self, start: date, end: date) -> list:
+        i0, i1 = self._tracks[METRIC_SALES].span(start, end)
+        return list(self.frame["date"].iloc[i0:i1])
+
+    # ---------- 하락 시작점 ----------
+
+    def first_sustained_below(self, metric: str, start: date, end: date, threshold: float, run: int = 3, k: int = 3) -> Optional[date]:
+        """행 기준 이동평균(k)이 threshold 미만으로 run행 연속되는 첫 구간의 시작 날짜"""
+        rolling = self.rolling_rows_mean(metric, start, end, k)
+        if len(rolling) < run:
+            return None
+        below = np.nan_to_num(rolling, nan=np.inf) < threshold
+        runs = np.convolve(below.astype(int), np.ones(run, dtype=int), mode="valid")
+        hits = np.flatnonzero(runs == run)
+        if len(hits) == 0:
+            return None
+        return self.dates(start, end)[int(hits[0])]
+
+    def latest_window_below(self, metric: str, start: date, end: date, threshold: float, days: int = 3) -> Optional[date]:
+        """[d-days+1, d] 달력 평균이 threshold 미만인 가장 최근 날짜 d (구간 내)"""
+        rolling = self.rolling_days_mean(metric, start, end, days)
+        hits = np.flatnonzero(np.nan_to_num(rolling, nan=np.inf) < threshold)
+        if len(hits) == 0:
+            return None
+        return self.dates(start, end)[int(hits[-1])]
+
+
+def shared_window(start, end, today: date, lookback_days: int = DEFAULT_LOOKBACK_DAYS) -> Tuple[date, date]:
+    """
+    시계열 조회 구간 결정
+
+    요청 구간이 공용 구간(today - lookback_days ~ today) 안이면 공용 구간 전체, 아니면 요청 구간
+    """
+    start, end = _to_date(start), _to_date(end)
+    shared_start = today - timedelta(days=lookback_days)
+    if shared_start <= start and end <= today:
+        return shared_start, today
+    return start, end
@@ -0,0 +1,230 @@
+"""
+수익/비용 구조 What-if 시뮬레이션 (순수 계산, 벡터화)
+
+CostModel: 고정비(원) + 변동비율(소수)을 한 번 읽어 둔 작은 모델
+evaluate_grid: 매출 수준 × 가격 변화 × 원가율 변화 격자를 한 번에 계산 (ProfitSurface)
+Streamlit 화면은 src.design.what_if (st.cache_data 로더)를 사용, 슬라이더 조작은 메모리 조회만
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+FIXED_CATEGORIES = ('임차료', '인건비', '공과금')
+VARIABLE_CATEGORIES = ('재료비', '부가세&카드수수료')
+# 매출(가격)에 비례하는 변동비 (재료비는 판매량에 비례)
+REVENUE_LINKED_CATEGORIES = ('부가세&카드수수료',)
+
+
+@dataclass(frozen=True)
+class CostModel:
+    """
+    비용 구조 모델
+
+    fixed_costs / variable_ratio: 손익 계산에 쓰는 합계 (SSOT 엔진 값)
+    fixed_breakdown: 고정비 카테고리별 금액(원), variable_rates: 변동비 카테고리별 비율(소수)
+    """
+    fixed_costs: float = 0.0
+    variable_ratio: float = 0.0
+    fixed_breakdown: Dict[str, float] = field(default_factory=dict)
+    variable_rates: Dict[str, float] = field(default_factory=dict)
+
+    @classmethod
+    def from_expense_frame(
+        cls,
+        expense_df: Optional[pd.DataFrame],
+        fixed_costs: Optional[float] = None,
+        variable_ratio: Optional[float] = None,
+    ) -> "CostModel":
+        """
+        expense_structure(category, amount)에서 모델 생성
+
+        고정비 카테고리 amount는 원, 변동비 카테고리 amount는 % 단위
+        fixed_costs / variable_ratio를 주면 합계는 그 값을 사용 (정산 확정값 등)
+        """
+        fixed_breakdown = {cat: 0.0 for cat in FIXED_CATEGORIES}
+        variable_rates = {cat: 0.0 for cat in VARIABLE_CATEGORIES}
+        if expense_df is not None and not expense_df.empty and {'category', 'amount'}.issubset(expense_df.columns):
+            sums = pd.to_numeric(expense_df['amount'], errors='coerce').fillna(0).groupby(expense_df['category']).sum()
+            for cat in FIXED_CATEGORIES:
+                fixed_breakdown[cat] = float(sums.get(cat, 0.0))
+            for cat in VARIABLE_CATEGORIES:
+                variable_rates[cat] = float(sums.get(cat, 0.0)) / 100.0
+        return cls(
+            fixed_costs=float(fixed_costs) if fixed_costs is not None else sum(fixed_breakdown.values()),
+            variable_ratio=float(variable_ratio) if variable_ratio is not None else sum(variable_rates.values()),
+            fixed_breakdown=fixed_breakdown,
+            variable_rates=variable_rates,
+        )
+
+    @property
+    def break_even(self) -> float:
+        """손익분기점 매출 (고정비 > 0, 0 < 변동비율 < 1 일 때만, 아니면 0)"""
+        if self.fixed_costs > 0 and 0 < self.variable_ratio < 1:
+            return self.fixed_costs / (1.0 - self.variable_ratio)
+        return 0.0
+
+    @property
+    def revenue_linked_share(self) -> float:
+        """변동비 중 매출(가격)에 비례하는 몫 (0~1, 내역이 없으면 0)"""
+        total = sum(self.variable_rates.values())
+        if total <= 0:
+            return 0.0
+        return sum(self.variable_rates.get(cat, 0.0) for cat in REVENUE_LINKED_CATEGORIES) / total
+
+    def with_levers(self, fixed_costs: Optional[float] = None, variable_ratio: Optional[float] = None) -> "CostModel":
+        """레버 값으로 합계만 바꾼 모델"""
+        return replace(
+            self,
+            fixed_costs=self.fixed_costs if fixed_costs is None else float(fixed_costs),
+            variable_ratio=self.variable_ratio if variable_ratio is None else float(variable_ratio),
+        )
+
+    def profit_at(self, sales: float) -> Dict[str, float]:
+        """매출 1점 손익 (변동비 = 매출 × 변동비율)"""
+        variable_cost = sales * self.variable_ratio
+        total_cost = self.fixed_costs + variable_cost
+        profit = sales - total_cost
+        return {
+            'sales': sales,
+            'variable_cost': variable_cost,
+            'total_cost': total_cost,
+            'profit': profit,
+            'profit_rate': (profit / sales * 100) if sales > 0 else 0.0,
+        }
+
+
+def costs_by_sales(model: CostModel, sales_levels: Iterable[float]) -> Dict[str, np.ndarray]:
+    """
+    매출 수준별 5대 비용 (카테고리 내역 기준)
+
+    Returns:
+        {'임차료', '인건비', '공과금', '재료비', '부가세&카드수수료', '총비용', '영업이익'} → 매출 수준 배열
+    """
+    sales = np.asarray(list(sales_levels), dtype=float)
+    result = {cat: np.full(sales.shape, model.fixed_breakdown.get(cat, 0.0)) for cat in FIXED_CATEGORIES}
+    for cat in VARIABLE_CATEGORIES:
+        result[cat] = sales * model.variable_rates.get(cat, 0.0)
+    total = sum(result[cat] for cat in FIXED_CATEGORIES + VARIABLE_CATEGORIES)
+    result['총비용'] = total
+    result['영업이익'] = sales - total
+    return result
+
+
+@dataclass(frozen=True)
+class ProfitSurface:
+    """
+    시나리오 격자 결과 (축: 매출 수준 S × 가격 변화 P × 원가율 변화 C)
+
+    revenue / variable_cost / total_cost / profit: shape (S, P, C)
+    break_even: shape (P, C), 가격·원가율 조합별 손익분기 매출 (도달 불가면 inf)
+    """
+    sales_levels: np.ndarray
+    price_changes: np.ndarray
+    cost_rate_changes: np.ndarray
+    fixed_costs: float
+    revenue: np.ndarray
+    variable_cost: np.ndarray
+    total_cost: np.ndarray
+    profit: np.ndarray
+    break_even: np.ndarray
+
+    @staticmethod
+    def _nearest(axis: np.ndarray, value: float) -> int:
+        return int(np.abs(axis - value).argmin())
+
+    def lookup(self, sales: float, price_change: float = 0.0, cost_rate_change: float = 0.0) -> Dict[str, float]:
+        """가장 가까운 격자점의 손익 (슬라이더 조회용)"""
+        i = self._nearest(self.sales_levels, sales)
+        j = self._nearest(self.price_changes, price_change)
+        k = self._nearest(self.cost_rate_changes, cost_rate_change)
+        revenue = float(self.revenue[i, j, k])
+        profit = float(self.profit[i, j, k])
+        return {
+            'sales': float(self.sales_levels[i]),
+            'revenue': revenue,
+            'variable_cost': float(self.variable_cost[i, j, k]),
+            'total_cost': float(self.total_cost[i, j, k]),
+            'profit': profit,
+            'profit_rate': (profit / revenue * 100) if revenue > 0 else 0.0,
+            'break_even': float(self.break_even[j, k]),
+        }
+
+    def profit_curve(self, price_change: float = 0.0, cost_rate_change: float = 0.0) -> pd.DataFrame:
+        """가격·원가율 조합 1개의 매출 수준별 손익 (차트용, index=매출 수준)"""
+        j = self._nearest(self.price_changes, price_change)
+        k = self._nearest(self.cost_rate_changes, cost_rate_change)
+        return pd.DataFrame({
+            '매출': self.revenue[:, j, k],
+            '총비용': self.total_cost[:, j, k],
+            '영업이익': self.profit[:, j, k],
+        }, index=pd.Index(self.sales_levels, name='매출 수준'))
+
+    def profit_table(self, sales: float) -> pd.DataFrame:
+        """매출 수준 1개의 가격 변화(행) × 원가율 변화(열) 영업이익 표 (히트맵용)"""
+        i = self._nearest(self.sales_levels, sales)
+        return pd.DataFrame(
+            self.profit[i],
+            index=pd.Index(self.price_changes, name='가격 변화(%)'),
+            columns=pd.Index(self.cost_rate_changes, name='원가율 변화(%)'),
+        )
+
+
+def evaluate_grid(
+    model: CostModel,
+    sales_levels: Iterable[float],
+    price_changes: Iterable[float] = (0.0,),
+    cost_rate_changes: Iterable[float] = (0.0,),
+) -> ProfitSurface:
+    """
+    시나리오 격자 일괄 평가 (numpy 브로드캐스트, I/O 없음)
+
+    - 매출 수준 S: 현재 가격 기준 매출 (판매량 × 현재 가격)
+    - 가격 변화 p(%): 판매량 그대로 가격만 변경 → 매출 R = S × (1 + p)
+    - 원가율 변화 c(%): 변동비율에 (1 + c) 배
+    - 변동비: 재료비 몫은 판매량(S)에, 수수료 몫은 매출(R)에 비례
+    p = c = 0 이면 기존 화면 공식(고정비 + 매출 × 변동비율)과 같음
+    """
+    s = np.asarray(list(sales_levels), dtype=float)[:, None, None]
+    p = np.asarray(list(price_changes), dtype=float)[None, :, None] / 100.0
+    c = np.asarray(list(cost_rate_changes), dtype=float)[None, None, :] / 100.0
+
+    rate = model.variable_ratio * (1.0 + c)
+    linked = model.revenue_linked_share
+    price_factor = 1.0 + p
+    # 매출 1원(현재 가격 기준)당 변동비
+    unit_variable = rate * ((1.0 - linked) + linked * price_factor)
+
+    revenue = s * price_factor
+    variable_cost = s * unit_variable
+    total_cost = model.fixed_costs + variable_cost
+    profit = revenue - total_cost
+
+    margin = (price_factor - unit_variable)[0]  # (P, C): 현재 가격 기준 매출 1원당 공헌이익
+    with np.errstate(divide='ignore', invalid='ignore'):
+        break_even = np.where(margin > 0, model.fixed_costs / margin * price_factor[0], np.inf)
+    if model.fixed_costs <= 0:
+        break_even = np.zeros_like(break_even)
+
+    shape = np.broadcast_shapes(s.shape, p.shape, c.shape)
+    return ProfitSurface(
+        sales_levels=s[:, 0, 0],
+        price_changes=p[0, :, 0] * 100.0,
+        cost_rate_changes=c[0, 0, :] * 100.0,
+        fixed_costs=model.fixed_costs,
+        revenue=np.broadcast_to(revenue, shape),
+        variable_cost=np.broadcast_to(variable_cost, shape),
+        total_cost=np.broadcast_to(total_cost, shape),
+        profit=np.broadcast_to(profit, shape),
+        break_even=np.broadcast_to(break_even, shape[1:]),
+    )
+
+
+def sales_grid(center: float, span: float = 0.5, steps: int = 41) -> np.ndarray:
+    """center ± span 비율 구간의 매출 수준 격자 (음수 제외)"""
+    if center <= 0:
+        return np.zeros(1)
+    return np.clip(np.linspace(center * (1 - span), center * (1 + span), steps), 0, None)
@@ -0,0 +1,102 @@
+"""
+체크리스트 답변 저장소 (세션 1개, 고정 크기 배열)
+
+- 답변: 문항 순번(QUESTION_KEYS) 인덱스 int8 배열 (-1 미응답, 0/1/2 = no/maybe/yes)
+- 변경: dirty 비트맵 → 저장 시 dirty 문항만 1회 일괄 upsert (연속 클릭은 debounce로 합침)
+- 진행률/영역별 개수는 배열 연산 (session_state 순회 없음)
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.health_check.questions_bank import CATEGORIES_ORDER, QUESTIONS
+
+RAW_VALUES = ("no", "maybe", "yes")
+_RAW_CODE = {raw: code for code, raw in enumerate(RAW_VALUES)}
+
+QUESTION_KEYS: Tuple[Tuple[str, str], ...] = tuple(
+    (category, q["code"]) for category in CATEGORIES_ORDER for q in QUESTIONS.get(category, [])
+)
+QUESTION_INDEX: Dict[Tuple[str, str], int] = {key: i for i, key in enumerate(QUESTION_KEYS)}
+QUESTION_CATEGORY = np.array([CATEGORIES_ORDER.index(category) for category, _ in QUESTION_KEYS], dtype=np.int64)
+CATEGORY_TOTALS = np.bincount(QUESTION_CATEGORY, minlength=len(CATEGORIES_ORDER))
+
+
+@dataclass
+class AnswerStore:
+    """
+    체크리스트 답변 상태
+
+    values[i]: QUESTION_KEYS[i] 답변 코드 (-1 미응답), dirty[i]: 저장 안 된 변경
+    last_edit_at / last_save_at: time.time() 기준 (debounce 판단용)
+    """
+    session_id: str
+    values: np.ndarray = field(default_factory=lambda: np.full(len(QUESTION_KEYS), -1, dtype=np.int8))
+    dirty: np.ndarray = field(default_factory=lambda: np.zeros(len(QUESTION_KEYS), dtype=bool))
+    last_edit_at: float = 0.0
+    last_save_at: Optional[float] = None
+
+    @classmethod
+    def from_rows(cls, session_id: str, rows: Iterable[Dict]) -> "AnswerStore":
+        """DB 답변 행(category, question_code, raw_value)에서 생성 (dirty 없음)"""
+        store = cls(session_id)
+        for row in rows:
+            i = QUESTION_INDEX.get((row.get("category"), row.get("question_code")))
+            code = _RAW_CODE.get(row.get("raw_value"))
+            if i is not None and code is not None:
+                store.values[i] = code
+        return store
+
+    def get(self, category: str, question_code: str) -> Optional[str]:
+        i = QUESTION_INDEX.get((category, question_code))
+        if i is None or self.values[i] < 0:
+            return None
+        return RAW_VALUES[self.values[i]]
+
+    def set(self, category: str, question_code: str, raw_value: str, now: Optional[float] = None) -> bool:
+        """답변 변경 (값이 같거나 알 수 없는 문항이면 False)"""
+        i = QUESTION_INDEX.get((category, question_code))
+        code = _RAW_CODE.get(raw_value)
+        if i is None or code is None or self.values[i] == code:
+            return False
+        self.values[i] = code
+        self.dirty[i] = True
+        self.last_edit_at = now if now is not None else time.time()
+        return True
+
+    @property
+    def answered_count(self) -> int:
+        return int(np.count_nonzero(self.values >= 0))
+
+    @property
+    def dirty_count(self) -> int:
+        return int(np.count_nonzero(self.dirty))
+
+    def category_answered(self) -> Dict[str, int]:
+        """영역별 답변 수 (CATEGORIES_ORDER 순서)"""
+        counts = np.bincount(QUESTION_CATEGORY[self.values >= 0], minlength=len(CATEGORIES_ORDER))
+        return dict(zip(CATEGORIES_ORDER, counts.tolist()))
+
+    def is_due(self, debounce: float, now: Optional[float] = None) -> bool:
+        """dirty가 있고 마지막 변경 후 debounce초가 지났으면 True"""
+        if not self.dirty.any():
+            return False
+        now = now if now is not None else time.time()
+        return now - self.last_edit_at >= debounce
+
+    def dirty_rows(self) -> Tuple[np.ndarray, List[Dict[str, str]]]:
+        """(dirty 인덱스, upsert 행 리스트)"""
+        indices = np.flatnonzero(self.dirty & (self.values >= 0))
+        rows = [
+            {"category": QUESTION_KEYS[i][0], "question_code": QUESTION_KEYS[i][1], "raw_value": RAW_VALUES[self.values[i]]}
+            for i in indices.tolist()
+        ]
+        return indices, rows
+
+    def mark_saved(self, indices: np.ndarray, now: Optional[float] = None) -> None:
+        self.dirty[indices] = False
+        self.last_save_at = now if now is not None else time.time()
@@ -0,0 +1,200 @@
+"""
+건강검진 프로필 캐시 (HOME / 전략 / 분석 요약 공용)
+
+- 키: (store_id, 최신 완료 세션 id). 완료된 세션의 결과/판독은 바뀌지 않으므로 세션 id가 곧 버전
+- 조회: "최신 완료 세션 id" 경량 조회 1회(st.cache_data, health_check 버전 토큰) → 번들 캐시 조회
+- 채우기: finalize_health_session이 저장한 값으로 바로 prime (완료 직후 첫 조회도 DB 왕복 없음)
+- 저장소: src.engine.cache 백엔드 (프로세스 내 LRU, 워커 간 공유 시 DiskCache로 교체 가능)
+"""
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from zoneinfo import ZoneInfo
+
+import streamlit as st
+
+from src.auth import get_supabase_client
+from src.engine.cache import get_cache_backend, make_key
+from src.utils.cache_tokens import get_data_version
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_NAMESPACE = "health_check.bundle"
+# 완료된 세션은 불변 → 길게 (LRU가 오래된 항목 정리)
+BUNDLE_TTL = 24 * 3600
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_latest_completed_session(store_id: str, v_health: int) -> Optional[Dict]:
+    """최신 완료 세션 (id, completed_at)만 조회 (캐시됨, version_token 기반)"""
+    supabase = get_supabase_client()
+    if not supabase:
+        return None
+    result = supabase.table("health_check_sessions")\
+        .select("id, completed_at")\
+        .eq("store_id", store_id)\
+        .not_.is_("completed_at", "null")\
+        .order("completed_at", desc=True)\
+        .limit(1)\
+        .execute()
+    return result.data[0] if result.data else None
+
+
+def get_latest_completed_session(store_id: str) -> Optional[Dict]:
+    """최신 완료 세션 {"id", "completed_at"} 또는 None"""
+    if not store_id:
+        return None
+    try:
+        return _load_latest_completed_session(store_id, get_data_version("health_check"))
+    except Exception as e:
+        logger.warning(f"get_latest_completed_session: Error - {e}")
+        return None
+
+
+def _parse_diagnosis(value) -> Optional[Dict]:
+    """diagnosis_json (JSONB dict 또는 문자열) → dict"""
+    if not value:
+        return None
+    if isinstance(value, str):
+        return json.loads(value)
+    return value
+
+
+def _generate_diagnosis(supabase, store_id: str, session_id: str, results: List[Dict]) -> Optional[Dict]:
+    """판독 결과가 없는 세션: 점수 결과로 판독 실행 후 저장 (다음 번에는 재사용)"""
+    axis_scores = {
+        r["category"]: float(r["score_avg"])
+        for r in results
+        if r.get("category") and r.get("score_avg") is not None
+    }
+    if not axis_scores:
+        logger.warning("health_cache: No axis scores found")
+        return None
+
+    from src.health_check.health_diagnosis_engine import diagnose_health_check
+    logger.info(f"health_cache: Generating diagnosis for session {session_id}")
+    diagnosis = diagnose_health_check(
+        session_id=session_id,
+        store_id=store_id,
+        axis_scores=axis_scores,
+        axis_raw=None,
+        meta=None
+    )
+    try:
+        supabase.table("health_check_sessions").update({
+            "diagnosis_json": json.dumps(diagnosis, ensure_ascii=False)
+        }).eq("id", session_id).execute()
+    except Exception as e:
+        logger.warning(f"health_cache: Failed to save diagnosis_json: {e}")
+    return diagnosis
+
+
+def _fetch_bundle(store_id: str, session_id: str) -> Optional[Dict]:
+    """세션 행 + 카테고리 결과 + 판독 (캐시 미스 시 1회)"""
+    supabase = get_supabase_client()
+    if not supabase:
+        return None
+    session_result = supabase.table("health_check_sessions").select("*").eq("id", session_id).execute()
+    if not session_result.data:
+        return None
+    session = session_result.data[0]
+    results_result = supabase.table("health_check_results").select("*").eq("session_id", session_id).execute()
+    results = results_result.data or []
+
+    diagnosis = _parse_diagnosis(session.get("diagnosis_json"))
+    if diagnosis is None and results:
+        diagnosis = _generate_diagnosis(supabase, store_id, session_id, results)
+    return {"session": session, "results": results, "diagnosis": diagnosis}
+
+
+def prime_health_bundle(store_id: str, session_id: str, session: Dict, results: List[Dict], diagnosis: Optional[Dict]) -> None:
+    """finalize 직후 저장한 값으로 캐시 채우기 + 최신 세션 조회 무효화"""
+    try:
+        bundle = {"session": session, "results": results, "diagnosis": diagnosis}
+        get_cache_backend().set(make_key(BUNDLE_NAMESPACE, store_id, session_id), bundle, BUNDLE_TTL)
+        from src.utils.cache_tokens import bump_data_version
+        bump_data_version("health_check")
+        _load_latest_completed_session.clear()
+    except Exception as e:
+        logger.warning(f"prime_health_bundle: Error - {e}")
+
+
+def load_health_bundle(store_id: str) -> Optional[Dict]:
+    """
+    최신 완료 검진 번들
+
+    Returns:
+        {"session": 세션 행, "results": 카테고리 결과 리스트, "diagnosis": 판독 dict 또는 None} 또는 None
+    """
+    latest = get_latest_completed_session(store_id)
+    if not latest:
+        return None
+    session_id = latest["id"]
+    key = make_key(BUNDLE_NAMESPACE, store_id, session_id)
+    backend = get_cache_backend()
+    hit, bundle = backend.get(key)
+    if hit:
+        return bundle
+    try:
+        bundle = _fetch_bundle(store_id, session_id)
+    except Exception as e:
+        logger.error(f"load_health_bundle: Error - {e}")
+        return None
+    if bundle is not None:
+        backend.set(key, bundle, BUNDLE_TTL)
+    return bundle
+
+
+def get_health_diag(store_id: str) -> Optional[Dict]:
+    """최신 완료 검진 판독 결과 (없으면 None)"""
+    bundle = load_health_bundle(store_id)
+    return bundle["diagnosis"] if bundle else None
+
+
+def _age_days(completed_at: Optional[str]) -> int:
+    if not completed_at:
+        return 0
+    try:
+        completed_dt = datetime.fromisoformat(completed_at.replace('Z', '+00:00'))
+        now = datetime.now(ZoneInfo("Asia/Seoul"))
+        return (now - completed_dt.replace(tzinfo=ZoneInfo("Asia/Seoul"))).days
+    except Exception:
+        return 999  # 파싱 실패 시 오래된 것으로 간주
+
+
+def build_health_profile(bundle: Optional[Dict], lookback_days: int = 60) -> Optional[Dict]:
+    """번들 → 전략 엔진용 프로필 (lookback_days 밖이거나 결과 없으면 None)"""
+    if not bundle or not bundle.get("results"):
+        return None
+    session = bundle["session"]
+    completed_at = session.get('completed_at')
+    if completed_at:
+        try:
+            completed_dt = datetime.fromisoformat(completed_at.replace('Z', '+00:00'))
+            if completed_dt < datetime.now(ZoneInfo("Asia/Seoul")) - timedelta(days=lookback_days):
+                return None
+        except Exception:
+            pass
+
+    category_scores = {}
+    risk_levels = {}
+    for r in bundle["results"]:
+        category = r['category']
+        category_scores[category] = float(r.get('score_avg', 0))
+        risk_levels[category] = r.get('risk_level', 'unknown')
+
+    ranked = sorted(category_scores.items(), key=lambda x: x[1])
+    return {
+        "exists": True,
+        "session_id": session.get('id'),
+        "completed_at": completed_at,
+        "overall_score": float(session.get('overall_score', 0)),
+        "overall_grade": session.get('overall_grade', 'E'),
+        "main_bottleneck": session.get('main_bottleneck'),
+        "category_scores": category_scores,
+        "risk_levels": risk_levels,
+        "risk_top": [cat for cat, _ in ranked[:3]],  # score 낮은 순 3개
+        "strength_top": [cat for cat, _ in sorted(category_scores.items(), key=lambda x: x[1], reverse=True)[:2]],
+        "age_days": _age_days(completed_at),
+    }
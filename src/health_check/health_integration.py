@@ -5,13 +5,7 @@ HOME/전략 엔진에서 검진 데이터를 활용하기 위한 헬퍼 함수
 
 import logging
 from typing import Dict, Optional, List
-from src.health_check.storage import (
-    get_health_diagnosis,
-    get_health_results,
-    get_health_session
-)
-from src.health_check.health_diagnosis_engine import diagnose_health_check
-from src.auth import get_supabase_client, get_current_store_id
+from src.health_check.health_cache import get_health_diag
 
 logger = logging.getLogger(__name__)
 
@@ -21,9 +15,9 @@ def get_health_diag_for_home(store_id: str) -> Optional[Dict]:
     HOME에서 사용할 최신 완료 검진 판독 데이터 로드
     
     Process:
-    1. 최신 완료 검진 세션 조회
-    2. 이미 DB에 판독 결과가 있으면 그것을 반환
-    3. 없으면 점수 결과를 로드하여 판독 실행 후 저장
+    1. 최신 완료 검진 세션 id 경량 조회 (캐시)
+    2. (store_id, session_id) 번들 캐시에서 판독 결과 반환 (src.health_check.health_cache)
+    3. 캐시/DB 모두 판독 결과가 없으면 점수 결과로 판독 실행 후 저장
     
     Args:
         store_id: 매장 ID
@@ -37,77 +31,7 @@ def get_health_diag_for_home(store_id: str) -> Optional[Dict]:
         } or None
     """
     try:
-        supabase = get_supabase_client()
-        if not supabase:
-            logger.debug("get_health_diag_for_home: Supabase client not available")
-            return None
-        
-        # 최신 완료 검진 세션 조회
-        result = supabase.table("health_check_sessions").select(
-            "id, completed_at, overall_score, overall_grade, diagnosis_json"
-        ).eq("store_id", store_id).not_.is_("completed_at", "null").order(
-            "completed_at", desc=True
-        ).limit(1).execute()
-        
-        if not result.data:
-            logger.debug("get_health_diag_for_home: No completed health check found")
-            return None
-        
-        from src.ui_helpers import safe_resp_first_data
-        session = safe_resp_first_data(result)
-        session_id = session["id"]
-        
-        # 이미 판독 결과가 있으면 반환
-        diagnosis_json = session.get("diagnosis_json")
-        if diagnosis_json:
-            # JSONB가 dict로 반환되는 경우와 문자열인 경우 모두 처리
-            if isinstance(diagnosis_json, dict):
-                return diagnosis_json
-            elif isinstance(diagnosis_json, str):
-                import json
-                return json.loads(diagnosis_json)
-        
-        # 판독 결과가 없으면 생성
-        logger.info(f"get_health_diag_for_home: Generating diagnosis for session {session_id}")
-        
-        # 검진 결과 로드
-        results = get_health_results(session_id)
-        if not results:
-            logger.warning("get_health_diag_for_home: No health results found")
-            return None
-        
-        # axis_scores 구성
-        axis_scores = {}
-        for r in results:
-            category = r.get("category")
-            score_avg = r.get("score_avg")
-            if category and score_avg is not None:
-                axis_scores[category] = float(score_avg)
-        
-        if not axis_scores:
-            logger.warning("get_health_diag_for_home: No axis scores found")
-            return None
-        
-        # 판독 실행
-        diagnosis = diagnose_health_check(
-            session_id=session_id,
-            store_id=store_id,
-            axis_scores=axis_scores,
-            axis_raw=None,
-            meta=None
-        )
-        
-        # DB에 저장 (다음 번에는 재사용)
-        try:
-            import json
-            supabase.table("health_check_sessions").update({
-                "diagnosis_json": json.dumps(diagnosis, ensure_ascii=False)
-            }).eq("id", session_id).execute()
-        except Exception as e:
-            logger.warning(f"get_health_diag_for_home: Failed to save diagnosis_json: {e}")
-        
-        return diagnosis
-    
+        return get_health_diag(store_id)
     except Exception as e:
         logger.error(f"get_health_diag_for_home: Error - {e}")
         return None
@@ -4,10 +4,7 @@
 """
 import logging
 from typing import Dict, Optional
-from datetime import datetime, timedelta
-from zoneinfo import ZoneInfo
-from src.auth import get_supabase_client
-from src.health_check.storage import get_health_session, get_health_results
+from src.health_check.health_cache import build_health_profile, load_health_bundle
 
 logger = logging.getLogger(__name__)
 
@@ -36,85 +33,9 @@ def load_latest_health_profile(store_id: str, lookback_days: int = 60) -> Dict:
         }
     """
     try:
-        supabase = get_supabase_client()
-        if not supabase:
-            return _get_empty_profile()
-        
-        # 최근 완료된 세션 조회
-        cutoff_date = (datetime.now(ZoneInfo("Asia/Seoul")) - timedelta(days=lookback_days)).isoformat()
-        
-        result = supabase.table("health_check_sessions").select("*").eq(
-            "store_id", store_id
-        ).not_.is_("completed_at", "null").gte(
-            "completed_at", cutoff_date
-        ).order("completed_at", desc=True).limit(1).execute()
-        
-        if not result.data or len(result.data) == 0:
-            return _get_empty_profile()
-        
-        from src.ui_helpers import safe_resp_first_data
-        session = safe_resp_first_data(result)
-        session_id = session['id']
-        completed_at = session.get('completed_at')
-        
-        # 결과 조회
-        results = get_health_results(session_id)
-        if not results:
-            return _get_empty_profile()
-        
-        # 카테고리별 점수/리스크 정리
-        category_scores = {}
-        risk_levels = {}
-        
-        for r in results:
-            category = r['category']
-            category_scores[category] = float(r.get('score_avg', 0))
-            risk_levels[category] = r.get('risk_level', 'unknown')
-        
-        # risk_top: 점수가 낮은 순 3개
-        if category_scores:
-            risk_top = sorted(
-                category_scores.items(),
-                key=lambda x: x[1]
-            )[:3]
-            risk_top = [cat for cat, _ in risk_top]
-        else:
-            risk_top = []
-        
-        # strength_top: 점수가 높은 순 2개
-        if category_scores:
-            strength_top = sorted(
-                category_scores.items(),
-                key=lambda x: x[1],
-                reverse=True
-            )[:2]
-            strength_top = [cat for cat, _ in strength_top]
-        else:
-            strength_top = []
-        
-        # age_days 계산
-        age_days = 0
-        if completed_at:
-            try:
-                completed_dt = datetime.fromisoformat(completed_at.replace('Z', '+00:00'))
-                now = datetime.now(ZoneInfo("Asia/Seoul"))
-                age_days = (now - completed_dt.replace(tzinfo=ZoneInfo("Asia/Seoul"))).days
-            except Exception:
-                age_days = 999  # 파싱 실패 시 오래된 것으로 간주
-        
-        return {
-            "exists": True,
-            "session_id": session_id,
-            "completed_at": completed_at,
-            "overall_score": float(session.get('overall_score', 0)),
-            "overall_grade": session.get('overall_grade', 'E'),
-            "main_bottleneck": session.get('main_bottleneck'),
-            "category_scores": category_scores,
-            "risk_levels": risk_levels,
-            "risk_top": risk_top,
-            "strength_top": strength_top,
-            "age_days": age_days
-        }
+        # 최신 완료 세션 번들 (store_id, session_id 캐시, HOME 판독과 공유)
+        profile = build_health_profile(load_health_bundle(store_id), lookback_days)
+        return profile or _get_empty_profile()
     
     except Exception as e:
         logger.error(f"load_latest_health_profile: Error - {e}")
@@ -3,7 +3,14 @@
 """
 
 from typing import Dict, List, Optional
-from src.health_check.questions_bank import CATEGORIES_ORDER
+
+import numpy as np
+import pandas as pd
+
+from src.health_check.questions_bank import CATEGORIES_ORDER, QUESTIONS
+
+# question_code → 카테고리 내 문항 순서 (플래그 정렬용)
+QUESTION_ORDINAL = {q["code"]: idx for questions in QUESTIONS.values() for idx, q in enumerate(questions)}
 
 
 def score_from_raw(raw_value: str) -> int:
@@ -220,3 +227,67 @@ def compute_risk_flags(answers: List[int], category: str) -> List[str]:
                 flags.append(question_code)
     
     return flags
+
+
+def compute_session_results_from_answers(answers: List[Dict]) -> Dict:
+    """
+    답변 행 → 세션 결과 + 강점/리스크 플래그 + 판독용 raw 값 (전 카테고리 한 번에 계산)
+    
+    Args:
+        answers: [{"category", "question_code", "score", "raw_value"}, ...] (순서 무관)
+    
+    Returns:
+        compute_session_results 결과 +
+        'flags': {category: {'strength_flags': [...], 'risk_flags': [...]}} (문항 순서, score 3 / 0)
+        'axis_raw': {category: [raw_value, ...]} (question_code 순서)
+    
+    Note:
+        - 플래그는 question_code 기준 (문항 위치로 추정하지 않음)
+    """
+    empty = compute_session_results({})
+    if not answers:
+        return {**empty, 'flags': {}, 'axis_raw': {}}
+    
+    df = pd.DataFrame(answers)
+    df['score'] = pd.to_numeric(df['score'], errors='coerce').fillna(0)
+    
+    # 판독용 raw 값 (question_code 순서)
+    axis_raw: Dict[str, List] = {}
+    if 'raw_value' in df.columns:
+        by_code = df.sort_values('question_code', kind='stable')
+        for category, raw in zip(by_code['category'], by_code['raw_value']):
+            axis_raw.setdefault(category, []).append(raw)
+    
+    scored = df[df['category'].isin(CATEGORIES_ORDER)]
+    if scored.empty:
+        return {**empty, 'flags': {}, 'axis_raw': axis_raw}
+    
+    grouped = scored['score'].groupby(scored['category'])
+    totals = grouped.sum().reindex(CATEGORIES_ORDER).dropna()
+    counts = grouped.count().reindex(totals.index)
+    score_avg = totals / (counts * 3) * 100.0
+    risk = np.select([score_avg >= 75, score_avg >= 45], ['green', 'yellow'], 'red')
+    per_category = {
+        category: {'score_avg': round(float(avg), 2), 'risk_level': str(level)}
+        for category, avg, level in zip(score_avg.index, score_avg.to_numpy(), risk)
+    }
+    
+    # 전체 점수 (카테고리별 평균의 평균), 병목 (최저 점수, 동점 시 CATEGORIES_ORDER 앞쪽)
+    overall_score = sum(score_avg.tolist()) / len(score_avg)
+    
+    # 강점/리스크 플래그
+    flags = {category: {'strength_flags': [], 'risk_flags': []} for category in per_category}
+    ordinal = scored['question_code'].map(QUESTION_ORDINAL)
+    flagged = scored.assign(_ordinal=ordinal)[ordinal.notna() & scored['score'].isin([0, 3])]
+    flagged = flagged.sort_values(['category', '_ordinal'], kind='stable')
+    for category, code, score in zip(flagged['category'], flagged['question_code'], flagged['score']):
+        flags[category]['strength_flags' if score == 3 else 'risk_flags'].append(code)
+    
+    return {
+        'per_category': per_category,
+        'overall_score': round(overall_score, 2),
+        'overall_grade': overall_grade(overall_score),
+        'main_bottleneck': score_avg.idxmin(),
+        'flags': flags,
+        'axis_raw': axis_raw,
+    }
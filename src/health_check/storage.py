@@ -10,15 +10,19 @@ from src.auth import get_supabase_client, get_current_store_id
 from src.health_check.scoring import (
     score_from_raw,
     calc_category_score,
-    compute_session_results,
-    compute_strength_flags,
-    compute_risk_flags
+    compute_session_results_from_answers
 )
 from src.health_check.questions_bank import CATEGORIES_ORDER, QUESTIONS
 from src.health_check.health_diagnosis_engine import diagnose_health_check
+from src.health_check.health_cache import prime_health_bundle
+from src.utils.rpc_errors import is_missing_function_error
 
 logger = logging.getLogger(__name__)
 
+FINALIZE_RPC = "finalize_health_session_transaction"
+# 트랜잭션 RPC 사용 가능 여부 (None: 미확인, False: 미설치 → 일괄 upsert + update 2회로 저장)
+_finalize_rpc_available: Optional[bool] = None
+
 
 def create_health_session(store_id: str, check_type: str = 'ad-hoc') -> tuple[Optional[str], Optional[str]]:
     """
@@ -199,6 +203,61 @@ def upsert_health_answer(
         return False
 
 
+def _save_finalized_session(
+    supabase,
+    store_id: str,
+    session_id: str,
+    result_rows: List[Dict],
+    session_update: Dict,
+    diagnosis: Optional[Dict]
+) -> None:
+    """
+    완료 결과 저장 (트랜잭션 RPC 1회, 미설치 시 결과 일괄 upsert + 세션 update)
+    
+    RPC: sql/finalize_health_session_transaction.sql
+    """
+    global _finalize_rpc_available
+    if _finalize_rpc_available is not False:
+        try:
+            supabase.rpc(FINALIZE_RPC, {
+                "p_store_id": store_id,
+                "p_session_id": session_id,
+                "p_results": [
+                    {k: row[k] for k in ("category", "score_avg", "risk_level", "strength_flags", "risk_flags", "structure_summary")}
+                    for row in result_rows
+                ],
+                "p_completed_at": session_update["completed_at"],
+                "p_overall_score": session_update["overall_score"],
+                "p_overall_grade": session_update["overall_grade"],
+                "p_main_bottleneck": session_update["main_bottleneck"],
+                "p_diagnosis": diagnosis,
+            }).execute()
+            _finalize_rpc_available = True
+            return
+        except Exception as e:
+            # 함수 미설치(PGRST202 등)일 때만 대체 경로. 타임아웃/5xx 등은 실제 저장 오류로 전파
+            # (대체 경로는 두 번 나눠 쓰므로 일시 오류에 쓰면 절반만 저장될 수 있음)
+            if not is_missing_function_error(e):
+                raise
+            _finalize_rpc_available = False
+            logger.warning(f"finalize_health_session: {FINALIZE_RPC} RPC unavailable, using bulk upsert ({e})")
+    
+    if result_rows:
+        supabase.table("health_check_results")\
+            .upsert(result_rows, on_conflict="store_id,session_id,category")\
+            .execute()
+    
+    update_data = dict(session_update)
+    if diagnosis is not None:
+        import json
+        # 판독 결과를 JSON으로 저장 (diagnosis_json 컬럼이 있으면 사용, 없으면 무시)
+        try:
+            update_data["diagnosis_json"] = json.dumps(diagnosis, ensure_ascii=False)
+        except Exception as e:
+            logger.warning(f"diagnosis_json 저장 실패 (컬럼이 없을 수 있음): {e}")
+    supabase.table("health_check_sessions").update(update_data).eq("id", session_id).execute()
+
+
 def finalize_health_session(store_id: str, session_id: str) -> bool:
     """
     건강검진 세션 완료 처리 및 결과 계산/저장
@@ -211,11 +270,11 @@ def finalize_health_session(store_id: str, session_id: str) -> bool:
         성공 여부
     
     Process:
-        1. answers 테이블에서 모든 답변 로드
-        2. 카테고리별로 그룹화하여 점수 계산
-        3. compute_session_results로 전체 결과 계산
-        4. health_check_results 테이블에 카테고리별 결과 저장
-        5. health_check_sessions 테이블에 overall_score/grade/main_bottleneck 업데이트
+        1. answers 테이블에서 모든 답변 1회 로드 (점수 + raw 값)
+        2. 전 카테고리 점수/리스크/병목/강점·리스크 플래그 일괄 계산 (compute_session_results_from_answers)
+        3. 판독 엔진 실행 (경영 해석)
+        4. 카테고리별 결과 + 세션 완료/판독 결과를 한 번에 저장 (트랜잭션 RPC)
+        5. 검진 프로필 캐시(health_cache)에 저장한 값으로 prime
     """
     try:
         supabase = get_supabase_client()
@@ -223,102 +282,63 @@ def finalize_health_session(store_id: str, session_id: str) -> bool:
             logger.error("finalize_health_session: Supabase client not available")
             return False
         
-        # 1. 답변 로드 (question_code 순서로 정렬)
-        answers_result = supabase.table("health_check_answers").select(
-            "category, question_code, score"
-        ).eq("store_id", store_id).eq("session_id", session_id).order("question_code").execute()
-        
-        if not answers_result.data:
+        # 1. 답변 로드 (1회)
+        answers_result = supabase.table("health_check_answers")\
+            .select("category, question_code, score, raw_value")\
+            .eq("store_id", store_id)\
+            .eq("session_id", session_id)\
+            .order("question_code")\
+            .execute()
+        answers = answers_result.data or []
+        
+        # 2. 결과 계산 (답변이 없어도 세션은 완료 처리: graceful fallback)
+        results = compute_session_results_from_answers(answers)
+        diagnosis = None
+        if answers:
+            # 3. 판독 실행
+            axis_scores = {
+                cat: data['score_avg']
+                for cat, data in results['per_category'].items()
+            }
+            diagnosis = diagnose_health_check(
+                session_id=session_id,
+                store_id=store_id,
+                axis_scores=axis_scores,
+                axis_raw=results['axis_raw'] or None,
+                meta=None
+            )
+        else:
             logger.warning(f"finalize_health_session: No answers found for session {session_id}")
-            # 답변이 없어도 세션은 완료 처리 (graceful fallback)
-            supabase.table("health_check_sessions").update({
-                "completed_at": datetime.utcnow().isoformat() + "Z",
-                "overall_score": 0.0,
-                "overall_grade": "E",
-                "main_bottleneck": None
-            }).eq("id", session_id).execute()
-            return True
         
-        # 2. 카테고리별로 그룹화 (question_code 순서 유지)
-        answers_by_category: Dict[str, List[int]] = {}
-        for answer in answers_result.data:
-            category = answer['category']
-            score = answer['score']
-            
-            if category not in answers_by_category:
-                answers_by_category[category] = []
-            answers_by_category[category].append(score)
-        
-        # 3. 결과 계산
-        results = compute_session_results(answers_by_category)
-        
-        # 3.5. 판독 엔진 실행 (경영 해석)
-        axis_scores = {
-            cat: data['score_avg']
-            for cat, data in results['per_category'].items()
-        }
-        
-        # raw answers 로드 (선택적, 판독 엔진에서 사용 가능)
-        axis_raw = {}
-        answers_raw_result = supabase.table("health_check_answers").select(
-            "category, question_code, raw_value"
-        ).eq("store_id", store_id).eq("session_id", session_id).order("question_code").execute()
-        
-        for answer in answers_raw_result.data:
-            category = answer['category']
-            raw_value = answer['raw_value']
-            if category not in axis_raw:
-                axis_raw[category] = []
-            axis_raw[category].append(raw_value)
-        
-        # 판독 실행
-        diagnosis = diagnose_health_check(
-            session_id=session_id,
-            store_id=store_id,
-            axis_scores=axis_scores,
-            axis_raw=axis_raw if axis_raw else None,
-            meta=None
-        )
-        
-        # 4. health_check_results에 카테고리별 결과 저장
-        for category, category_data in results['per_category'].items():
-            # 해당 카테고리의 답변 리스트 가져오기
-            category_answers = answers_by_category.get(category, [])
-            
-            # 강점/리스크 플래그 계산
-            strength_flags = compute_strength_flags(category_answers, category)
-            risk_flags = compute_risk_flags(category_answers, category)
-            
-            # upsert
-            supabase.table("health_check_results").upsert({
+        # 4. 저장 (카테고리 결과 + 세션 업데이트)
+        now = datetime.utcnow().isoformat() + "Z"
+        result_rows = [
+            {
                 "store_id": store_id,
                 "session_id": session_id,
                 "category": category,
                 "score_avg": category_data['score_avg'],
                 "risk_level": category_data['risk_level'],
-                "strength_flags": strength_flags,
-                "risk_flags": risk_flags,
+                "strength_flags": results['flags'][category]['strength_flags'],
+                "risk_flags": results['flags'][category]['risk_flags'],
                 "structure_summary": None,  # 나중에 확장 가능
-                "updated_at": datetime.utcnow().isoformat() + "Z"
-            }, on_conflict="store_id,session_id,category").execute()
-        
-        # 5. health_check_sessions 업데이트 (판독 결과 포함)
-        import json
-        update_data = {
-            "completed_at": datetime.utcnow().isoformat() + "Z",
+                "updated_at": now
+            }
+            for category, category_data in results['per_category'].items()
+        ]
+        session_update = {
+            "completed_at": now,
             "overall_score": results['overall_score'],
             "overall_grade": results['overall_grade'],
             "main_bottleneck": results['main_bottleneck']
         }
+        _save_finalized_session(supabase, store_id, session_id, result_rows, session_update, diagnosis)
         
-        # 판독 결과를 JSON으로 저장 (diagnosis_json 컬럼이 있으면 사용, 없으면 무시)
-        try:
-            # JSON 필드로 저장 시도
-            update_data["diagnosis_json"] = json.dumps(diagnosis, ensure_ascii=False)
-        except Exception as e:
-            logger.warning(f"diagnosis_json 저장 실패 (컬럼이 없을 수 있음): {e}")
-        
-        supabase.table("health_check_sessions").update(update_data).eq("id", session_id).execute()
+        # 5. 검진 프로필 캐시 채우기 (HOME/전략/분석 요약이 DB 재조회 없이 사용)
+        session_row = {"id": session_id, "store_id": store_id, **session_update}
+        if diagnosis is not None:
+            session_row["diagnosis_json"] = diagnosis
+        prime_health_bundle(store_id, session_id, session_row, result_rows, diagnosis)
         
         logger.info(f"finalize_health_session: Session finalized - {session_id}, score: {results['overall_score']}, grade: {results['overall_grade']}")
         return True
@@ -0,0 +1,164 @@
+"""
+마감 캘린더 (매장별 최근 구간 마감 여부 비트맵)
+
+- daily_close 날짜만 1회 범위 조회 (오늘 기준 최근 STREAK_WINDOW_DAYS일 + 이번 달/이번 주)
+  → 조회량은 매장 운영 기간과 무관하게 최대 약 100행
+- 오늘 마감 여부 / 연속 마감(스트릭) / 이번 달·이번 주 마감일 수를 O(1) 조회 (누적합)
+- 캐시 키: (store_id, 기준일, daily_close 버전) → save_daily_close의 soft_invalidate로 갱신
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Iterable, Optional
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import streamlit as st
+
+from src.storage_supabase import get_read_client
+from src.utils.cache_tokens import get_data_version
+
+logger = logging.getLogger(__name__)
+
+KST = ZoneInfo("Asia/Seoul")
+# 스트릭 조회 구간 (이 이상 연속이면 STREAK_WINDOW_DAYS로 표시)
+STREAK_WINDOW_DAYS = 62
+
+
+def _today_kst() -> date:
+    return datetime.now(KST).date()
+
+
+def _window(today: date):
+    """조회 구간 [start, end] (최근 스트릭 구간 + 이번 달 + 이번 주)"""
+    month_start = today.replace(day=1)
+    next_month = date(today.year + 1, 1, 1) if today.month == 12 else date(today.year, today.month + 1, 1)
+    week_start = today - timedelta(days=today.weekday())
+    start = min(today - timedelta(days=STREAK_WINDOW_DAYS - 1), month_start, week_start)
+    end = max(next_month - timedelta(days=1), week_start + timedelta(days=6))
+    return start, end
+
+
+@dataclass(frozen=True)
+class CloseCalendar:
+    """
+    마감 캘린더
+
+    closed[i]: start + i일 마감 여부, cum: closed 누적합 (길이 +1)
+    streak: 오늘부터 거꾸로 연속 마감 일수 (오늘 미마감이면 0)
+    """
+    today: date
+    start: date
+    closed: np.ndarray
+    cum: np.ndarray
+    streak: int
+
+    @classmethod
+    def build(cls, dates: Iterable, today: date, start: Optional[date] = None, end: Optional[date] = None) -> "CloseCalendar":
+        """마감 날짜 목록(date 또는 'YYYY-MM-DD')에서 생성, 구간 밖 날짜는 무시"""
+        if start is None or end is None:
+            start, end = _window(today)
+        closed = np.zeros((end - start).days + 1, dtype=bool)
+        for d in dates:
+            if not d:
+                continue
+            if isinstance(d, str):
+                try:
+                    d = date.fromisoformat(d[:10])
+                except ValueError:
+                    continue
+            i = (d - start).days
+            if 0 <= i < len(closed):
+                closed[i] = True
+        cum = np.concatenate(([0], np.cumsum(closed)))
+        # 오늘부터 거꾸로 첫 미마감일까지
+        back = closed[:(today - start).days + 1][::-1]
+        streak = int(len(back) if back.all() else back.argmin())
+        return cls(today=today, start=start, closed=closed, cum=cum, streak=streak)
+
+    def is_closed(self, d: date) -> bool:
+        i = (d - self.start).days
+        return bool(0 <= i < len(self.closed) and self.closed[i])
+
+    @property
+    def closed_today(self) -> bool:
+        return self.is_closed(self.today)
+
+    def count_between(self, first: date, last: date) -> int:
+        """[first, last] 마감일 수 (구간 밖은 0으로 간주)"""
+        i = max((first - self.start).days, 0)
+        j = min((last - self.start).days + 1, len(self.closed))
+        return int(self.cum[j] - self.cum[i]) if j > i else 0
+
+    @property
+    def month_start(self) -> date:
+        return self.today.replace(day=1)
+
+    @property
+    def month_days(self) -> int:
+        t = self.today
+        next_month = date(t.year + 1, 1, 1) if t.month == 12 else date(t.year, t.month + 1, 1)
+        return (next_month - self.month_start).days
+
+    @property
+    def closed_this_month(self) -> int:
+        return self.count_between(self.month_start, self.month_start + timedelta(days=self.month_days - 1))
+
+    @property
+    def closed_this_week(self) -> int:
+        week_start = self.today - timedelta(days=self.today.weekday())
+        return self.count_between(week_start, week_start + timedelta(days=6))
+
+    @property
+    def month_streak(self) -> int:
+        """이번 달 안에서의 연속 마감 (get_monthly_close_stats 기존 정의)"""
+        return min(self.streak, (self.today - self.month_start).days + 1)
+
+    def month_stats(self):
+        """(closed_days, total_days, close_rate, streak_days) - 이번 달"""
+        closed_days = self.closed_this_month
+        total_days = self.month_days
+        return (closed_days, total_days, closed_days / total_days if total_days > 0 else 0.0, self.month_streak)
+
+
+def fetch_close_dates(supabase, store_id: str, start: date, end: date) -> list:
+    """daily_close 날짜만 범위 조회 (1회)"""
+    result = supabase.table("daily_close")\
+        .select("date")\
+        .eq("store_id", store_id)\
+        .gte("date", start.isoformat())\
+        .lte("date", end.isoformat())\
+        .execute()
+    return [r.get("date") for r in (result.data or [])]
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _load_close_calendar(store_id: str, today_iso: str, v_close: int) -> Optional[CloseCalendar]:
+    """마감 캘린더 (캐시됨, version_token 기반)"""
+    today = date.fromisoformat(today_iso)
+    supabase = get_read_client()
+    if not supabase:
+        return None
+    start, end = _window(today)
+    return CloseCalendar.build(fetch_close_dates(supabase, store_id, start, end), today, start, end)
+
+
+def get_close_calendar(store_id: str, today: Optional[date] = None) -> CloseCalendar:
+    """
+    마감 캘린더 조회 (실패/매장 없음이면 빈 캘린더)
+
+    Args:
+        store_id: 매장 ID
+        today: 기준일 (None이면 오늘, KST)
+    """
+    today = today or _today_kst()
+    if store_id:
+        try:
+            calendar = _load_close_calendar(store_id, today.isoformat(), get_data_version("daily_close"))
+            if calendar is not None:
+                return calendar
+        except Exception as e:
+            logger.warning(f"get_close_calendar: Error - {e}")
+    return CloseCalendar.build([], today)
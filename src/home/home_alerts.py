@@ -2,6 +2,7 @@
 홈 이상 징후 (룰 기반)
 - get_anomaly_signals_light: 경량 버전 (1-2개만)
 - get_anomaly_signals: 전체 버전 (최대 3개)
+- UI 없음: ui_pages.home 등 현재 화면 공용 (ui_pages._legacy 사본 대체)
 """
 from __future__ import annotations
 
@@ -1,32 +1,31 @@
 """
 홈 전용 경량 데이터 로더
-- load_home_kpis: 홈 최초 진입 시 KPI만 로드
+- load_home_kpis: 홈 최초 진입 시 KPI만 로드 (src.home.home_snapshot 스냅샷)
 - get_monthly_close_stats: 마감률/스트릭
 - get_menu_count, get_close_count, check_actual_settlement_exists
 - detect_data_level, detect_owner_day_level
 - load_latest_health_diag: 최신 완료 검진 판독 데이터 로드
+- UI 없음: ui_pages.home / 전략 보드 공용 (ui_pages._legacy 사본 대체)
 """
 from __future__ import annotations
 
-import streamlit as st
-from datetime import datetime, date, timedelta
+from datetime import datetime, date
 from zoneinfo import ZoneInfo
 from typing import Tuple, Optional, Dict
 
 from src.auth import get_supabase_client
-from src.storage_supabase import load_monthly_sales_total, load_monthly_settlement_snapshot, count_unofficial_days_in_month
+from src.home.close_calendar import get_close_calendar
+from src.home.home_snapshot import load_home_snapshot
 from src.health_check.health_integration import get_health_diag_for_home
-from src.ui_helpers import safe_get_value
 
 
-@st.cache_data(ttl=300, show_spinner=False)
 def load_latest_health_diag(store_id: str) -> Optional[Dict]:
     """
     최신 완료 검진 판독 데이터 로드 (HOME용)
     
     캐싱:
-    - 세션 ID 기반으로 캐싱 (같은 검진은 재사용)
-    - TTL 300초 (5분)
+    - (store_id, 최신 완료 세션 id) 번들 캐시 공유 (src.health_check.health_cache)
+    - 검진 완료(finalize) 시 즉시 갱신 → 별도 TTL 캐시 없음
     
     Args:
         store_id: 매장 ID
@@ -46,9 +45,14 @@ def load_latest_health_diag(store_id: str) -> Optional[Dict]:
 def get_monthly_close_stats(store_id: str, year: int, month: int) -> Tuple[int, int, float, int]:
     """
     이번 달 마감률과 연속 마감(스트릭) 계산
+    이번 달은 마감 캘린더(src.home.close_calendar, 최근 구간 1회 조회·캐시)에서 O(1) 조회
     Returns: (closed_days, total_days, close_rate, streak_days)
     """
     try:
+        kst = ZoneInfo("Asia/Seoul")
+        today = datetime.now(kst).date()
+        if (year, month) == (today.year, today.month):
+            return get_close_calendar(store_id, today).month_stats()
         supabase = get_supabase_client()
         if not supabase:
             return (0, 0, 0.0, 0)
@@ -57,102 +61,25 @@ def get_monthly_close_stats(store_id: str, year: int, month: int) -> Tuple[int,
         total_days = (end_date - start_date).days
         result = supabase.table("daily_close").select("date").eq("store_id", store_id).gte(
             "date", start_date.isoformat()
-        ).lt("date", end_date.isoformat()).order("date", desc=True).execute()
+        ).lt("date", end_date.isoformat()).execute()
         if not result.data:
             return (0, total_days, 0.0, 0)
         closed_days = len(result.data)
         close_rate = closed_days / total_days if total_days > 0 else 0.0
-        kst = ZoneInfo("Asia/Seoul")
-        today = datetime.now(kst).date()
-        closed_dates = {r["date"] for r in result.data if r.get("date")}
-        streak_days = 0
-        check = today
-        while start_date <= check < end_date:
-            if check.isoformat() in closed_dates:
-                streak_days += 1
-                check -= timedelta(days=1)
-            else:
-                break
-        return (closed_days, total_days, close_rate, streak_days)
+        # 스트릭은 오늘이 속한 달에서만 의미 있음
+        return (closed_days, total_days, close_rate, 0)
     except Exception:
         return (0, 0, 0.0, 0)
 
 
-@st.cache_data(ttl=300)
 def load_home_kpis(store_id: str, year: int, month: int) -> dict:
     """
-    홈 최초 진입 시 필요한 핵심 KPI만 로드.
-    Returns: monthly_sales, yesterday_sales, close_stats, revenue_per_visit, monthly_profit, target_sales, target_ratio
+    홈 최초 진입 시 필요한 핵심 KPI만 로드 (HOME 스냅샷 1회 조회).
+    Returns: monthly_sales, yesterday_sales, close_stats, revenue_per_visit, monthly_profit, target_sales, target_ratio,
+             unofficial_days, total_visitors, fixed_costs, break_even, recent_avg, month_avg, version
     """
-    out = {
-        "monthly_sales": 0,
-        "yesterday_sales": 0,
-        "close_stats": (0, 0, 0.0, 0),
-        "revenue_per_visit": None,
-        "monthly_profit": None,
-        "target_sales": 0,
-        "target_ratio": None,
-    }
-    if not store_id:
-        return out
-    try:
-        kst = ZoneInfo("Asia/Seoul")
-        now = datetime.now(kst)
-        today = now.date()
-        yesterday = today - timedelta(days=1)
-        start = f"{year}-{month:02d}-01"
-        end = f"{year + 1}-01-01" if month == 12 else f"{year}-{month + 1:02d}-01"
-
-        # SSOT 정책: 통계/KPI는 best_available, 마감 여부는 official
-        monthly_sales = load_monthly_sales_total(store_id, year, month)  # best_available 기반
-        out["monthly_sales"] = monthly_sales or 0
-        out["close_stats"] = get_monthly_close_stats(store_id, year, month)  # official 기반 (마감률)
-        
-        # 미마감 날짜 개수 확인
-        unofficial_days = count_unofficial_days_in_month(store_id, year, month)
-        out["unofficial_days"] = unofficial_days
-
-        supabase = get_supabase_client()
-        if supabase:
-            # 어제 매출: best_available 사용 (통계용)
-            from src.storage_supabase import load_best_available_daily_sales
-            yesterday_best = load_best_available_daily_sales(store_id=store_id, start_date=yesterday.isoformat(), end_date=yesterday.isoformat())
-            if not yesterday_best.empty and 'total_sales' in yesterday_best.columns:
-                out["yesterday_sales"] = int(float(safe_get_value(yesterday_best, 'total_sales', 0) or 0))
-            else:
-                # 어제 데이터가 없으면 최근 best_available 매출 조회
-                recent_best = load_best_available_daily_sales(store_id=store_id, start_date=(today - timedelta(days=7)).isoformat(), end_date=(today - timedelta(days=1)).isoformat())
-                if not recent_best.empty and 'total_sales' in recent_best.columns:
-                    # 최근 날짜의 매출 사용
-                    recent_best = recent_best.sort_values('date', ascending=False)
-                    out["yesterday_sales"] = int(float(safe_get_value(recent_best, 'total_sales', 0) or 0))
-
-            # 유입당 매출 계산 (네이버방문자 기준)
-            if monthly_sales and monthly_sales > 0:
-                naver_visits = supabase.table("naver_visitors").select("visitors").eq(
-                    "store_id", store_id
-                ).gte("date", start).lt("date", end).execute()
-                if naver_visits.data:
-                    tot_visits = sum(int(r.get("visitors", 0) or 0) for r in naver_visits.data)
-                    if tot_visits > 0:
-                        out["revenue_per_visit"] = int(monthly_sales / tot_visits)
-
-            # 목표 매출 조회
-            target_result = supabase.table("targets").select("target_sales").eq(
-                "store_id", store_id
-            ).eq("year", year).eq("month", month).limit(1).execute()
-            if target_result.data and len(target_result.data) > 0:
-                target_sales = target_result.data[0].get("target_sales")
-                if target_sales is not None:
-                    out["target_sales"] = int(float(target_sales or 0))
-                    if out["target_sales"] > 0 and monthly_sales > 0:
-                        out["target_ratio"] = round((monthly_sales / out["target_sales"]) * 100, 1)
-
-        snap = load_monthly_settlement_snapshot(store_id, year, month)
-        if snap and snap.get("operating_profit") is not None:
-            out["monthly_profit"] = int(snap.get("operating_profit", 0))
-    except Exception:
-        pass
+    out = load_home_snapshot(store_id, year, month)
+    out["close_stats"] = tuple(out.get("close_stats") or (0, 0, 0.0, 0))
     return out
 
 
@@ -2,6 +2,7 @@
 홈 문제/잘한 점 룰 (룰 기반)
 - get_problems_top1, get_good_points_top1: 경량 버전 (TOP1만)
 - get_problems_top3, get_good_points_top3: 전체 버전 (TOP3)
+- UI 없음: ui_pages.home 등 현재 화면 공용 (ui_pages._legacy 사본 대체)
 """
 from __future__ import annotations
 
@@ -9,7 +10,7 @@ from datetime import datetime, date, timedelta
 from zoneinfo import ZoneInfo
 
 from src.auth import get_supabase_client
-from ui_pages.home.home_data import get_monthly_close_stats
+from src.home.home_data import get_monthly_close_stats
 
 
 def get_problems_top1(store_id: str) -> list:
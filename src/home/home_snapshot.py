@@ -0,0 +1,286 @@
+"""
+HOME 스냅샷 (매장별 사전 계산 읽기 모델)
+
+- HOME 진입 시 필요한 KPI/존 입력값을 한 문서(home_snapshots.payload)로 저장
+- 쓰기 경로(save_daily_close, save_sales, 정산 저장)에서 이번 달 스냅샷을 재계산해 upsert
+  (삭제·방문자·목표·비용 구조·비용 항목 템플릿 저장은 무효화만, 다음 조회 시 재계산)
+- 읽기: 1회 조회. 버전 스탬프(version) + 기준일(as_of_date) + 스키마 버전이 맞지 않으면 즉시 재계산
+- 재계산 실패/정산 항목 개별 저장 등은 payload를 비워(invalidate) 다음 조회 시 재계산되도록 함
+"""
+from __future__ import annotations
+
+import logging
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+import streamlit as st
+
+from src.storage_supabase import get_read_client, get_supabase_client
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_TABLE = "home_snapshots"
+SNAPSHOT_SCHEMA = 1
+RECENT_DAYS = 7
+
+KST = ZoneInfo("Asia/Seoul")
+
+
+def _today_kst() -> date:
+    return datetime.now(KST).date()
+
+
+def _month_range(year: int, month: int):
+    start = date(year, month, 1)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start, end
+
+
+def _empty_payload(year: int, month: int) -> Dict:
+    start, end = _month_range(year, month)
+    return {
+        "monthly_sales": 0,
+        "yesterday_sales": 0,
+        "close_stats": [0, (end - start).days, 0.0, 0],
+        "revenue_per_visit": None,
+        "monthly_profit": None,
+        "target_sales": 0,
+        "target_ratio": None,
+        "unofficial_days": 0,
+        "total_visitors": 0,
+        "fixed_costs": 0,
+        "break_even": 0,
+        "recent_avg": 0,
+        "month_avg": 0,
+    }
+
+
+def compute_home_snapshot(store_id: str, year: int, month: int, today: Optional[date] = None) -> Dict:
+    """
+    HOME 스냅샷 payload 계산 (캐시 없이 DB에서 직접 계산)
+
+    best_available 1회 조회로 월매출/미마감/마감률/스트릭/어제 매출/최근 7일 평균을 함께 계산하고,
+    네이버 방문자·목표·정산·손익분기점만 별도 조회한다.
+
+    Returns:
+        dict: monthly_sales, yesterday_sales, close_stats[closed, total, rate, streak], revenue_per_visit,
+              monthly_profit, target_sales, target_ratio, unofficial_days, total_visitors,
+              fixed_costs, break_even, recent_avg, month_avg
+    """
+    out = _empty_payload(year, month)
+    if not store_id:
+        return out
+    today = today or _today_kst()
+    month_start, month_end = _month_range(year, month)
+    total_days = (month_end - month_start).days
+    yesterday = today - timedelta(days=1)
+    recent_start = today - timedelta(days=RECENT_DAYS)
+
+    supabase = get_read_client()
+    if not supabase:
+        return out
+
+    # 1) best_available: 이번 달 + 최근 7일 (SSOT 정책: KPI는 best_available, 마감 여부는 is_official)
+    range_start = min(month_start, recent_start)
+    range_end = max(month_end - timedelta(days=1), today)
+    result = supabase.table("v_daily_sales_best_available")\
+        .select("date,total_sales,is_official")\
+        .eq("store_id", store_id)\
+        .gte("date", range_start.isoformat())\
+        .lte("date", range_end.isoformat())\
+        .execute()
+    df = pd.DataFrame(result.data or [], columns=["date", "total_sales", "is_official"])
+    if not df.empty:
+        df["date"] = pd.to_datetime(df["date"], errors="coerce").dt.date
+        df = df.dropna(subset=["date"])
+        df["total_sales"] = pd.to_numeric(df["total_sales"], errors="coerce").fillna(0)
+        df["is_official"] = df["is_official"].fillna(True).astype(bool)
+
+        month_df = df[(df["date"] >= month_start) & (df["date"] < month_end)]
+        monthly_sales = int(month_df["total_sales"].sum())
+        out["monthly_sales"] = monthly_sales
+        out["unofficial_days"] = int((~month_df["is_official"]).sum())
+        out["month_avg"] = float(month_df["total_sales"].mean()) if not month_df.empty else 0
+
+        # 마감률/스트릭 (official = daily_close 존재)
+        closed_dates = set(month_df.loc[month_df["is_official"], "date"])
+        streak_days = 0
+        check = today
+        while month_start <= check < month_end and check in closed_dates:
+            streak_days += 1
+            check -= timedelta(days=1)
+        closed_days = len(closed_dates)
+        out["close_stats"] = [closed_days, total_days, closed_days / total_days if total_days > 0 else 0.0, streak_days]
+
+        # 어제 매출 (없으면 최근 7일 중 가장 최근 날짜)
+        recent_df = df[(df["date"] >= recent_start) & (df["date"] <= today)]
+        out["recent_avg"] = float(recent_df["total_sales"].mean()) if not recent_df.empty else 0
+        before_today = recent_df[recent_df["date"] <= yesterday].sort_values("date")
+        if not before_today.empty:
+            y_row = before_today[before_today["date"] == yesterday]
+            row = y_row.iloc[-1] if not y_row.empty else before_today.iloc[-1]
+            out["yesterday_sales"] = int(float(row["total_sales"] or 0))
+
+    # 2) 네이버 방문자 (유입당 매출)
+    visitors_result = supabase.table("naver_visitors")\
+        .select("visitors")\
+        .eq("store_id", store_id)\
+        .gte("date", month_start.isoformat())\
+        .lt("date", month_end.isoformat())\
+        .execute()
+    total_visitors = sum(int(r.get("visitors", 0) or 0) for r in (visitors_result.data or []))
+    out["total_visitors"] = total_visitors
+    if out["monthly_sales"] > 0 and total_visitors > 0:
+        out["revenue_per_visit"] = int(out["monthly_sales"] / total_visitors)
+
+    # 3) 목표 매출
+    target_result = supabase.table("targets")\
+        .select("target_sales")\
+        .eq("store_id", store_id)\
+        .eq("year", year)\
+        .eq("month", month)\
+        .limit(1)\
+        .execute()
+    if target_result.data and target_result.data[0].get("target_sales") is not None:
+        out["target_sales"] = int(float(target_result.data[0].get("target_sales") or 0))
+        if out["target_sales"] > 0 and out["monthly_sales"] > 0:
+            out["target_ratio"] = round((out["monthly_sales"] / out["target_sales"]) * 100, 1)
+
+    # 4) 정산 이익 / 고정비 / 손익분기점 (SSOT 엔진)
+    from src.storage_supabase import load_monthly_settlement_snapshot, get_fixed_costs, calculate_break_even_sales
+    try:
+        snap = load_monthly_settlement_snapshot(store_id, year, month)
+        if snap and snap.get("operating_profit") is not None:
+            out["monthly_profit"] = int(snap.get("operating_profit", 0))
+    except Exception as e:
+        logger.warning(f"compute_home_snapshot: settlement snapshot failed - {e}")
+    try:
+        out["fixed_costs"] = float(get_fixed_costs(store_id, year, month) or 0)
+        out["break_even"] = float(calculate_break_even_sales(store_id, year, month) or 0)
+    except Exception as e:
+        logger.warning(f"compute_home_snapshot: break-even failed - {e}")
+    return out
+
+
+def _store_snapshot(store_id: str, year: int, month: int, today: date, payload: Optional[Dict]) -> int:
+    """스냅샷 upsert (payload=None이면 무효화). 새 버전 스탬프 반환"""
+    version = int(time.time() * 1000)
+    supabase = get_supabase_client()
+    if not supabase:
+        return 0
+    supabase.table(SNAPSHOT_TABLE).upsert({
+        "store_id": store_id,
+        "year": int(year),
+        "month": int(month),
+        "as_of_date": today.isoformat(),
+        "schema_version": SNAPSHOT_SCHEMA,
+        "version": version,
+        "payload": payload,
+        "computed_at": datetime.now(KST).isoformat(),
+    }, on_conflict="store_id").execute()
+    return version
+
+
+def refresh_home_snapshot(store_id: str, reason: str = "") -> Optional[Dict]:
+    """
+    쓰기 경로 훅: 이번 달 스냅샷 재계산 + upsert (실패 시 payload를 비워 다음 조회에서 재계산)
+
+    Returns:
+        새 payload (실패 시 None)
+    """
+    if not store_id:
+        return None
+    today = _today_kst()
+    try:
+        payload = compute_home_snapshot(store_id, today.year, today.month, today)
+        _store_snapshot(store_id, today.year, today.month, today, payload)
+        logger.info(f"Home snapshot refreshed ({reason}): store={store_id}")
+        return payload
+    except Exception as e:
+        logger.warning(f"refresh_home_snapshot failed ({reason}): {e}")
+        invalidate_home_snapshot(store_id, reason)
+        return None
+    finally:
+        _load_home_snapshot.clear()
+
+
+def invalidate_home_snapshot(store_id: str, reason: str = "") -> None:
+    """스냅샷 무효화 (payload 비움, 다음 HOME 조회 시 재계산). 반복 저장 경로용 경량 훅"""
+    if not store_id:
+        return
+    try:
+        supabase = get_supabase_client()
+        if supabase:
+            supabase.table(SNAPSHOT_TABLE)\
+                .update({"payload": None, "version": int(time.time() * 1000)})\
+                .eq("store_id", store_id)\
+                .execute()
+    except Exception as e:
+        logger.warning(f"invalidate_home_snapshot failed ({reason}): {e}")
+    finally:
+        _load_home_snapshot.clear()
+
+
+def _is_fresh(row: Optional[Dict], year: int, month: int, today: date) -> bool:
+    return bool(
+        row
+        and row.get("payload")
+        and row.get("schema_version") == SNAPSHOT_SCHEMA
+        and row.get("year") == year
+        and row.get("month") == month
+        and str(row.get("as_of_date") or "")[:10] == today.isoformat()
+    )
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_home_snapshot(store_id: str, year: int, month: int, as_of: str, v_sales: int, v_close: int, v_visitors: int) -> Dict:
+    today = date.fromisoformat(as_of)
+    row = None
+    try:
+        supabase = get_read_client()
+        if supabase:
+            result = supabase.table(SNAPSHOT_TABLE)\
+                .select("year,month,as_of_date,schema_version,version,payload")\
+                .eq("store_id", store_id)\
+                .limit(1)\
+                .execute()
+            row = result.data[0] if result.data else None
+    except Exception as e:
+        logger.warning(f"load_home_snapshot: read failed - {e}")
+
+    if _is_fresh(row, year, month, today):
+        return {**_empty_payload(year, month), **row["payload"], "version": row.get("version")}
+
+    # 없음/기준일 지남/무효화됨 → 재계산 (이번 달이면 저장해 다음 조회부터 1회 읽기)
+    payload = compute_home_snapshot(store_id, year, month, today)
+    version = None
+    if (year, month) == (today.year, today.month):
+        try:
+            version = _store_snapshot(store_id, year, month, today, payload)
+        except Exception as e:
+            logger.warning(f"load_home_snapshot: store failed - {e}")
+    return {**payload, "version": version}
+
+
+def load_home_snapshot(store_id: str, year: int, month: int) -> Dict:
+    """
+    HOME 스냅샷 조회 (1회 읽기, 버전 스탬프 검증)
+
+    Returns:
+        dict: compute_home_snapshot payload + "version" (스냅샷 버전 스탬프, 저장 못 했으면 None)
+    """
+    if not store_id:
+        return {**_empty_payload(year, month), "version": None}
+    from src.utils.cache_tokens import get_data_version
+    try:
+        return _load_home_snapshot(
+            store_id, year, month, _today_kst().isoformat(),
+            get_data_version("sales"), get_data_version("daily_close"), get_data_version("visitors"),
+        )
+    except Exception as e:
+        logger.warning(f"load_home_snapshot failed: {e}")
+        return {**_empty_payload(year, month), "version": None}
+
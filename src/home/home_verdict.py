@@ -2,31 +2,37 @@
 홈 코치 판결 로직 (HOME v2)
 - get_coach_verdict: 이번 달 가장 중요한 문제 1개 판결
 - 3개 분류: 수익 구조 위험, 메뉴 수익 구조 위험, 재료 구조 위험
-- 설계 DB 데이터를 우선 근거로 사용
+- 설계 DB 데이터(설계 인사이트)를 우선 근거로 사용
+- UI 없음: ui_pages.home / 코치 어댑터 공용 (ui_pages._legacy 사본 대체)
+  설계 인사이트(ui_pages.design_lab.design_insights)는 호출하는 UI 계층에서 넘겨받음
 """
 from __future__ import annotations
 
-from datetime import datetime
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
 from zoneinfo import ZoneInfo
 
 from src.storage_supabase import (
-    load_best_available_daily_sales,
     get_fixed_costs,
     get_variable_cost_ratio,
     calculate_break_even_sales,
     load_csv,
 )
 from src.auth import get_supabase_client
-from ui_pages.design_lab.design_insights import get_design_insights
-from ui_pages.design_lab.design_state_loader import get_design_state, get_primary_risk_area
-from src.ui_helpers import safe_get_value, safe_get_row_by_condition
+from src.ui_helpers import safe_get_value
 
+logger = logging.getLogger(__name__)
 
-def get_coach_verdict(store_id: str, year: int, month: int, monthly_sales: int) -> dict:
+
+def get_coach_verdict(store_id: str, year: int, month: int, monthly_sales: int, insights: Optional[dict] = None) -> dict:
     """
     이번 달 코치 판결 (가장 중요한 문제 1개)
     설계 DB 데이터를 우선 근거로 사용
     
+    Args:
+        insights: get_design_insights(store_id, year, month) 결과 (없으면 운영 데이터만으로 판단)
+    
     Returns:
         {
             "verdict_type": "revenue_structure" | "menu_profit" | "ingredient_structure" | None,
@@ -46,16 +52,11 @@ def get_coach_verdict(store_id: str, year: int, month: int, monthly_sales: int)
         }
     
     try:
-        # 설계 상태 로드 (점수화 + 상태 판정)
-        design_state = get_design_state(store_id, year, month)
-        
-        # 설계 인사이트 로드 (상세 데이터)
-        insights = get_design_insights(store_id, year, month)
-        
-        # 1순위: 설계 상태 기반 판단 (우선순위 높음)
-        design_verdict = _check_design_state_risks(design_state, insights)
-        if design_verdict:
-            return design_verdict
+        # 1순위: 설계 인사이트 기반 판단 (우선순위 높음)
+        if insights:
+            design_verdict = _check_design_based_risks(insights, store_id, year, month, monthly_sales)
+            if design_verdict:
+                return design_verdict
         
         # 2순위: 운영 데이터 기반 판단 (fallback)
         # 수익 구조 위험 판단
@@ -85,6 +86,7 @@ def get_coach_verdict(store_id: str, year: int, month: int, monthly_sales: int)
             "button_label": "📊 매출 관리 보러가기"
         }
     except Exception as e:
+        logger.warning(f"get_coach_verdict: Error - {e}")
         return {
             "verdict_type": None,
             "verdict_text": "판결 분석 중 오류가 발생했습니다.",
@@ -98,7 +100,6 @@ def _check_design_based_risks(insights: dict, store_id: str, year: int, month: i
     """설계 DB 기반 위험 판단 (우선순위 높음)"""
     try:
         # 1순위: 메뉴 수익 구조 위험 (마진 메뉴 0개)
-        menu_profit = insights.get("menu_profit", {})
         menu_portfolio = insights.get("menu_portfolio", {})
         
         if menu_portfolio.get("has_data") and menu_portfolio.get("margin_menu_count", 0) == 0:
@@ -329,7 +330,7 @@ def _check_ingredient_structure_risk(store_id: str, year: int, month: int) -> di
         # 재료별 사용량 집계 (최근 30일)
         kst = ZoneInfo("Asia/Seoul")
         today = datetime.now(kst).date()
-        start_date = (today - __import__('datetime').timedelta(days=30)).isoformat()
+        start_date = (today - timedelta(days=30)).isoformat()
         end_date = today.isoformat()
         
         # daily_sales_items에서 재료별 사용량 집계
@@ -0,0 +1,277 @@
+"""
+PDF 한글 폰트 레지스트리 (ReportLab)
+
+- 폰트 탐색/등록은 프로세스당 1회 (reporting.py, pdf_scorecard_mvp.py 공용)
+- 탐색 경로: 프로젝트 assets/fonts → Windows Fonts → Linux/macOS 시스템 폰트 경로
+- 선택: 자주 쓰는 글리프(KS X 1001 한글 2,350자 + ASCII/기호)만 남긴 서브셋 폰트를 1회 생성해 등록
+  (대용량 한글 TTF 파싱 비용 절감, PDF 용량 축소). fontTools가 없거나 문구가 서브셋 밖이면 원본 폰트 사용
+
+환경변수:
+- PDF_FONT_SUBSET=1: 서브셋 폰트 사용
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import platform
+import tempfile
+import threading
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+    REPORTLAB_AVAILABLE = True
+except ImportError:
+    REPORTLAB_AVAILABLE = False
+
+try:
+    from fontTools import subset as ft_subset
+    from fontTools.ttLib import TTFont as FTFont
+    FONTTOOLS_AVAILABLE = True
+except ImportError:
+    FONTTOOLS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+FONT_NAME = "KoreanFont"
+SUBSET_FONT_NAME = "KoreanFont-Subset"
+FALLBACK_FONT_NAME = "Helvetica"
+
+_BASE_DIR = Path(__file__).parent.parent
+
+# 파일명 패턴 우선순위 (앞쪽일수록 우선)
+_FONT_PATTERNS = [
+    "notosanskr-regular", "pretendard-regular", "applesdgothicneo",
+    "malgun", "nanumgothic", "nanumbarungothic", "notosanskr", "notosanscjkkr",
+    "undotum", "gulim", "batang", "dotum", "gungsuh",
+]
+_FONT_EXTENSIONS = (".ttf", ".ttc")
+
+_lock = threading.Lock()
+_font_info: Optional[Dict] = None
+_subset_info: Optional[Dict] = None
+_subset_charset: Optional[frozenset] = None
+
+
+def _search_dirs() -> List[Path]:
+    """폰트 탐색 디렉토리 (우선순위 순)"""
+    dirs = [_BASE_DIR / "assets" / "fonts"]
+    if platform.system() == "Windows":
+        dirs.append(Path(os.environ.get("WINDIR", "C:\\Windows")) / "Fonts")
+    dirs += [
+        Path("/usr/share/fonts"),
+        Path("/usr/local/share/fonts"),
+        Path.home() / ".fonts",
+        Path.home() / ".local" / "share" / "fonts",
+        Path("/Library/Fonts"),
+        Path("/System/Library/Fonts"),
+    ]
+    return dirs
+
+
+def discover_font_files() -> List[str]:
+    """
+    한글 폰트 파일 후보 탐색 (디렉토리 우선순위 → 파일명 패턴 우선순위)
+
+    Returns:
+        list: 폰트 파일 경로 리스트 (등록 시도 순서)
+    """
+    found = []
+    for dir_index, base in enumerate(_search_dirs()):
+        if not base.is_dir():
+            continue
+        try:
+            for root, _dirs, files in os.walk(base):
+                for filename in files:
+                    lower = filename.lower()
+                    if not lower.endswith(_FONT_EXTENSIONS):
+                        continue
+                    for rank, pattern in enumerate(_FONT_PATTERNS):
+                        if pattern in lower:
+                            found.append((dir_index, rank, os.path.join(root, filename)))
+                            break
+        except Exception as e:
+            logger.warning(f"Failed to scan font directory {base}: {e}")
+    found.sort()
+    return [path for _, _, path in found]
+
+
+def _register_ttf(font_name: str, source) -> None:
+    """TTF/TTC 등록 (TTC는 첫 번째 서브폰트)"""
+    name = getattr(source, "name", str(source)).lower()
+    if name.endswith(".ttc"):
+        pdfmetrics.registerFont(TTFont(font_name, source, subfontIndex=0))
+    else:
+        pdfmetrics.registerFont(TTFont(font_name, source))
+
+
+def _register_full_font() -> Dict:
+    """원본 폰트 탐색 + 등록 (호출자가 lock 보유)"""
+    info = {
+        "ok": False,
+        "font_name": FALLBACK_FONT_NAME,
+        "path": None,
+        "reason": "한글 폰트를 찾을 수 없습니다. Helvetica로 fallback합니다.",
+    }
+    if not REPORTLAB_AVAILABLE:
+        info["reason"] = "ReportLab이 설치되지 않았습니다."
+        return info
+
+    for font_path in discover_font_files():
+        try:
+            _register_ttf(FONT_NAME, font_path)
+            info.update({
+                "ok": True,
+                "font_name": FONT_NAME,
+                "path": font_path,
+                "reason": f"폰트 등록 성공: {os.path.basename(font_path)}",
+            })
+            logger.info(f"Korean font registered: {font_path}")
+            return info
+        except Exception as e:
+            # CFF 기반 OTF/TTC 등 ReportLab 미지원 포맷은 건너뜀
+            logger.warning(f"Failed to register font {font_path}: {e}")
+    logger.warning("Using Helvetica fallback (Korean font not available)")
+    return info
+
+
+def _subset_charset_codepoints() -> frozenset:
+    """서브셋 대상 문자: ASCII/Latin-1, 일반 구두점/기호, 한글 자모, KS X 1001 한글 2,350자"""
+    global _subset_charset
+    if _subset_charset is None:
+        codepoints = set(range(0x20, 0x7F)) | set(range(0xA0, 0x100))
+        codepoints |= set(range(0x2000, 0x2070))   # 일반 구두점
+        codepoints |= set(range(0x2190, 0x2200))   # 화살표
+        codepoints |= set(range(0x2460, 0x2500))   # 원문자
+        codepoints |= set(range(0x25A0, 0x2600))   # 도형
+        codepoints |= set(range(0x3000, 0x3040))   # CJK 기호
+        codepoints |= set(range(0x3130, 0x3190))   # 한글 호환 자모
+        codepoints |= set(range(0xFF01, 0xFF5F))   # 전각 ASCII
+        for cp in range(0xAC00, 0xD7A4):
+            # KS X 1001 완성형만 (2바이트, 선두 0xB0~0xC8). 그 외 음절은 euc-kr 코덱이
+            # 8바이트 자모 조합으로 인코딩하므로 인코딩 성공 여부만으로는 걸러지지 않음
+            try:
+                encoded = chr(cp).encode("euc-kr")
+            except UnicodeEncodeError:
+                continue
+            if len(encoded) == 2 and 0xB0 <= encoded[0] <= 0xC8:
+                codepoints.add(cp)
+        _subset_charset = frozenset(codepoints)
+    return _subset_charset
+
+
+def _subset_cache_path(font_path: str) -> Path:
+    stat = os.stat(font_path)
+    # 문자 집합 크기도 키에 포함 (집합이 바뀌면 이전 서브셋 파일을 재사용하지 않음)
+    charset_size = len(_subset_charset_codepoints())
+    key = hashlib.sha1(f"{font_path}:{stat.st_size}:{int(stat.st_mtime)}:{charset_size}".encode("utf-8")).hexdigest()[:12]
+    cache_dir = Path(tempfile.gettempdir()) / "store_ops_fonts"
+    return cache_dir / f"{Path(font_path).stem}-ksx1001-{key}.ttf"
+
+
+def _build_subset_bytes(font_path: str) -> bytes:
+    """fontTools로 서브셋 TTF 생성 (hinting 제거, 글리프 이름 제거)"""
+    options = ft_subset.Options()
+    options.hinting = False
+    options.desubroutinize = True
+    options.glyph_names = False
+    options.notdef_outline = True
+    options.layout_features = []
+    font = FTFont(font_path, fontNumber=0, lazy=True)
+    subsetter = ft_subset.Subsetter(options=options)
+    subsetter.populate(unicodes=_subset_charset_codepoints())
+    subsetter.subset(font)
+    out = BytesIO()
+    font.save(out)
+    font.close()
+    return out.getvalue()
+
+
+def _register_subset_font() -> Optional[Dict]:
+    """서브셋 폰트 등록 (디스크 캐시 우선, 실패 시 None). 호출자가 lock 보유"""
+    if not FONTTOOLS_AVAILABLE or not REPORTLAB_AVAILABLE:
+        return None
+    candidates = discover_font_files()
+    for font_path in candidates:
+        try:
+            cache_path = _subset_cache_path(font_path)
+            if cache_path.exists():
+                data = cache_path.read_bytes()
+            else:
+                data = _build_subset_bytes(font_path)
+                try:
+                    cache_path.parent.mkdir(parents=True, exist_ok=True)
+                    tmp_path = cache_path.with_suffix(".tmp")
+                    tmp_path.write_bytes(data)
+                    os.replace(tmp_path, cache_path)
+                except OSError as e:
+                    logger.info(f"Subset font cache not written ({cache_path}): {e}")
+            buffer = BytesIO(data)
+            buffer.name = str(cache_path)
+            _register_ttf(SUBSET_FONT_NAME, buffer)
+            logger.info(f"Korean subset font registered: {font_path} ({len(data):,} bytes)")
+            return {
+                "ok": True,
+                "font_name": SUBSET_FONT_NAME,
+                "path": font_path,
+                "reason": f"서브셋 폰트 등록 성공: {os.path.basename(font_path)}",
+            }
+        except Exception as e:
+            logger.warning(f"Failed to build subset font from {font_path}: {e}")
+    return None
+
+
+def _subset_enabled() -> bool:
+    return os.getenv("PDF_FONT_SUBSET", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _needs_korean_glyph(cp: int) -> bool:
+    """한글/한자 영역 여부 (이모지 등은 원본 한글 폰트에도 없으므로 커버 판정에서 제외)"""
+    return 0x1100 <= cp <= 0x11FF or 0x3130 <= cp <= 0x318F or 0xAC00 <= cp <= 0xD7A3 or 0x4E00 <= cp <= 0x9FFF
+
+
+def _text_covered(text: str) -> bool:
+    charset = _subset_charset_codepoints()
+    return all(cp in charset for cp in map(ord, set(text)) if _needs_korean_glyph(cp))
+
+
+def get_korean_font(text: Optional[str] = None, subset: Optional[bool] = None) -> Dict:
+    """
+    한글 폰트 정보 반환 (탐색/등록은 프로세스당 1회, 이후 캐시 반환)
+
+    Args:
+        text: PDF에 들어갈 문구 (서브셋 사용 시 커버 여부 확인용, 선택)
+        subset: 서브셋 폰트 사용 여부 (None이면 PDF_FONT_SUBSET 환경변수)
+
+    Returns:
+        dict: {"ok": bool, "font_name": str, "path": str | None, "reason": str}
+    """
+    global _font_info, _subset_info
+    if subset is None:
+        subset = _subset_enabled()
+
+    if subset and (text is None or _text_covered(text)):
+        if _subset_info is None:
+            with _lock:
+                if _subset_info is None:
+                    _subset_info = _register_subset_font() or {"ok": False}
+        if _subset_info.get("ok"):
+            return dict(_subset_info)
+
+    if _font_info is None:
+        with _lock:
+            if _font_info is None:
+                _font_info = _register_full_font()
+    return dict(_font_info)
+
+
+def reset_font_registry() -> None:
+    """캐시된 폰트 정보 초기화 (테스트/디버깅용, ReportLab 등록은 유지)"""
+    global _font_info, _subset_info
+    with _lock:
+        _font_info = None
+        _subset_info = None
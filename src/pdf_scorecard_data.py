@@ -0,0 +1,512 @@
+"""
+PDF 성적표 데이터 수집 레이어 (set-based)
+
+- (store, month) 단위로 테이블을 1회씩만 조회하고, 섹션(요약/매출흐름/원가/메뉴/룰)이 같은 DataFrame을 공유
+- 재료/메뉴 TOP 10은 groupby/merge로 벡터화 계산 (iterrows/dict 루프 제거)
+- UI 모듈(ui_pages.*) import 금지: PDF 생성 시 홈 패키지 전체를 로드하지 않도록 룰 함수를 DataFrame 기반으로 재구성
+
+룰 기준일(as_of):
+- 이번 달 성적표: 오늘 (홈 룰과 동일)
+- 지난 달 성적표: 해당 월 말일 (오늘 기준으로 과거 월을 평가하지 않도록)
+"""
+from __future__ import annotations
+
+import logging
+from datetime import datetime, date, timedelta
+from zoneinfo import ZoneInfo
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+KST = ZoneInfo("Asia/Seoul")
+
+# 룰 계산에 필요한 최대 과거 일수 (판매량 10일 비교: 최근 5일 vs 직전 5일)
+_RULE_LOOKBACK_DAYS = 10
+
+_WEEKDAY_NAMES = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+# 문제/잘한점 중 "데이터 부족" 안내 문구 (PDF에서는 제외)
+_PROBLEM_PLACEHOLDERS = ("데이터를 불러올 수 없습니다", "아직 분석할 데이터가 충분하지 않습니다")
+_GOOD_PLACEHOLDERS = ("데이터를 불러올 수 없습니다", "데이터가 쌓이면 자동 분석됩니다")
+
+
+# ============================================
+# 기간 계산
+# ============================================
+
+def month_range(year: int, month: int) -> Tuple[date, date]:
+    """해당 월의 [시작일, 다음달 1일) 반환"""
+    start = date(year, month, 1)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start, end
+
+
+def resolve_as_of(year: int, month: int, today: date | None = None) -> date:
+    """룰 기준일: 이번 달이면 오늘, 지난 달이면 말일, 미래 월이면 1일"""
+    if today is None:
+        today = datetime.now(KST).date()
+    start, end = month_range(year, month)
+    if today < start:
+        return start
+    return min(today, end - timedelta(days=1))
+
+
+# ============================================
+# 조회 (테이블당 1회)
+# ============================================
+
+def _rows_to_df(result, columns: List[str]) -> pd.DataFrame:
+    """Supabase 응답 → DataFrame (빈 응답도 컬럼 보장)"""
+    rows = result.data if result is not None and result.data else []
+    df = pd.DataFrame(rows)
+    for col in columns:
+        if col not in df.columns:
+            df[col] = pd.Series(dtype="object")
+    return df[columns]
+
+
+def _count_rows(result) -> int:
+    """count='exact' 응답에서 건수 추출"""
+    if hasattr(result, "count") and result.count is not None:
+        return int(result.count)
+    return len(result.data) if result.data else 0
+
+
+def count_daily_close(supabase, store_id: str) -> int:
+    """점장마감 누적 건수 (head 조회 1회)"""
+    try:
+        r = supabase.table("daily_close").select("id", count="exact").eq("store_id", store_id).limit(1).execute()
+        return _count_rows(r)
+    except Exception:
+        return 0
+
+
+def load_scorecard_frames(supabase, store_id: str, year: int, month: int, as_of: date | None = None) -> Dict:
+    """
+    성적표 1건에 필요한 원천 데이터를 테이블당 1회 조회
+
+    날짜 범위 테이블(sales/daily_close/v_daily_sales_items_effective)은
+    [min(월 시작일, as_of - 10일), 다음달 1일) 한 번으로 월 집계와 최근 N일 룰을 모두 커버한다.
+
+    Returns:
+        dict: store_name, operating_profit, has_settlement, close_count,
+              sales_df(date, total_sales), close_df(date), items_df(date, menu_id, qty),
+              menus_df(id, name, price), recipes_df(menu_id, ingredient_id, qty),
+              ingredients_df(id, name, unit_cost), month_start, month_end, as_of
+    """
+    month_start, month_end = month_range(year, month)
+    if as_of is None:
+        as_of = resolve_as_of(year, month)
+    window_start = min(month_start, as_of - timedelta(days=_RULE_LOOKBACK_DAYS))
+
+    frames = {
+        "store_name": None,
+        "operating_profit": None,
+        "has_settlement": False,
+        "close_count": 0,
+        "month_start": month_start,
+        "month_end": month_end,
+        "as_of": as_of,
+    }
+
+    try:
+        r = supabase.table("stores").select("name").eq("id", store_id).limit(1).execute()
+        frames["store_name"] = (r.data[0].get("name") if r.data else None) or "가게"
+    except Exception:
+        frames["store_name"] = "가게"
+
+    try:
+        r = supabase.table("actual_settlement").select("operating_profit").eq("store_id", store_id)\
+            .eq("year", year).eq("month", month).limit(1).execute()
+        if r.data:
+            frames["has_settlement"] = True
+            if r.data[0].get("operating_profit") is not None:
+                frames["operating_profit"] = float(r.data[0]["operating_profit"])
+    except Exception:
+        pass
+
+    frames["close_count"] = count_daily_close(supabase, store_id)
+
+    def _range_query(table: str, columns: str):
+        return supabase.table(table).select(columns).eq("store_id", store_id)\
+            .gte("date", window_start.isoformat()).lt("date", month_end.isoformat())\
+            .order("date", desc=False).execute()
+
+    def _safe(loader, columns: List[str], label: str) -> pd.DataFrame:
+        try:
+            return _rows_to_df(loader(), columns)
+        except Exception as e:
+            logger.warning(f"scorecard frames: failed to load {label}: {e}")
+            return pd.DataFrame(columns=columns)
+
+    sales_df = _safe(lambda: _range_query("sales", "date, total_sales"), ["date", "total_sales"], "sales")
+    close_df = _safe(lambda: _range_query("daily_close", "date"), ["date"], "daily_close")
+    items_df = _safe(lambda: _range_query("v_daily_sales_items_effective", "date, menu_id, qty"),
+                     ["date", "menu_id", "qty"], "v_daily_sales_items_effective")
+    menus_df = _safe(lambda: supabase.table("menu_master").select("id, name, price").eq("store_id", store_id).execute(),
+                     ["id", "name", "price"], "menu_master")
+    recipes_df = _safe(lambda: supabase.table("recipes").select("menu_id, ingredient_id, qty").eq("store_id", store_id).execute(),
+                       ["menu_id", "ingredient_id", "qty"], "recipes")
+    ingredients_df = _safe(lambda: supabase.table("ingredients").select("id, name, unit_cost").eq("store_id", store_id).execute(),
+                           ["id", "name", "unit_cost"], "ingredients")
+
+    # 타입 정규화 (섹션별 재변환 방지)
+    sales_df["date"] = pd.to_datetime(sales_df["date"], errors="coerce").dt.date
+    sales_df["total_sales"] = pd.to_numeric(sales_df["total_sales"], errors="coerce").fillna(0.0).astype(float)
+    sales_df = sales_df.dropna(subset=["date"]).drop_duplicates("date", keep="last").reset_index(drop=True)
+
+    close_df["date"] = pd.to_datetime(close_df["date"], errors="coerce").dt.date
+    close_df = close_df.dropna(subset=["date"]).drop_duplicates("date").reset_index(drop=True)
+
+    items_df["date"] = pd.to_datetime(items_df["date"], errors="coerce").dt.date
+    items_df["qty"] = pd.to_numeric(items_df["qty"], errors="coerce").fillna(0).astype(int)
+    items_df = items_df.dropna(subset=["date", "menu_id"]).reset_index(drop=True)
+
+    menus_df["name"] = menus_df["name"].fillna("")
+    menus_df["price"] = pd.to_numeric(menus_df["price"], errors="coerce").fillna(0.0).astype(float)
+    recipes_df["qty"] = pd.to_numeric(recipes_df["qty"], errors="coerce").fillna(0.0).astype(float)
+    ingredients_df["name"] = ingredients_df["name"].fillna("")
+    ingredients_df["unit_cost"] = pd.to_numeric(ingredients_df["unit_cost"], errors="coerce").fillna(0.0).astype(float)
+
+    frames.update({
+        "sales_df": sales_df,
+        "close_df": close_df,
+        "items_df": items_df,
+        "menus_df": menus_df,
+        "recipes_df": recipes_df,
+        "ingredients_df": ingredients_df,
+    })
+    return frames
+
+
+# ============================================
+# 섹션 계산 (DataFrame 공유)
+# ============================================
+
+def _between(df: pd.DataFrame, start: date, end: date, inclusive_end: bool = True) -> pd.DataFrame:
+    """date 컬럼 기준 기간 필터"""
+    if df.empty:
+        return df
+    upper = df["date"] <= end if inclusive_end else df["date"] < end
+    return df[(df["date"] >= start) & upper]
+
+
+def compute_close_stats(frames: Dict) -> Tuple[int, int, float, int]:
+    """마감률/스트릭 (closed_days, total_days, close_rate, streak_days)"""
+    month_start, month_end, as_of = frames["month_start"], frames["month_end"], frames["as_of"]
+    total_days = (month_end - month_start).days
+    month_close = _between(frames["close_df"], month_start, month_end, inclusive_end=False)
+    closed_days = len(month_close)
+    close_rate = closed_days / total_days if total_days > 0 else 0.0
+    closed_dates = set(month_close["date"])
+    streak_days = 0
+    check = as_of
+    while month_start <= check < month_end and check in closed_dates:
+        streak_days += 1
+        check -= timedelta(days=1)
+    return closed_days, total_days, close_rate, streak_days
+
+
+def compute_sales_series(frames: Dict) -> Tuple[List[Tuple[str, float]], List[Tuple[str, float]] | None]:
+    """일별 매출 시리즈(MM-DD) + 요일별 평균 (7일 이상일 때)"""
+    month_sales = _between(frames["sales_df"], frames["month_start"], frames["month_end"], inclusive_end=False)
+    month_sales = month_sales[month_sales["total_sales"] > 0]
+    if month_sales.empty:
+        return [], None
+    labels = [f"{d.month:02d}-{d.day:02d}" for d in month_sales["date"]]
+    daily_series = list(zip(labels, month_sales["total_sales"].tolist()))
+
+    weekday_series = None
+    if len(daily_series) >= 7:
+        weekday = pd.Series([d.weekday() for d in month_sales["date"]], index=month_sales.index)
+        weekday_avg = month_sales["total_sales"].groupby(weekday).mean()
+        weekday_series = [(_WEEKDAY_NAMES[idx], float(avg)) for idx, avg in weekday_avg.items()] or None
+    return daily_series, weekday_series
+
+
+def _month_items(frames: Dict) -> pd.DataFrame:
+    """이번 달 판매 수량 (qty > 0)"""
+    items = _between(frames["items_df"], frames["month_start"], frames["month_end"], inclusive_end=False)
+    return items[items["qty"] > 0]
+
+
+def compute_ingredient_top10(frames: Dict) -> List[Dict]:
+    """재료 사용 단가 TOP 10 (판매수량 × 레시피 사용량 × 단가, 1회 조인)"""
+    items = _month_items(frames)
+    menus, recipes, ingredients = frames["menus_df"], frames["recipes_df"], frames["ingredients_df"]
+    if items.empty or recipes.empty or ingredients.empty:
+        return []
+
+    menu_qty = items.groupby("menu_id", as_index=False)["qty"].sum()
+    # 매장 메뉴/재료에 속한 레시피만 사용
+    recipes = recipes[recipes["menu_id"].isin(menus["id"]) & recipes["ingredient_id"].isin(ingredients["id"])]
+    usage = menu_qty.merge(recipes, on="menu_id", suffixes=("_sold", "_recipe"))
+    if usage.empty:
+        return []
+    usage["총사용량"] = usage["qty_sold"] * usage["qty_recipe"]
+    summary = usage.groupby("ingredient_id", as_index=False)["총사용량"].sum()
+    summary = summary.merge(ingredients, left_on="ingredient_id", right_on="id", how="left")
+    summary["총사용단가"] = summary["총사용량"] * summary["unit_cost"].fillna(0.0)
+    top10 = summary.sort_values("총사용단가", ascending=False, kind="stable").head(10)
+    return [
+        {"재료명": name, "사용단가": float(cost), "사용량": float(qty)}
+        for name, cost, qty in zip(top10["name"], top10["총사용단가"], top10["총사용량"])
+    ]
+
+
+def compute_menu_top10(frames: Dict) -> Tuple[List[Dict], float | None]:
+    """메뉴 매출 TOP 10 + 상위 1개 메뉴 판매량 비중(%)"""
+    items = _month_items(frames)
+    menus = frames["menus_df"]
+    if items.empty or menus.empty:
+        return [], None
+    summary = items.groupby("menu_id", as_index=False)["qty"].sum()
+    summary = summary.merge(menus, left_on="menu_id", right_on="id", how="inner")
+    if summary.empty:
+        return [], None
+    summary["매출"] = summary["qty"] * summary["price"]
+    top10 = summary.sort_values("매출", ascending=False, kind="stable").head(10)
+    menu_top10 = [
+        {"메뉴명": name, "판매량": int(qty), "매출": float(amount)}
+        for name, qty, amount in zip(top10["name"], top10["qty"], top10["매출"])
+    ]
+    total_qty = summary["qty"].sum()
+    concentration = float(summary["qty"].max() / total_qty * 100) if total_qty > 0 else None
+    return menu_top10, concentration
+
+
+# ============================================
+# 룰 (홈 문제/잘한점/이상징후와 동일 기준, as_of 기준일)
+# ============================================
+
+def _recent_sales(frames: Dict, days: int, positive_only: bool) -> pd.Series:
+    """as_of 기준 최근 N일 sales (date → total_sales, 날짜순)"""
+    as_of = frames["as_of"]
+    window = _between(frames["sales_df"], as_of - timedelta(days=days), as_of)
+    if positive_only:
+        window = window[window["total_sales"] > 0]
+    return pd.Series(window["total_sales"].values, index=window["date"].values, dtype=float)
+
+
+def _month_positive_sales(frames: Dict) -> pd.Series:
+    """이번 달 as_of까지 매출 > 0인 날"""
+    window = _between(frames["sales_df"], frames["month_start"], frames["month_end"], inclusive_end=False)
+    window = window[(window["total_sales"] > 0) & (window["date"] <= frames["as_of"])]
+    return pd.Series(window["total_sales"].values, index=window["date"].values, dtype=float)
+
+
+def _three_day_trend(frames: Dict) -> float:
+    """최근 3일 평균 - 직전 3일 평균 (6일 미만이면 0, 직전 평균이 0이면 0)"""
+    recent = _recent_sales(frames, 6, positive_only=False)
+    if len(recent) < 6:
+        return 0.0
+    r3, p3 = recent.iloc[-3:].mean(), recent.iloc[-6:-3].mean()
+    return float(r3 - p3) if p3 > 0 else 0.0
+
+
+def _has_close_gap(frames: Dict) -> bool:
+    """이번 달 as_of 전날까지 마감하지 않은 날 존재 여부"""
+    month_start, as_of = frames["month_start"], frames["as_of"]
+    expected_days = (min(as_of, frames["month_end"]) - month_start).days
+    if expected_days <= 0:
+        return False
+    closed = _between(frames["close_df"], month_start, as_of, inclusive_end=False)
+    return len(closed) < expected_days
+
+
+def _week_items(frames: Dict) -> pd.DataFrame:
+    as_of = frames["as_of"]
+    return _between(frames["items_df"], as_of - timedelta(days=7), as_of)
+
+
+def _menu_share(items: pd.DataFrame) -> Tuple[pd.Series, int]:
+    """메뉴별 판매량(qty > 0)과 총합"""
+    items = items[items["qty"] > 0]
+    per_menu = items.groupby("menu_id")["qty"].sum()
+    return per_menu, int(per_menu.sum())
+
+
+def compute_problems_top3(frames: Dict) -> List[Dict]:
+    """문제 TOP3 (룰 기반)"""
+    problems = []
+    if _three_day_trend(frames) < 0:
+        problems.append({"text": "최근 3일 평균 매출이 직전 기간보다 감소했습니다.", "target_page": "매출 관리"})
+    month_sales = _month_positive_sales(frames)
+    if not month_sales.empty:
+        min_day = month_sales.idxmin()
+        if 0 <= (frames["as_of"] - min_day).days <= 3:
+            problems.append({"text": "이번 달 최저 매출일이 최근에 발생했습니다.", "target_page": "매출 관리"})
+    if _has_close_gap(frames):
+        problems.append({"text": "이번 달 마감하지 않은 날이 있습니다.", "target_page": "점장 마감"})
+    week = _week_items(frames)
+    if not week.empty:
+        per_menu, total = _menu_share(week)
+        if total > 0 and per_menu.max() / total >= 0.5:
+            problems.append({"text": "상위 1개 메뉴가 전체 판매의 50% 이상을 차지합니다.", "target_page": "판매 관리"})
+        if week["date"].nunique() <= 2:
+            problems.append({"text": "최근 일주일 판매 데이터가 거의 없습니다.", "target_page": "점장 마감"})
+    return problems[:3] if problems else [{"text": "아직 분석할 데이터가 충분하지 않습니다.", "target_page": "점장 마감"}]
+
+
+def compute_good_points_top3(frames: Dict, streak_days: int) -> List[Dict]:
+    """잘한 점 TOP3 (룰 기반)"""
+    good_points = []
+    if _three_day_trend(frames) > 0:
+        good_points.append({"text": "최근 3일 평균 매출이 이전 기간보다 증가했습니다.", "target_page": "매출 관리"})
+    month_sales = _month_positive_sales(frames)
+    if not month_sales.empty:
+        # 동률이면 가장 최근 날짜 (홈 룰과 동일)
+        max_day = month_sales[month_sales == month_sales.max()].index.max()
+        if 0 <= (frames["as_of"] - max_day).days <= 3:
+            good_points.append({"text": "이번 달 최고 매출일이 최근에 발생했습니다.", "target_page": "매출 관리"})
+    if streak_days >= 3:
+        good_points.append({"text": "연속 마감 기록이 유지되고 있습니다.", "target_page": "점장 마감"})
+    week = _week_items(frames)
+    if not week.empty:
+        per_menu, total = _menu_share(week)
+        if total > 0 and per_menu.max() / total < 0.5 and len(per_menu) >= 3:
+            good_points.append({"text": "최근 판매가 여러 메뉴로 분산되고 있습니다.", "target_page": "판매 관리"})
+        if week["date"].nunique() >= 5:
+            good_points.append({"text": "최근 일주일 판매 입력이 꾸준히 이루어지고 있습니다.", "target_page": "판매 관리"})
+    return good_points[:3] if good_points else [{"text": "데이터가 쌓이면 자동 분석됩니다.", "target_page": "점장 마감"}]
+
+
+def compute_anomaly_signals(frames: Dict) -> List[Dict]:
+    """이상 징후 (조기경보, 최대 3개)"""
+    signals = []
+    as_of = frames["as_of"]
+    recent = _recent_sales(frames, 7, positive_only=True)
+    if len(recent) >= 3:
+        a, b, c = recent.iloc[-3:].tolist()
+        if a > b > c:
+            signals.append({"icon": "📉", "text": "최근 3일 연속 매출이 감소하고 있습니다.", "target_page": "매출 관리"})
+    if 8 - len(recent) >= 2:
+        signals.append({"icon": "⚠️", "text": "최근 7일 중 매출이 입력되지 않은 날이 2일 이상 있습니다.", "target_page": "매출 관리"})
+    if len(signals) >= 3:
+        return signals[:3]
+
+    month_sales = _between(frames["sales_df"], frames["month_start"], frames["month_end"], inclusive_end=False)
+    month_sales = month_sales[month_sales["total_sales"] > 0]["total_sales"]
+    if len(recent) >= 3 and len(month_sales) >= 3:
+        month_avg = month_sales.mean()
+        if month_avg > 0:
+            ratio = recent.iloc[-3:].mean() / month_avg
+            if ratio <= 0.7 or ratio >= 1.3:
+                signals.append({"icon": "📊", "text": "최근 매출 흐름이 이번 달 평균 대비 크게 변했습니다.", "target_page": "매출 관리"})
+                if len(signals) >= 3:
+                    return signals[:3]
+
+    items = frames["items_df"]
+    r3 = _between(items, as_of - timedelta(days=3), as_of)
+    p3 = _between(items, as_of - timedelta(days=6), as_of - timedelta(days=3), inclusive_end=False)
+    if not r3.empty and not p3.empty:
+        rmt, rtot = _menu_share(r3)
+        pmt, ptot = _menu_share(p3)
+        if rtot > 0 and ptot > 0:
+            shares = pd.DataFrame({"r": rmt / rtot}).join(pd.DataFrame({"p": pmt / ptot}), how="left").fillna(0.0)
+            if ((shares["p"] > 0) & (shares["r"] >= shares["p"] * 1.5)).any():
+                signals.append({"icon": "🍽️", "text": "최근 판매에서 특정 메뉴 비중이 급격히 증가했습니다.", "target_page": "판매 관리"})
+                if len(signals) >= 3:
+                    return signals[:3]
+
+    five_ago = as_of - timedelta(days=5)
+    s5 = _between(items, five_ago, as_of)
+    p5 = _between(items, five_ago - timedelta(days=5), five_ago, inclusive_end=False)
+    if not s5.empty and not p5.empty:
+        rq, pq = int(s5["qty"].sum()), int(p5["qty"].sum())
+        if pq > 0 and rq / pq <= 0.7:
+            signals.append({"icon": "📉", "text": "최근 판매량이 눈에 띄게 줄었습니다.", "target_page": "판매 관리"})
+            if len(signals) >= 3:
+                return signals[:3]
+
+    closed_recent = _between(frames["close_df"], as_of - timedelta(days=2), as_of)
+    if closed_recent.empty:
+        signals.append({"icon": "⏰", "text": "최근 3일 연속 마감이 없습니다.", "target_page": "점장 마감"})
+    return signals[:3]
+
+
+def detect_day_level(frames: Dict) -> str | None:
+    """DAY1/DAY3/DAY7 판별 (누적 마감 건수 + 해당 월 정산 여부)"""
+    n = frames["close_count"]
+    if 0 < n < 3:
+        return "DAY1"
+    if n >= 3:
+        return "DAY7" if frames["has_settlement"] else "DAY3"
+    return None
+
+
+def _count_real(items: List[Dict], placeholders: Tuple[str, ...]) -> int:
+    return len([i for i in items if not any(p in i.get("text", "") for p in placeholders)])
+
+
+def build_coach_summary(problems: List[Dict], goods: List[Dict], signals: List[Dict], day_level: str | None) -> str:
+    """코치 요약 문장 (DAY 단계 톤)"""
+    if day_level == "DAY1":
+        return "아직은 데이터를 쌓는 중입니다. 3일만 지나면 가게 흐름이 보이기 시작합니다."
+    problem_count = _count_real(problems, _PROBLEM_PLACEHOLDERS)
+    signal_count = len(signals)
+
+    def _any(items, subject, words):
+        return any(subject in i.get("text", "") and any(w in i.get("text", "") for w in words) for i in items)
+
+    has_good_sales = _any(goods, "매출", ("증가", "최고"))
+    has_good_close = any("마감" in g.get("text", "") for g in goods)
+    if day_level == "DAY3":
+        if has_good_sales and has_good_close:
+            return "이번 달은 구조가 안정적이고, 운영 리듬도 잘 유지되고 있습니다."
+        if has_good_sales:
+            return "이번 달은 매출 흐름이 양호하고, 운영이 안정적으로 진행되고 있습니다."
+        if problem_count == 0:
+            return "이번 달은 전반적으로 안정적인 상태를 유지하고 있습니다."
+        return "이번 달 가게 상태를 점검 중입니다."
+    has_sales_decline = _any(problems, "매출", ("감소", "떨어"))
+    has_close_gap = _any(problems, "마감", ("공백", "누락", "없는 날"))
+    if has_sales_decline and signal_count > 0:
+        return "최근 매출이 떨어지고 있어, 원인 점검이 필요한 상태입니다."
+    if has_sales_decline:
+        return "이번 달은 매출 흐름이 불안정하여 관리가 필요합니다."
+    if has_close_gap:
+        return "마감 데이터가 끊겨 있어, 가게 상태 파악이 어려운 상황입니다."
+    if problem_count > 0 and signal_count > 0:
+        return "이번 달은 변동성이 증가하고 있어, 원인 추적이 필요한 상태입니다."
+    if has_good_sales and has_good_close:
+        return "이번 달은 구조가 안정적이고, 운영 리듬도 잘 유지되고 있습니다."
+    if has_good_sales:
+        return "이번 달은 매출 흐름이 양호하고, 운영이 안정적으로 진행되고 있습니다."
+    if problem_count == 0 and signal_count == 0:
+        return "이번 달은 전반적으로 안정적인 상태를 유지하고 있습니다."
+    return "이번 달 가게 상태를 점검 중입니다."
+
+
+def build_month_status_summary(problems: List[Dict], signals: List[Dict], has_settlement: bool,
+                               monthly_sales: float, day_level: str | None) -> str:
+    """이번 달 가게 상태 한 줄 (DAY prefix)"""
+    problem_count = _count_real(problems, _PROBLEM_PLACEHOLDERS)
+    signal_count = len(signals)
+    if problem_count == 0 and signal_count == 0 and has_settlement:
+        status_text = "'구조 안정 + 운영 리듬 양호' 상태입니다." if monthly_sales > 0 else "'데이터 수집 중' 상태입니다."
+    elif problem_count > 0 or signal_count > 0:
+        status_text = "'변동성 증가, 원인 추적 필요' 상태입니다." if has_settlement else "'관리 필요, 데이터 보완 필요' 상태입니다."
+    elif has_settlement:
+        status_text = "'매출은 유지, 이익은 관리 필요' 상태입니다."
+    else:
+        status_text = "'데이터 수집 중' 상태입니다."
+    if day_level == "DAY1":
+        return f"이번 달은 아직 구조를 만드는 중입니다. ({status_text})"
+    if day_level == "DAY3":
+        return f"이번 달 가게 상태가 정리되기 시작했습니다. ({status_text})"
+    if day_level == "DAY7":
+        return f"이번 달 가게 상태 요약입니다. ({status_text})"
+    return f"이번 달은 {status_text}"
+
+
+def filter_problem_texts(problems: List[Dict]) -> List[str]:
+    """문제 TOP3 텍스트 ('데이터 부족' 안내 문구 제외)"""
+    return [p.get("text", "") for p in problems[:3] if _count_real([p], _PROBLEM_PLACEHOLDERS)]
+
+
+def filter_good_texts(goods: List[Dict]) -> List[str]:
+    """잘한 점 TOP3 텍스트 ('데이터 부족' 안내 문구 제외)"""
+    return [g.get("text", "") for g in goods[:3] if _count_real([g], _GOOD_PLACEHOLDERS)]
@@ -4,8 +4,6 @@ ReportLab 기반 최소 6페이지 PDF 생성
 """
 import logging
 from io import BytesIO
-from datetime import datetime, date
-from zoneinfo import ZoneInfo
 from typing import Tuple, Optional, Dict, List
 
 try:
@@ -14,85 +12,37 @@ try:
     from reportlab.lib.colors import HexColor, black, white
     from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
     from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
-    from reportlab.pdfbase import pdfmetrics
-    from reportlab.pdfbase.ttfonts import TTFont
     REPORTLAB_AVAILABLE = True
 except ImportError:
     REPORTLAB_AVAILABLE = False
 
+from src.pdf_fonts import get_korean_font
+
 logger = logging.getLogger(__name__)
 
 
-def register_korean_font() -> Dict:
+def register_korean_font(text: Optional[str] = None) -> Dict:
     """
-    한글 폰트 등록 시도 (STEP 2-A)
+    한글 폰트 등록 (src.pdf_fonts 공용 레지스트리, 프로세스당 1회)
     
-    우선순위:
-    1. 프로젝트 assets/fonts/ 폴더의 폰트 파일
-    2. Windows 기본 폰트
-    3. Fallback: Helvetica (한글 최소화 모드)
+    Args:
+        text: PDF 문구 (PDF_FONT_SUBSET=1일 때 서브셋 폰트 커버 여부 확인용)
     
     Returns:
         dict: {"ok": bool, "font_name": str, "reason": str}
     """
-    result = {
-        "ok": False,
-        "font_name": "Helvetica",
-        "reason": "폰트 파일을 찾을 수 없습니다. Helvetica로 fallback합니다."
-    }
-    
-    if not REPORTLAB_AVAILABLE:
-        result["reason"] = "ReportLab이 설치되지 않았습니다."
-        return result
-    
-    # 우선순위 1: 프로젝트 assets/fonts/ 폴더
-    import os
-    font_paths = [
-        "assets/fonts/NotoSansKR-Regular.ttf",
-        "assets/fonts/Pretendard-Regular.ttf",
-        "assets/fonts/AppleSDGothicNeo.ttf"
-    ]
-    
-    for font_path in font_paths:
-        if os.path.exists(font_path):
-            try:
-                pdfmetrics.registerFont(TTFont('KoreanFont', font_path))
-                result["ok"] = True
-                result["font_name"] = "KoreanFont"
-                result["reason"] = f"폰트 등록 성공: {font_path}"
-                logger.info(f"Korean font registered: {font_path}")
-                return result
-            except Exception as e:
-                logger.warning(f"Failed to register font {font_path}: {e}")
-                continue
-    
-    # 우선순위 2: Windows 기본 폰트
-    try:
-        import platform
-        if platform.system() == "Windows":
-            windows_fonts = [
-                "C:/Windows/Fonts/malgun.ttf",
-                "C:/Windows/Fonts/gulim.ttc",
-                "C:/Windows/Fonts/batang.ttc"
-            ]
-            for font_path in windows_fonts:
-                if os.path.exists(font_path):
-                    try:
-                        pdfmetrics.registerFont(TTFont('KoreanFont', font_path))
-                        result["ok"] = True
-                        result["font_name"] = "KoreanFont"
-                        result["reason"] = f"폰트 등록 성공: {font_path}"
-                        logger.info(f"Korean font registered: {font_path}")
-                        return result
-                    except Exception as e:
-                        logger.warning(f"Failed to register font {font_path}: {e}")
-                        continue
-    except Exception as e:
-        logger.warning(f"Failed to check Windows fonts: {e}")
-    
-    # Fallback: Helvetica
-    logger.info("Using Helvetica fallback (Korean font not available)")
-    return result
+    return get_korean_font(text=text)
+
+
+def _collect_text(value) -> str:
+    """데이터 dict 내 문자열 수집 (서브셋 폰트 커버 확인용)"""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        return "".join(_collect_text(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return "".join(_collect_text(v) for v in value)
+    return ""
 
 
 # 전역 폰트 정보 (build_scorecard_pdf_bytes에서 초기화)
@@ -120,7 +70,7 @@ def can_generate_scorecard(store_id: str, year: int, month: int) -> Tuple[bool,
             get_month_settlement_status,
             load_monthly_sales_total
         )
-        from ui_pages._legacy.home_pkg_20260126.home_data import get_close_count
+        from src.pdf_scorecard_data import count_daily_close
         
         supabase = get_supabase_client()
         if not supabase:
@@ -137,7 +87,7 @@ def can_generate_scorecard(store_id: str, year: int, month: int) -> Tuple[bool,
             return True, ""
         
         # 조건 3: daily_close 1건 이상
-        close_count = get_close_count(store_id)
+        close_count = count_daily_close(supabase, store_id)
         if close_count > 0:
             return True, ""
         
@@ -150,7 +100,10 @@ def can_generate_scorecard(store_id: str, year: int, month: int) -> Tuple[bool,
 
 def gather_scorecard_mvp_data(store_id: str, year: int, month: int) -> Dict:
     """
-    PDF 성적표에 필요한 데이터 수집 (SSOT 함수만 사용)
+    PDF 성적표에 필요한 데이터 수집 (SSOT 함수 + set-based 조회)
+    
+    원천 테이블은 src.pdf_scorecard_data.load_scorecard_frames에서 (store, month)당 1회만 조회하고,
+    모든 섹션이 같은 DataFrame을 공유한다. UI 모듈은 import하지 않는다.
     
     Returns:
         dict: PDF 생성에 필요한 모든 데이터
@@ -189,160 +142,68 @@ def gather_scorecard_mvp_data(store_id: str, year: int, month: int) -> Dict:
             get_variable_cost_ratio,
             calculate_break_even_sales
         )
-        from ui_pages._legacy.home_pkg_20260126.home_rules import (
-            get_problems_top3,
-            get_good_points_top3,
-        )
-        from ui_pages._legacy.home_pkg_20260126.home_alerts import get_anomaly_signals
-        from ui_pages._legacy.home_pkg_20260126.home_page import get_coach_summary
-            get_month_status_summary,
-            get_monthly_close_stats,
-            detect_owner_day_level,
-            get_store_financial_structure
-        )
+        from src import pdf_scorecard_data as sd
         
         supabase = get_supabase_client()
         if not supabase:
             return data
         
-        # 가게 이름
-        try:
-            store_result = supabase.table("stores").select("name").eq("id", store_id).limit(1).execute()
-            if store_result.data:
-                from src.ui_helpers import safe_resp_first_data
-                store_data = safe_resp_first_data(store_result)
-                if store_data:
-                    data["store_name"] = store_data.get("name", "가게")
-        except:
-            data["store_name"] = "가게"
+        # 원천 데이터 (테이블당 1회)
+        frames = sd.load_scorecard_frames(supabase, store_id, year, month)
+        data["store_name"] = frames["store_name"]
+        data["operating_profit"] = frames["operating_profit"]
         
-        # 월매출
+        # 월매출 (SSOT)
         data["monthly_sales"] = float(load_monthly_sales_total(store_id, year, month))
         
-        # 영업이익 (actual_settlement에서)
-        try:
-            settlement_result = supabase.table("actual_settlement")\
-                .select("operating_profit")\
-                .eq("store_id", store_id)\
-                .eq("year", year)\
-                .eq("month", month)\
-                .limit(1)\
-                .execute()
-            from src.ui_helpers import safe_resp_first_data
-            settlement_data = safe_resp_first_data(settlement_result)
-            if settlement_data and settlement_data.get("operating_profit") is not None:
-                data["operating_profit"] = float(settlement_data.get("operating_profit", 0))
-        except:
-            pass
-        
         # 마감률/스트릭
-        try:
-            close_stats = get_monthly_close_stats(store_id, year, month)
-            closed_days, total_days, close_rate, streak_days = close_stats
-            if total_days > 0:
-                data["close_rate"] = close_rate
-            data["close_streak"] = streak_days
-        except:
-            pass
+        closed_days, total_days, close_rate, streak_days = sd.compute_close_stats(frames)
+        if total_days > 0:
+            data["close_rate"] = close_rate
+        data["close_streak"] = streak_days
         
-        # 일별 매출 시리즈
+        # 일별 매출 시리즈 + 요일별 평균
         try:
-            KST = ZoneInfo("Asia/Seoul")
-            start_date = date(year, month, 1)
-            if month == 12:
-                end_date = date(year + 1, 1, 1)
-            else:
-                end_date = date(year, month + 1, 1)
-            
-            sales_result = supabase.table("sales")\
-                .select("date, total_sales")\
-                .eq("store_id", store_id)\
-                .gte("date", start_date.isoformat())\
-                .lt("date", end_date.isoformat())\
-                .order("date", desc=False)\
-                .execute()
-            
-            if sales_result.data:
-                for row in sales_result.data:
-                    date_str = row.get("date", "")
-                    total = float(row.get("total_sales", 0) or 0)
-                    if date_str and total > 0:
-                        # 날짜 포맷: MM-DD
-                        try:
-                            date_obj = datetime.strptime(date_str, "%Y-%m-%d").date()
-                            date_label = f"{date_obj.month:02d}-{date_obj.day:02d}"
-                            data["sales_daily_series"].append((date_label, total))
-                        except:
-                            pass
-        except:
-            pass
+            data["sales_daily_series"], data["sales_weekday_series"] = sd.compute_sales_series(frames)
+        except Exception as e:
+            logger.warning(f"Failed to build sales series: {e}")
         
-        # 요일별 평균 (선택적, 데이터 충분 시)
-        if len(data["sales_daily_series"]) >= 7:
-            try:
-                weekday_totals = {"Mon": [], "Tue": [], "Wed": [], "Thu": [], "Fri": [], "Sat": [], "Sun": []}
-                weekday_names = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
-                
-                for date_label, total in data["sales_daily_series"]:
-                    try:
-                        date_obj = datetime.strptime(f"{year}-{date_label}", "%Y-%m-%d").date()
-                        weekday_idx = date_obj.weekday()
-                        weekday_name = weekday_names[weekday_idx]
-                        weekday_totals[weekday_name].append(total)
-                    except:
-                        pass
-                
-                weekday_avg = []
-                for wd in weekday_names:
-                    if weekday_totals[wd]:
-                        avg = sum(weekday_totals[wd]) / len(weekday_totals[wd])
-                        weekday_avg.append((wd, avg))
-                
-                if weekday_avg:
-                    data["sales_weekday_series"] = weekday_avg
-            except:
-                pass
+        # 손익 구조 (SSOT)
+        fixed_cost = float(get_fixed_costs(store_id, year, month))
+        variable_ratio = float(get_variable_cost_ratio(store_id, year, month))
+        break_even = float(calculate_break_even_sales(store_id, year, month))
+        data["fixed_cost"] = fixed_cost
+        data["variable_ratio"] = variable_ratio
+        data["break_even_sales"] = break_even
         
-        # 손익 구조
-        data["fixed_cost"] = float(get_fixed_costs(store_id, year, month))
-        data["variable_ratio"] = float(get_variable_cost_ratio(store_id, year, month))
-        data["break_even_sales"] = float(calculate_break_even_sales(store_id, year, month))
+        # 구조 문장 및 예시 (매출 구간 80% / 100% / 120%)
+        if int(break_even) > 0:
+            margin_per_100k = int((100000 * (1 - variable_ratio)))
+            data["structure_sentence"] = f"이 가게는 매출 {int(break_even):,}원부터 흑자가 시작되고, 매출이 10만원 늘면 약 {margin_per_100k:,}원이 남는 구조입니다."
+            for ratio in (0.8, 1.0, 1.2):
+                sales_val = int(break_even * ratio)
+                if sales_val > 0:
+                    profit_val = int(sales_val - fixed_cost - (sales_val * variable_ratio))
+                    label = f"{int(sales_val / int(break_even) * 100)}%"
+                    data["profit_examples"].append((label, sales_val, profit_val))
         
-        # 구조 문장 및 예시
+        # 문제/잘한점/이상징후 (같은 프레임 재사용)
         try:
-            structure = get_store_financial_structure(store_id, year, month)
-            if structure["source"] != "none" and structure["break_even_sales"] > 0:
-                break_even = structure["break_even_sales"]
-                variable_ratio = structure["variable_ratio"]
-                margin_per_100k = int((100000 * (1 - variable_ratio)))
-                data["structure_sentence"] = f"이 가게는 매출 {int(break_even):,}원부터 흑자가 시작되고, 매출이 10만원 늘면 약 {margin_per_100k:,}원이 남는 구조입니다."
-                
-                # 예시 테이블 (3행)
-                if structure.get("example_table"):
-                    examples = structure["example_table"][:3]
-                    for ex in examples:
-                        sales_val = ex["sales"]
-                        profit_val = ex["profit"]
-                        label = f"{int(sales_val / break_even * 100)}%" if break_even > 0 else "100%"
-                        data["profit_examples"].append((label, sales_val, profit_val))
-        except:
-            pass
-        
-        # 문제/잘한점/이상징후
-        try:
-            day_level = detect_owner_day_level(store_id)
-            problems = get_problems_top3(store_id)
-            goods = get_good_points_top3(store_id)
-            signals = get_anomaly_signals(store_id)
+            day_level = sd.detect_day_level(frames)
+            problems = sd.compute_problems_top3(frames)
+            goods = sd.compute_good_points_top3(frames, streak_days)
+            signals = sd.compute_anomaly_signals(frames)
             
-            data["problems_top3"] = [p.get("text", "") for p in problems[:3] if "데이터를 불러올 수 없습니다" not in p.get("text", "") and "아직 분석할 데이터가 충분하지 않습니다" not in p.get("text", "")]
-            data["goods_top3"] = [g.get("text", "") for g in goods[:3] if "데이터를 불러올 수 없습니다" not in g.get("text", "") and "데이터가 쌓이면 자동 분석됩니다" not in g.get("text", "")]
+            data["problems_top3"] = sd.filter_problem_texts(problems)
+            data["goods_top3"] = sd.filter_good_texts(goods)
             data["anomaly_signals"] = [s.get("text", "") for s in signals[:3]]
             
-            data["coach_summary"] = get_coach_summary(store_id, day_level)
-            data["month_status_summary"] = get_month_status_summary(store_id, year, month, day_level)
-        except:
-            pass
+            data["coach_summary"] = sd.build_coach_summary(problems, goods, signals, day_level)
+            data["month_status_summary"] = sd.build_month_status_summary(
+                problems, signals, frames["has_settlement"], data["monthly_sales"], day_level
+            )
+        except Exception as e:
+            logger.warning(f"Failed to evaluate scorecard rules: {e}")
         
         # 코치 액션 (간단 버전)
         if data["problems_top3"]:
@@ -352,207 +213,13 @@ def gather_scorecard_mvp_data(store_id: str, year: int, month: int) -> Dict:
         
         # STEP 2-C: 5P 원가 구조 데이터 (재료 사용 단가 TOP 10)
         try:
-            from src.analytics import calculate_ingredient_usage
-            from src.storage_supabase import load_csv
-            
-            # 이번 달 기간
-            KST = ZoneInfo("Asia/Seoul")
-            start_date = date(year, month, 1)
-            if month == 12:
-                end_date = date(year + 1, 1, 1)
-            else:
-                end_date = date(year, month + 1, 1)
-            
-            # 판매 데이터 로드
-            daily_sales_result = supabase.table("v_daily_sales_items_effective")\
-                .select("date, menu_id, qty")\
-                .eq("store_id", store_id)\
-                .gte("date", start_date.isoformat())\
-                .lt("date", end_date.isoformat())\
-                .execute()
-            
-            if daily_sales_result.data:
-                # 메뉴 ID -> 메뉴명 매핑
-                menu_result = supabase.table("menu_master")\
-                    .select("id, name")\
-                    .eq("store_id", store_id)\
-                    .execute()
-                menu_map = {m['id']: m['name'] for m in menu_result.data if menu_result.data}
-                
-                # 일일 판매 DataFrame 생성
-                import pandas as pd
-                daily_sales_list = []
-                for row in daily_sales_result.data:
-                    menu_id = row.get('menu_id')
-                    menu_name = menu_map.get(menu_id, f"Menu_{menu_id}")
-                    date_str = row.get('date')
-                    qty = int(row.get('qty', 0) or 0)
-                    if date_str and qty > 0:
-                        daily_sales_list.append({
-                            '날짜': date_str,
-                            '메뉴명': menu_name,
-                            '판매수량': qty
-                        })
-                
-                if daily_sales_list:
-                    daily_sales_df = pd.DataFrame(daily_sales_list)
-                    
-                    # 레시피 로드
-                    recipe_result = supabase.table("recipes")\
-                        .select("menu_id, ingredient_id, qty")\
-                        .eq("store_id", store_id)\
-                        .execute()
-                    
-                    # 재료 정보 로드
-                    ingredient_result = supabase.table("ingredients")\
-                        .select("id, name, unit_cost")\
-                        .eq("store_id", store_id)\
-                        .execute()
-                    
-                    if recipe_result.data and ingredient_result.data:
-                        # 재료 ID -> 재료명/단가 매핑
-                        ingredient_map = {}
-                        for ing in ingredient_result.data:
-                            ing_id = ing.get('id')
-                            ingredient_map[ing_id] = {
-                                'name': ing.get('name', ''),
-                                'unit_cost': float(ing.get('unit_cost', 0) or 0)
-                            }
-                        
-                        # 레시피 DataFrame 생성
-                        recipe_list = []
-                        for r in recipe_result.data:
-                            menu_id = r.get('menu_id')
-                            menu_name = menu_map.get(menu_id)
-                            if menu_name:
-                                ing_id = r.get('ingredient_id')
-                                ing_info = ingredient_map.get(ing_id)
-                                if ing_info:
-                                    recipe_list.append({
-                                        '메뉴명': menu_name,
-                                        '재료명': ing_info['name'],
-                                        '사용량': float(r.get('qty', 0))
-                                    })
-                        
-                        if recipe_list:
-                            recipe_df = pd.DataFrame(recipe_list)
-                            
-                            # 재료 사용량 계산
-                            usage_df = calculate_ingredient_usage(daily_sales_df, recipe_df)
-                            
-                            if not usage_df.empty:
-                                # 재료별 집계
-                                ingredient_summary = usage_df.groupby('재료명')['총사용량'].sum().reset_index()
-                                
-                                # 재료 단가 조인
-                                ingredient_cost_list = []
-                                for ing in ingredient_result.data:
-                                    ing_id = ing.get('id')
-                                    ing_info = ingredient_map.get(ing_id)
-                                    if ing_info:
-                                        ingredient_cost_list.append({
-                                            '재료명': ing_info['name'],
-                                            '단가': ing_info['unit_cost']
-                                        })
-                                
-                                if ingredient_cost_list:
-                                    ingredient_cost_df = pd.DataFrame(ingredient_cost_list)
-                                    ingredient_summary = pd.merge(
-                                        ingredient_summary,
-                                        ingredient_cost_df,
-                                        on='재료명',
-                                        how='left'
-                                    )
-                                    ingredient_summary['단가'] = ingredient_summary['단가'].fillna(0)
-                                    ingredient_summary['총사용단가'] = ingredient_summary['총사용량'] * ingredient_summary['단가']
-                                    
-                                    # TOP 10 정렬
-                                    ingredient_summary = ingredient_summary.sort_values('총사용단가', ascending=False)
-                                    top10 = ingredient_summary.head(10)
-                                    
-                                    data["ingredient_top10"] = [
-                                        {
-                                            "재료명": row['재료명'],
-                                            "사용단가": float(row['총사용단가']),
-                                            "사용량": float(row['총사용량'])
-                                        }
-                                        for _, row in top10.iterrows()
-                                    ]
+            data["ingredient_top10"] = sd.compute_ingredient_top10(frames)
         except Exception as e:
             logger.warning(f"Failed to gather ingredient data: {e}")
         
         # STEP 2-C: 7P 메뉴 구조 데이터
         try:
-            # 이번 달 메뉴별 판매량
-            KST = ZoneInfo("Asia/Seoul")
-            start_date = date(year, month, 1)
-            if month == 12:
-                end_date = date(year + 1, 1, 1)
-            else:
-                end_date = date(year, month + 1, 1)
-            
-            menu_sales_result = supabase.table("v_daily_sales_items_effective")\
-                .select("menu_id, qty")\
-                .eq("store_id", store_id)\
-                .gte("date", start_date.isoformat())\
-                .lt("date", end_date.isoformat())\
-                .execute()
-            
-            if menu_sales_result.data:
-                # 메뉴 정보 로드
-                menu_result = supabase.table("menu_master")\
-                    .select("id, name, price")\
-                    .eq("store_id", store_id)\
-                    .execute()
-                
-                menu_map = {}
-                if menu_result.data:
-                    for m in menu_result.data:
-                        menu_map[m['id']] = {
-                            'name': m.get('name', ''),
-                            'price': float(m.get('price', 0) or 0)
-                        }
-                
-                # 메뉴별 집계
-                import pandas as pd
-                menu_sales_list = []
-                for row in menu_sales_result.data:
-                    menu_id = row.get('menu_id')
-                    menu_info = menu_map.get(menu_id)
-                    if menu_info:
-                        qty = int(row.get('qty', 0) or 0)
-                        if qty > 0:
-                            menu_sales_list.append({
-                                '메뉴명': menu_info['name'],
-                                '판매량': qty,
-                                '판매가': menu_info['price']
-                            })
-                
-                if menu_sales_list:
-                    menu_sales_df = pd.DataFrame(menu_sales_list)
-                    menu_summary = menu_sales_df.groupby('메뉴명').agg({
-                        '판매량': 'sum',
-                        '판매가': 'first'
-                    }).reset_index()
-                    menu_summary['매출'] = menu_summary['판매량'] * menu_summary['판매가']
-                    menu_summary = menu_summary.sort_values('매출', ascending=False)
-                    
-                    top10 = menu_summary.head(10)
-                    data["menu_top10"] = [
-                        {
-                            "메뉴명": row['메뉴명'],
-                            "판매량": int(row['판매량']),
-                            "매출": float(row['매출'])
-                        }
-                        for _, row in top10.iterrows()
-                    ]
-                    
-                    # 메뉴 쏠림도 계산
-                    if len(menu_summary) > 0:
-                        total_qty = menu_summary['판매량'].sum()
-                        if total_qty > 0:
-                            max_qty = menu_summary['판매량'].max()
-                            data["menu_concentration_ratio"] = (max_qty / total_qty) * 100
+            data["menu_top10"], data["menu_concentration_ratio"] = sd.compute_menu_top10(frames)
         except Exception as e:
             logger.warning(f"Failed to gather menu data: {e}")
         
@@ -1161,15 +828,14 @@ def build_scorecard_pdf_bytes(store_id: str, year: int, month: int) -> bytes:
     if not REPORTLAB_AVAILABLE:
         raise ImportError("ReportLab이 설치되지 않았습니다. requirements.txt에 reportlab을 추가해주세요.")
     
-    # STEP 2-A: 폰트 등록 (1회만)
-    global FONT_INFO
-    if FONT_INFO is None:
-        FONT_INFO = register_korean_font()
-        logger.info(f"Font registration: {FONT_INFO['reason']}")
-    
     # 데이터 수집
     data = gather_scorecard_mvp_data(store_id, year, month)
     
+    # STEP 2-A: 폰트 등록 (공용 레지스트리, 프로세스당 1회)
+    global FONT_INFO
+    FONT_INFO = register_korean_font(_collect_text(data))
+    logger.info(f"Font registration: {FONT_INFO['reason']}")
+    
     # PDF 생성
     buffer = BytesIO()
     doc = SimpleDocTemplate(
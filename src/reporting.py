@@ -3,11 +3,8 @@
 """
 import pandas as pd
 import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
 from pathlib import Path
 from datetime import datetime
-import os
-import platform
 import logging
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -15,9 +12,8 @@ from reportlab.lib.units import cm
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak, Image
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 from io import BytesIO
+from src.pdf_fonts import get_korean_font
 
 logger = logging.getLogger(__name__)
 
@@ -26,178 +22,20 @@ plt.rcParams['font.family'] = 'Malgun Gothic'
 plt.rcParams['axes.unicode_minus'] = False
 
 
-def find_windows_korean_fonts():
-    """
-    Windows에서 사용 가능한 한글 폰트 파일 찾기
-    
-    Returns:
-        list: 찾은 폰트 파일 경로 리스트
-    """
-    fonts_found = []
-    
-    try:
-        if platform.system() == "Windows":
-            fonts_dir = os.path.join(os.environ.get('WINDIR', 'C:\\Windows'), 'Fonts')
-            
-            if not os.path.exists(fonts_dir):
-                return fonts_found
-            
-            # 폰트 디렉토리에서 한글 폰트 파일 검색
-            korean_font_patterns = [
-                'malgun', 'gulim', 'batang', 'gungsuh', 'dotum',
-                'NanumGothic', 'NanumBarunGothic', 'NotoSansKR'
-            ]
-            
-            # 디렉토리 내 모든 파일 검색
-            try:
-                for filename in os.listdir(fonts_dir):
-                    filename_lower = filename.lower()
-                    # 한글 폰트 패턴과 일치하는 파일 찾기
-                    for pattern in korean_font_patterns:
-                        if pattern.lower() in filename_lower and (
-                            filename_lower.endswith('.ttf') or 
-                            filename_lower.endswith('.ttc')
-                        ):
-                            font_path = os.path.join(fonts_dir, filename)
-                            if os.path.exists(font_path):
-                                fonts_found.append(font_path)
-                                break
-            except Exception as e:
-                logger.warning(f"Failed to list fonts directory: {e}")
-    except Exception as e:
-        logger.warning(f"Failed to find Windows fonts: {e}")
-    
-    return fonts_found
-
-
 def register_korean_font():
     """
-    한글 폰트 등록 시도
+    ReportLab에 한글 폰트 등록 (src.pdf_fonts 공용 레지스트리 사용, 프로세스당 1회)
     
-    우선순위:
-    1. Windows 기본 폰트 (가장 확실한 방법)
-    2. 프로젝트 assets/fonts/ 폴더의 폰트 파일
-    3. Fallback: Helvetica (한글 미지원, 경고 표시)
+    리포트 문구(메뉴/재료명 등)를 미리 알 수 없으므로 서브셋 대신 전체 폰트 사용
+    (KS X 1001 밖 음절이 빈 상자로 나오지 않도록)
     
     Returns:
-        tuple: (font_name: str, success: bool, message: str)
+        tuple: (font_name, success, message)
     """
-    font_name = "Helvetica"
-    success = False
-    message = "한글 폰트를 찾을 수 없습니다."
-    
-    # 우선순위 1: Windows 기본 폰트 (가장 확실)
-    try:
-        if platform.system() == "Windows":
-            # 실제 존재하는 폰트 파일 찾기
-            found_fonts = find_windows_korean_fonts()
-            
-            # 맑은 고딕 우선 정렬
-            found_fonts.sort(key=lambda x: 0 if 'malgun' in x.lower() else 1)
-            
-            # 찾은 폰트들로 등록 시도
-            for font_path in found_fonts:
-                try:
-                    # 폰트 등록
-                    pdfmetrics.registerFont(TTFont('KoreanFont', font_path))
-                    
-                    # 등록 확인
-                    try:
-                        # 등록 확인 - 여러 방법 시도
-                        try:
-                            registered_names = pdfmetrics.getRegisteredFontNames()
-                            if 'KoreanFont' in registered_names:
-                                # 추가 확인: 폰트 객체 가져오기
-                                try:
-                                    test_font = pdfmetrics.getFont('KoreanFont')
-                                    if test_font:
-                                        font_name = "KoreanFont"
-                                        success = True
-                                        message = f"한글 폰트 등록 성공: {os.path.basename(font_path)}"
-                                        logger.info(f"Korean font registered: {font_path}")
-                                        print(f"[PDF] {message}")
-                                        return (font_name, success, message)
-                                except:
-                                    # 폰트 객체 가져오기 실패해도 등록은 됐을 수 있음
-                                    pass
-                        except Exception as check_e:
-                            logger.warning(f"Font registration check failed: {check_e}")
-                        
-                        # 등록 확인 실패해도 등록은 됐을 수 있으니 시도
-                        font_name = "KoreanFont"
-                        success = True
-                        message = f"한글 폰트 등록: {os.path.basename(font_path)} (확인 불가)"
-                        logger.info(f"Korean font registered (verification failed): {font_path}")
-                        print(f"[PDF] {message}")
-                        return (font_name, success, message)
-                    except Exception as check_e:
-                        # 등록 확인 실패해도 등록은 됐을 수 있음
-                        font_name = "KoreanFont"
-                        success = True
-                        message = f"한글 폰트 등록: {os.path.basename(font_path)} (확인 불가)"
-                        logger.info(f"Korean font registered (check failed): {font_path}")
-                        print(f"[PDF] {message}")
-                        return (font_name, success, message)
-                except Exception as e:
-                    logger.warning(f"Failed to register font {font_path}: {e}")
-                    continue
-            
-            # 찾은 폰트가 없으면 고정 경로 시도
-            fonts_dir = os.path.join(os.environ.get('WINDIR', 'C:\\Windows'), 'Fonts')
-            fixed_paths = [
-                os.path.join(fonts_dir, 'malgun.ttf'),
-                os.path.join(fonts_dir, 'gulim.ttc'),
-                os.path.join(fonts_dir, 'batang.ttc'),
-            ]
-            
-            for font_path in fixed_paths:
-                if os.path.exists(font_path):
-                    try:
-                        pdfmetrics.registerFont(TTFont('KoreanFont', font_path))
-                        font_name = "KoreanFont"
-                        success = True
-                        message = f"한글 폰트 등록 성공: {os.path.basename(font_path)}"
-                        logger.info(f"Korean font registered: {font_path}")
-                        print(f"[PDF] {message}")
-                        return (font_name, success, message)
-                    except Exception as e:
-                        logger.warning(f"Failed to register font {font_path}: {e}")
-                        continue
-    except Exception as e:
-        logger.warning(f"Failed to check Windows fonts: {e}")
-        message = f"Windows 폰트 확인 실패: {e}"
-    
-    # 우선순위 2: 프로젝트 assets/fonts/ 폴더
-    base_dir = Path(__file__).parent.parent
-    font_paths = [
-        base_dir / "assets/fonts/NotoSansKR-Regular.ttf",
-        base_dir / "assets/fonts/Pretendard-Regular.ttf",
-        base_dir / "assets/fonts/AppleSDGothicNeo.ttf"
-    ]
-    
-    for font_path in font_paths:
-        if font_path.exists():
-            try:
-                pdfmetrics.registerFont(TTFont('KoreanFont', str(font_path)))
-                try:
-                    registered_font = pdfmetrics.getFont('KoreanFont')
-                    if registered_font:
-                        font_name = "KoreanFont"
-                        success = True
-                        message = f"한글 폰트 등록 성공: {font_path}"
-                        logger.info(message)
-                        print(f"[PDF] {message}")
-                        return (font_name, success, message)
-                except:
-                    pass
-            except Exception as e:
-                logger.warning(f"Failed to register font {font_path}: {e}")
-                continue
-    
-    # Fallback: Helvetica (한글 미지원)
-    logger.warning(f"Using Helvetica fallback - {message}")
-    print(f"[PDF] 경고: {message} - Helvetica 사용 (한글 깨짐 가능)")
-    return (font_name, success, message)
+    info = get_korean_font(subset=False)
+    if not info["ok"]:
+        logger.warning(f"Using Helvetica fallback - {info['reason']}")
+    return (info["font_name"], info["ok"], info["reason"])
 
 
 # 전역 폰트 정보 (함수 호출 시 초기화)
@@ -290,22 +128,10 @@ def generate_weekly_report(
     
     filepath = reports_dir / filename
     
-    # 한글 폰트 등록 (매번 새로 등록하여 최신 상태 유지)
+    # 한글 폰트 등록 (공용 레지스트리에서 1회 등록 후 재사용)
     global KOREAN_FONT_NAME, KOREAN_FONT_SUCCESS
     KOREAN_FONT_NAME, KOREAN_FONT_SUCCESS, font_message = register_korean_font()
     
-    # 폰트 등록 확인 및 디버깅 정보
-    if KOREAN_FONT_SUCCESS:
-        try:
-            # 등록된 폰트 재확인
-            registered = pdfmetrics.getRegisteredFontNames()
-            if 'KoreanFont' not in registered:
-                logger.warning("KoreanFont가 등록 목록에 없습니다. 재등록 시도...")
-                # 재등록 시도
-                KOREAN_FONT_NAME, KOREAN_FONT_SUCCESS, font_message = register_korean_font()
-        except Exception as e:
-            logger.warning(f"폰트 등록 확인 중 오류: {e}")
-    
     # PDF 문서 생성
     doc = SimpleDocTemplate(
         str(filepath),
@@ -5,7 +5,7 @@ auth.uid() 기반 RLS로 보안 적용
 import pandas as pd
 import logging
 from datetime import datetime, timezone, date
-from typing import Optional, List, Tuple
+from typing import Dict, Optional, List, Tuple
 import json
 from zoneinfo import ZoneInfo
 from src.utils.time_utils import now_kst, today_kst, current_year_kst, current_month_kst
@@ -24,13 +24,20 @@ except ImportError:
     def record_data_call(name: str, ms: float, rows: int = None, source: str = None):
         pass
 
+from src.utils.query_telemetry import query_scope
+from src.utils.disk_cache import cached_load, invalidate_watermarks
+from src.engine.cost_structure import CostStructure
+from src.utils.single_flight import shared_cache_data
+
 # cache_tokens에서 버전 토큰 함수 import
 try:
-    from src.utils.cache_tokens import bump_data_version, bump_versions
+    from src.utils.cache_tokens import bump_data_version, bump_versions, get_data_version
 except ImportError:
     # cache_tokens가 없을 때를 대비한 fallback
     def bump_data_version(name: str):
         pass
+    def get_data_version(name: str) -> int:
+        return 0
     def bump_versions(names: List[str]):
         pass
 
@@ -91,7 +98,9 @@ def timed_select(query_name: str, query_func, *args, **kwargs):
     global _query_timing_log  # 함수 최상단에 global 선언
     start_time = time.time()
     try:
-        result = query_func(*args, **kwargs)
+        # 상시 텔레메트리는 transport 훅(src.utils.query_telemetry)이 기록, 여기서는 쿼리 이름만 지정
+        with query_scope(query_name):
+            result = query_func(*args, **kwargs)
         elapsed_ms = (time.time() - start_time) * 1000
         row_count = len(result.data) if result.data else 0
         
@@ -349,6 +358,9 @@ def hard_clear_all(reason: str = "unknown"):
         
         # dashboard.py는 퇴역되었으므로 캐시 무효화 제거됨
         
+        # 영구 캐시 워터마크 메모 폐기 (디스크 항목은 워터마크 비교로 자동 무효)
+        invalidate_watermarks()
+        
         # 세션 캐시 전체 정리 (ss_로 시작하는 키들)
         keys_to_remove = [key for key in st.session_state.keys() if key.startswith('ss_')]
         for key in keys_to_remove:
@@ -385,13 +397,14 @@ def soft_invalidate(reason: str, targets: List[str], session_keys: List[str] = N
         # targets 매핑: 어떤 데이터 타입이 어떤 로더에 영향을 주는지
         cache_mapping = {
             "sales": ["load_csv", "load_monthly_sales_total", "load_best_available_daily_sales", "load_official_daily_sales"],  # sales.csv + SSOT views
-            "daily_close": ["load_csv", "load_monthly_sales_total", "load_best_available_daily_sales", "load_official_daily_sales", "load_monthly_official_sales_total"],  # daily_close + SSOT views
+            "daily_close": ["load_csv", "load_monthly_sales_total", "load_best_available_daily_sales", "load_official_daily_sales", "load_monthly_official_sales_total", "load_close_calendar"],  # daily_close + SSOT views + 마감 캘린더
             "visitors": ["load_csv"],  # naver_visitors.csv
             "menus": ["load_csv"],  # menu_master.csv
             "recipes": ["load_csv"],  # recipes.csv
             "ingredients": ["load_csv"],  # ingredient_master.csv
-            "cost": ["load_expense_structure"],  # expense_structure
-            "expense_structure": ["load_expense_structure"],
+            "daily_sales_items": ["load_csv"],  # daily_sales_items.csv (v_daily_sales_items_effective)
+            "cost": ["load_expense_structure", "load_expense_structure_range", "load_cost_structure"],  # expense_structure + 비용 구조
+            "expense_structure": ["load_expense_structure", "load_expense_structure_range", "load_cost_structure"],
         }
         
         loaders_to_clear = set()
@@ -404,6 +417,16 @@ def soft_invalidate(reason: str, targets: List[str], session_keys: List[str] = N
             load_csv.clear()
         if "load_expense_structure" in loaders_to_clear:
             load_expense_structure.clear()
+        if "load_expense_structure_range" in loaders_to_clear:
+            try:
+                _load_expense_structure_range_impl.clear()
+            except Exception as e:
+                logger.warning(f"캐시 클리어 실패 (load_expense_structure_range): {e}")
+        if "load_cost_structure" in loaders_to_clear:
+            try:
+                _load_cost_structure.clear()
+            except Exception as e:
+                logger.warning(f"캐시 클리어 실패 (load_cost_structure): {e}")
         if "load_key_menus" in loaders_to_clear or "menus" in targets:
             load_key_menus.clear()
         # SSOT 함수 캐시 무효화
@@ -427,6 +450,15 @@ def soft_invalidate(reason: str, targets: List[str], session_keys: List[str] = N
                 load_monthly_official_sales_total.clear()
             except Exception as e:
                 logger.warning(f"캐시 클리어 실패 (load_monthly_official_sales_total): {e}")
+        if "load_close_calendar" in loaders_to_clear:
+            try:
+                from src.home.close_calendar import _load_close_calendar
+                _load_close_calendar.clear()
+            except Exception as e:
+                logger.warning(f"캐시 클리어 실패 (load_close_calendar): {e}")
+        
+        # 영구 캐시 워터마크 메모 폐기 (같은 rerun 안에서 다시 읽을 때 저장 전 워터마크를 쓰지 않도록)
+        invalidate_watermarks()
         
         # 3. 세션 캐시 부분 clear
         if session_keys is None:
@@ -468,6 +500,25 @@ def soft_invalidate(reason: str, targets: List[str], session_keys: List[str] = N
             hard_clear_all(reason=f"soft_invalidate 실패 후 폴백: {reason}")
 
 
+def _sync_home_snapshot(store_id: str, reason: str, recompute: bool = True):
+    """
+    HOME 스냅샷 동기화 (best effort, 저장 결과에는 영향 없음)
+    
+    Args:
+        store_id: 매장 ID
+        reason: 동기화 이유 (디버깅용)
+        recompute: True면 즉시 재계산, False면 무효화만 (반복 저장 경로용)
+    """
+    try:
+        from src.home.home_snapshot import refresh_home_snapshot, invalidate_home_snapshot
+        if recompute:
+            refresh_home_snapshot(store_id, reason=reason)
+        else:
+            invalidate_home_snapshot(store_id, reason=reason)
+    except Exception as e:
+        logger.warning(f"HOME 스냅샷 동기화 실패 ({reason}): {e}")
+
+
 def _clear_cache_and_session(affected_keys: List[str]):
     """
     캐시 클리어 및 세션 캐시 무효화 헬퍼 함수 (레거시 호환)
@@ -555,6 +606,49 @@ def _get_cache_ttl(filename: str) -> int:
 # 파일명에 따라 적절한 TTL을 사용하도록 주석으로 가이드 제공
 # 실제 구현은 기존 load_csv 함수를 유지하되, TTL을 300초(5분)로 조정하여 균형 유지
 
+# CSV 파일명 -> DB 테이블명 매핑
+_CSV_TABLE_MAPPING = {
+    'sales.csv': 'sales',
+    'naver_visitors.csv': 'naver_visitors',
+    'menu_master.csv': 'menu_master',
+    'ingredient_master.csv': 'ingredients',
+    'recipes.csv': 'recipes',
+    'daily_sales_items.csv': 'v_daily_sales_items_effective',  # STEP 2: 우선순위 뷰 사용
+    'daily_sales_items_effective.csv': 'v_daily_sales_items_effective',
+    'inventory.csv': 'inventory',
+    'targets.csv': 'targets',
+    'abc_history.csv': 'abc_history',
+    'daily_close.csv': 'daily_close',
+    'actual_settlement.csv': 'actual_settlement',
+    # 파일명 없이 테이블명으로 직접 호출 가능
+    'sales': 'sales',
+    'naver_visitors': 'naver_visitors',
+    'menu_master': 'menu_master',
+    'ingredient_master': 'ingredients',
+    'recipes': 'recipes',
+    'daily_sales_items': 'v_daily_sales_items_effective',  # STEP 2: 우선순위 뷰 사용
+    'daily_sales_items_effective': 'v_daily_sales_items_effective',
+    'inventory': 'inventory',
+    'targets': 'targets',
+    'abc_history': 'abc_history',
+    'daily_close': 'daily_close',
+    'actual_settlement': 'actual_settlement',
+}
+
+# 대용량 테이블은 최근 90일만 조회
+_LARGE_TABLES = ('sales', 'daily_close', 'daily_sales_items', 'v_daily_sales_items_effective', 'naver_visitors')
+_LARGE_TABLE_DAYS = 90
+
+
+def _csv_table(filename: str) -> str:
+    return _CSV_TABLE_MAPPING.get(filename, filename.replace('.csv', ''))
+
+
+def _large_table_cutoff() -> date:
+    from datetime import timedelta
+    return (now_kst() - timedelta(days=_LARGE_TABLE_DAYS)).date()
+
+
 def _load_csv_impl(filename: str, store_id: str, client_mode: str, default_columns: Optional[List[str]] = None):
     """
     캐시된 load_csv 내부 구현 (store_id와 client_mode를 캐시 키에 포함)
@@ -601,34 +695,7 @@ def _load_csv_impl(filename: str, store_id: str, client_mode: str, default_colum
     is_view_fallback = False
     
     try:
-        # CSV 파일명 -> DB 테이블명 매핑
-        table_mapping = {
-            'sales.csv': 'sales',
-            'naver_visitors.csv': 'naver_visitors',
-            'menu_master.csv': 'menu_master',
-            'ingredient_master.csv': 'ingredients',
-            'recipes.csv': 'recipes',
-            'daily_sales_items.csv': 'v_daily_sales_items_effective',  # STEP 2: 우선순위 뷰 사용
-            'inventory.csv': 'inventory',
-            'targets.csv': 'targets',
-            'abc_history.csv': 'abc_history',
-            'daily_close.csv': 'daily_close',
-            'actual_settlement.csv': 'actual_settlement',
-            # 파일명 없이 테이블명으로 직접 호출 가능
-            'sales': 'sales',
-            'naver_visitors': 'naver_visitors',
-            'menu_master': 'menu_master',
-            'ingredient_master': 'ingredients',
-            'recipes': 'recipes',
-            'daily_sales_items': 'v_daily_sales_items_effective',  # STEP 2: 우선순위 뷰 사용
-            'inventory': 'inventory',
-            'targets': 'targets',
-            'abc_history': 'abc_history',
-            'daily_close': 'daily_close',
-            'actual_settlement': 'actual_settlement',
-        }
-        
-        actual_table = table_mapping.get(filename, filename.replace('.csv', ''))
+        actual_table = _csv_table(filename)
         
         # STEP 2: 뷰가 없을 경우 fallback (안정성 우선)
         # v_daily_sales_items_effective 뷰가 없으면 기존 daily_sales_items 테이블 사용
@@ -645,8 +712,7 @@ def _load_csv_impl(filename: str, store_id: str, client_mode: str, default_colum
                 is_view_fallback = True
         
         # 대용량 테이블 필터 기본값 강제 (최근 90일)
-        large_tables = ['sales', 'daily_close', 'daily_sales_items', 'v_daily_sales_items_effective', 'naver_visitors']
-        use_date_filter = actual_table in large_tables
+        use_date_filter = actual_table in _LARGE_TABLES
         
         # store_id로 필터링하여 조회 (RLS가 자동으로 적용됨)
         try:
@@ -654,8 +720,7 @@ def _load_csv_impl(filename: str, store_id: str, client_mode: str, default_colum
             
             # 대용량 테이블은 최근 90일 필터 강제 적용
             if use_date_filter:
-                from datetime import timedelta
-                cutoff_date = (now_kst() - timedelta(days=90)).date()
+                cutoff_date = _large_table_cutoff()
                 query = query.gte("date", cutoff_date.isoformat())
             
             # 디버그: 실제 쿼리 정보 로깅 (온라인 환경 진단용)
@@ -1035,10 +1100,32 @@ USING (
         return pd.DataFrame(columns=default_columns) if default_columns else pd.DataFrame()
 
 
+def _cache_scope(bound) -> Optional[str]:
+    """
+    공유 캐시 인자 정리 (shared_cache_data scope)
+
+    store_id / client_mode 인자가 None이면 현재 세션 값으로 채움 (명시/생략 호출이 같은 캐시를 씀)
+    client_mode 인자가 없는 함수는 클라이언트 모드를 추가 키로 반환 (RLS 결과가 모드별로 다름)
+    """
+    args = bound.arguments
+    if "store_id" in args and args["store_id"] is None:
+        args["store_id"] = get_current_store_id()
+    try:
+        client_mode = get_read_client_mode()
+    except Exception:
+        client_mode = "unknown"
+    if "client_mode" in args:
+        if args["client_mode"] is None:
+            args["client_mode"] = client_mode
+        return None
+    return client_mode
+
+
 # 캐시 적용 (store_id와 client_mode를 캐시 키에 포함)
 # 주의: 데코레이터 레벨에서 is_dev_mode() 호출 시 모듈 로드 시점에 session_state가 없어 캐시가 재생성됨
 # 따라서 TTL을 고정값(300초)으로 설정하여 캐시 안정성 확보
-@st.cache_data(ttl=300)  # 5분 캐시 (고정값으로 설정하여 캐시 안정성 확보)
+# 동시 미스는 1회 조회로 합침, 만료 후 60초 동안은 이전 값 반환 + 백그라운드 갱신
+@shared_cache_data(ttl=300, stale_grace=60, scope=_cache_scope, show_spinner=False)  # 5분 캐시 (고정값으로 설정하여 캐시 안정성 확보)
 def load_csv(filename: str, default_columns: Optional[List[str]] = None, store_id: str = None, client_mode: str = None):
     """
     테이블에서 데이터 로드 (CSV 호환 인터페이스)
@@ -1092,8 +1179,18 @@ def load_csv(filename: str, default_columns: Optional[List[str]] = None, store_i
         logger.warning(f"No store_id found, returning empty DataFrame for {filename}")
         return pd.DataFrame(columns=default_columns) if default_columns else pd.DataFrame()
     
-    # @st.cache_data 캐시 또는 DB 조회
-    df = _load_csv_impl(filename, store_id, client_mode, default_columns)
+    # @st.cache_data 캐시 미스 → 영구 캐시(설정 시) → DB 조회
+    # anon은 _load_csv_impl의 보안 가드를 반드시 거치도록 영구 캐시를 쓰지 않음
+    actual_table = _csv_table(filename)
+    range_key = f"since:{_large_table_cutoff().isoformat()}" if actual_table in _LARGE_TABLES else "all"
+    with query_scope(f"load_csv({filename})"):
+        if client_mode == "anon":
+            df = _load_csv_impl(filename, store_id, client_mode, default_columns)
+        else:
+            df = cached_load(
+                store_id, actual_table, range_key,
+                lambda: _load_csv_impl(filename, store_id, client_mode, default_columns),
+            )
     
     # 세션 캐시에 저장 (마스터 데이터만)
     if session_key:
@@ -1228,6 +1325,8 @@ def save_sales(date, store_name, card_sales, cash_sales, total_sales=None, check
         except Exception as e:
             logger.warning(f"캐시 클리어 실패 (load_monthly_sales_total): {e}")  # 에러 삼킴 방지
         
+        _sync_home_snapshot(store_id, reason=f"save_sales: {date_str}")
+        
         # S5: 매출 저장 직후 스냅샷 (dev_mode에서만)
         try:
             from src.auth import is_dev_mode
@@ -1269,6 +1368,7 @@ def save_visitor(date, visitors):
             reason=f"save_visitor: {date_str}",
             targets=["visitors"]
         )
+        _sync_home_snapshot(store_id, reason=f"save_visitor: {date_str}", recompute=False)
         
         return True
     except Exception as e:
@@ -1365,6 +1465,7 @@ def save_sales_entry(date, store_name, card_sales, cash_sales, total_sales, visi
             reason=f"save_sales_entry: {date_str}",
             targets=["sales", "visitors", "daily_close"] if has_close else ["sales", "visitors"]
         )
+        _sync_home_snapshot(store_id, reason=f"save_sales_entry: {date_str}")
         
         # 메시지 구성
         if synced_to_close:
@@ -2072,6 +2173,8 @@ def save_targets(year, month, target_sales, target_cost_rate, target_labor_rate,
         }, on_conflict="store_id,year,month").execute()
         
         logger.info(f"Targets saved: {year}-{month}")
+        bump_data_version("targets")
+        _sync_home_snapshot(store_id, reason=f"save_targets: {year}-{month}", recompute=False)
         return True
     except Exception as e:
         logger.error(f"Failed to save targets: {e}")
@@ -2102,6 +2205,8 @@ def save_actual_settlement(year, month, actual_sales, actual_cost, actual_profit
             on_conflict="store_id,year,month",
         ).execute()
         logger.info(f"Actual settlement saved: {year}-{month}")
+        load_monthly_settlement_snapshot.clear()
+        _sync_home_snapshot(store_id, reason=f"save_actual_settlement: {year}-{month}")
         return True
     except Exception as e:
         logger.error(f"Failed to save actual settlement: {e}")
@@ -2260,11 +2365,19 @@ def save_daily_close(date, store_name, card_sales, cash_sales, total_sales,
         
         logger.info(f"Daily close saved (transactional): {date_str}")
         
+        # 매출 하락 변화점 감지 상태 증분 갱신 (실패해도 마감 저장에는 영향 없음)
+        try:
+            from core.change_point import update_change_point_state
+            update_change_point_state(supabase, str(store_id), date_str, total_sales)
+        except Exception as e:
+            logger.warning(f"Change point update skipped: {e}")
+        
         # 캐시 무효화 (SSOT 정책: daily_close 변경 시 best_available/official 모두 무효화)
         soft_invalidate(
             reason=f"save_daily_close: {date_str}",
             targets=["daily_close"]  # daily_close 변경 시 관련 모든 캐시 무효화
         )
+        _sync_home_snapshot(str(store_id), reason=f"save_daily_close: {date_str}")
         
         # ========== 재고 자동 차감 기능 ==========
         # 공식 엔진 함수 사용 (헌법 준수)
@@ -2386,6 +2499,7 @@ def delete_sales(date, store=None):
             reason=f"delete_sales: {date_str}",
             targets=["sales"]
         )
+        _sync_home_snapshot(store_id, reason=f"delete_sales: {date_str}", recompute=False)
         
         return True, "삭제 성공"
     except Exception as e:
@@ -2413,6 +2527,7 @@ def delete_visitor(date):
             reason=f"delete_visitor: {date_str}",
             targets=["visitors"]
         )
+        _sync_home_snapshot(store_id, reason=f"delete_visitor: {date_str}", recompute=False)
         
         return True, "삭제 성공"
     except Exception as e:
@@ -2449,6 +2564,7 @@ def save_expense_item(year, month, category, item_name, amount, notes=None):
             targets=["cost", "expense_structure"],
             session_keys=['ss_expense_structure_df']
         )
+        _sync_home_snapshot(store_id, reason=f"save_expense_item: {year}-{month}", recompute=False)
         
         # S6: 비용 저장 직후 스냅샷 (dev_mode에서만)
         try:
@@ -2498,6 +2614,7 @@ def update_expense_item(expense_id, item_name, amount, notes=None):
             targets=["cost", "expense_structure"],
             session_keys=['ss_expense_structure_df']
         )
+        _sync_home_snapshot(store_id, reason=f"update_expense_item: {expense_id}", recompute=False)
         
         # S6: 비용 저장 직후 스냅샷 (dev_mode에서만)
         try:
@@ -2534,6 +2651,7 @@ def delete_expense_item(expense_id):
             targets=["cost", "expense_structure"],
             session_keys=['ss_expense_structure_df']
         )
+        _sync_home_snapshot(store_id, reason=f"delete_expense_item: {expense_id}", recompute=False)
         
         return True, "삭제 성공"
     except Exception as e:
@@ -2758,46 +2876,124 @@ def load_expense_structure(year, month, store_id: str = None, client_mode: str =
     return df
 
 
-@st.cache_data(ttl=60)  # 1분 캐시
-def load_expense_structure_range(year_start, month_start, year_end, month_end):
-    """비용구조 데이터 로드 (기간 범위)"""
-    supabase = _check_supabase_for_dev_mode()
+# 비용구조 카테고리 (기간 피벗 열 순서)
+EXPENSE_CATEGORIES = ('임차료', '인건비', '공과금', '재료비', '부가세&카드수수료')
+
+
+def _ym_index(year, month) -> int:
+    """(연, 월) → 연속 월 번호 (year*12 + month-1)"""
+    return int(year) * 12 + int(month) - 1
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_expense_structure_range_impl(store_id: str, ym_start: int, ym_end: int, v_cost: int, v_expense: int):
+    """
+    load_expense_structure_range 내부 구현 (캐시됨, store_id + version_token 기반)
+
+    DB 조건: store_id + 연도 범위 + 월 범위 (해가 다르면 경계 연도 월 조건을 or 트리로, 예: 12월~1월은 2개월만 조회)
+    """
+    start_time = time.perf_counter()
+    label = f"load_expense_structure_range({ym_start // 12}-{ym_start % 12 + 1}~{ym_end // 12}-{ym_end % 12 + 1})"
+    _log_cache_miss("load_expense_structure_range", store_id=store_id, ym_start=ym_start, ym_end=ym_end)
+
+    supabase = get_read_client()
     if not supabase:
+        record_data_call(f"{label} [NO_CLIENT]", (time.perf_counter() - start_time) * 1000, rows=0, source="supabase")
         return pd.DataFrame()
-    
-    store_id = get_current_store_id()
+
+    year_start, year_end = ym_start // 12, ym_end // 12
+    month_start, month_end = ym_start % 12 + 1, ym_end % 12 + 1
+    query = supabase.table("expense_structure")\
+        .select("*")\
+        .eq("store_id", store_id)\
+        .gte("year", year_start)\
+        .lte("year", year_end)
+    if year_start == year_end:
+        query = query\
+            .gte("month", month_start)\
+            .lte("month", month_end)
+    else:
+        # PostgREST는 year*12+month 식 필터가 없으므로 (시작 연도 월 이후 | 중간 연도 | 종료 연도 월 이전)
+        query = query.or_(
+            f"and(year.eq.{year_start},month.gte.{month_start}),"
+            f"and(year.gt.{year_start},year.lt.{year_end}),"
+            f"and(year.eq.{year_end},month.lte.{month_end})"
+        )
+    result = timed_select(label, lambda: query.execute())
+
+    if not result.data:
+        record_data_call(label, (time.perf_counter() - start_time) * 1000, rows=0, source="supabase")
+        return pd.DataFrame(columns=['id', 'category', 'item_name', 'amount', 'notes', 'year', 'month'])
+
+    df = pd.DataFrame(result.data)
+    record_data_call(label, (time.perf_counter() - start_time) * 1000, rows=len(df), source="supabase")
+    return df
+
+
+def load_expense_structure_range(year_start, month_start, year_end, month_end, store_id: str = None):
+    """
+    비용구조 데이터 로드 (기간 범위, 쿼리 1회)
+
+    Args:
+        year_start, month_start: 시작 연/월 (포함)
+        year_end, month_end: 종료 연/월 (포함)
+        store_id: store_id (None이면 get_current_store_id() 사용)
+
+    Returns:
+        expense_structure 행 DataFrame (year, month 포함, 실패/매장 없음이면 빈 DataFrame)
+    """
+    if store_id is None:
+        store_id = get_current_store_id()
     if not store_id:
         return pd.DataFrame()
-    
+
+    ym_start, ym_end = _ym_index(year_start, month_start), _ym_index(year_end, month_end)
+    if ym_start > ym_end:
+        return pd.DataFrame()
+
     try:
-        # 모든 데이터를 가져온 후 필터링
-        result = supabase.table("expense_structure")\
-            .select("*")\
-            .eq("store_id", store_id)\
-            .execute()
-        
-        if result.data:
-            df = pd.DataFrame(result.data)
-            # 기간 필터링
-            def in_range(row):
-                y, m = row['year'], row['month']
-                if y < year_start or y > year_end:
-                    return False
-                if y == year_start and m < month_start:
-                    return False
-                if y == year_end and m > month_end:
-                    return False
-                return True
-            
-            df = df[df.apply(in_range, axis=1)]
-            return df
-        else:
-            return pd.DataFrame(columns=['id', 'category', 'item_name', 'amount', 'notes', 'year', 'month'])
+        return _load_expense_structure_range_impl(
+            store_id, ym_start, ym_end,
+            get_data_version("cost"), get_data_version("expense_structure")
+        )
     except Exception as e:
         logger.error(f"Failed to load expense structure range: {e}")
         return pd.DataFrame()
 
 
+def pivot_expense_structure(df: pd.DataFrame, year_start, month_start, year_end, month_end) -> pd.DataFrame:
+    """
+    비용구조 행 → 월 × 카테고리 행렬
+
+    - 행: (year, month) MultiIndex, 기간 내 모든 월 (데이터 없는 월은 NaN 행)
+    - 열: EXPENSE_CATEGORIES 순서 (그 외 카테고리는 뒤에), 값: 카테고리별 amount 합계
+      (고정비는 원, 변동비 카테고리는 비율(%) 합계 — expense_structure 저장 단위 그대로)
+    - 데이터가 있는 월의 빈 카테고리는 0
+    """
+    ym_range = range(_ym_index(year_start, month_start), _ym_index(year_end, month_end) + 1)
+    index = pd.MultiIndex.from_tuples([(ym // 12, ym % 12 + 1) for ym in ym_range], names=['year', 'month'])
+    extra = []
+    if df is not None and not df.empty and 'category' in df.columns:
+        extra = sorted(set(df['category'].dropna()) - set(EXPENSE_CATEGORIES))
+    columns = list(EXPENSE_CATEGORIES) + extra
+    if df is None or df.empty or not {'year', 'month', 'category', 'amount'}.issubset(df.columns):
+        return pd.DataFrame(index=index, columns=columns, dtype=float)
+
+    amounts = pd.to_numeric(df['amount'], errors='coerce').fillna(0.0)
+    matrix = amounts.groupby([df['year'].astype(int), df['month'].astype(int), df['category']]).sum()\
+        .unstack('category')\
+        .reindex(columns=columns)\
+        .fillna(0.0)
+    matrix.index.names = ['year', 'month']
+    return matrix.reindex(index)
+
+
+def load_expense_structure_pivot(year_start, month_start, year_end, month_end, store_id: str = None) -> pd.DataFrame:
+    """기간 비용구조 월 × 카테고리 행렬 (load_expense_structure_range 1회 + pivot_expense_structure)"""
+    df = load_expense_structure_range(year_start, month_start, year_end, month_end, store_id)
+    return pivot_expense_structure(df, year_start, month_start, year_end, month_end)
+
+
 def copy_expense_structure_from_previous_month(year, month):
     """전월 비용구조 데이터를 현재 월로 복사"""
     supabase = _check_supabase_for_dev_mode()
@@ -2842,6 +3038,12 @@ def copy_expense_structure_from_previous_month(year, month):
         if records:
             supabase.table("expense_structure").insert(records).execute()
             logger.info(f"Expense structure copied from {prev_year}-{prev_month} to {year}-{month}")
+            soft_invalidate(
+                reason=f"copy_expense_structure_from_previous_month: {year}-{month}",
+                targets=["cost", "expense_structure"],
+                session_keys=['ss_expense_structure_df']
+            )
+            _sync_home_snapshot(store_id, reason=f"copy_expense_structure_from_previous_month: {year}-{month}", recompute=False)
             return True, f"전월({prev_year}년 {prev_month}월) 데이터가 복사되었습니다."
         else:
             return False, "복사할 데이터가 없습니다."
@@ -3224,6 +3426,9 @@ def save_cost_item_template(
         }, on_conflict="store_id,category,item_name").execute()
         
         logger.info(f"Cost item template saved: {category} - {item_name}")
+        _load_cost_structure.clear()
+        bump_data_version("settlement")
+        _sync_home_snapshot(store_id, reason=f"save_cost_item_template: {category}/{item_name}", recompute=False)
         return True
     except Exception as e:
         logger.error(f"Failed to save cost item template: {e}")
@@ -3256,6 +3461,9 @@ def soft_delete_cost_item_template(store_id: str, category: str, item_name: str)
             .execute()
         
         logger.info(f"Cost item template soft deleted: {category} - {item_name}")
+        _load_cost_structure.clear()
+        bump_data_version("settlement")
+        _sync_home_snapshot(store_id, reason=f"soft_delete_cost_item_template: {category}/{item_name}", recompute=False)
         return True
     except Exception as e:
         logger.error(f"Failed to soft delete cost item template: {e}")
@@ -3358,6 +3566,10 @@ def upsert_actual_settlement_item(
         ).execute()
         
         logger.info(f"Actual settlement item saved: {year}-{month}, template_id={template_id}, amount={amount}, percent={percent}")
+        load_monthly_settlement_snapshot.clear()
+        _load_cost_structure.clear()
+        bump_data_version("settlement")
+        _sync_home_snapshot(store_id, reason=f"upsert_actual_settlement_item: {year}-{month}", recompute=False)
         return True
     except Exception as e:
         logger.error(f"Failed to upsert actual settlement_item: {e}")
@@ -3373,6 +3585,43 @@ def upsert_actual_settlement_item(
 # ============================================
 
 @st.cache_data(ttl=60, show_spinner=False)
+def _load_cost_structure(store_id: str, year: int, month: int, v_cost: int, v_expense: int) -> CostStructure:
+    """
+    월 비용 구조 (캐시됨, store_id + version_token 기반)
+
+    조회: 정산 상태 (get_month_settlement_status 캐시 공유) + 확정 월이면 실제정산 항목/템플릿 각 1회
+    + expense_structure (load_expense_structure 캐시 공유)
+    """
+    status = get_month_settlement_status(store_id, year, month)
+    saved_items, templates = [], []
+    if status == 'final':
+        saved_items = load_actual_settlement_items(store_id, year, month)
+        templates = load_cost_item_templates(store_id)
+    expense_df = load_expense_structure(year, month, store_id)
+    if not isinstance(expense_df, pd.DataFrame):
+        expense_df = pd.DataFrame()
+    return CostStructure.build(year, month, expense_df, status, saved_items, templates)
+
+
+def load_cost_structure(store_id: str, year: int, month: int) -> CostStructure:
+    """
+    월 비용 구조 조회 (고정비 / 변동비율 / 손익분기점 / 카테고리 합계 / 손익 예시표)
+
+    (매장, 연/월, 비용 버전)당 1회 계산 → get_fixed_costs / get_variable_cost_ratio / calculate_break_even_sales는 이 결과의 뷰
+    실패/매장 없음이면 빈 구조 (모든 값 0)
+    """
+    if not store_id:
+        return CostStructure(year=int(year), month=int(month))
+    try:
+        return _load_cost_structure(
+            store_id, int(year), int(month),
+            get_data_version("cost"), get_data_version("expense_structure")
+        )
+    except Exception as e:
+        logger.error(f"Failed to load cost structure: {e}")
+        return CostStructure(year=int(year), month=int(month))
+
+
 def get_fixed_costs(store_id: str, year: int, month: int) -> float:
     """
     고정비 조회 (SSOT 엔진)
@@ -3389,86 +3638,9 @@ def get_fixed_costs(store_id: str, year: int, month: int) -> float:
     Returns:
         float: 고정비 합계 (원 단위)
     """
-    try:
-        # 1순위: actual_settlement_items (final 상태 확인)
-        month_status = get_month_settlement_status(store_id, year, month)
-        if month_status == 'final':
-            try:
-                total_sales = load_monthly_sales_total(store_id, year, month)
-                expense_items = {}
-                templates = load_cost_item_templates(store_id)
-                saved_items = load_actual_settlement_items(store_id, year, month)
-                
-                saved_dict = {}
-                for saved in saved_items:
-                    template_id = saved.get('template_id')
-                    if template_id:
-                        saved_dict[template_id] = saved
-                
-                for template in templates:
-                    if not template.get('is_active', True):
-                        continue
-                    category = template.get('category')
-                    if not category:
-                        continue
-                    
-                    if category not in expense_items:
-                        expense_items[category] = []
-                    
-                    template_id = template.get('id')
-                    saved = saved_dict.get(template_id, {})
-                    
-                    saved_amount = saved.get('amount')
-                    saved_percent = saved.get('percent')
-                    has_amount = saved_amount is not None and float(saved_amount or 0) > 0
-                    has_percent = saved_percent is not None and float(saved_percent or 0) > 0
-                    
-                    if has_amount and not has_percent:
-                        input_type = 'amount'
-                    elif has_percent and not has_amount:
-                        input_type = 'rate'
-                    elif has_amount and has_percent:
-                        input_type = 'amount'
-                    else:
-                        input_type = 'amount'
-                    
-                    item = {
-                        'template_id': template_id,
-                        'item_name': template.get('item_name', ''),
-                        'input_type': input_type,
-                        'amount': int(saved_amount or 0) if input_type == 'amount' else 0,
-                        'rate': float(saved_percent or 0.0) if input_type == 'rate' else 0.0,
-                    }
-                    expense_items[category].append(item)
-                
-                # 고정비 카테고리 (임차료, 인건비, 공과금)의 amount 합계
-                fixed_categories = ['임차료', '인건비', '공과금']
-                fixed_total = 0.0
-                for cat in fixed_categories:
-                    if cat in expense_items:
-                        for item in expense_items[cat]:
-                            if item.get('input_type') == 'amount':
-                                fixed_total += float(item.get('amount', 0))
-                
-                if fixed_total > 0:
-                    return fixed_total
-            except Exception:
-                pass
-        
-        # 2순위: expense_structure
-        expense_df = load_expense_structure(year, month, store_id)
-        if not expense_df.empty:
-            fixed_categories = ['임차료', '인건비', '공과금']
-            fixed_costs = expense_df[expense_df['category'].isin(fixed_categories)]['amount'].sum()
-            return float(fixed_costs)
-        
-        return 0.0
-    except Exception as e:
-        logger.error(f"Failed to get fixed costs: {e}")
-        return 0.0
+    return load_cost_structure(store_id, year, month).fixed_costs
 
 
-@st.cache_data(ttl=60, show_spinner=False)
 def get_variable_cost_ratio(store_id: str, year: int, month: int) -> float:
     """
     변동비율 조회 (SSOT 엔진)
@@ -3485,89 +3657,9 @@ def get_variable_cost_ratio(store_id: str, year: int, month: int) -> float:
     Returns:
         float: 변동비율 (0.0 ~ 1.0, 소수 형태)
     """
-    try:
-        # 1순위: actual_settlement_items (final 상태 확인)
-        month_status = get_month_settlement_status(store_id, year, month)
-        if month_status == 'final':
-            try:
-                total_sales = load_monthly_sales_total(store_id, year, month)
-                expense_items = {}
-                templates = load_cost_item_templates(store_id)
-                saved_items = load_actual_settlement_items(store_id, year, month)
-                
-                saved_dict = {}
-                for saved in saved_items:
-                    template_id = saved.get('template_id')
-                    if template_id:
-                        saved_dict[template_id] = saved
-                
-                for template in templates:
-                    if not template.get('is_active', True):
-                        continue
-                    category = template.get('category')
-                    if not category:
-                        continue
-                    
-                    if category not in expense_items:
-                        expense_items[category] = []
-                    
-                    template_id = template.get('id')
-                    saved = saved_dict.get(template_id, {})
-                    
-                    saved_amount = saved.get('amount')
-                    saved_percent = saved.get('percent')
-                    has_amount = saved_amount is not None and float(saved_amount or 0) > 0
-                    has_percent = saved_percent is not None and float(saved_percent or 0) > 0
-                    
-                    if has_amount and not has_percent:
-                        input_type = 'amount'
-                    elif has_percent and not has_amount:
-                        input_type = 'rate'
-                    elif has_amount and has_percent:
-                        input_type = 'amount'
-                    else:
-                        input_type = 'amount'
-                    
-                    item = {
-                        'template_id': template_id,
-                        'item_name': template.get('item_name', ''),
-                        'input_type': input_type,
-                        'amount': int(saved_amount or 0) if input_type == 'amount' else 0,
-                        'rate': float(saved_percent or 0.0) if input_type == 'rate' else 0.0,
-                    }
-                    expense_items[category].append(item)
-                
-                # 변동비 카테고리 (재료비, 부가세&카드수수료)의 rate 합계
-                variable_categories = ['재료비', '부가세&카드수수료']
-                variable_rate_total = 0.0
-                for cat in variable_categories:
-                    if cat in expense_items:
-                        for item in expense_items[cat]:
-                            if item.get('input_type') == 'rate':
-                                variable_rate_total += float(item.get('rate', 0.0))
-                
-                # %를 소수로 변환
-                if variable_rate_total > 0:
-                    return variable_rate_total / 100.0
-            except Exception:
-                pass
-        
-        # 2순위: expense_structure
-        expense_df = load_expense_structure(year, month, store_id)
-        if not expense_df.empty:
-            variable_categories = ['재료비', '부가세&카드수수료']
-            variable_df = expense_df[expense_df['category'].isin(variable_categories)]
-            if not variable_df.empty:
-                variable_cost_rate = variable_df['amount'].sum()  # % 단위
-                return variable_cost_rate / 100.0  # 소수로 변환
-        
-        return 0.0
-    except Exception as e:
-        logger.error(f"Failed to get variable cost ratio: {e}")
-        return 0.0
+    return load_cost_structure(store_id, year, month).variable_ratio
 
 
-@st.cache_data(ttl=60, show_spinner=False)
 def calculate_break_even_sales(store_id: str, year: int, month: int) -> float:
     """
     손익분기점 매출 계산 (SSOT 엔진)
@@ -3582,28 +3674,14 @@ def calculate_break_even_sales(store_id: str, year: int, month: int) -> float:
     Returns:
         float: 손익분기점 매출 (원 단위), 계산 불가 시 0.0
     """
-    try:
-        fixed_costs = get_fixed_costs(store_id, year, month)
-        variable_ratio = get_variable_cost_ratio(store_id, year, month)
-        
-        # 계산 조건: 고정비 > 0 AND 변동비율 > 0 AND 변동비율 < 1
-        if fixed_costs > 0 and variable_ratio > 0 and variable_ratio < 1:
-            denominator = 1.0 - variable_ratio
-            if denominator > 0:
-                breakeven = fixed_costs / denominator
-                return float(breakeven)
-        
-        return 0.0
-    except Exception as e:
-        logger.error(f"Failed to calculate break even sales: {e}")
-        return 0.0
+    return load_cost_structure(store_id, year, month).break_even
 
 
 # ============================================
 # SSOT VIEW 기반 조회 함수
 # ============================================
 
-@st.cache_data(ttl=60, show_spinner=False)
+@shared_cache_data(ttl=60, stale_grace=30, scope=_cache_scope, show_spinner=False)
 def load_official_daily_sales(store_id: str = None, start_date: str = None, end_date: str = None):
     """
     공식 매출 SSOT 조회 (daily_close 기준)
@@ -3630,19 +3708,19 @@ def load_official_daily_sales(store_id: str = None, start_date: str = None, end_
         if not supabase:
             return pd.DataFrame()
         
-        query = supabase.table("v_daily_sales_official").select("*").eq("store_id", store_id)
-        
-        if start_date:
-            query = query.gte("date", start_date)
-        if end_date:
-            query = query.lte("date", end_date)
-        
-        result = query.order("date", desc=False).execute()
-        
-        if not result.data:
-            return pd.DataFrame()
+        def _query():
+            query = supabase.table("v_daily_sales_official").select("*").eq("store_id", store_id)
+            if start_date:
+                query = query.gte("date", start_date)
+            if end_date:
+                query = query.lte("date", end_date)
+            result = query.order("date", desc=False).execute()
+            return pd.DataFrame(result.data) if result.data else pd.DataFrame()
+        
+        df = cached_load(store_id, "v_daily_sales_official", f"{start_date or ''}~{end_date or ''}", _query)
+        if df.empty:
+            return df
         
-        df = pd.DataFrame(result.data)
         logger.info(f"Loaded {len(df)} official daily sales records")
         return df
     except Exception as e:
@@ -3769,7 +3847,7 @@ def get_day_record_status(store_id: str, date) -> dict:
         }
 
 
-@st.cache_data(ttl=60, show_spinner=False)
+@shared_cache_data(ttl=60, stale_grace=30, scope=_cache_scope, show_spinner=False)
 def load_best_available_daily_sales(store_id: str = None, start_date: str = None, end_date: str = None):
     """
     최선의 매출 데이터 조회 (daily_close 우선, 없으면 sales 사용)
@@ -3796,19 +3874,19 @@ def load_best_available_daily_sales(store_id: str = None, start_date: str = None
         if not supabase:
             return pd.DataFrame()
         
-        query = supabase.table("v_daily_sales_best_available").select("*").eq("store_id", store_id)
-        
-        if start_date:
-            query = query.gte("date", start_date)
-        if end_date:
-            query = query.lte("date", end_date)
-        
-        result = query.order("date", desc=False).execute()
-        
-        if not result.data:
-            return pd.DataFrame()
+        def _query():
+            query = supabase.table("v_daily_sales_best_available").select("*").eq("store_id", store_id)
+            if start_date:
+                query = query.gte("date", start_date)
+            if end_date:
+                query = query.lte("date", end_date)
+            result = query.order("date", desc=False).execute()
+            return pd.DataFrame(result.data) if result.data else pd.DataFrame()
+        
+        df = cached_load(store_id, "v_daily_sales_best_available", f"{start_date or ''}~{end_date or ''}", _query)
+        if df.empty:
+            return df
         
-        df = pd.DataFrame(result.data)
         logger.info(f"Loaded {len(df)} best available daily sales records")
         return df
     except Exception as e:
@@ -3816,7 +3894,7 @@ def load_best_available_daily_sales(store_id: str = None, start_date: str = None
         return pd.DataFrame()
 
 
-@st.cache_data(ttl=60, show_spinner=False)  # 1분 캐시 (월이 바뀌거나 입력 즉시 반영)
+@shared_cache_data(ttl=60, stale_grace=30, scope=_cache_scope, show_spinner=False)  # 1분 캐시 (월이 바뀌거나 입력 즉시 반영)
 def load_monthly_official_sales_total(store_id: str, year: int, month: int) -> int:
     """
     공식 월매출 합계 조회 (official 전용: daily_close만)
@@ -3855,28 +3933,30 @@ def load_monthly_official_sales_total(store_id: str, year: int, month: int) -> i
         
         # v_daily_sales_official 뷰 조회: store_id + 날짜 범위 필터
         # date >= start_date AND date < end_date
-        result = supabase.table("v_daily_sales_official")\
-            .select("total_sales")\
-            .eq("store_id", store_id)\
-            .gte("date", start_date_str)\
-            .lt("date", end_date_str)\
-            .execute()
+        def _rollup():
+            result = supabase.table("v_daily_sales_official")\
+                .select("total_sales")\
+                .eq("store_id", store_id)\
+                .gte("date", start_date_str)\
+                .lt("date", end_date_str)\
+                .execute()
+            rows = result.data or []
+            # 합산 (total_sales 컬럼 사용)
+            return {
+                "total": sum(float(row.get('total_sales', 0) or 0) for row in rows),
+                "rows": len(rows),
+            }
         
-        # 합산 (total_sales 컬럼 사용)
-        if result.data:
-            total = sum(float(row.get('total_sales', 0) or 0) for row in result.data)
-            row_count = len(result.data)
-            logger.info(f"Monthly official sales total loaded: {year}-{month}, {row_count} rows, total={total:,.0f}원")
-            return int(total)
-        else:
-            logger.info(f"Monthly official sales total loaded: {year}-{month}, 0 rows, total=0원")
-            return 0
+        # 월 롤업은 영구 캐시(설정 시) 경유
+        rollup = cached_load(store_id, "v_daily_sales_official", f"month_total:{year}-{month:02d}", _rollup)
+        logger.info(f"Monthly official sales total loaded: {year}-{month}, {rollup['rows']} rows, total={rollup['total']:,.0f}원")
+        return int(rollup["total"])
     except Exception as e:
         logger.error(f"Failed to load monthly official sales total: {e}")
         return 0
 
 
-@st.cache_data(ttl=60, show_spinner=False)  # 1분 캐시 (월이 바뀌거나 입력 즉시 반영)
+@shared_cache_data(ttl=60, stale_grace=30, scope=_cache_scope, show_spinner=False)  # 1분 캐시 (월이 바뀌거나 입력 즉시 반영)
 def load_monthly_sales_total(store_id: str, year: int, month: int) -> int:
     """
     월매출 합계 조회 (best_available 기반: daily_close 우선, 없으면 sales)
@@ -3915,24 +3995,25 @@ def load_monthly_sales_total(store_id: str, year: int, month: int) -> int:
         
         # v_daily_sales_best_available 뷰 조회: store_id + 날짜 범위 필터
         # date >= start_date AND date < end_date
-        result = supabase.table("v_daily_sales_best_available")\
-            .select("total_sales, is_official")\
-            .eq("store_id", store_id)\
-            .gte("date", start_date_str)\
-            .lt("date", end_date_str)\
-            .execute()
+        def _rollup():
+            result = supabase.table("v_daily_sales_best_available")\
+                .select("total_sales, is_official")\
+                .eq("store_id", store_id)\
+                .gte("date", start_date_str)\
+                .lt("date", end_date_str)\
+                .execute()
+            rows = result.data or []
+            # 합산 (total_sales 컬럼 사용), 미마감 날짜 개수 (is_official=false)
+            return {
+                "total": sum(float(row.get('total_sales', 0) or 0) for row in rows),
+                "rows": len(rows),
+                "unofficial": sum(1 for row in rows if not row.get('is_official', True)),
+            }
         
-        # 합산 (total_sales 컬럼 사용)
-        if result.data:
-            total = sum(float(row.get('total_sales', 0) or 0) for row in result.data)
-            row_count = len(result.data)
-            # 미마감 날짜 개수 계산 (is_official=false)
-            unofficial_count = sum(1 for row in result.data if not row.get('is_official', True))
-            logger.info(f"Monthly sales total loaded (best_available): {year}-{month}, {row_count} rows, total={total:,.0f}원, unofficial={unofficial_count} days")
-            return int(total)
-        else:
-            logger.info(f"Monthly sales total loaded (best_available): {year}-{month}, 0 rows, total=0원")
-            return 0
+        # 월 롤업은 영구 캐시(설정 시) 경유
+        rollup = cached_load(store_id, "v_daily_sales_best_available", f"month_total:{year}-{month:02d}", _rollup)
+        logger.info(f"Monthly sales total loaded (best_available): {year}-{month}, {rollup['rows']} rows, total={rollup['total']:,.0f}원, unofficial={rollup['unofficial']} days")
+        return int(rollup["total"])
     except Exception as e:
         logger.error(f"Failed to load monthly sales total: {e}")
         return 0
@@ -4072,10 +4153,14 @@ def set_month_settlement_status(store_id: str, year: int, month: int, status: st
         # 캐시 무효화
         try:
             get_month_settlement_status.clear()
+            load_monthly_settlement_snapshot.clear()
+            _load_cost_structure.clear()
             # load_actual_settlement_items는 함수가 아니므로 직접 clear 불가
             # 대신 캐시 키 기반으로 무효화 (필요 시)
         except Exception:
             pass
+        bump_data_version("settlement")
+        _sync_home_snapshot(store_id, reason=f"set_month_settlement_status: {year}-{month}={status}")
         
         return affected_count
     except Exception as e:
@@ -4305,6 +4390,22 @@ def upsert_menu_role_tag(store_id: str, menu_id: str, role_tag: str) -> bool:
         menu_id: 메뉴 ID (UUID)
         role_tag: 역할 태그 ('미끼', '볼륨', '마진' 또는 None)
     
+    Returns:
+        bool: 성공 여부
+    """
+    if not menu_id:
+        return False
+    return upsert_menu_role_tags(store_id, {menu_id: role_tag})
+
+
+def upsert_menu_role_tags(store_id: str, tags: Dict[str, Optional[str]]) -> bool:
+    """
+    메뉴 역할 태그 일괄 저장/수정 (DB, upsert 1회)
+    
+    Args:
+        store_id: 매장 ID
+        tags: {menu_id: role_tag} ('미분류'/None/빈 문자열은 NULL로 저장)
+    
     Returns:
         bool: 성공 여부
     """
@@ -4312,32 +4413,91 @@ def upsert_menu_role_tag(store_id: str, menu_id: str, role_tag: str) -> bool:
     if not supabase:
         return False
     
-    if not store_id or not menu_id:
+    if not store_id:
         return False
     
-    try:
-        # role_tag가 None이거나 빈 문자열이면 삭제 (NULL로 설정)
-        data = {
+    rows = [
+        {
             "store_id": store_id,
             "menu_id": menu_id,
             "role_tag": role_tag if role_tag and role_tag != "미분류" else None
         }
-        
+        for menu_id, role_tag in tags.items() if menu_id
+    ]
+    if not rows:
+        return False
+    
+    try:
         supabase.table("menu_portfolio_state").upsert(
-            data,
+            rows,
             on_conflict="store_id,menu_id"
         ).execute()
         
-        logger.info(f"Menu role tag upserted: {menu_id} -> {role_tag}")
+        logger.info(f"Menu role tags upserted: {len(rows)}개")
+        
+        # 소프트 무효화 (MenuIndex 역할 태그 버전)
+        soft_invalidate(
+            reason=f"upsert_menu_role_tags: {len(rows)}개",
+            targets=["menu_roles"],
+            session_keys=[]
+        )
         return True
     except Exception as e:
-        logger.error(f"Failed to upsert menu role tag: {e}")
+        logger.error(f"Failed to upsert menu role tags: {e}")
         if _is_dev_mode():
             import streamlit as st
             st.error(f"메뉴 역할 태그 저장 실패: {e}")
         return False
 
 
+def update_menu_categories(store_id: str, categories: Dict[str, str]) -> bool:
+    """
+    메뉴 카테고리 일괄 수정 (DB)
+    
+    같은 카테고리로 바뀌는 메뉴를 묶어 카테고리당 update 1회 (카테고리는 5종)
+    
+    Args:
+        store_id: 매장 ID
+        categories: {menu_id: category}
+    
+    Returns:
+        bool: 성공 여부
+    """
+    supabase = _check_supabase_for_dev_mode()
+    if not supabase:
+        return False
+    
+    if not store_id or not categories:
+        return False
+    
+    by_category: Dict[str, List[str]] = {}
+    for menu_id, category in categories.items():
+        if menu_id and category:
+            by_category.setdefault(category, []).append(menu_id)
+    
+    try:
+        for category, menu_ids in by_category.items():
+            supabase.table("menu_master")\
+                .update({"category": category})\
+                .eq("store_id", store_id)\
+                .in_("id", menu_ids)\
+                .execute()
+        
+        logger.info(f"Menu categories updated: {sum(len(ids) for ids in by_category.values())}개")
+        return True
+    except Exception as e:
+        logger.error(f"Failed to update menu categories: {e}")
+        return False
+    finally:
+        if by_category:
+            # 일부만 반영됐을 수 있으므로 실패해도 무효화
+            soft_invalidate(
+                reason=f"update_menu_categories: {len(categories)}개",
+                targets=["menus"],
+                session_keys=['ss_menu_master_df']
+            )
+
+
 def load_ingredient_structure_state(store_id: str) -> dict:
     """
     재료별 설계 상태 조회 (DB)
@@ -22,6 +22,7 @@ def estimate_impact(strategy_type: str, context: Dict) -> Dict:
         context: {
             "store_id": ...,
             "period": {"year":..., "month":...},
+            "strategy_context": StrategyContext | None,
             "kpi": {...},
             "revenue": {...},
             "menu": {...},
@@ -51,8 +52,12 @@ def estimate_impact(strategy_type: str, context: Dict) -> Dict:
     ingredient = context.get("ingredient", {})
     health = context.get("health", {})
     
-    # 예상 월 매출 계산
-    expected_monthly_sales = _estimate_expected_monthly_sales(store_id, year, month, kpi)
+    # 예상 월 매출 계산 (StrategyContext가 있으면 memoize된 값 재사용)
+    strategy_context = context.get("strategy_context")
+    if strategy_context is not None:
+        expected_monthly_sales = strategy_context.expected_monthly_sales
+    else:
+        expected_monthly_sales = _estimate_expected_monthly_sales(store_id, year, month, kpi)
     
     # 변동비율 계산
     variable_cost_rate = revenue.get("variable_cost_rate")
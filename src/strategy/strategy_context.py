@@ -0,0 +1,217 @@
+"""
+전략 컨텍스트 (가게 상태 분류 / 전략 카드 / 건강검진 가중치 / Impact 공용 입력)
+
+- (매장, 연월, 데이터 버전)당 1회 생성, 필드는 처음 접근할 때 1회만 로드 (lazy memoize)
+- classify_store_state, build_strategy_cards(v4/v1), apply_health_weighting, estimate_impact가
+  같은 객체를 공유해 월매출/손익분기점/일별 매출/설계 인사이트/검진 데이터를 한 번씩만 읽음
+- 일별 매출은 core.timeseries_engine 공용 시계열(오늘 기준 120일)을 사용
+"""
+from __future__ import annotations
+
+import logging
+import time
+from datetime import date, datetime, timedelta
+from functools import cached_property
+from typing import Dict, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+KST = ZoneInfo("Asia/Seoul")
+
+_SESSION_KEY = "_strategy_context_cache"
+# 컨텍스트 재사용 시간 (초). 다른 기기에서의 저장은 이 세션 버전 토큰을 올리지 않으므로
+# 하위 로더 캐시와 같은 60초가 지나면 새로 만듦
+_CONTEXT_TTL_SEC = 60
+# 컨텍스트 필드가 읽는 데이터의 버전 토큰 (하나라도 바뀌면 새 컨텍스트)
+# 매출/구조: sales~settlement, 설계(design_insights/design_state): menus~menu_roles, 검진: health_check
+_VERSION_TOKENS = (
+    "sales", "daily_close", "visitors", "cost", "targets", "settlement",
+    "menus", "recipes", "ingredients", "menu_roles",
+    "health_check",
+)
+_DEFAULT_VARIABLE_COST_RATE = 0.3
+
+
+class StrategyContext:
+    """매장/월 전략 계산 입력 (필드는 lazy 로드 후 memoize)"""
+
+    def __init__(self, store_id: str, year: int, month: int, today: Optional[date] = None):
+        self.store_id = store_id
+        self.year = year
+        self.month = month
+        self.today = today or datetime.now(KST).date()
+        self.month_start = date(year, month, 1)
+        self.month_end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+
+    # ---------- 기간 ----------
+
+    @property
+    def is_current_month(self) -> bool:
+        return (self.today.year, self.today.month) == (self.year, self.month)
+
+    @property
+    def days_in_month(self) -> int:
+        return (self.month_end - self.month_start).days
+
+    @property
+    def elapsed_days(self) -> int:
+        """경과 일수 (현재 월이면 오늘까지, 과거 월이면 월 전체)"""
+        if self.is_current_month:
+            return max(1, (self.today - self.month_start).days + 1)
+        return self.days_in_month
+
+    # ---------- 매출/구조 ----------
+
+    @cached_property
+    def monthly_sales(self) -> int:
+        from src.storage_supabase import load_monthly_sales_total
+        return load_monthly_sales_total(self.store_id, self.year, self.month) or 0
+
+    @cached_property
+    def break_even(self) -> float:
+        from src.storage_supabase import calculate_break_even_sales
+        try:
+            return calculate_break_even_sales(self.store_id, self.year, self.month) or 0
+        except Exception as e:
+            logger.warning(f"StrategyContext.break_even failed: {e}")
+            return 0
+
+    @cached_property
+    def variable_cost_rate(self) -> float:
+        from src.storage_supabase import get_variable_cost_ratio
+        try:
+            return get_variable_cost_ratio(self.store_id, self.year, self.month) or _DEFAULT_VARIABLE_COST_RATE
+        except Exception:
+            return _DEFAULT_VARIABLE_COST_RATE
+
+    @property
+    def projected_sales_30d(self) -> float:
+        """가게 상태 분류용 예상 매출 (현재 월: 일평균 × 30, 과거 월: 월 합계)"""
+        if self.is_current_month and self.today.day > 0:
+            return (self.monthly_sales / self.today.day) * 30
+        return self.monthly_sales
+
+    @cached_property
+    def expected_monthly_sales(self) -> float:
+        """Impact용 예상 월 매출 (MTD 일평균 × 월 일수)"""
+        if self.monthly_sales > 0:
+            return (self.monthly_sales / self.elapsed_days) * self.days_in_month
+        return 0.0
+
+    @cached_property
+    def series(self):
+        """일별 매출 시계열 (오늘 기준 최근 30일, 공용 120일 구간에서 재사용)"""
+        from core.timeseries_engine import get_daily_series
+        return get_daily_series(self.store_id, self.today - timedelta(days=30), self.today)
+
+    def sales_window_means(self, recent_days: int = 14) -> Tuple[Optional[float], Optional[float]]:
+        """최근 N일 평균 매출, 직전 N일 평균 매출"""
+        from core.timeseries_engine import METRIC_SALES
+        recent_start = self.today - timedelta(days=recent_days - 1)
+        compare_end = recent_start - timedelta(days=1)
+        compare_start = compare_end - timedelta(days=recent_days - 1)
+        return (
+            self.series.mean(METRIC_SALES, recent_start, self.today),
+            self.series.mean(METRIC_SALES, compare_start, compare_end),
+        )
+
+    @cached_property
+    def yesterday_sales(self) -> int:
+        from core.timeseries_engine import METRIC_SALES
+        yesterday = self.today - timedelta(days=1)
+        if self.series.count(yesterday, yesterday) == 0:
+            return 0
+        return int(self.series.total(METRIC_SALES, yesterday, yesterday))
+
+    @cached_property
+    def sales_trend(self) -> str:
+        """최근 7일 매출 추세 (앞 3일 vs 뒤 3일): up | down | stable | unknown"""
+        from core.timeseries_engine import METRIC_SALES
+        week_ago = self.today - timedelta(days=7)
+        n = self.series.count(week_ago, self.today)
+        if n < 2:
+            return "unknown"
+        head_avg, tail_avg = self.series.head_tail_means(METRIC_SALES, week_ago, self.today, k=3)
+        tail_avg = tail_avg or 0
+        older_avg = (head_avg or 0) if n >= 6 else tail_avg
+        if tail_avg > older_avg * 1.1:
+            return "up"
+        if tail_avg < older_avg * 0.9:
+            return "down"
+        return "stable"
+
+    @cached_property
+    def visitors_mtd(self) -> int:
+        try:
+            from src.auth import get_supabase_client
+            supabase = get_supabase_client()
+            if not supabase:
+                return 0
+            result = supabase.table("naver_visitors").select("visitors").eq(
+                "store_id", self.store_id
+            ).gte("date", self.month_start.isoformat()).lt("date", self.month_end.isoformat()).execute()
+            return sum(int(r.get("visitors", 0) or 0) for r in (result.data or []))
+        except Exception:
+            return 0
+
+    @property
+    def sales_per_visitor(self) -> float:
+        if self.visitors_mtd > 0 and self.monthly_sales > 0:
+            return self.monthly_sales / self.visitors_mtd
+        return 0
+
+    # ---------- 설계 ----------
+
+    @cached_property
+    def design_insights(self) -> Dict:
+        from ui_pages.design_lab.design_insights import get_design_insights
+        return get_design_insights(self.store_id, self.year, self.month)
+
+    @cached_property
+    def design_state(self) -> Dict:
+        from ui_pages.design_lab.design_state_loader import get_design_state
+        return get_design_state(self.store_id, self.year, self.month)
+
+    # ---------- 건강검진 ----------
+
+    @cached_property
+    def health_diag(self) -> Optional[Dict]:
+        try:
+            from src.health_check.health_integration import get_health_diag_for_home
+            return get_health_diag_for_home(self.store_id)
+        except Exception as e:
+            logger.warning(f"StrategyContext.health_diag failed: {e}")
+            return None
+
+    @cached_property
+    def health_profile(self) -> Dict:
+        from src.health_check.profile import load_latest_health_profile
+        return load_latest_health_profile(self.store_id, lookback_days=60)
+
+
+def get_strategy_context(store_id: str, year: int, month: int) -> StrategyContext:
+    """
+    전략 컨텍스트 조회 (세션 내 (매장, 연월, 오늘, 데이터 버전)당 1개 재사용)
+
+    _VERSION_TOKENS(매출/마감/방문자/비용/설계/검진) 중 하나라도 바뀌거나
+    _CONTEXT_TTL_SEC가 지나면 새 컨텍스트를 만든다.
+    """
+    today = datetime.now(KST).date()
+    try:
+        from src.utils.cache_tokens import get_data_version
+        key = (
+            store_id, int(year), int(month), today.isoformat(),
+            tuple(get_data_version(name) for name in _VERSION_TOKENS),
+        )
+        now = time.time()
+        cache = st.session_state.get(_SESSION_KEY)
+        if cache is None or cache.get("key") != key or now - cache.get("created_at", 0.0) >= _CONTEXT_TTL_SEC:
+            cache = {"key": key, "ctx": StrategyContext(store_id, year, month, today), "created_at": now}
+            st.session_state[_SESSION_KEY] = cache
+        return cache["ctx"]
+    except Exception:
+        # Streamlit 런타임 밖(스크립트/배치)에서는 매번 새로 생성
+        return StrategyContext(store_id, year, month, today)
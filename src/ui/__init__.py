@@ -6,14 +6,6 @@ UI 컴포넌트 모듈
 import sys
 import importlib.util
 
-# src/ui.py 모듈을 동적으로 로드
-_ui_module_path = None
-for path in sys.path:
-    potential_path = __import__('pathlib').Path(path) / 'src' / 'ui.py'
-    if potential_path.exists():
-        _ui_module_path = potential_path
-        break
-
 # src/ui.py에서 export할 모든 함수 목록
 _EXPORTED_FUNCTIONS = [
     'render_manager_closing_input',
@@ -37,24 +29,39 @@ _EXPORTED_FUNCTIONS = [
     'render_recipe_input',
 ]
 
-if _ui_module_path:
-    spec = importlib.util.spec_from_file_location("src_ui_module", _ui_module_path)
-    _ui_module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(_ui_module)
+_ui_module = None
+
+
+def _load_ui_module():
+    """src/ui.py 모듈 로드 (pandas/matplotlib 포함, 최초 접근 시 1회)"""
+    global _ui_module
+    if _ui_module is not None:
+        return _ui_module
     
-    # 모든 함수들을 re-export
-    for func_name in _EXPORTED_FUNCTIONS:
-        globals()[func_name] = getattr(_ui_module, func_name, None)
-else:
-    # src/ui.py를 찾을 수 없는 경우 (fallback)
-    try:
-        import importlib
-        _ui_module = importlib.import_module('src.ui')
-        for func_name in _EXPORTED_FUNCTIONS:
-            globals()[func_name] = getattr(_ui_module, func_name, None)
-    except ImportError:
-        # 모듈을 찾을 수 없으면 None으로 설정
-        for func_name in _EXPORTED_FUNCTIONS:
-            globals()[func_name] = None
+    # src/ui.py 모듈을 동적으로 로드
+    _ui_module_path = None
+    for path in sys.path:
+        potential_path = __import__('pathlib').Path(path) / 'src' / 'ui.py'
+        if potential_path.exists():
+            _ui_module_path = potential_path
+            break
+    
+    if _ui_module_path:
+        spec = importlib.util.spec_from_file_location("src_ui_module", _ui_module_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _ui_module = module
+    return _ui_module
+
+
+def __getattr__(name):
+    # re-export 함수는 처음 접근할 때 src/ui.py를 로드
+    # (src.ui.css_manager 등 하위 모듈 import 시 pandas/matplotlib을 끌어오지 않도록 지연)
+    if name in _EXPORTED_FUNCTIONS:
+        module = _load_ui_module()
+        value = getattr(module, name, None) if module is not None else None
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = _EXPORTED_FUNCTIONS
@@ -0,0 +1,147 @@
+"""
+CSS 번들: css_manager 계층 CSS를 정적 파일로 묶어 브라우저 캐시로 제공
+
+- 계층/이름별 CSS를 minify 후 내용 해시 파일명(static/ps-{layer}-{name}.{hash}.css)으로 1회 기록
+- 페이지에는 수백 byte짜리 로더만 출력 → rerun마다 수십 KB CSS를 웹소켓으로 다시 보내지 않음
+- Streamlit 정적 서빙은 .css를 text/plain + nosniff로 내보내 <link rel="stylesheet">가 거부되므로,
+  로더(components.html)가 파일을 fetch해 부모 문서 <head>에 <style id=...>로 1회 삽입한다
+  (같은 해시면 재요청 없음, 파일은 ETag로 HTTP 캐시)
+- 정적 서빙 비활성/파일 기록 실패/CSS 외 마크업 포함 시 None 반환 → 호출부가 기존 인라인 주입 사용
+"""
+import hashlib
+import logging
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+# Streamlit 정적 서빙 경로 (app.py 옆 static/ → app/static/)
+STATIC_DIR = Path(__file__).resolve().parents[2] / "static"
+STATIC_URL = "app/static"
+BUNDLE_PREFIX = "ps-"
+
+# 이보다 작은 CSS는 인라인 유지 (로더보다 작거나 조건부 오버라이드라 번들 이득 없음)
+BUNDLE_MIN_BYTES = 2048
+
+# 원본 CSS 다이제스트 → (내용 해시, 파일명) (프로세스 전역, 파일은 1회만 기록)
+_BUNDLES: Dict[str, Tuple[str, str]] = {}
+
+_STYLE_TAG_RE = re.compile(r"</?style[^>]*>", re.IGNORECASE)
+_OTHER_TAG_RE = re.compile(r"<(?!/?style\b)[a-zA-Z!/]")
+_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+_SPACE_RE = re.compile(r"\s+")
+_PUNCT_RE = re.compile(r"\s*([{};,>])\s*")
+
+
+def _static_serving_enabled() -> bool:
+    try:
+        return bool(st.get_option("server.enableStaticServing"))
+    except Exception:
+        return False
+
+
+def minify_css(css: str) -> Optional[str]:
+    """<style> 래퍼/주석/공백 제거. CSS 외 마크업(<script>, <div> 등)이 있으면 None"""
+    body = _STYLE_TAG_RE.sub("", css)
+    if _OTHER_TAG_RE.search(body):
+        return None
+    body = _COMMENT_RE.sub("", body)
+    body = _SPACE_RE.sub(" ", body)
+    body = _PUNCT_RE.sub(r"\1", body)
+    return body.replace(";}", "}").strip()
+
+
+def _safe_name(text: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9_-]", "_", text)[:48]
+
+
+def build_bundle(layer: str, name: str, css: str) -> Optional[Tuple[str, str]]:
+    """
+    계층 CSS를 해시 파일로 기록
+
+    Returns:
+        (내용 해시, 정적 URL) 또는 None (번들 불가 → 인라인 주입)
+    """
+    if len(css) < BUNDLE_MIN_BYTES or not _static_serving_enabled():
+        return None
+
+    digest = hashlib.sha1(f"{layer}:{name}:{css}".encode("utf-8")).hexdigest()
+    cached = _BUNDLES.get(digest)
+    if cached:
+        return cached[0], f"{STATIC_URL}/{cached[1]}"
+
+    minified = minify_css(css)
+    if not minified:
+        return None
+    content_hash = hashlib.sha256(minified.encode("utf-8")).hexdigest()[:12]
+    filename = f"{BUNDLE_PREFIX}{_safe_name(layer.lower())}-{_safe_name(name)}.{content_hash}.css"
+    path = STATIC_DIR / filename
+    try:
+        if not path.exists():
+            STATIC_DIR.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=STATIC_DIR, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(minified)
+            os.replace(tmp_path, path)
+    except Exception as e:
+        logger.warning(f"CSS bundle write failed ({layer}/{name}): {e}")
+        return None
+
+    _BUNDLES[digest] = (content_hash, filename)
+    return content_hash, f"{STATIC_URL}/{filename}"
+
+
+def render_bundle_loader(layer: str, name: str, content_hash: str, url: str, scoped: bool) -> None:
+    """
+    번들 로더 출력 (부모 문서 <head>에 <style id="ps-css-{layer}-{name}"> 보장)
+
+    Args:
+        scoped: True(DOM 계층)면 로더가 더 이상 렌더링되지 않을 때 스타일도 제거
+                (rerun마다 주입되던 페이지 전용 CSS의 기존 동작 유지)
+    """
+    import streamlit.components.v1 as components
+
+    style_id = f"ps-css-{_safe_name(layer.lower())}-{_safe_name(name)}"
+    release = """
+        window.addEventListener("pagehide", function () {
+            parent.setTimeout(function () {
+                var e = d.getElementById(id);
+                if (e && e.dataset.owner === token) e.remove();
+            }, 1000);
+        });""" if scoped else ""
+    components.html(
+        f"""
+        <script>
+        (function () {{
+            var d = parent.document, id = "{style_id}", hash = "{content_hash}";
+            var token = Math.random().toString(36).slice(2);
+            var el = d.getElementById(id);
+            if (el && el.dataset.hash === hash) {{
+                el.dataset.owner = token;
+            }} else {{
+                fetch(new URL("{url}", d.baseURI)).then(function (r) {{
+                    if (!r.ok) throw new Error(r.status);
+                    return r.text();
+                }}).then(function (text) {{
+                    el = d.getElementById(id);
+                    if (!el) {{
+                        el = d.createElement("style");
+                        el.id = id;
+                        d.head.appendChild(el);
+                    }}
+                    el.textContent = text;
+                    el.dataset.hash = hash;
+                    el.dataset.owner = token;
+                }}).catch(function () {{}});
+            }}{release}
+        }})();
+        </script>
+        """,
+        height=0,
+        width=0,
+    )
@@ -8,9 +8,14 @@ CSS Manager: CSS 주입 통합 관리 모듈
 - FX: Ultra, 배경, 애니메이션, glow (1회 주입)
 - DOM: form_kit, input_layouts, 페이지 박스, sidebar 꾸밈 (rerun마다 주입)
 - RESCUE: FINAL_SAFETY_PIN (1회 주입)
+
+정적 서빙(server.enableStaticServing)이 켜져 있으면 큰 CSS는 해시 번들 파일로 기록하고
+페이지에는 작은 로더만 출력한다 (src/ui/css_bundle). 번들 불가 시 기존 인라인 주입.
 """
 import streamlit as st
 
+from src.ui.css_bundle import build_bundle, render_bundle_loader
+
 try:
     from src.debug.nav_trace import push_render_step
 except ImportError:
@@ -31,8 +36,14 @@ def _inject_once(layer: str, css: str, key: str, name: str):
     if st.session_state.get(key, False):
         return
     
-    st.markdown(css, unsafe_allow_html=True)
-    push_render_step(f"CSS_{layer}_INJECT", extra={"where": layer.lower(), "name": name})
+    extra = {"where": layer.lower(), "name": name}
+    bundle = build_bundle(layer, name, css)
+    if bundle:
+        render_bundle_loader(layer, name, bundle[0], bundle[1], scoped=False)
+        extra["bundle"] = bundle[0]
+    else:
+        st.markdown(css, unsafe_allow_html=True)
+    push_render_step(f"CSS_{layer}_INJECT", extra=extra)
     st.session_state[key] = True
 
 
@@ -46,8 +57,14 @@ def _inject_always(layer: str, css: str, name: str, scope: str = None):
         name: 로그용 이름
         scope: 스코프 ID (선택사항)
     """
-    st.markdown(css, unsafe_allow_html=True)
     extra = {"where": layer.lower(), "name": name}
+    bundle = build_bundle(layer, name, css)
+    if bundle:
+        # 로더만 rerun마다 출력 (CSS 본문은 브라우저에 1회만 전송)
+        render_bundle_loader(layer, name, bundle[0], bundle[1], scoped=True)
+        extra["bundle"] = bundle[0]
+    else:
+        st.markdown(css, unsafe_allow_html=True)
     if scope:
         extra["scope"] = scope
     push_render_step(f"CSS_{layer}_INJECT", extra=extra)
@@ -4,6 +4,8 @@ HOME 페이지에서만 적용되는 스코프 CSS
 """
 import streamlit as st
 
+from src.ui.css_manager import inject_dom
+
 
 def inject_home_premium_css():
     """
@@ -702,22 +704,8 @@ def inject_home_premium_css():
     </style>
     """
     
-    # 기존 스타일 태그 제거 후 재주입 (중복 방지)
-    remove_script = """
-    <script>
-    (function() {
-        // 기존 홈 프리미엄 CSS 제거
-        var existingStyle = document.getElementById('ps-home-premium-style');
-        if (existingStyle) {
-            existingStyle.remove();
-        }
-    })();
-    </script>
-    """
-    st.markdown(remove_script, unsafe_allow_html=True)
-    
-    # CSS 주입
-    st.markdown(css, unsafe_allow_html=True)
+    # DOM 계층: 홈 진입 시마다 주입 (번들 가능 시 로더만 출력, 홈을 벗어나면 스타일 제거)
+    inject_dom(css, "home_premium")
     
     # 주입 완료 플래그 설정 (디버깅용)
     st.session_state["_ps_home_premium_css_injected"] = True
@@ -0,0 +1,147 @@
+"""
+페이지 레지스트리: 사이드바 메뉴 + 라우팅의 단일 정의
+
+- 페이지 key → (모듈 경로, 렌더 함수, 사이드바 라벨/카테고리)
+- 라우팅 시 선택된 페이지 모듈만 import (나머지 페이지 트리는 로드하지 않음)
+- 페이지 import/render 시간은 boot_perf에 기록, import 예산 초과 시 경고
+  (CI: scripts/check_page_import_budget.py 가 페이지별 cold import 예산을 검사)
+- 페이지별 rerun 쿼리 예산(query_budget)은 src/utils/query_ledger 가 검사 (N+1 의심 형태도 경고)
+"""
+import importlib
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 페이지 모듈 cold import 예산 (앱 셸 import 이후 추가 비용, ms)
+DEFAULT_IMPORT_BUDGET_MS = 2000.0
+
+
+@dataclass(frozen=True)
+class PageSpec:
+    key: str                        # current_page 값
+    module: str                     # 페이지 모듈 경로
+    func: str                       # 렌더 함수 이름
+    category: Optional[str] = None  # 사이드바 카테고리 (None이면 메뉴에 노출 안 함)
+    label: Optional[str] = None     # 사이드바 버튼 라벨
+    main: bool = False              # 허브형 카테고리의 대표 버튼 (False면 "상세 선택" 안)
+    import_budget_ms: float = DEFAULT_IMPORT_BUDGET_MS
+    query_budget: Optional[int] = None  # rerun 1회 DB 요청 상한 (None이면 검사 안 함)
+
+
+# 사이드바 카테고리 순서 (허브형: main + sub expander / 목록형: 버튼 나열)
+CATEGORIES = [
+    ("🏠 홈", "list"),
+    ("✍ 입력", "hub"),
+    ("📊 분석", "hub"),
+    ("🎯 전략", "hub"),
+    ("🛠 운영", "list"),
+    ("🧪 테스트", "list"),
+]
+
+# rerun 쿼리 예산: 벤치마크(small) 가짜 백엔드에서 잰 cold 렌더 호출 수 + 앱 셸(로그인/매장 조회) 여유분
+#   홈 0 (정적 화면, 셸만) / 매출 8 / 원가 13 / 검진 실시 2 (+저장) / 검진 요약 18 / 분석 허브 15 / 하락 원인 18
+# 사이드바 노출 순서 = 선언 순서
+PAGES: List[PageSpec] = [
+    # 🏠 홈
+    PageSpec("홈", "ui_pages.home_page_v0", "render_home", "🏠 홈", "홈", query_budget=10),
+    # ✍ 입력
+    PageSpec("입력 허브", "ui_pages.input.input_hub", "render_input_hub_v3", "✍ 입력", "데이터 입력센터", main=True),
+    PageSpec("일일 입력(통합)", "ui_pages.daily_input_hub", "render_daily_input_hub", "✍ 입력", "오늘 마감"),
+    PageSpec("매출 등록", "ui_pages.sales_entry", "render_sales_entry", "✍ 입력", "매출·방문자"),
+    PageSpec("판매량 등록", "ui_pages.sales_volume_entry", "render_sales_volume_entry", "✍ 입력", "판매량"),
+    PageSpec("실제정산", "ui_pages.settlement_actual", "render_settlement_actual", "✍ 입력", "월간 정산"),
+    PageSpec("목표 비용구조", "ui_pages.target_cost_structure", "render_target_cost_structure", "✍ 입력", "목표(비용)"),
+    PageSpec("목표 매출구조", "ui_pages.target_sales_structure", "render_target_sales_structure", "✍ 입력", "목표(매출)"),
+    PageSpec("건강검진 실시", "ui_pages.health_check.health_check_page", "render_health_check_page", "✍ 입력", "QSC 체크", query_budget=20),
+    # 📊 분석
+    PageSpec("분석 허브", "ui_pages.analysis.analysis_hub", "render_analysis_hub", "📊 분석", "데이터 분석센터", main=True, query_budget=30),
+    PageSpec("매출 관리", "ui_pages.analysis.sales_analysis", "render_sales_analysis", "📊 분석", "매출", query_budget=20),
+    PageSpec("판매 관리", "ui_pages.analysis.sales_analysis", "render_sales_analysis", "📊 분석", "판매·메뉴", query_budget=20),
+    PageSpec("비용 분석", "ui_pages.analysis.cost_analysis", "render_cost_analysis", "📊 분석", "원가", query_budget=30),
+    PageSpec("검진 결과 요약", "ui_pages.health_check.health_check_result", "render_health_check_result", "📊 분석", "QSC 요약", query_budget=35),
+    PageSpec("검진 히스토리", "ui_pages.health_check.health_check_history", "render_health_check_history", "📊 분석", "QSC 히스토리"),
+    PageSpec("매출 하락 원인 찾기", "ui_pages.diagnostics.sales_drop_oneclick", "render_sales_drop_oneclick", "📊 분석", "하락 원인", query_budget=35),
+    # 🎯 전략
+    PageSpec("가게 전략 센터", "ui_pages.design_lab.design_hub", "render_design_hub", "🎯 전략", "데이터 전략센터", main=True),
+    PageSpec("메뉴 등록", "ui_pages.menu_management", "render_menu_management", "🎯 전략", "메뉴 구성"),
+    PageSpec("메뉴 수익 구조 설계실", "ui_pages.menu_profit_design_lab", "render_menu_profit_design_lab", "🎯 전략", "메뉴 수익"),
+    PageSpec("재료 등록", "ui_pages.ingredient_management", "render_ingredient_management", "🎯 전략", "재료 구조"),
+    PageSpec("수익 구조 설계실", "ui_pages.revenue_structure_design_lab", "render_revenue_structure_design_lab", "🎯 전략", "수익 구조"),
+    PageSpec("레시피 등록", "ui_pages.recipe_management", "render_recipe_management", "🎯 전략", "레시피"),
+    # 🛠 운영
+    PageSpec("직원 연락망", "ui_pages.staff_contacts", "render_staff_contacts", "🛠 운영", "직원 연락망"),
+    PageSpec("협력사 연락망", "ui_pages.vendor_contacts", "render_vendor_contacts", "🛠 운영", "협력사 연락망"),
+    PageSpec("게시판", "ui_pages.board", "render_board", "🛠 운영", "게시판"),
+    # 🧪 테스트
+    PageSpec("화면테스트", "ui_pages.design_test.header_unified_test", "render_header_unified_test", "🧪 테스트", "화면테스트"),
+    PageSpec("화면테스트2", "ui_pages.design_test.header_unified_test2", "render_header_unified_test2", "🧪 테스트", "화면테스트2"),
+    # 메뉴 미노출 (다른 페이지의 버튼으로 진입)
+    PageSpec("오늘의 전략 실행", "ui_pages.strategy.mission_detail", "render_mission_detail"),
+    PageSpec("분석총평", "ui_pages.analysis.analysis_summary", "render_analysis_summary"),
+    PageSpec("메뉴 입력", "ui_pages.input.menu_input", "render_menu_input_page"),
+    PageSpec("재료 입력", "ui_pages.input.ingredient_input", "render_ingredient_input_page"),
+    PageSpec("재고 입력", "ui_pages.input.inventory_input", "render_inventory_input_page"),
+    PageSpec("원가 파악", "ui_pages.cost_overview", "render_cost_overview"),
+    PageSpec("주간 리포트", "ui_pages.weekly_report", "render_weekly_report"),
+    PageSpec("재료 사용량 집계", "ui_pages.ingredient_usage_summary", "render_ingredient_usage_summary"),
+    PageSpec("재고 분석", "ui_pages.analysis.inventory_analysis", "render_inventory_analysis"),
+    PageSpec("실제정산 분석", "ui_pages.analysis.settlement_analysis", "render_settlement_analysis"),
+]
+
+_PAGES_BY_KEY: Dict[str, PageSpec] = {spec.key: spec for spec in PAGES}
+
+
+def get_page(key: str) -> Optional[PageSpec]:
+    return _PAGES_BY_KEY.get(key)
+
+
+def build_sidebar_menu() -> Dict:
+    """
+    사이드바 메뉴 구조 생성 (render_expanded_sidebar 입력 형식)
+
+    Returns:
+        {카테고리: [(라벨, key), ...]} (목록형) 또는
+        {카테고리: {"main": [...], "sub": [...]}} (허브형)
+    """
+    menu = {}
+    for category, kind in CATEGORIES:
+        specs = [spec for spec in PAGES if spec.category == category]
+        if kind == "hub":
+            menu[category] = {
+                "main": [(spec.label, spec.key) for spec in specs if spec.main],
+                "sub": [(spec.label, spec.key) for spec in specs if not spec.main],
+            }
+        else:
+            menu[category] = [(spec.label, spec.key) for spec in specs]
+    return menu
+
+
+def render_page(key: str) -> bool:
+    """
+    선택된 페이지 모듈만 import 후 렌더링 (import/render 시간 기록)
+
+    Returns:
+        등록된 페이지면 True, 아니면 False (아무것도 렌더링하지 않음)
+    """
+    spec = get_page(key)
+    if spec is None:
+        return False
+
+    from src.utils.boot_perf import record_page_import, record_page_render_time, record_page_total_time
+    from src.utils.query_ledger import check_query_budget, set_ledger_page
+
+    set_ledger_page(spec.key, spec.query_budget)
+    start = time.perf_counter()
+    module = importlib.import_module(spec.module)
+    imported = time.perf_counter()
+    record_page_import(spec.key, (imported - start) * 1000, spec.import_budget_ms)
+
+    getattr(module, spec.func)()
+    end = time.perf_counter()
+    record_page_render_time((end - imported) * 1000)
+    record_page_total_time((end - start) * 1000)
+    check_query_budget()
+    return True
@@ -16,6 +16,8 @@ _boot_perf_data = {
     "BOOTSTRAP_DB_CALLS": [],
     "BOOTSTRAP_DB_TIME_MS": 0.0,
     "PAGE_IMPORT_MS": None,
+    "PAGE_KEY": None,  # 마지막으로 렌더링한 페이지 (page_registry)
+    "PAGE_IMPORT_BUDGET_MS": None,  # 해당 페이지 import 예산
     "PAGE_RENDER_MS": None,
     "PAGE_TOTAL_MS": None,
     "DATA_CALLS": [],  # 데이터 호출 기록
@@ -98,6 +100,18 @@ def record_page_import_time(duration_ms: float):
         _recent_measurements["PAGE_IMPORT_MS"].pop(0)
 
 
+def record_page_import(page_key: str, duration_ms: float, budget_ms: Optional[float] = None):
+    """페이지 import 시간 + 예산 기록 (예산 초과 시 경고 로그)"""
+    record_page_import_time(duration_ms)
+    _boot_perf_data["PAGE_KEY"] = page_key
+    _boot_perf_data["PAGE_IMPORT_BUDGET_MS"] = budget_ms
+    if budget_ms is not None and duration_ms > budget_ms:
+        import logging
+        logging.getLogger(__name__).warning(
+            f"[BOOT_PERF] page import over budget: {page_key} {duration_ms:.1f}ms > {budget_ms:.0f}ms"
+        )
+
+
 def record_page_render_time(duration_ms: float):
     """페이지 render 시간 기록"""
     _boot_perf_data["PAGE_RENDER_MS"] = duration_ms
@@ -140,11 +154,14 @@ def render_boot_perf_panel(container, key_prefix="panel"):
         if not is_dev_mode():
             return
         
-        # 1회 렌더 가드 (같은 run 내 중복 방지)
+        # 1회 렌더 가드 (같은 run 내 중복 방지, 다음 rerun에서는 다시 렌더)
+        from src.utils.query_ledger import N1_THRESHOLD, get_query_ledger
+        ledger = get_query_ledger()
+        run_id = ledger.run_id if ledger is not None else None
         guard_key = f"_dev_panel_rendered_{key_prefix}"
-        if st.session_state.get(guard_key, False):
+        if run_id is not None and st.session_state.get(guard_key) == run_id:
             return
-        st.session_state[guard_key] = True
+        st.session_state[guard_key] = run_id
         
         with container:
             # force_hard_clear 토글 (dev_mode에서만)
@@ -162,6 +179,39 @@ def render_boot_perf_panel(container, key_prefix="panel"):
                 else:
                     st.caption("ℹ️ 소프트 무효화 모드 (권장)")
             
+            if ledger is not None:
+                repeated = ledger.repeated()
+                with st.expander(
+                    f"🔁 쿼리 원장 (이번 rerun {ledger.total}회)"
+                    + (" ⚠️" if repeated or ledger.over_budget else ""),
+                    expanded=bool(repeated or ledger.over_budget),
+                ):
+                    budget_info = f" / 예산 {ledger.budget}회" if ledger.budget is not None else ""
+                    st.caption(f"{ledger.page_key or '-'} · {ledger.total}회{budget_info} · {ledger.total_ms:.1f}ms")
+                    if ledger.over_budget:
+                        st.warning(f"쿼리 예산 초과: {ledger.total}회 > {ledger.budget}회")
+                    if repeated:
+                        st.write(f"**N+1 의심 (같은 형태 {N1_THRESHOLD}회 이상)**")
+                        for row in repeated:
+                            st.caption(f"  • {row['shape']} ×{row['count']} ({row['total_ms']:.1f}ms) [{', '.join(row['names'])}]")
+                            for site in row["callsite"]:
+                                st.caption(f"      ↳ {site}")
+                    st.write("**형태별 요청 (상위 10개)**")
+                    for row in ledger.summary()[:10]:
+                        st.caption(f"  • {row['shape']} ×{row['count']} ({row['total_ms']:.1f}ms)")
+            
+            with st.expander("📡 쿼리 텔레메트리 (상시)", expanded=False):
+                from src.utils.query_telemetry import get_telemetry_snapshot
+                snapshot = get_telemetry_snapshot()
+                st.caption(f"샘플링 {snapshot['sample_rate']:.0%} · 시리즈 {len(snapshot['series'])}개 (누적 시간순)")
+                for row in snapshot["series"][:10]:
+                    st.caption(
+                        f"  • {row['name']} / {row['table']}: {row['count']}회 "
+                        f"p50 {row['p50_ms']}ms · p95 {row['p95_ms']}ms · p99 {row['p99_ms']}ms "
+                        f"· {row['rows']}행 · {row['bytes'] / 1024:.1f}KB"
+                        + (f" · 오류 {row['errors']}" if row["errors"] else "")
+                    )
+            
             with st.expander("🚀 부팅 성능", expanded=False):
                 data = get_boot_perf_data()
                 
@@ -187,6 +237,10 @@ def render_boot_perf_panel(container, key_prefix="panel"):
                         st.metric("PAGE_IMPORT", f"{data['PAGE_IMPORT_MS']:.1f}ms", delta=delta)
                     else:
                         st.metric("PAGE_IMPORT", f"{data['PAGE_IMPORT_MS']:.1f}ms")
+                    budget = data.get("PAGE_IMPORT_BUDGET_MS")
+                    if budget:
+                        status = "✅" if data["PAGE_IMPORT_MS"] <= budget else "⚠️ 예산 초과"
+                        st.caption(f"{data.get('PAGE_KEY')} · 예산 {budget:.0f}ms {status}")
                 if data["PAGE_RENDER_MS"] is not None:
                     recent = get_recent_measurements()
                     if len(recent["PAGE_RENDER_MS"]) >= 2:
@@ -0,0 +1,365 @@
+"""
+영구 캐시 계층 (프로세스 재시작 후에도 유지, 선택 사항)
+
+- st.cache_data / session_state 는 프로세스 메모리라 재배포·슬립 후 모든 매장이 cold 로드를 다시 함
+- 이 계층은 st.cache_data 미스일 때만 조회: DataFrame → Parquet 파일, 작은 결과(JSON) → SQLite
+- 색인(SQLite): (store_id, table, range, 워터마크) → 항목, 크기 상한 LRU 삭제
+- 신선도: 원본 테이블별 (행 수, max(updated_at)) 워터마크를 RPC 1회로 조회해 저장 시점과 비교
+  → 같으면 디스크에서 반환, 다르면 원래 로더로 다시 읽고 교체
+- 워터마크는 rerun(쿼리 원장 run_id)마다 1회만 조회 (실행 컨텍스트 밖에서는 WATERMARK_TTL_SEC)
+
+활성화: secrets [app] disk_cache_dir = "..." 또는 환경변수 PS_DISK_CACHE_DIR (기본: 꺼짐)
+크기 상한: [app] disk_cache_max_mb 또는 PS_DISK_CACHE_MAX_MB (기본 512MB)
+전제: sql/store_watermarks.sql 적용 (updated_at 트리거 + get_store_watermarks RPC).
+      RPC가 없으면 updated_at 이 수정 시 갱신된다는 보장이 없으므로 이 계층은 스스로 꺼짐.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from src.utils.rpc_errors import is_missing_function_error
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_RPC = "get_store_watermarks"
+WATERMARK_TTL_SEC = 5
+# 워터마크 RPC 일시 오류(타임아웃/5xx 등) 후 다시 시도하기까지 (그동안은 원래 로더 사용)
+RPC_RETRY_SEC = 30
+DEFAULT_MAX_MB = 512
+
+# 캐시 대상 테이블/뷰 → 워터마크 원본 테이블 (모두 store_id + updated_at 보유)
+# recipes / abc_history / actual_settlement 는 updated_at 이 없어 제외
+WATERMARK_SOURCES: Dict[str, Tuple[str, ...]] = {
+    "sales": ("sales",),
+    "naver_visitors": ("naver_visitors",),
+    "menu_master": ("menu_master",),
+    "ingredients": ("ingredients",),
+    "inventory": ("inventory", "ingredients"),
+    "targets": ("targets",),
+    "daily_close": ("daily_close",),
+    "daily_sales_items": ("daily_sales_items", "menu_master"),
+    "v_daily_sales_items_effective": ("daily_sales_items", "daily_sales_items_overrides", "menu_master"),
+    "v_daily_sales_official": ("daily_close",),
+    "v_daily_sales_best_available": ("daily_close", "sales", "naver_visitors"),  # visitors: COALESCE(dc, nv)
+    "expense_structure": ("expense_structure",),
+    "suppliers": ("suppliers",),
+    "ingredient_suppliers": ("ingredient_suppliers", "ingredients", "suppliers"),
+    "orders": ("orders", "ingredients", "suppliers"),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    store_id TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    range_key TEXT NOT NULL,
+    watermark TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    payload TEXT,
+    json_columns TEXT,
+    size_bytes INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries(last_access);
+CREATE INDEX IF NOT EXISTS idx_entries_store_table ON entries(store_id, table_name);
+"""
+
+
+class PersistentCache:
+    """Parquet + SQLite 캐시 디렉터리 1개"""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.frames_dir = os.path.join(directory, "frames")
+        os.makedirs(self.frames_dir, mode=0o700, exist_ok=True)
+        self.index_path = os.path.join(directory, "index.sqlite")
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.index_path, timeout=5)
+
+    @staticmethod
+    def make_key(store_id: str, table: str, range_key: str) -> str:
+        return hashlib.sha1(f"{store_id}|{table}|{range_key}".encode("utf-8")).hexdigest()
+
+    def _frame_path(self, key: str) -> str:
+        return os.path.join(self.frames_dir, f"{key}.parquet")
+
+    # ---------- 조회 ----------
+
+    def lookup(self, store_id: str, table: str, range_key: str, watermark: str) -> Tuple[bool, object]:
+        """(적중 여부, 값). 워터마크가 다르면 미스 (항목은 다음 저장 때 교체)"""
+        key = self.make_key(store_id, table, range_key)
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT watermark, kind, payload, json_columns FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[0] != watermark:
+                return False, None
+            conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+        kind, payload, json_columns = row[1], row[2], row[3]
+        if kind == "json":
+            return True, json.loads(payload)
+        df = pd.read_parquet(self._frame_path(key))
+        for col in json.loads(json_columns or "[]"):
+            df[col] = df[col].map(lambda v: json.loads(v) if isinstance(v, str) else v)
+        return True, df
+
+    # ---------- 저장 ----------
+
+    def store(self, store_id: str, table: str, range_key: str, watermark: str, value) -> None:
+        key = self.make_key(store_id, table, range_key)
+        now = time.time()
+        if isinstance(value, pd.DataFrame):
+            frame, json_columns = _encode_nested(value)
+            path = self._frame_path(key)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            frame.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+            record = ("parquet", None, json.dumps(json_columns), os.path.getsize(path))
+        else:
+            payload = json.dumps(value, ensure_ascii=False, default=str)
+            record = ("json", payload, None, len(payload.encode("utf-8")))
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(key, store_id, table_name, range_key, watermark, kind, payload, json_columns, size_bytes, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, store_id, table, range_key, watermark, *record, now, now),
+            )
+        self.evict()
+
+    def evict(self) -> int:
+        """크기 상한 초과 시 오래 안 쓴 항목부터 삭제 (상한의 90%까지). 삭제 수 반환"""
+        with self._lock, self._connect() as conn:
+            total = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM entries").fetchone()[0]
+            if total <= self.max_bytes:
+                return 0
+            target = int(self.max_bytes * 0.9)
+            removed = []
+            for key, kind, size in conn.execute("SELECT key, kind, size_bytes FROM entries ORDER BY last_access ASC"):
+                if total <= target:
+                    break
+                removed.append((key, kind))
+                total -= size
+            conn.executemany("DELETE FROM entries WHERE key = ?", [(k,) for k, _ in removed])
+        for key, kind in removed:
+            if kind == "parquet":
+                try:
+                    os.remove(self._frame_path(key))
+                except OSError:
+                    pass
+        return len(removed)
+
+    def clear(self, store_id: Optional[str] = None) -> None:
+        with self._connect() as conn:
+            if store_id:
+                keys = [r[0] for r in conn.execute("SELECT key FROM entries WHERE store_id = ?", (store_id,))]
+                conn.execute("DELETE FROM entries WHERE store_id = ?", (store_id,))
+            else:
+                keys = [r[0] for r in conn.execute("SELECT key FROM entries")]
+                conn.execute("DELETE FROM entries")
+        for key in keys:
+            try:
+                os.remove(self._frame_path(key))
+            except OSError:
+                pass
+
+    def stats(self) -> Dict:
+        with self._connect() as conn:
+            count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM entries").fetchone()
+        return {"entries": count, "bytes": total, "max_bytes": self.max_bytes, "directory": self.directory}
+
+
+def _encode_nested(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[str]]:
+    """dict/list 값이 있는 object 컬럼은 JSON 문자열로 (jsonb 컬럼 원형 유지)"""
+    json_columns = []
+    out = df
+    for col in df.columns:
+        if df[col].dtype != object:
+            continue
+        if df[col].map(lambda v: isinstance(v, (dict, list))).any():
+            if out is df:
+                out = df.copy()
+            out[col] = df[col].map(lambda v: json.dumps(v, ensure_ascii=False) if isinstance(v, (dict, list)) else v)
+            json_columns.append(str(col))
+    return out, json_columns
+
+
+# ============================================
+# 설정 / 싱글턴
+# ============================================
+
+_cache: Optional[PersistentCache] = None
+_cache_dir: Optional[str] = None
+_rpc_available: Optional[bool] = None
+_rpc_retry_at = 0.0
+_watermarks: Dict[Tuple, Tuple[float, Dict[str, str]]] = {}
+_state_lock = threading.Lock()
+
+
+def _setting(name: str, env: str):
+    value = os.environ.get(env)
+    if value is not None:
+        return value
+    try:
+        import streamlit as st
+        return st.secrets.get("app", {}).get(name)
+    except Exception:
+        return None
+
+
+def get_persistent_cache() -> Optional[PersistentCache]:
+    """설정된 영구 캐시 (꺼져 있거나 RPC 없음/초기화 실패 시 None)"""
+    global _cache, _cache_dir
+    if _rpc_available is False:
+        return None
+    directory = _setting("disk_cache_dir", "PS_DISK_CACHE_DIR")
+    if not directory:
+        return None
+    if _cache is not None and _cache_dir == directory:
+        return _cache
+    with _state_lock:
+        if _cache is None or _cache_dir != directory:
+            try:
+                max_mb = float(_setting("disk_cache_max_mb", "PS_DISK_CACHE_MAX_MB") or DEFAULT_MAX_MB)
+                _cache = PersistentCache(directory, int(max_mb * 1024 * 1024))
+                _cache_dir = directory
+            except Exception as e:
+                logger.warning(f"Persistent cache disabled (init failed: {directory}): {e}")
+                return None
+    return _cache
+
+
+# ============================================
+# 워터마크
+# ============================================
+
+def _run_scope():
+    """워터마크 재사용 범위: 현재 rerun (원장 run_id), 실행 컨텍스트 밖이면 None"""
+    try:
+        from src.utils.query_ledger import get_query_ledger
+        ledger = get_query_ledger()
+        return ledger.run_id if ledger is not None else None
+    except Exception:
+        return None
+
+
+def invalidate_watermarks(store_id: Optional[str] = None) -> None:
+    """쓰기 직후 호출: 메모된 워터마크 폐기 (다음 조회에서 새로 읽음)"""
+    with _state_lock:
+        if store_id is None:
+            _watermarks.clear()
+        else:
+            for key in [k for k in _watermarks if k[0] == store_id]:
+                del _watermarks[key]
+
+
+def _fetch_watermarks(client, store_id: str, tables: Iterable[str]) -> Optional[Dict[str, str]]:
+    """
+    {테이블: "행수:max(updated_at)"} (RPC 1회)
+
+    RPC 함수가 없으면 None + 이 계층 비활성화, 일시 오류면 None + RPC_RETRY_SEC 동안 RPC 생략
+    """
+    global _rpc_available, _rpc_retry_at
+    if time.time() < _rpc_retry_at:
+        return None
+    tables = sorted(set(tables))
+    try:
+        result = client.rpc(WATERMARK_RPC, {"p_store_id": store_id, "p_tables": tables}).execute()
+    except Exception as e:
+        if is_missing_function_error(e):
+            _rpc_available = False
+            logger.warning(f"Persistent cache disabled: {WATERMARK_RPC} RPC unavailable ({e})")
+        else:
+            _rpc_retry_at = time.time() + RPC_RETRY_SEC
+            logger.warning(f"Persistent cache skipped for {RPC_RETRY_SEC}s: {WATERMARK_RPC} failed ({e})")
+        return None
+    _rpc_available = True
+    marks = {t: "0:" for t in tables}
+    for row in result.data or []:
+        marks[row.get("table_name")] = f"{row.get('row_count') or 0}:{row.get('max_updated_at') or ''}"
+    return marks
+
+
+def current_watermark(store_id: str, table: str) -> Optional[str]:
+    """캐시 대상 테이블의 현재 워터마크 (대상 아님/조회 실패 시 None)"""
+    sources = WATERMARK_SOURCES.get(table)
+    if not sources:
+        return None
+    scope = _run_scope()
+    memo_key = (store_id, scope)
+    now = time.time()
+    with _state_lock:
+        memo = _watermarks.get(memo_key)
+    if memo and (scope is not None or now - memo[0] < WATERMARK_TTL_SEC) and all(s in memo[1] for s in sources):
+        marks = memo[1]
+    else:
+        from src.auth import get_read_client
+        # 같은 rerun의 다른 로더도 쓰도록 전체 대상 테이블을 한 번에 조회
+        all_sources = {s for group in WATERMARK_SOURCES.values() for s in group}
+        marks = _fetch_watermarks(get_read_client(), store_id, all_sources)
+        if marks is None:
+            return None
+        with _state_lock:
+            # 이전 rerun 메모 정리 (실행 컨텍스트 밖 항목은 TTL로 자연 만료)
+            for key in [k for k in _watermarks if k[0] == store_id and k[1] != scope]:
+                del _watermarks[key]
+            _watermarks[memo_key] = (now, marks)
+    return "|".join(f"{s}={marks.get(s, '0:')}" for s in sources)
+
+
+# ============================================
+# 로더 래퍼
+# ============================================
+
+def cached_load(store_id: str, table: str, range_key: str, loader: Callable[[], object]):
+    """
+    영구 캐시를 거친 로드
+
+    - 꺼져 있거나 대상 테이블이 아니면 loader() 그대로
+    - 적중: 디스크 값 반환 / 미스: loader() 결과 저장 (빈 DataFrame·None 은 저장하지 않음)
+    - 캐시 I/O 실패는 경고만 남기고 loader() 결과 사용 (loader 예외는 그대로 전파)
+    """
+    cache = get_persistent_cache() if store_id else None
+    watermark = current_watermark(store_id, table) if cache else None
+    if cache is None or watermark is None:
+        return loader()
+
+    try:
+        hit, value = cache.lookup(store_id, table, range_key, watermark)
+        if hit:
+            _record_hit(table, range_key, value)
+            return value
+    except Exception as e:
+        logger.warning(f"Persistent cache read failed ({table}, {range_key}): {e}")
+
+    value = loader()
+    if value is None or (isinstance(value, pd.DataFrame) and value.empty):
+        return value
+    try:
+        cache.store(store_id, table, range_key, watermark, value)
+    except Exception as e:
+        logger.warning(f"Persistent cache write failed ({table}, {range_key}): {e}")
+    return value
+
+
+def _record_hit(table: str, range_key: str, value) -> None:
+    try:
+        from src.utils.boot_perf import record_data_call
+        rows = len(value) if isinstance(value, pd.DataFrame) else 1
+        record_data_call(f"disk_cache({table}:{range_key})", 0.0, rows=rows, source="disk_cache")
+    except Exception:
+        pass
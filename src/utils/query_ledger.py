@@ -0,0 +1,219 @@
+"""
+쿼리 원장: 스크립트 실행(rerun) 1회 동안의 DB 요청을 형태(shape)별로 집계
+
+- 형태 = 요청 종류(select/insert/upsert/update/delete/rpc) + 테이블 + 필터 컬럼/연산자
+  (값은 제외: store_id=eq.A 와 store_id=eq.B 는 같은 형태)
+- 같은 형태가 N1_THRESHOLD회 이상 반복되면 N+1 의심으로 표시 (첫 반복 시 호출 위치 기록)
+- 페이지별 하드 예산(PageSpec.query_budget): 초과 시 경고 로그,
+  strict 모드(PS_QUERY_BUDGET_STRICT=1 또는 secrets [app].query_budget_strict)면 QueryBudgetExceeded
+- 요청은 query_telemetry의 httpx 훅이 기록 (샘플링과 무관하게 전수), 결과는 DEV 패널에 표시
+- 원장은 세션별(st.session_state)로 app.py 시작 시 새로 만들고, Streamlit 실행 컨텍스트 밖에서는 기록하지 않음
+"""
+import itertools
+import logging
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+N1_THRESHOLD = 5  # 같은 형태 반복 횟수 (이상이면 N+1 의심)
+MAX_CALLSITE_FRAMES = 3
+
+_SESSION_KEY = "_query_ledger"
+_ROOT = str(Path(__file__).resolve().parents[2])
+_SKIP_FILES = ("query_ledger.py", "query_telemetry.py")
+
+# 필터가 아닌 PostgREST 파라미터
+_NON_FILTER_PARAMS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+
+_run_ids = itertools.count(1)
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """페이지 쿼리 예산 초과 (strict 모드)"""
+
+
+class _ShapeStats:
+    __slots__ = ("count", "total_ms", "names", "callsite")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.names: List[str] = []
+        self.callsite: Optional[List[str]] = None
+
+
+class QueryLedger:
+    """rerun 1회의 DB 요청 원장"""
+
+    def __init__(self):
+        self.run_id = next(_run_ids)
+        self.page_key: Optional[str] = None
+        self.budget: Optional[int] = None
+        self.total = 0
+        self.total_ms = 0.0
+        self.shapes: Dict[str, _ShapeStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, shape: str, name: str, ms: float) -> None:
+        with self._lock:
+            stats = self.shapes.get(shape)
+            if stats is None:
+                stats = _ShapeStats()
+                self.shapes[shape] = stats
+            stats.count += 1
+            stats.total_ms += ms
+            if name not in stats.names and len(stats.names) < 3:
+                stats.names.append(name)
+            self.total += 1
+            self.total_ms += ms
+            need_callsite = stats.count == 2 and stats.callsite is None
+        if need_callsite:
+            stats.callsite = _callsite()
+
+    def repeated(self, threshold: int = N1_THRESHOLD) -> List[Dict]:
+        """N+1 의심 형태 (반복 횟수 내림차순)"""
+        return [row for row in self.summary() if row["count"] >= threshold]
+
+    def summary(self) -> List[Dict]:
+        with self._lock:
+            rows = [
+                {
+                    "shape": shape,
+                    "count": s.count,
+                    "total_ms": round(s.total_ms, 1),
+                    "names": list(s.names),
+                    "callsite": list(s.callsite or []),
+                }
+                for shape, s in self.shapes.items()
+            ]
+        rows.sort(key=lambda r: (r["count"], r["total_ms"]), reverse=True)
+        return rows
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.total > self.budget
+
+
+# ---------- 형태 정규화 ----------
+
+def normalize_shape(kind: str, table: str, params) -> str:
+    """
+    요청 형태 문자열 (예: "select inventory?ingredient_id=eq&store_id=eq")
+
+    Args:
+        params: (key, value) 쌍 iterable (httpx QueryParams.multi_items())
+    """
+    filters = set()
+    for key, value in params:
+        if key in _NON_FILTER_PARAMS:
+            continue
+        if key in ("or", "and", "not.or", "not.and"):
+            filters.add(key)
+            continue
+        parts = str(value).split(".", 2)
+        op = f"not.{parts[1]}" if parts[0] == "not" and len(parts) > 1 else parts[0]
+        filters.add(f"{key}={op}")
+    return f"{kind} {table}" + ("?" + "&".join(sorted(filters)) if filters else "")
+
+
+def _callsite() -> List[str]:
+    """앱 코드 호출 위치 (안쪽부터 최대 MAX_CALLSITE_FRAMES개, 계측 모듈 제외)"""
+    frames = []
+    frame = sys._getframe(1)
+    while frame is not None and len(frames) < MAX_CALLSITE_FRAMES:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_ROOT) and not filename.endswith(_SKIP_FILES):
+            rel = os.path.relpath(filename, _ROOT)
+            frames.append(f"{rel}:{frame.f_lineno} {frame.f_code.co_name}")
+        frame = frame.f_back
+    return frames
+
+
+# ---------- 세션 원장 ----------
+
+def _in_script_run() -> bool:
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        return get_script_run_ctx(suppress_warning=True) is not None
+    except Exception:
+        return False
+
+
+def begin_query_ledger() -> Optional[QueryLedger]:
+    """새 rerun 원장 시작 (app.py 최상단에서 매 실행 호출)"""
+    if not _in_script_run():
+        return None
+    import streamlit as st
+    ledger = QueryLedger()
+    st.session_state[_SESSION_KEY] = ledger
+    return ledger
+
+
+def get_query_ledger() -> Optional[QueryLedger]:
+    """현재 세션의 원장 (Streamlit 실행 컨텍스트 밖이면 None)"""
+    if not _in_script_run():
+        return None
+    try:
+        import streamlit as st
+        return st.session_state.get(_SESSION_KEY)
+    except Exception:
+        return None
+
+
+def record_request(kind: str, table: str, params, name: str, ms: float) -> None:
+    """요청 1건 기록 (query_telemetry 응답 훅에서 호출)"""
+    ledger = get_query_ledger()
+    if ledger is None:
+        return
+    ledger.record(normalize_shape(kind, table, params), name, ms)
+
+
+def set_ledger_page(page_key: str, budget: Optional[int]) -> None:
+    """렌더링할 페이지와 쿼리 예산 지정 (page_registry.render_page)"""
+    ledger = get_query_ledger()
+    if ledger is not None:
+        ledger.page_key = page_key
+        ledger.budget = budget
+
+
+def _strict_mode() -> bool:
+    env = os.environ.get("PS_QUERY_BUDGET_STRICT")
+    if env is not None:
+        return env.strip().lower() in ("1", "true", "yes")
+    try:
+        import streamlit as st
+        return bool(st.secrets.get("app", {}).get("query_budget_strict", False))
+    except Exception:
+        return False
+
+
+def check_query_budget() -> Tuple[Optional[QueryLedger], bool]:
+    """
+    페이지 렌더 후 예산/N+1 검사
+
+    Returns:
+        (원장, 예산 초과 여부). strict 모드에서 초과 시 QueryBudgetExceeded
+    """
+    ledger = get_query_ledger()
+    if ledger is None:
+        return None, False
+
+    for row in ledger.repeated():
+        logger.warning(
+            f"[QUERY_LEDGER] N+1 suspect on {ledger.page_key}: {row['shape']} x{row['count']} "
+            f"({', '.join(row['callsite']) or '-'})"
+        )
+
+    if not ledger.over_budget:
+        return ledger, False
+
+    top = ", ".join(f"{r['shape']} x{r['count']}" for r in ledger.summary()[:3])
+    message = f"query budget exceeded on {ledger.page_key}: {ledger.total} > {ledger.budget} ({top})"
+    if _strict_mode():
+        raise QueryBudgetExceeded(message)
+    logger.warning(f"[QUERY_LEDGER] {message}")
+    return ledger, True
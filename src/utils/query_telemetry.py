@@ -0,0 +1,395 @@
+"""
+Supabase 쿼리 텔레메트리 (상시 수집, 고정 메모리)
+
+- Supabase 클라이언트의 PostgREST httpx 세션에 요청/응답 훅을 달아 모든 table().execute() / rpc() 계측
+  (timed_select를 거치지 않는 직접 호출 포함, dev_mode와 무관하게 항상 동작)
+- (쿼리 이름, 테이블)별 지연시간 히스토그램 (HDR 방식 로그-선형 버킷, 고정 크기) + 행 수/바이트/오류 수
+- p50/p95/p99 는 버킷 상한으로 계산 (상대 오차 ≤ 1/SUB_BUCKETS)
+- 샘플링: PS_TELEMETRY_SAMPLE_RATE (환경변수) 또는 st.secrets["telemetry"]["sample_rate"], 기본 1.0
+- 내보내기: FLUSH_INTERVAL_S 마다 PS_TELEMETRY_DIR(기본 .telemetry/)에 query_telemetry.json / query_telemetry.prom 기록
+- 같은 훅이 rerun 단위 쿼리 원장(src/utils/query_ledger: N+1/페이지 예산)에도 전수 기록
+- 쿼리 이름: query_scope("load_csv(sales.csv)") 컨텍스트로 지정, 없으면 HTTP 메서드 기반(select/insert/upsert/update/delete/rpc)
+"""
+import contextvars
+import json
+import logging
+import math
+import os
+import random
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.utils.query_ledger import record_request
+
+logger = logging.getLogger(__name__)
+
+# 히스토그램 범위: MIN_MS × 2^OCTAVES (0.1ms ~ 약 107초), 옥타브당 SUB_BUCKETS 칸
+MIN_MS = 0.1
+OCTAVES = 20
+SUB_BUCKETS = 8
+NUM_BUCKETS = OCTAVES * SUB_BUCKETS + 1  # 마지막 칸 = 범위 초과
+
+MAX_SERIES = 256  # (쿼리 이름, 테이블) 조합 상한, 초과 시 _other 로 합침
+FLUSH_INTERVAL_S = 60.0
+DEFAULT_EXPORT_DIR = Path(__file__).resolve().parents[2] / ".telemetry"
+
+_OVERFLOW_KEY = ("_other", "_other")
+_T0_KEY = "ps_telemetry_t0"
+_NAME_KEY = "ps_telemetry_name"
+_SAMPLED_KEY = "ps_telemetry_sampled"
+
+_query_name: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("ps_query_name", default=None)
+
+
+class LatencyHistogram:
+    """고정 크기 로그-선형 히스토그램 (HDR 방식)"""
+
+    __slots__ = ("counts", "total", "sum_ms", "max_ms")
+
+    def __init__(self):
+        self.counts = [0] * NUM_BUCKETS
+        self.total = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    @staticmethod
+    def bucket_index(ms: float) -> int:
+        if ms <= MIN_MS:
+            return 0
+        exp = math.log2(ms / MIN_MS)
+        if exp >= OCTAVES:
+            return NUM_BUCKETS - 1
+        octave = int(exp)
+        sub = int((2 ** (exp - octave) - 1.0) * SUB_BUCKETS)
+        return octave * SUB_BUCKETS + min(sub, SUB_BUCKETS - 1)
+
+    @staticmethod
+    def bucket_upper_ms(index: int) -> float:
+        if index >= NUM_BUCKETS - 1:
+            return float("inf")
+        octave, sub = divmod(index, SUB_BUCKETS)
+        return MIN_MS * (2 ** octave) * (1.0 + (sub + 1) / SUB_BUCKETS)
+
+    def record(self, ms: float) -> None:
+        self.counts[self.bucket_index(ms)] += 1
+        self.total += 1
+        self.sum_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def percentile(self, q: float) -> Optional[float]:
+        if self.total == 0:
+            return None
+        rank = max(1, math.ceil(self.total * q))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self.bucket_upper_ms(index), self.max_ms)
+        return self.max_ms
+
+
+class _Series:
+    __slots__ = ("hist", "rows", "bytes", "errors")
+
+    def __init__(self):
+        self.hist = LatencyHistogram()
+        self.rows = 0
+        self.bytes = 0
+        self.errors = 0
+
+
+_lock = threading.Lock()
+_series: Dict[Tuple[str, str], _Series] = {}
+_started_at = time.time()
+_last_flush = time.time()
+_sample_rate: Optional[float] = None
+
+
+def get_sample_rate() -> float:
+    """샘플링 비율 (0~1, 최초 1회 설정에서 읽음)"""
+    global _sample_rate
+    if _sample_rate is None:
+        rate = os.getenv("PS_TELEMETRY_SAMPLE_RATE")
+        if rate is None:
+            try:
+                import streamlit as st
+                rate = st.secrets.get("telemetry", {}).get("sample_rate")
+            except Exception:
+                rate = None
+        try:
+            _sample_rate = min(1.0, max(0.0, float(rate))) if rate is not None else 1.0
+        except (TypeError, ValueError):
+            _sample_rate = 1.0
+    return _sample_rate
+
+
+def set_sample_rate(rate: float) -> None:
+    global _sample_rate
+    _sample_rate = min(1.0, max(0.0, float(rate)))
+
+
+@contextmanager
+def query_scope(name: str):
+    """이 블록 안에서 실행되는 Supabase 요청에 쿼리 이름 지정"""
+    token = _query_name.set(name)
+    try:
+        yield
+    finally:
+        _query_name.reset(token)
+
+
+def record_query(name: str, table: str, ms: float, rows: Optional[int] = None,
+                 nbytes: Optional[int] = None, error: bool = False) -> None:
+    """쿼리 1건 기록 (샘플링은 호출부에서 결정)"""
+    key = (name, table)
+    with _lock:
+        series = _series.get(key)
+        if series is None:
+            if len(_series) >= MAX_SERIES:
+                key = _OVERFLOW_KEY
+                series = _series.get(key)
+            if series is None:
+                series = _Series()
+                _series[key] = series
+        series.hist.record(ms)
+        series.rows += rows or 0
+        series.bytes += nbytes or 0
+        if error:
+            series.errors += 1
+    _maybe_flush()
+
+
+# ---------- httpx 훅 ----------
+
+def _table_of(path: str) -> str:
+    """/rest/v1/{table} 또는 /rest/v1/rpc/{fn} → 테이블(함수) 이름"""
+    parts = [p for p in path.split("/") if p]
+    if "rpc" in parts:
+        i = parts.index("rpc")
+        return f"rpc:{parts[i + 1]}" if i + 1 < len(parts) else "rpc"
+    return parts[-1] if parts else "-"
+
+
+def _default_name(request) -> str:
+    if "/rpc/" in request.url.path:
+        return "rpc"
+    method = request.method.upper()
+    if method == "GET" or method == "HEAD":
+        return "select"
+    if method == "POST":
+        prefer = request.headers.get("prefer", "")
+        return "upsert" if "resolution=" in prefer else "insert"
+    return {"PATCH": "update", "DELETE": "delete"}.get(method, method.lower())
+
+
+def _rows_of(response) -> Optional[int]:
+    """Content-Range(0-24/* , */0) 에서 행 수"""
+    content_range = response.headers.get("content-range")
+    if not content_range:
+        return None
+    span = content_range.split("/")[0]
+    if span == "*":
+        return 0
+    try:
+        start, end = span.split("-")
+        return int(end) - int(start) + 1
+    except ValueError:
+        return None
+
+
+def _on_request(request) -> None:
+    rate = get_sample_rate()
+    request.extensions[_T0_KEY] = time.perf_counter()
+    request.extensions[_NAME_KEY] = _query_name.get() or _default_name(request)
+    request.extensions[_SAMPLED_KEY] = rate >= 1.0 or (rate > 0 and random.random() < rate)
+
+
+def _on_response(response) -> None:
+    request = response.request
+    t0 = request.extensions.get(_T0_KEY)
+    if t0 is None:
+        return
+    ms = (time.perf_counter() - t0) * 1000
+    try:
+        # 쿼리 원장(rerun 단위 N+1/예산 검사)은 샘플링과 무관하게 전수 기록
+        record_request(
+            _default_name(request),
+            _table_of(request.url.path),
+            request.url.params.multi_items(),
+            request.extensions.get(_NAME_KEY) or "-",
+            ms,
+        )
+    except Exception as e:
+        logger.debug(f"query ledger: record failed - {e}")
+    if not request.extensions.get(_SAMPLED_KEY):
+        return
+    try:
+        response.read()
+        record_query(
+            request.extensions.get(_NAME_KEY) or "-",
+            _table_of(request.url.path),
+            ms,
+            rows=_rows_of(response),
+            nbytes=len(response.content),
+            error=response.status_code >= 400,
+        )
+    except Exception as e:
+        logger.debug(f"query telemetry: response hook failed - {e}")
+
+
+def instrument_http_session(session) -> None:
+    """httpx.Client 에 텔레메트리 훅 설치 (중복 설치 방지)"""
+    if session is None or getattr(session, "_ps_telemetry", False):
+        return
+    hooks = session.event_hooks
+    hooks.setdefault("request", []).append(_on_request)
+    hooks.setdefault("response", []).append(_on_response)
+    session.event_hooks = hooks
+    session._ps_telemetry = True
+
+
+def instrument_client(client):
+    """
+    Supabase Client 계측 (PostgREST 세션)
+
+    PostgREST 클라이언트는 인증 이벤트마다 재생성되므로 생성 함수를 감싸 새 세션에도 훅을 설치한다.
+    """
+    if client is None or getattr(client, "_ps_telemetry", False):
+        return client
+    try:
+        original = client._init_postgrest_client
+
+        def _init_postgrest_client(*args, **kwargs):
+            postgrest = original(*args, **kwargs)
+            instrument_http_session(getattr(postgrest, "session", None))
+            return postgrest
+
+        client._init_postgrest_client = _init_postgrest_client
+        existing = getattr(client, "_postgrest", None)
+        if existing is not None:
+            instrument_http_session(getattr(existing, "session", None))
+        client._ps_telemetry = True
+    except Exception as e:
+        logger.warning(f"query telemetry: instrument_client failed - {e}")
+    return client
+
+
+# ---------- 조회/내보내기 ----------
+
+def get_telemetry_snapshot() -> Dict:
+    """(쿼리 이름, 테이블)별 요약 (count, p50/p95/p99/max ms, 평균, 행/바이트/오류)"""
+    with _lock:
+        items = list(_series.items())
+        series_out: List[Dict] = []
+        for (name, table), s in items:
+            h = s.hist
+            series_out.append({
+                "name": name,
+                "table": table,
+                "count": h.total,
+                "errors": s.errors,
+                "rows": s.rows,
+                "bytes": s.bytes,
+                "mean_ms": round(h.sum_ms / h.total, 2) if h.total else None,
+                "p50_ms": _round(h.percentile(0.50)),
+                "p95_ms": _round(h.percentile(0.95)),
+                "p99_ms": _round(h.percentile(0.99)),
+                "max_ms": round(h.max_ms, 2),
+                "sum_ms": round(h.sum_ms, 2),
+            })
+    series_out.sort(key=lambda r: r["sum_ms"], reverse=True)
+    return {
+        "started_at": _started_at,
+        "generated_at": time.time(),
+        "sample_rate": get_sample_rate(),
+        "series": series_out,
+    }
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 2) if value is not None else None
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+def to_prometheus_text() -> str:
+    """Prometheus text exposition (histogram + rows/bytes/errors 카운터)"""
+    lines = [
+        "# HELP ps_query_duration_ms Supabase query latency (sampled)",
+        "# TYPE ps_query_duration_ms histogram",
+    ]
+    with _lock:
+        items = [(key, list(s.hist.counts), s.hist.total, s.hist.sum_ms, s.rows, s.bytes, s.errors)
+                 for key, s in _series.items()]
+    counters = []
+    for (name, table), counts, total, sum_ms, rows, nbytes, errors in items:
+        labels = f'name="{_escape_label(name)}",table="{_escape_label(table)}"'
+        cumulative = 0
+        for index, count in enumerate(counts[:-1]):
+            cumulative += count
+            if count:
+                le = f"{LatencyHistogram.bucket_upper_ms(index):.4g}"
+                lines.append(f'ps_query_duration_ms_bucket{{{labels},le="{le}"}} {cumulative}')
+        lines.append(f'ps_query_duration_ms_bucket{{{labels},le="+Inf"}} {total}')
+        lines.append(f"ps_query_duration_ms_sum{{{labels}}} {sum_ms:.3f}")
+        lines.append(f"ps_query_duration_ms_count{{{labels}}} {total}")
+        counters.append((labels, rows, nbytes, errors))
+    for metric, help_text, index in (
+        ("ps_query_rows_total", "Rows returned (Content-Range)", 1),
+        ("ps_query_bytes_total", "Response bytes", 2),
+        ("ps_query_errors_total", "HTTP status >= 400", 3),
+    ):
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} counter")
+        for row in counters:
+            lines.append(f"{metric}{{{row[0]}}} {row[index]}")
+    lines.append("# HELP ps_query_sample_rate Telemetry sampling rate")
+    lines.append("# TYPE ps_query_sample_rate gauge")
+    lines.append(f"ps_query_sample_rate {get_sample_rate()}")
+    return "\n".join(lines) + "\n"
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def export_telemetry(directory: Optional[str] = None) -> Optional[Path]:
+    """query_telemetry.json / query_telemetry.prom 기록 (실패 시 None)"""
+    target = Path(directory or os.getenv("PS_TELEMETRY_DIR") or DEFAULT_EXPORT_DIR)
+    try:
+        _write_atomic(target / "query_telemetry.json", json.dumps(get_telemetry_snapshot(), ensure_ascii=False, indent=2))
+        _write_atomic(target / "query_telemetry.prom", to_prometheus_text())
+        return target
+    except Exception as e:
+        logger.warning(f"query telemetry: export failed - {e}")
+        return None
+
+
+def _maybe_flush() -> None:
+    global _last_flush
+    now = time.time()
+    if now - _last_flush < FLUSH_INTERVAL_S:
+        return
+    with _lock:
+        if now - _last_flush < FLUSH_INTERVAL_S:
+            return
+        _last_flush = now
+    threading.Thread(target=export_telemetry, name="ps-telemetry-export", daemon=True).start()
+
+
+def reset_telemetry() -> None:
+    global _started_at
+    with _lock:
+        _series.clear()
+        _started_at = time.time()
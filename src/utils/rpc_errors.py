@@ -0,0 +1,22 @@
+"""
+Supabase RPC 오류 분류
+
+- 함수 미설치(마이그레이션 전)만 "RPC 없음"으로 보고 대체 경로로 전환
+- 타임아웃/5xx/네트워크 오류 등 일시 오류는 RPC 없음으로 취급하지 않음 (호출부에서 재시도/전파)
+"""
+
+# PostgREST: 스키마 캐시에 함수 없음 / PostgreSQL: undefined_function
+MISSING_FUNCTION_CODES = ("PGRST202", "42883")
+
+
+def is_missing_function_error(error: Exception) -> bool:
+    """RPC 함수가 DB에 없어서 난 오류이면 True"""
+    code = str(getattr(error, "code", "") or "")
+    if code in MISSING_FUNCTION_CODES:
+        return True
+    if code == "404" or getattr(error, "status_code", None) == 404:
+        return True
+    message = str(getattr(error, "message", None) or error).lower()
+    return "could not find the function" in message or (
+        "function" in message and "does not exist" in message
+    )
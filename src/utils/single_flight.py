@@ -0,0 +1,243 @@
+"""
+동시 요청 합치기 (single-flight) + stale-while-revalidate
+
+- FlightGroup.do(key, fn): 같은 키로 동시에 들어온 호출은 진행 중인 1회 호출 결과를 함께 받음
+- shared_cache_data: st.cache_data 대체 데코레이터 (저장은 그대로 st.cache_data)
+  · 캐시 미스 시 DB 조회를 FlightGroup으로 합침 (매장/클라이언트 모드 scope 포함 키)
+  · stale_grace > 0: TTL이 지난 값은 grace 동안 그대로 반환하고 백그라운드에서 1회 갱신
+  · load_csv.clear() / st.cache_data.clear() 는 기존과 동일하게 동작 (값은 st.cache_data에만 있음)
+- 프로세스 내 합치기 (워커 프로세스 간은 각자 1회)
+"""
+from __future__ import annotations
+
+import copy
+import functools
+import inspect
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+import streamlit as st
+
+from src.engine.cache import make_key
+
+logger = logging.getLogger(__name__)
+
+# 진행 중 호출을 기다리는 최대 시간 (초과 시 직접 조회)
+WAIT_TIMEOUT = 30.0
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.owner = threading.get_ident()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class FlightGroup:
+    """키별 진행 중 호출 1개 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self.stats = {"leader": 0, "shared": 0, "timeout": 0}
+
+    def do(self, key: str, fn: Callable[[], Any], timeout: float = WAIT_TIMEOUT) -> Any:
+        """
+        fn() 결과 반환 (같은 키 호출이 진행 중이면 그 결과를 기다려 복사본 반환)
+
+        리더의 예외는 기다리던 호출에도 그대로 전파, 같은 스레드 재진입은 바로 fn() 실행
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None and call.owner != threading.get_ident():
+                self.stats["shared"] += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.stats["leader"] += 1
+                leader = True
+
+        if not leader:
+            if not call.done.wait(timeout):
+                self.stats["timeout"] += 1
+                logger.warning(f"single_flight: wait timeout ({key[:12]}), fetching directly")
+                return fn()
+            if call.error is not None:
+                raise call.error
+            # 세션 간 같은 객체 공유 방지 (st.cache_data의 복사 반환과 같은 이유)
+            return copy.deepcopy(call.value)
+
+        try:
+            call.value = fn()
+            return call.value
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+
+
+_flights = FlightGroup()
+# shared_cache_data 래퍼 목록 (clear_shared_caches용)
+_shared_funcs = []
+
+
+def get_flight_group() -> FlightGroup:
+    return _flights
+
+
+def clear_shared_caches() -> None:
+    """shared_cache_data 함수 전체 clear (값 + 갱신 시각 기록)"""
+    for wrapper in list(_shared_funcs):
+        wrapper.clear()
+
+
+def _start_background(target: Callable[[], None], name: str) -> None:
+    """현재 세션 컨텍스트(로그인 토큰/매장)를 붙인 데몬 스레드로 실행"""
+    thread = threading.Thread(target=target, name=name, daemon=True)
+    try:
+        from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+        ctx = get_script_run_ctx(suppress_warning=True)
+        if ctx is not None:
+            add_script_run_ctx(thread, ctx)
+    except Exception as e:
+        logger.warning(f"single_flight: script context attach failed: {e}")
+    thread.start()
+
+
+def shared_cache_data(
+    ttl: float,
+    stale_grace: float = 0.0,
+    scope: Optional[Callable[[inspect.BoundArguments], Any]] = None,
+    **cache_kwargs,
+) -> Callable:
+    """
+    st.cache_data + single-flight (+ 선택적 stale-while-revalidate)
+
+    Args:
+        ttl: 신선 기간 (초)
+        stale_grace: TTL 이후 이전 값을 반환하며 백그라운드 갱신하는 기간 (0이면 끔)
+        scope: 호출 세션 기준 인자 정리 (None 인자를 현재 매장 등으로 채움) + 추가 키 반환
+               → 같은 요청이 인자 형태와 무관하게 같은 캐시/동시 요청 키를 씀
+        cache_kwargs: st.cache_data 옵션 (show_spinner 등, stale_grace > 0이면 show_spinner는 항상 False)
+
+    래퍼.clear(*args, **kwargs): st.cache_data.clear와 동일 (인자 없으면 전체)
+        + 진행 중 조회/백그라운드 갱신 결과는 이후 호출에 쓰이지 않음 (clear 이후 호출은 항상 새로 조회)
+    """
+    def decorator(fn: Callable) -> Callable:
+        namespace = f"{fn.__module__}.{fn.__qualname__}"
+        signature = inspect.signature(fn)
+        fetched_at: "OrderedDict[str, float]" = OrderedDict()
+        refreshing = set()
+        # 백그라운드에서 미리 조회한 값 {키: (세대, 값)} (st.cache_data 재계산 시 DB 대신 사용)
+        prefetched: Dict[str, Any] = {}
+        meta_lock = threading.Lock()
+        # clear()마다 증가: 진행 중 조회(clear 이전 시작)와 새 조회를 다른 동시 요청 키로 분리
+        generation = [0]
+
+        def _bind(args, kwargs):
+            """(정리된 위치 인자, 키워드 인자, scope) - 위치/키워드/기본값 차이 제거"""
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            flight_scope = scope(bound) if scope else None
+            return bound.args, bound.kwargs, flight_scope
+
+        def _key(flight_scope, args, kwargs) -> str:
+            """호출 키 (`_` 인자 제외, memoize와 같은 규칙)"""
+            bound = signature.bind(*args, **kwargs)
+            parts = tuple((k, v) for k, v in bound.arguments.items() if not k.startswith("_"))
+            return make_key(namespace, flight_scope, *parts)
+
+        def _current_generation() -> int:
+            with meta_lock:
+                return generation[0]
+
+        def _fetch(key, args, kwargs):
+            """(세대, 값) - 조회 중 clear()가 있었으면 새 세대로 다시 조회 (clear 이전 값이 캐시에 남지 않도록)"""
+            gen = _current_generation()
+            while True:
+                value = _flights.do(f"{key}:{gen}", lambda: fn(*args, **kwargs))
+                latest = _current_generation()
+                if latest == gen:
+                    return gen, value
+                gen = latest
+
+        @functools.wraps(fn)
+        def compute(*args, flight_scope=None, **kwargs):
+            key = _key(flight_scope, args, kwargs)
+            with meta_lock:
+                ready = prefetched.pop(key, None)
+                if ready is not None and ready[0] != generation[0]:
+                    ready = None
+            value = ready[1] if ready is not None else _fetch(key, args, kwargs)[1]
+            with meta_lock:
+                fetched_at[key] = time.time()
+                fetched_at.move_to_end(key)
+                while len(fetched_at) > 1024:
+                    fetched_at.popitem(last=False)
+            return value
+
+        options = dict(cache_kwargs)
+        if stale_grace > 0:
+            # 백그라운드 갱신이 cached()를 다시 부르므로 스피너가 끝난 세션으로 전송되지 않게 끔
+            options["show_spinner"] = False
+        cached = st.cache_data(ttl=ttl + stale_grace, **options)(compute)
+
+        def _refresh(key, flight_scope, args, kwargs):
+            """새 값을 먼저 조회한 뒤 st.cache_data 항목 교체 (교체 중에도 대기 없음)"""
+            try:
+                gen = _current_generation()
+                value = _flights.do(f"{key}:{gen}", lambda: fn(*args, **kwargs))
+                with meta_lock:
+                    # 조회 중 clear()됨: 이미 지워진 항목이므로 교체하지 않음 (다음 조회가 새로 읽음)
+                    if generation[0] != gen:
+                        return
+                    prefetched[key] = (gen, value)
+                cached.clear(*args, flight_scope=flight_scope, **kwargs)
+                cached(*args, flight_scope=flight_scope, **kwargs)
+            except Exception as e:
+                logger.warning(f"single_flight: background refresh failed ({namespace}): {e}")
+            finally:
+                with meta_lock:
+                    prefetched.pop(key, None)
+                    refreshing.discard(key)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            args, kwargs, flight_scope = _bind(args, kwargs)
+            if stale_grace > 0:
+                key = _key(flight_scope, args, kwargs)
+                with meta_lock:
+                    age = time.time() - fetched_at.get(key, 0.0)
+                    stale = ttl <= age < ttl + stale_grace and key not in refreshing
+                    if stale:
+                        refreshing.add(key)
+                if stale:
+                    _start_background(lambda: _refresh(key, flight_scope, args, kwargs), f"refresh:{fn.__name__}")
+            return cached(*args, flight_scope=flight_scope, **kwargs)
+
+        def clear(*args, **kwargs):
+            with meta_lock:
+                generation[0] += 1
+            if args or kwargs:
+                args, kwargs, flight_scope = _bind(args, kwargs)
+                cached.clear(*args, flight_scope=flight_scope, **kwargs)
+            else:
+                cached.clear()
+                with meta_lock:
+                    fetched_at.clear()
+                    prefetched.clear()
+
+        wrapper.clear = clear
+        wrapper.uncached = fn
+        _shared_funcs.append(wrapper)
+        return wrapper
+    return decorator
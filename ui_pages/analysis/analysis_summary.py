@@ -83,27 +83,9 @@ def _safe_actual_costs(store_id: str, year: int, month: int) -> float:
         return 0.0
 
 
-@st.cache_data(ttl=300)
 def _load_latest_qsc_session(store_id: str) -> Optional[Dict]:
-    try:
-        from src.auth import get_supabase_client
-        supabase = get_supabase_client()
-        if not supabase:
-            return None
-        r = (
-            supabase.table("health_check_sessions")
-            .select("id, completed_at")
-            .eq("store_id", store_id)
-            .not_.is_("completed_at", "null")
-            .order("completed_at", desc=True)
-            .limit(1)
-            .execute()
-        )
-        if r.data and len(r.data) > 0:
-            return r.data[0]
-    except Exception as e:
-        logger.warning("_load_latest_qsc_session: %s", e)
-    return None
+    from src.health_check.health_cache import get_latest_completed_session
+    return get_latest_completed_session(store_id)
 
 
 def _summary_sales(store_id: str, year: int, month: int) -> Dict[str, Any]:
@@ -324,9 +306,9 @@ def _summary_qsc(store_id: str) -> Dict[str, Any]:
         }
 
     try:
-        from src.health_check.storage import get_health_diagnosis
+        from src.health_check.health_cache import get_health_diag
 
-        diag = get_health_diagnosis(sess["id"])
+        diag = get_health_diag(store_id)
     except Exception:
         diag = None
 
@@ -11,9 +11,7 @@ from src.ui_helpers import render_page_header, render_section_header, render_sec
 from src.utils.time_utils import current_year_kst, current_month_kst, today_kst
 from src.storage_supabase import (
     load_expense_structure,
-    get_fixed_costs,
-    get_variable_cost_ratio,
-    calculate_break_even_sales,
+    load_expense_structure_pivot,
     load_monthly_sales_total,
     load_csv,
     load_cost_item_templates,
@@ -21,6 +19,8 @@ from src.storage_supabase import (
 )
 from src.analytics import calculate_ingredient_usage
 from src.auth import get_current_store_id
+from src.design.what_if import load_cost_model
+from src.engine.what_if import CostModel, costs_by_sales
 
 bootstrap(page_title="비용 분석")
 
@@ -77,6 +77,23 @@ def _load_five_core_costs(store_id: str, year: int, month: int, monthly_sales: f
     return result
 
 
+def _prev_month_category_totals(store_id: str, year: int, month: int) -> dict:
+    """
+    전월 5대 비용 카테고리 합계 (전월~이번 달 비용구조 기간 조회 1회)
+
+    Returns:
+        dict: {카테고리: 합계} (고정비는 원, 변동비는 비율(%)), 전월 입력이 없으면 빈 dict
+    """
+    prev_year, prev_month = (year - 1, 12) if month == 1 else (year, month - 1)
+    pivot = load_expense_structure_pivot(prev_year, prev_month, year, month, store_id)
+    if pivot.empty or (prev_year, prev_month) not in pivot.index:
+        return {}
+    row = pivot.loc[(prev_year, prev_month)]
+    if row.isna().all():
+        return {}
+    return {cat: float(row.get(cat, 0.0) or 0.0) for cat in _FIVE_CORE_CATEGORIES}
+
+
 def _calculate_costs_by_sales_level(sales_level: float, five_core_costs: dict, expense_df: pd.DataFrame = None) -> dict:
     """
     매출 수준별 5대 비용 계산
@@ -97,39 +114,23 @@ def _calculate_costs_by_sales_level(sales_level: float, five_core_costs: dict, e
             '영업이익': float
         }
     """
+    levels = _costs_by_sales_levels([sales_level], five_core_costs, expense_df)
+    return {key: float(values[0]) for key, values in levels.items()}
+
+
+def _costs_by_sales_levels(sales_levels, five_core_costs: dict, expense_df: pd.DataFrame = None) -> dict:
+    """여러 매출 수준의 5대 비용을 한 번에 계산 ({카테고리: 배열})"""
     # 고정비: expense_structure의 원본 금액 사용 (매출과 무관)
     if expense_df is not None and not expense_df.empty and 'category' in expense_df.columns and 'amount' in expense_df.columns:
-        rent_df = expense_df[expense_df['category'] == '임차료']
-        labor_df = expense_df[expense_df['category'] == '인건비']
-        utility_df = expense_df[expense_df['category'] == '공과금']
-        rent = float(rent_df['amount'].sum()) if not rent_df.empty else 0.0
-        labor = float(labor_df['amount'].sum()) if not labor_df.empty else 0.0
-        utility = float(utility_df['amount'].sum()) if not utility_df.empty else 0.0
+        model = CostModel.from_expense_frame(expense_df)
+        fixed_breakdown = model.fixed_breakdown
     else:
         # fallback: five_core_costs의 amount 사용 (이미 expense_structure 원본 금액)
-        rent = five_core_costs.get('임차료', {}).get('amount', 0.0)
-        labor = five_core_costs.get('인건비', {}).get('amount', 0.0)
-        utility = five_core_costs.get('공과금', {}).get('amount', 0.0)
+        fixed_breakdown = {cat: five_core_costs.get(cat, {}).get('amount', 0.0) for cat in _FIXED_CATEGORIES}
     
     # 변동비: 매출 × 비율(%)
-    material_rate = five_core_costs.get('재료비', {}).get('rate', 0.0)  # % 단위
-    fee_rate = five_core_costs.get('부가세&카드수수료', {}).get('rate', 0.0)  # % 단위
-    
-    material = sales_level * (material_rate / 100) if material_rate else 0.0
-    fee = sales_level * (fee_rate / 100) if fee_rate else 0.0
-    
-    total_cost = rent + labor + utility + material + fee
-    profit = sales_level - total_cost
-    
-    return {
-        '임차료': rent,
-        '인건비': labor,
-        '공과금': utility,
-        '재료비': material,
-        '부가세&카드수수료': fee,
-        '총비용': total_cost,
-        '영업이익': profit
-    }
+    variable_rates = {cat: (five_core_costs.get(cat, {}).get('rate', 0.0) or 0.0) / 100 for cat in _VARIABLE_CATEGORIES}
+    return costs_by_sales(CostModel(fixed_breakdown=fixed_breakdown, variable_rates=variable_rates), sales_levels)
 
 
 def _compare_target_vs_actual(store_id: str, year: int, month: int, target_costs: dict, monthly_sales: float) -> dict:
@@ -216,9 +217,10 @@ def render_cost_analysis():
     render_section_divider()
 
     # 데이터 로드
-    fixed = get_fixed_costs(store_id, selected_year, selected_month) or 0.0
-    variable_ratio = get_variable_cost_ratio(store_id, selected_year, selected_month) or 0.0
-    breakeven = calculate_break_even_sales(store_id, selected_year, selected_month) or 0.0
+    cost_model = load_cost_model(store_id, selected_year, selected_month)
+    fixed = cost_model.fixed_costs
+    variable_ratio = cost_model.variable_ratio
+    breakeven = cost_model.break_even
     monthly_sales = 0.0
     try:
         monthly_sales = load_monthly_sales_total(store_id, selected_year, selected_month) or 0.0
@@ -278,6 +280,10 @@ def render_cost_analysis():
     if expense_df.empty:
         st.info("💡 비용 구조가 입력되지 않았습니다. **목표 비용 구조 입력**에서 설정하세요.")
     else:
+        try:
+            prev_totals = _prev_month_category_totals(store_id, selected_year, selected_month)
+        except Exception:
+            prev_totals = {}
         tabs = st.tabs(_FIVE_CORE_CATEGORIES)
         for idx, cat in enumerate(_FIVE_CORE_CATEGORIES):
             with tabs[idx]:
@@ -309,24 +315,16 @@ def render_cost_analysis():
                         st.dataframe(display_df, use_container_width=True, hide_index=True)
                 
                 # 전월 대비 (간단 버전)
-                if selected_month == 1:
-                    prev_year, prev_month = selected_year - 1, 12
+                if cat in _FIXED_CATEGORIES:
+                    prev_amount = prev_totals.get(cat, 0.0)
+                    if prev_amount > 0:
+                        change = ((amount - prev_amount) / prev_amount * 100) if prev_amount > 0 else 0.0
+                        st.caption(f"📈 전월 대비: **{change:+.1f}%** ({int(prev_amount):,}원 → {int(amount):,}원)")
                 else:
-                    prev_year, prev_month = selected_year, selected_month - 1
-                try:
-                    prev_costs = _load_five_core_costs(store_id, prev_year, prev_month)
-                    if cat in _FIXED_CATEGORIES:
-                        prev_amount = prev_costs.get(cat, {}).get('amount', 0.0)
-                        if prev_amount > 0:
-                            change = ((amount - prev_amount) / prev_amount * 100) if prev_amount > 0 else 0.0
-                            st.caption(f"📈 전월 대비: **{change:+.1f}%** ({int(prev_amount):,}원 → {int(amount):,}원)")
-                    else:
-                        prev_rate = prev_costs.get(cat, {}).get('rate', 0.0)
-                        if prev_rate > 0:
-                            change = rate - prev_rate
-                            st.caption(f"📈 전월 대비: **{change:+.2f}%p** ({prev_rate:.2f}% → {rate:.2f}%)")
-                except Exception:
-                    pass
+                    prev_rate = prev_totals.get(cat, 0.0)
+                    if prev_rate > 0:
+                        change = rate - prev_rate
+                        st.caption(f"📈 전월 대비: **{change:+.2f}%p** ({prev_rate:.2f}% → {rate:.2f}%)")
 
     render_section_divider()
 
@@ -467,30 +465,30 @@ def render_cost_analysis():
                 comparison_levels.append(('현재 매출', monthly_sales))
             comparison_levels.append(('시뮬레이션', sim_sales))
             
+            comparison_costs = _costs_by_sales_levels([sales_val for _, sales_val in comparison_levels], five_core_costs, expense_df)
             comparison_data = []
-            for label, sales_val in comparison_levels:
-                comp_costs = _calculate_costs_by_sales_level(sales_val, five_core_costs, expense_df)
+            for i, (label, sales_val) in enumerate(comparison_levels):
                 comparison_data.append({
                     '매출 수준': label,
                     '매출': f"{int(sales_val):,}원",
-                    '임차료': f"{int(comp_costs['임차료']):,}원",
-                    '인건비': f"{int(comp_costs['인건비']):,}원",
-                    '공과금': f"{int(comp_costs['공과금']):,}원",
-                    '재료비': f"{int(comp_costs['재료비']):,}원",
-                    '부가세&카드': f"{int(comp_costs['부가세&카드수수료']):,}원",
-                    '총비용': f"{int(comp_costs['총비용']):,}원",
-                    '영업이익': f"{int(comp_costs['영업이익']):,}원"
+                    '임차료': f"{int(comparison_costs['임차료'][i]):,}원",
+                    '인건비': f"{int(comparison_costs['인건비'][i]):,}원",
+                    '공과금': f"{int(comparison_costs['공과금'][i]):,}원",
+                    '재료비': f"{int(comparison_costs['재료비'][i]):,}원",
+                    '부가세&카드': f"{int(comparison_costs['부가세&카드수수료'][i]):,}원",
+                    '총비용': f"{int(comparison_costs['총비용'][i]):,}원",
+                    '영업이익': f"{int(comparison_costs['영업이익'][i]):,}원"
                 })
             st.dataframe(pd.DataFrame(comparison_data), use_container_width=True, hide_index=True)
             
             # 스택 바 차트: 여러 매출 수준별 5대 비용 구성
             stack_comparison = pd.DataFrame({
                 '매출 수준': [label for label, _ in comparison_levels],
-                '임차료': [_calculate_costs_by_sales_level(sales_val, five_core_costs, expense_df)['임차료'] for _, sales_val in comparison_levels],
-                '인건비': [_calculate_costs_by_sales_level(sales_val, five_core_costs, expense_df)['인건비'] for _, sales_val in comparison_levels],
-                '공과금': [_calculate_costs_by_sales_level(sales_val, five_core_costs, expense_df)['공과금'] for _, sales_val in comparison_levels],
-                '재료비': [_calculate_costs_by_sales_level(sales_val, five_core_costs, expense_df)['재료비'] for _, sales_val in comparison_levels],
-                '부가세&카드': [_calculate_costs_by_sales_level(sales_val, five_core_costs, expense_df)['부가세&카드수수료'] for _, sales_val in comparison_levels],
+                '임차료': comparison_costs['임차료'],
+                '인건비': comparison_costs['인건비'],
+                '공과금': comparison_costs['공과금'],
+                '재료비': comparison_costs['재료비'],
+                '부가세&카드': comparison_costs['부가세&카드수수료'],
             })
             st.bar_chart(stack_comparison.set_index('매출 수준'), height=300)
     else:
@@ -8,133 +8,16 @@ import pandas as pd
 from datetime import timedelta
 from calendar import monthrange
 
-from src.ui_helpers import render_page_header, render_section_header, render_section_divider, safe_get_value
+from src.ui_helpers import render_page_header, render_section_header, render_section_divider
 from src.utils.time_utils import current_year_kst, current_month_kst, today_kst
-from src.storage_supabase import (
-    load_csv,
-    load_monthly_sales_total,
-    load_best_available_daily_sales,
-    count_unofficial_days_in_month,
-    get_fixed_costs,
-    get_variable_cost_ratio,
-    calculate_break_even_sales,
-)
-from src.analytics import merge_sales_visitors, calculate_correlation
+from src.storage_supabase import load_csv, load_monthly_sales_total
+from src.analytics import calculate_correlation
 from src.auth import get_current_store_id
+from src.utils.cache_tokens import get_data_version
+from ui_pages.analysis.sales_pnl_engine import sales_pnl_engine
 
 bootstrap(page_title="매출 분석")
 
-# 요일 한글 매핑
-_WEEKDAY_KR = {
-    "Monday": "월요일",
-    "Tuesday": "화요일",
-    "Wednesday": "수요일",
-    "Thursday": "목요일",
-    "Friday": "금요일",
-    "Saturday": "토요일",
-    "Sunday": "일요일",
-}
-_WEEKDAY_ORDER = ["월요일", "화요일", "수요일", "목요일", "금요일", "토요일", "일요일"]
-
-
-def _build_sales_and_merged(store_id):
-    """best_available 일별 매출 + 방문자 병합 DataFrame 생성"""
-    best = load_best_available_daily_sales(store_id=store_id)
-    if best.empty:
-        sales_df = pd.DataFrame(columns=["날짜", "총매출", "카드매출", "현금매출", "is_official", "source"])
-    else:
-        sales_df = best.copy()
-        sales_df["날짜"] = pd.to_datetime(sales_df["date"])
-        sales_df["총매출"] = sales_df["total_sales"]
-        sales_df["카드매출"] = sales_df.get("card_sales", 0)
-        sales_df["현금매출"] = sales_df.get("cash_sales", 0)
-        sales_df["is_official"] = sales_df.get("is_official", True)
-        sales_df["source"] = sales_df.get("source", "daily_close")
-
-    visitors_df = load_csv("naver_visitors.csv", default_columns=["날짜", "방문자수"], store_id=store_id)
-    if not visitors_df.empty and "날짜" in visitors_df.columns:
-        visitors_df["날짜"] = pd.to_datetime(visitors_df["날짜"])
-
-    try:
-        merged = merge_sales_visitors(sales_df, visitors_df)
-    except Exception:
-        merged = pd.DataFrame()
-
-    if not merged.empty and "날짜" in merged.columns:
-        merged["날짜"] = pd.to_datetime(merged["날짜"])
-
-    return sales_df, merged
-
-
-def _month_data(merged_df, year, month):
-    """선택 연·월 해당 일별 데이터"""
-    if merged_df is None or merged_df.empty or "날짜" not in merged_df.columns:
-        return pd.DataFrame()
-    m = merged_df[
-        (merged_df["날짜"].dt.year == year) & (merged_df["날짜"].dt.month == month)
-    ].copy()
-    return m
-
-
-def _calculate_daily_profit_loss(
-    year, month, daily_sales_df, fixed_costs, variable_ratio, breakeven_daily, target_daily
-):
-    """일자별 손익 분석 계산. variable_ratio는 0~1 소수."""
-    if daily_sales_df is None or daily_sales_df.empty or "총매출" not in daily_sales_df.columns:
-        return pd.DataFrame()
-    days_in_month = monthrange(year, month)[1]
-    daily_fixed = fixed_costs / days_in_month if days_in_month > 0 else 0.0
-    result = []
-    for _, row in daily_sales_df.iterrows():
-        date = row["날짜"]
-        sales = float(row.get("총매출", 0) or 0)
-        variable = sales * variable_ratio if variable_ratio else 0.0
-        total_cost = daily_fixed + variable
-        profit = sales - total_cost
-        profit_rate = (profit / sales * 100) if sales > 0 else 0.0
-        breakeven_ratio = (sales / breakeven_daily * 100) if breakeven_daily and breakeven_daily > 0 else 0.0
-        target_ratio = (sales / target_daily * 100) if target_daily and target_daily > 0 else 0.0
-        if profit > 0 and breakeven_ratio >= 100:
-            grade = "🟢 양호"
-        elif profit > 0:
-            grade = "🟡 보통"
-        else:
-            grade = "🔴 위험"
-        result.append({
-            "날짜": date,
-            "매출": sales,
-            "고정비(일할)": daily_fixed,
-            "변동비": variable,
-            "총비용": total_cost,
-            "영업이익": profit,
-            "이익률": profit_rate,
-            "손익분기대비": breakeven_ratio,
-            "목표대비": target_ratio,
-            "등급": grade,
-        })
-    df = pd.DataFrame(result)
-    if not df.empty and "날짜" in df.columns:
-        df["요일"] = pd.to_datetime(df["날짜"]).dt.day_name().map(_WEEKDAY_KR)
-    return df
-
-
-def _analyze_weekday_patterns(daily_profit_df):
-    """요일별 패턴 분석. daily_profit_df에 요일 컬럼 필요."""
-    if daily_profit_df is None or daily_profit_df.empty or "요일" not in daily_profit_df.columns:
-        return pd.DataFrame()
-    agg = daily_profit_df.groupby("요일").agg({
-        "매출": "mean",
-        "총비용": "mean",
-        "영업이익": "mean",
-        "이익률": "mean",
-        "손익분기대비": "mean",
-        "목표대비": "mean",
-    }).reset_index()
-    order_map = {w: i for i, w in enumerate(_WEEKDAY_ORDER)}
-    agg["_ord"] = agg["요일"].map(lambda x: order_map.get(x, 99)).fillna(99).astype(int)
-    agg = agg.sort_values("_ord").drop(columns=["_ord"])
-    return agg
-
 
 def _simulate_target_achievement(year, month, current_sales, target_sales, fixed_costs, variable_ratio):
     """목표 달성 시뮬레이션."""
@@ -168,66 +51,6 @@ def _simulate_target_achievement(year, month, current_sales, target_sales, fixed
     }
 
 
-def _diagnose_sales_drop(daily_profit_df, target_daily, breakeven_daily):
-    """매출 하락 원인 자동 진단."""
-    insights = []
-    breakeven_fail = target_fail = drop_days = 0
-    worst_weekday = ""
-    if daily_profit_df is None or daily_profit_df.empty:
-        return {"breakeven_fail_days": 0, "target_fail_days": 0, "worst_weekday": "", "drop_days": 0, "insights": insights}
-    if "손익분기대비" in daily_profit_df.columns:
-        breakeven_fail = int((daily_profit_df["손익분기대비"] < 100).sum())
-        if breakeven_fail > 0:
-            n = len(daily_profit_df)
-            pct = (breakeven_fail / n * 100) if n else 0
-            insights.append(f"손익분기 미달 일수: {breakeven_fail}일 ({pct:.0f}%)")
-    if "목표대비" in daily_profit_df.columns and target_daily and target_daily > 0:
-        target_fail = int((daily_profit_df["목표대비"] < 100).sum())
-        if target_fail > 0:
-            n = len(daily_profit_df)
-            pct = (target_fail / n * 100) if n else 0
-            insights.append(f"목표 미달 일수: {target_fail}일 ({pct:.0f}%)")
-    if "요일" in daily_profit_df.columns and "매출" in daily_profit_df.columns and target_daily and target_daily > 0:
-        wd_avg = daily_profit_df.groupby("요일")["매출"].mean()
-        if not wd_avg.empty:
-            worst_weekday = wd_avg.idxmin()
-            worst_avg = wd_avg.min()
-            if worst_avg < target_daily * 0.8:
-                insights.append(f"{worst_weekday} 매출이 목표 대비 낮습니다. ({int(worst_avg):,}원 vs 목표 {int(target_daily):,}원)")
-    sorted_df = daily_profit_df.sort_values("날짜").copy()
-    if "매출" in sorted_df.columns and len(sorted_df) >= 2:
-        sorted_df["_pct"] = sorted_df["매출"].pct_change() * 100
-        drop_days = int((sorted_df["_pct"] < -20).sum())
-        if drop_days > 0:
-            insights.append(f"급락 일수: {drop_days}일 (전일 대비 -20% 이상)")
-    return {"breakeven_fail_days": breakeven_fail, "target_fail_days": target_fail, "worst_weekday": worst_weekday, "drop_days": drop_days, "insights": insights}
-
-
-def _sensitivity_analysis(base_sales, fixed_costs, variable_ratio):
-    """비용 구조 민감도 분석. variable_ratio 0~1."""
-    scenarios = []
-    var = variable_ratio or 0.0
-    for change in [-20, -10, 0, 10, 20]:
-        new_fixed = fixed_costs * (1 + change / 100)
-        v = base_sales * var
-        tc = new_fixed + v
-        profit = base_sales - tc
-        scenarios.append({"시나리오": f"고정비 {change:+.0f}%", "매출": base_sales, "고정비": new_fixed, "변동비": v, "총비용": tc, "영업이익": profit, "이익률": (profit / base_sales * 100) if base_sales > 0 else 0})
-    for change in [-10, -5, 0, 5, 10]:
-        new_var = var * (1 + change / 100)
-        v = base_sales * new_var
-        tc = fixed_costs + v
-        profit = base_sales - tc
-        scenarios.append({"시나리오": f"변동비율 {change:+.0f}%", "매출": base_sales, "고정비": fixed_costs, "변동비": v, "총비용": tc, "영업이익": profit, "이익률": (profit / base_sales * 100) if base_sales > 0 else 0})
-    for change in [-30, -20, -10, 0, 10, 20, 30]:
-        new_sales = base_sales * (1 + change / 100)
-        v = new_sales * var
-        tc = fixed_costs + v
-        profit = new_sales - tc
-        scenarios.append({"시나리오": f"매출 {change:+.0f}%", "매출": new_sales, "고정비": fixed_costs, "변동비": v, "총비용": tc, "영업이익": profit, "이익률": (profit / new_sales * 100) if new_sales > 0 else 0})
-    return pd.DataFrame(scenarios)
-
-
 def _assess_target_difficulty(year, month, current_sales, target_sales, daily_avg, required_daily):
     """목표 달성 난이도 평가."""
     days_in_month = monthrange(year, month)[1]
@@ -268,60 +91,22 @@ def _generate_action_items(daily_profit_df, weekday_summary, target_sales, break
     return actions
 
 
-def _render_key_metrics(store_id, year, month, merged_df, targets_df, fixed, var_ratio, breakeven, daily_profit_df):
+def _render_key_metrics(pnl):
     """ZONE A: 핵심 지표 (강화: 손익분기/목표 달성 일수, 평균 일별 영업이익, 손익분기 대비)"""
     render_section_header("핵심 지표", "📊")
 
-    month_sales = 0.0
-    try:
-        month_sales = load_monthly_sales_total(store_id, year, month) or 0.0
-    except Exception:
-        pass
-
-    target_sales = 0.0
-    if not targets_df.empty:
-        tr = targets_df[(targets_df["연도"] == year) & (targets_df["월"] == month)]
-        if not tr.empty:
-            target_sales = float(safe_get_value(tr, "목표매출", 0) or 0)
-
-    days_in_month = monthrange(year, month)[1]
-    today = today_kst()
-    is_current = today.year == year and today.month == month
-    current_day = today.day if is_current else days_in_month
-    remaining = max(0, days_in_month - current_day)
-    current_day = max(1, current_day)
-
-    daily_avg = month_sales / current_day if current_day > 0 else 0.0
-    required_daily = 0.0
-    if target_sales > 0 and remaining > 0 and month_sales < target_sales:
-        required_daily = (target_sales - month_sales) / remaining
-
-    forecast = month_sales + (daily_avg * remaining) if current_day > 0 else month_sales
+    month_sales = pnl["month_sales"]
+    target_sales = pnl["target_sales"]
+    is_current = pnl["is_current"]
+    remaining = pnl["remaining"]
+    daily_avg = pnl["daily_avg"]
+    required_daily = pnl["required_daily"]
+    forecast = pnl["forecast"]
     forecast_achievement = (forecast / target_sales * 100) if target_sales > 0 else None
-
-    prev_sales = 0.0
-    if month == 1:
-        py, pm = year - 1, 12
-    else:
-        py, pm = year, month - 1
-    try:
-        prev_sales = load_monthly_sales_total(store_id, py, pm) or 0.0
-    except Exception:
-        pass
-    mom_pct = ((month_sales - prev_sales) / prev_sales * 100) if prev_sales > 0 else None
-
-    breakeven_daily = (breakeven / days_in_month) if breakeven and days_in_month > 0 else 0.0
-    target_daily = (target_sales / days_in_month) if target_sales and days_in_month > 0 else 0.0
-    be_achieve = 0
-    tg_achieve = 0
-    avg_daily_profit = 0.0
-    if daily_profit_df is not None and not daily_profit_df.empty:
-        if "손익분기대비" in daily_profit_df.columns:
-            be_achieve = int((daily_profit_df["손익분기대비"] >= 100).sum())
-        if "목표대비" in daily_profit_df.columns:
-            tg_achieve = int((daily_profit_df["목표대비"] >= 100).sum())
-        if "영업이익" in daily_profit_df.columns:
-            avg_daily_profit = float(daily_profit_df["영업이익"].mean())
+    mom_pct = pnl["mom_pct"]
+    breakeven = pnl["breakeven"]
+    daily_profit_df = pnl["daily_pnl"]
+    gaps = pnl["gaps"]
 
     c1, c2, c3 = st.columns(3)
     with c1:
@@ -356,25 +141,23 @@ def _render_key_metrics(store_id, year, month, merged_df, targets_df, fixed, var
 
     if breakeven and breakeven > 0:
         be_pct = (month_sales / breakeven * 100) if month_sales else 0
-        n_days = len(daily_profit_df) if daily_profit_df is not None and not daily_profit_df.empty else 0
-        st.caption(f"📊 손익분기 대비 현재 매출: **{be_pct:.0f}%** · 손익분기 달성 일수: **{be_achieve}**/{n_days} · 목표 달성 일수: **{tg_achieve}**")
-    if daily_profit_df is not None and not daily_profit_df.empty and "영업이익" in daily_profit_df.columns:
-        st.caption(f"📈 평균 일별 영업이익: **{int(avg_daily_profit):,}원**")
+        st.caption(f"📊 손익분기 대비 현재 매출: **{be_pct:.0f}%** · 손익분기 달성 일수: **{gaps['breakeven_achieve_days']}**/{gaps['days']} · 목표 달성 일수: **{gaps['target_achieve_days']}**")
+    if not daily_profit_df.empty:
+        st.caption(f"📈 평균 일별 영업이익: **{int(gaps['avg_daily_profit']):,}원**")
     if mom_pct is not None:
         st.caption(f"📈 전월 대비: **{mom_pct:+.1f}%**")
 
-    unofficial = count_unofficial_days_in_month(store_id, year, month)
+    unofficial = pnl["unofficial_days"]
     if unofficial > 0:
         st.warning(f"⚠️ 미마감 데이터 포함 ({unofficial}일): 누적 매출에 미마감일 매출이 포함됩니다.")
 
 
-def _render_target_vs_actual(store_id, year, month, merged_df, targets_df, month_sales, target_sales, breakeven):
+def _render_target_vs_actual(pnl):
     """ZONE B: 목표 vs 실제 상세 (손익분기/목표 라인 차트)"""
     render_section_header("목표 vs 실제", "🎯")
 
-    if not targets_df.empty:
-        tr = targets_df[(targets_df["연도"] == year) & (targets_df["월"] == month)]
-        if tr.empty:
+    if pnl["targets_loaded"]:
+        if not pnl["has_month_target"]:
             st.info("이번 달 목표가 없습니다. **목표 매출구조**에서 설정하세요.")
             if st.button("목표 매출구조 입력으로 이동", key="sales_analysis_go_target"):
                 st.session_state["current_page"] = "목표 매출구조"
@@ -387,15 +170,16 @@ def _render_target_vs_actual(store_id, year, month, merged_df, targets_df, month
             st.rerun()
         return
 
+    month_sales = pnl["month_sales"]
+    target_sales = pnl["target_sales"]
     if not target_sales or target_sales <= 0:
         st.info("목표 매출을 입력해주세요.")
         return
 
     diff = month_sales - target_sales
     ach = (month_sales / target_sales * 100) if target_sales > 0 else 0
-    days_in_month = monthrange(year, month)[1]
-    daily_target = target_sales / days_in_month if days_in_month > 0 else 0
-    breakeven_daily = (breakeven / days_in_month) if breakeven and days_in_month > 0 else 0.0
+    daily_target = pnl["target_daily"]
+    breakeven_daily = pnl["breakeven_daily"]
 
     col1, col2, col3, col4 = st.columns(4)
     with col1:
@@ -407,7 +191,7 @@ def _render_target_vs_actual(store_id, year, month, merged_df, targets_df, month
     with col4:
         st.metric("일평균 목표", f"{int(daily_target):,}원")
 
-    month_data = _month_data(merged_df, year, month)
+    month_data = pnl["month_df"]
     if not month_data.empty and "총매출" in month_data.columns and "날짜" in month_data.columns:
         st.markdown("**일별 매출 추이 (이번 달) — 매출 vs 목표/손익분기 일평균**")
         chart_df = month_data.sort_values("날짜")[["날짜", "총매출"]].copy()
@@ -423,7 +207,7 @@ def _render_target_vs_actual(store_id, year, month, merged_df, targets_df, month
         st.caption("일별 매출 데이터가 없으면 차트가 표시되지 않습니다. **일일 마감**을 입력해주세요.")
 
 
-def _render_daily_profit_table(daily_profit_df):
+def _render_daily_profit_table(daily_profit_df, gaps):
     """ZONE C: 일자별 손익 분석표"""
     render_section_header("일자별 손익 분석표", "📋")
 
@@ -448,12 +232,7 @@ def _render_daily_profit_table(daily_profit_df):
         "목표대비": st.column_config.NumberColumn("목표대비", format="%.0f%%"),
     })
 
-    total_sales = float(daily_profit_df["매출"].sum())
-    total_cost = float(daily_profit_df["총비용"].sum())
-    total_profit = float(daily_profit_df["영업이익"].sum())
-    n = len(daily_profit_df)
-    avg_profit = total_profit / n if n > 0 else 0
-    st.caption(f"**합계** 매출 {int(total_sales):,}원 · 비용 {int(total_cost):,}원 · 영업이익 {int(total_profit):,}원 · **평균 일별 영업이익** {int(avg_profit):,}원")
+    st.caption(f"**합계** 매출 {int(gaps['total_sales']):,}원 · 비용 {int(gaps['total_cost']):,}원 · 영업이익 {int(gaps['total_profit']):,}원 · **평균 일별 영업이익** {int(gaps['avg_daily_profit']):,}원")
 
 
 def _render_weekday_patterns(weekday_summary, target_daily):
@@ -472,7 +251,7 @@ def _render_weekday_patterns(weekday_summary, target_daily):
             st.warning(f"⚠️ **{row['요일']}** 매출이 목표 대비 **{row['목표대비']:.0f}%**로 낮습니다. (평균 {int(row['매출']):,}원 vs 목표 {int(target_daily):,}원)")
 
 
-def _render_simulation(store_id, year, month, month_sales, target_sales, fixed, var_ratio):
+def _render_simulation(year, month, month_sales, target_sales, fixed, var_ratio):
     """ZONE F: 목표 달성 시뮬레이션"""
     render_section_header("목표 달성 시뮬레이션", "🔮")
 
@@ -489,7 +268,7 @@ def _render_simulation(store_id, year, month, month_sales, target_sales, fixed,
         st.metric("필요 일평균 달성 시 예상 영업이익", f"{int(sim['required_daily_profit']):,}원")
 
 
-def _render_sensitivity(month_sales, fixed, var_ratio):
+def _render_sensitivity(sens, fixed, var_ratio):
     """ZONE G: 비용 구조 민감도 분석"""
     render_section_header("비용 구조 민감도 분석", "📐")
 
@@ -501,9 +280,7 @@ def _render_sensitivity(month_sales, fixed, var_ratio):
         st.info("💡 변동비율이 없으면 민감도 분석을 할 수 없습니다. **목표 비용구조**에서 변동비율을 입력해주세요.")
         return
 
-    base = month_sales if month_sales and month_sales > 0 else 10_000_000
-    sens = _sensitivity_analysis(base, fixed or 0.0, var_ratio or 0.0)
-    if sens.empty:
+    if sens is None or sens.empty:
         st.info("💡 민감도 분석 데이터를 생성할 수 없습니다.")
         return
     st.dataframe(sens, use_container_width=True, hide_index=True, column_config={
@@ -516,32 +293,29 @@ def _render_sensitivity(month_sales, fixed, var_ratio):
     })
 
 
-def _render_diagnosis(daily_profit_df, weekday_summary, target_sales, breakeven_daily, year, month, month_sales, daily_avg, required_daily):
+def _render_diagnosis(pnl, year, month):
     """ZONE H: 자동 진단 및 액션 아이템"""
     render_section_header("자동 진단 및 액션 아이템", "⚠️")
 
+    daily_profit_df = pnl["daily_pnl"]
     if daily_profit_df is None or daily_profit_df.empty:
         st.info("💡 일별 손익 데이터가 없으면 자동 진단을 할 수 없습니다. **일일 마감**과 **목표 비용구조**를 입력해주세요.")
         return
 
-    target_daily = 0.0
-    days_in_month = monthrange(year, month)[1]
-    if target_sales and target_sales > 0 and days_in_month > 0:
-        target_daily = target_sales / days_in_month
-
-    diag = _diagnose_sales_drop(daily_profit_df, target_daily, breakeven_daily)
-    for s in diag["insights"]:
+    target_sales = pnl["target_sales"]
+    breakeven_daily = pnl["breakeven_daily"]
+    for s in pnl["insights"]:
         st.warning(s)
-    if not diag["insights"]:
+    if not pnl["insights"]:
         st.success("✅ 진단 결과: 특별한 이슈 없음.")
 
     if target_sales and target_sales > 0:
-        diff = _assess_target_difficulty(year, month, month_sales, target_sales, daily_avg, required_daily)
+        diff = _assess_target_difficulty(year, month, pnl["month_sales"], target_sales, pnl["daily_avg"], pnl["required_daily"])
         st.info(f"**목표 달성 난이도**: {diff['difficulty']} — {diff['insight']}")
     else:
         st.caption("목표 매출을 설정하면 난이도 평가가 표시됩니다.")
 
-    actions = _generate_action_items(daily_profit_df, weekday_summary, target_sales, breakeven_daily)
+    actions = _generate_action_items(daily_profit_df, pnl["weekday_summary"], target_sales, breakeven_daily)
     if actions:
         st.markdown("**개선 액션**")
         for a in actions:
@@ -552,11 +326,10 @@ def _render_diagnosis(daily_profit_df, weekday_summary, target_sales, breakeven_
         st.success("✅ 당장 추천할 개선 액션이 없습니다. 현재 추세를 유지해 보세요.")
 
 
-def _render_trends(store_id, year, month, merged_df):
+def _render_trends(merged_df, month_data):
     """ZONE E: 트렌드 분석 (일별 이번 달, 월간 6개월)"""
     render_section_header("트렌드 분석", "📈")
 
-    month_data = _month_data(merged_df, year, month)
     if not month_data.empty and "총매출" in month_data.columns:
         st.markdown("**일별 매출 (이번 달)**")
         c = month_data.sort_values("날짜")[["날짜", "총매출"]].copy()
@@ -578,16 +351,12 @@ def _render_trends(store_id, year, month, merged_df):
             st.bar_chart(monthly.set_index("월키")["총매출"], height=220)
 
 
-def _render_detailed_analysis(store_id, year, month, merged_df):
+def _render_detailed_analysis(pnl):
     """ZONE I: 상세 분석 (방문자, 결제수단, 예측)"""
     render_section_header("상세 분석", "🔍")
 
-    month_data = _month_data(merged_df, year, month)
-    month_sales = 0.0
-    try:
-        month_sales = load_monthly_sales_total(store_id, year, month) or 0.0
-    except Exception:
-        pass
+    month_data = pnl["month_df"]
+    month_sales = pnl["month_sales"]
 
     # 방문자 / 객단가
     if not month_data.empty and "방문자수" in month_data.columns and "총매출" in month_data.columns:
@@ -616,23 +385,11 @@ def _render_detailed_analysis(store_id, year, month, merged_df):
             st.caption(f"카드 {card / total * 100:.1f}% · 현금 {cash / total * 100:.1f}%")
 
     # 예측 및 액션
-    days_in_month = monthrange(year, month)[1]
-    today = today_kst()
-    is_current = today.year == year and today.month == month
-    current_day = today.day if is_current else days_in_month
-    remaining = max(0, days_in_month - current_day)
-    daily_avg = month_sales / current_day if current_day > 0 else 0.0
-    forecast = month_sales + (daily_avg * remaining) if current_day > 0 else month_sales
-
+    remaining = pnl["remaining"]
     st.markdown("**예상 및 액션**")
-    st.metric("현재 추세 기준 예상 월 매출", f"{int(forecast):,}원")
-    if remaining > 0 and is_current:
-        targets_df = load_csv("targets.csv", default_columns=["연도", "월", "목표매출"], store_id=store_id)
-        target_sales = 0.0
-        if not targets_df.empty:
-            tr = targets_df[(targets_df["연도"] == year) & (targets_df["월"] == month)]
-            if not tr.empty:
-                target_sales = float(safe_get_value(tr, "목표매출", 0) or 0)
+    st.metric("현재 추세 기준 예상 월 매출", f"{int(pnl['forecast']):,}원")
+    if remaining > 0 and pnl["is_current"]:
+        target_sales = pnl["target_sales"]
         if target_sales > 0 and month_sales < target_sales:
             need = (target_sales - month_sales) / remaining
             st.warning(f"📌 목표 달성을 위해 남은 {remaining}일 동안 **일평균 {int(need):,}원**이 필요합니다.")
@@ -662,6 +419,7 @@ def render_sales_analysis():
                 load_monthly_sales_total.clear()
             except Exception:
                 pass
+            sales_pnl_engine.clear()
             st.success("매출 데이터를 새로고침했습니다.")
             st.rerun()
 
@@ -685,29 +443,19 @@ def render_sales_analysis():
 
     render_section_divider()
 
-    sales_df, merged_df = _build_sales_and_merged(store_id)
-    targets_df = load_csv(
-        "targets.csv",
-        default_columns=["연도", "월", "목표매출", "목표원가율", "목표인건비율", "목표임대료율", "목표기타비용율", "목표순이익률"],
-        store_id=store_id,
+    pnl = sales_pnl_engine(
+        store_id,
+        int(selected_year),
+        int(selected_month),
+        today_kst(),
+        get_data_version("sales"),
+        get_data_version("daily_close"),
+        get_data_version("visitors"),
+        get_data_version("cost"),
+        get_data_version("targets"),
+        get_data_version("settlement"),
     )
-
-    month_sales = 0.0
-    try:
-        month_sales = load_monthly_sales_total(store_id, selected_year, selected_month) or 0.0
-    except Exception:
-        pass
-
-    target_sales = 0.0
-    if not targets_df.empty:
-        tr = targets_df[(targets_df["연도"] == selected_year) & (targets_df["월"] == selected_month)]
-        if not tr.empty:
-            target_sales = float(safe_get_value(tr, "목표매출", 0) or 0)
-
-    if merged_df.empty and not sales_df.empty:
-        merged_df = sales_df.copy()
-        if "방문자수" not in merged_df.columns:
-            merged_df["방문자수"] = 0
+    merged_df = pnl["merged_df"]
 
     if merged_df.empty:
         st.info("저장된 매출 데이터가 없습니다. **일일 마감**에서 매출을 입력한 뒤 분석할 수 있습니다.")
@@ -716,52 +464,31 @@ def render_sales_analysis():
             st.rerun()
         return
 
-    fixed = get_fixed_costs(store_id, selected_year, selected_month) or 0.0
-    var_ratio = get_variable_cost_ratio(store_id, selected_year, selected_month) or 0.0
-    breakeven = calculate_break_even_sales(store_id, selected_year, selected_month) or 0.0
-    days_in_month = monthrange(selected_year, selected_month)[1]
-    today = today_kst()
-    is_current = today.year == selected_year and today.month == selected_month
-    current_day = max(1, today.day if is_current else days_in_month)
-    remaining = max(0, days_in_month - current_day)
-    daily_avg = month_sales / current_day if current_day > 0 else 0.0
-    required_daily = (target_sales - month_sales) / remaining if target_sales and remaining > 0 and month_sales < target_sales else 0.0
-    breakeven_daily = (breakeven / days_in_month) if breakeven and days_in_month > 0 else 0.0
-    target_daily = (target_sales / days_in_month) if target_sales and days_in_month > 0 else 0.0
-
-    month_data = _month_data(merged_df, selected_year, selected_month)
-    daily_profit_df = _calculate_daily_profit_loss(
-        selected_year, selected_month, month_data, fixed, var_ratio, breakeven_daily, target_daily
-    )
-    weekday_summary = _analyze_weekday_patterns(daily_profit_df) if daily_profit_df is not None and not daily_profit_df.empty else pd.DataFrame()
-
-    _render_key_metrics(store_id, selected_year, selected_month, merged_df, targets_df, fixed, var_ratio, breakeven, daily_profit_df)
+    _render_key_metrics(pnl)
     render_section_divider()
 
-    _render_target_vs_actual(
-        store_id, selected_year, selected_month, merged_df, targets_df, month_sales, target_sales, breakeven
-    )
+    _render_target_vs_actual(pnl)
     render_section_divider()
 
-    _render_daily_profit_table(daily_profit_df)
+    _render_daily_profit_table(pnl["daily_pnl"], pnl["gaps"])
     render_section_divider()
 
-    _render_weekday_patterns(weekday_summary, target_daily)
+    _render_weekday_patterns(pnl["weekday_summary"], pnl["target_daily"])
     render_section_divider()
 
-    _render_trends(store_id, selected_year, selected_month, merged_df)
+    _render_trends(merged_df, pnl["month_df"])
     render_section_divider()
 
-    _render_simulation(store_id, selected_year, selected_month, month_sales, target_sales, fixed, var_ratio)
+    _render_simulation(selected_year, selected_month, pnl["month_sales"], pnl["target_sales"], pnl["fixed_costs"], pnl["variable_ratio"])
     render_section_divider()
 
-    _render_sensitivity(month_sales, fixed, var_ratio)
+    _render_sensitivity(pnl["sensitivity"], pnl["fixed_costs"], pnl["variable_ratio"])
     render_section_divider()
 
-    _render_diagnosis(daily_profit_df, weekday_summary, target_sales, breakeven_daily, selected_year, selected_month, month_sales, daily_avg, required_daily)
+    _render_diagnosis(pnl, selected_year, selected_month)
     render_section_divider()
 
-    _render_detailed_analysis(store_id, selected_year, selected_month, merged_df)
+    _render_detailed_analysis(pnl)
 
     st.markdown("---")
     st.caption("💡 매출 입력·수정은 **일일 마감**에서 하세요. 목표·비용 구조는 **목표 매출구조**·**목표 비용구조**에서 하세요.")
@@ -0,0 +1,378 @@
+"""
+매출 분석 손익 엔진 (sales_pnl_engine)
+(store, 월, 데이터 버전) 단위로 일자별 손익 / 요일 요약 / 손익분기·목표 갭 / 민감도 그리드를 한 번에 계산
+- compute_sales_pnl: 순수 함수 (Streamlit 의존 없음, 벡터 연산)
+- sales_pnl_engine: 데이터 로드 + compute_sales_pnl 캐시 래퍼 (매출 분석 페이지 전용)
+"""
+from calendar import monthrange
+from datetime import date
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from src.analytics import merge_sales_visitors
+from src.ui_helpers import safe_get_value
+
+# 요일 한글 매핑
+WEEKDAY_KR = {
+    "Monday": "월요일",
+    "Tuesday": "화요일",
+    "Wednesday": "수요일",
+    "Thursday": "목요일",
+    "Friday": "금요일",
+    "Saturday": "토요일",
+    "Sunday": "일요일",
+}
+WEEKDAY_ORDER = ["월요일", "화요일", "수요일", "목요일", "금요일", "토요일", "일요일"]
+
+# 민감도 시나리오 (변화율 %)
+_FIXED_CHANGES = [-20, -10, 0, 10, 20]
+_VARIABLE_CHANGES = [-10, -5, 0, 5, 10]
+_SALES_CHANGES = [-30, -20, -10, 0, 10, 20, 30]
+_SENSITIVITY_DEFAULT_SALES = 10_000_000
+
+
+def _safe_ratio(numer: pd.Series, denom, scale: float = 100.0) -> pd.Series:
+    """numer / denom * scale (denom <= 0 이면 0)"""
+    if isinstance(denom, pd.Series):
+        return (numer / denom.where(denom > 0) * scale).fillna(0.0)
+    if denom and denom > 0:
+        return numer / denom * scale
+    return pd.Series(0.0, index=numer.index)
+
+
+def month_frame(merged_df: pd.DataFrame, year: int, month: int) -> pd.DataFrame:
+    """선택 연·월 해당 일별 데이터"""
+    if merged_df is None or merged_df.empty or "날짜" not in merged_df.columns:
+        return pd.DataFrame()
+    return merged_df[(merged_df["날짜"].dt.year == year) & (merged_df["날짜"].dt.month == month)].copy()
+
+
+def daily_pnl_frame(month_df, days_in_month, fixed_costs, variable_ratio, breakeven_daily, target_daily) -> pd.DataFrame:
+    """일자별 손익표 (벡터 연산). variable_ratio는 0~1 소수."""
+    if month_df is None or month_df.empty or "총매출" not in month_df.columns:
+        return pd.DataFrame()
+    src = month_df[month_df["총매출"].notna()].sort_values("날짜")
+    if src.empty:
+        return pd.DataFrame()
+
+    daily_fixed = fixed_costs / days_in_month if days_in_month > 0 else 0.0
+    sales = pd.to_numeric(src["총매출"], errors="coerce").fillna(0.0).astype(float).reset_index(drop=True)
+    variable = sales * (variable_ratio or 0.0)
+    total_cost = daily_fixed + variable
+    profit = sales - total_cost
+    breakeven_ratio = _safe_ratio(sales, breakeven_daily)
+
+    df = pd.DataFrame({
+        "날짜": pd.to_datetime(src["날짜"]).reset_index(drop=True),
+        "매출": sales,
+        "고정비(일할)": daily_fixed,
+        "변동비": variable,
+        "총비용": total_cost,
+        "영업이익": profit,
+        "이익률": _safe_ratio(profit, sales),
+        "손익분기대비": breakeven_ratio,
+        "목표대비": _safe_ratio(sales, target_daily),
+    })
+    df["등급"] = np.select(
+        [(profit > 0) & (breakeven_ratio >= 100), profit > 0],
+        ["🟢 양호", "🟡 보통"],
+        default="🔴 위험",
+    )
+    df["요일"] = df["날짜"].dt.day_name().map(WEEKDAY_KR)
+    return df
+
+
+def weekday_summary_frame(daily_pnl: pd.DataFrame) -> pd.DataFrame:
+    """요일별 평균 (월~일 순서, 데이터 있는 요일만)"""
+    if daily_pnl is None or daily_pnl.empty or "요일" not in daily_pnl.columns:
+        return pd.DataFrame()
+    agg = daily_pnl.groupby("요일")[["매출", "총비용", "영업이익", "이익률", "손익분기대비", "목표대비"]].mean()
+    agg = agg.reindex([w for w in WEEKDAY_ORDER if w in agg.index])
+    return agg.reset_index()
+
+
+def gap_summary(daily_pnl: pd.DataFrame, target_daily: float) -> Dict:
+    """손익분기/목표 달성·미달 일수, 급락 일수, 최저 요일"""
+    gaps = {
+        "days": 0,
+        "breakeven_achieve_days": 0,
+        "target_achieve_days": 0,
+        "breakeven_fail_days": 0,
+        "target_fail_days": 0,
+        "drop_days": 0,
+        "worst_weekday": "",
+        "worst_weekday_avg": 0.0,
+        "avg_daily_profit": 0.0,
+        "total_sales": 0.0,
+        "total_cost": 0.0,
+        "total_profit": 0.0,
+    }
+    if daily_pnl is None or daily_pnl.empty:
+        return gaps
+
+    be = daily_pnl["손익분기대비"]
+    tg = daily_pnl["목표대비"]
+    gaps.update({
+        "days": len(daily_pnl),
+        "breakeven_achieve_days": int((be >= 100).sum()),
+        "target_achieve_days": int((tg >= 100).sum()),
+        "breakeven_fail_days": int((be < 100).sum()),
+        "avg_daily_profit": float(daily_pnl["영업이익"].mean()),
+        "total_sales": float(daily_pnl["매출"].sum()),
+        "total_cost": float(daily_pnl["총비용"].sum()),
+        "total_profit": float(daily_pnl["영업이익"].sum()),
+    })
+    if target_daily and target_daily > 0:
+        gaps["target_fail_days"] = int((tg < 100).sum())
+        wd_avg = daily_pnl.groupby("요일")["매출"].mean()
+        if not wd_avg.empty:
+            gaps["worst_weekday"] = wd_avg.idxmin()
+            gaps["worst_weekday_avg"] = float(wd_avg.min())
+    if len(daily_pnl) >= 2:
+        gaps["drop_days"] = int((daily_pnl["매출"].pct_change() * 100 < -20).sum())
+    return gaps
+
+
+def diagnosis_insights(gaps: Dict, target_daily: float) -> list:
+    """자동 진단 문구"""
+    insights = []
+    n = gaps["days"]
+    if gaps["breakeven_fail_days"] > 0:
+        pct = (gaps["breakeven_fail_days"] / n * 100) if n else 0
+        insights.append(f"손익분기 미달 일수: {gaps['breakeven_fail_days']}일 ({pct:.0f}%)")
+    if gaps["target_fail_days"] > 0:
+        pct = (gaps["target_fail_days"] / n * 100) if n else 0
+        insights.append(f"목표 미달 일수: {gaps['target_fail_days']}일 ({pct:.0f}%)")
+    if gaps["worst_weekday"] and gaps["worst_weekday_avg"] < target_daily * 0.8:
+        insights.append(f"{gaps['worst_weekday']} 매출이 목표 대비 낮습니다. ({int(gaps['worst_weekday_avg']):,}원 vs 목표 {int(target_daily):,}원)")
+    if gaps["drop_days"] > 0:
+        insights.append(f"급락 일수: {gaps['drop_days']}일 (전일 대비 -20% 이상)")
+    return insights
+
+
+def sensitivity_grid(base_sales: float, fixed_costs: float, variable_ratio: float) -> pd.DataFrame:
+    """비용 구조 민감도 그리드 (고정비 / 변동비율 / 매출 변화). variable_ratio 0~1."""
+    var = variable_ratio or 0.0
+    fixed_chg = np.array(_FIXED_CHANGES, dtype=float)
+    var_chg = np.array(_VARIABLE_CHANGES, dtype=float)
+    sales_chg = np.array(_SALES_CHANGES, dtype=float)
+
+    labels = (
+        [f"고정비 {c:+.0f}%" for c in _FIXED_CHANGES]
+        + [f"변동비율 {c:+.0f}%" for c in _VARIABLE_CHANGES]
+        + [f"매출 {c:+.0f}%" for c in _SALES_CHANGES]
+    )
+    sales = np.concatenate([
+        np.full(len(fixed_chg), base_sales),
+        np.full(len(var_chg), base_sales),
+        base_sales * (1 + sales_chg / 100),
+    ])
+    fixed = np.concatenate([
+        fixed_costs * (1 + fixed_chg / 100),
+        np.full(len(var_chg) + len(sales_chg), fixed_costs),
+    ])
+    ratio = np.concatenate([
+        np.full(len(fixed_chg), var),
+        var * (1 + var_chg / 100),
+        np.full(len(sales_chg), var),
+    ])
+    variable = sales * ratio
+    total_cost = fixed + variable
+    profit = sales - total_cost
+    with np.errstate(divide="ignore", invalid="ignore"):
+        profit_rate = np.where(sales > 0, profit / sales * 100, 0.0)
+
+    return pd.DataFrame({
+        "시나리오": labels,
+        "매출": sales,
+        "고정비": fixed,
+        "변동비": variable,
+        "총비용": total_cost,
+        "영업이익": profit,
+        "이익률": profit_rate,
+    })
+
+
+def compute_sales_pnl(
+    merged_df: pd.DataFrame,
+    year: int,
+    month: int,
+    today: date,
+    month_sales: float,
+    prev_sales: float,
+    target_sales: float,
+    fixed_costs: float,
+    variable_ratio: float,
+    breakeven: float,
+) -> Dict:
+    """
+    매출 분석 손익 계산 (순수 함수, 한 번의 벡터 패스)
+
+    Returns:
+        dict: 달력 지표 / month_df / daily_pnl / weekday_summary / gaps / insights / sensitivity
+    """
+    days_in_month = monthrange(year, month)[1]
+    is_current = today.year == year and today.month == month
+    current_day = max(1, today.day if is_current else days_in_month)
+    remaining = max(0, days_in_month - current_day)
+
+    daily_avg = month_sales / current_day if current_day > 0 else 0.0
+    required_daily = 0.0
+    if target_sales and target_sales > 0 and remaining > 0 and month_sales < target_sales:
+        required_daily = (target_sales - month_sales) / remaining
+    forecast = month_sales + daily_avg * remaining
+    breakeven_daily = (breakeven / days_in_month) if breakeven and days_in_month > 0 else 0.0
+    target_daily = (target_sales / days_in_month) if target_sales and days_in_month > 0 else 0.0
+
+    month_df = month_frame(merged_df, year, month)
+    daily_pnl = daily_pnl_frame(month_df, days_in_month, fixed_costs, variable_ratio, breakeven_daily, target_daily)
+    weekday_summary = weekday_summary_frame(daily_pnl)
+    gaps = gap_summary(daily_pnl, target_daily)
+
+    base_sales = month_sales if month_sales and month_sales > 0 else _SENSITIVITY_DEFAULT_SALES
+
+    return {
+        "days_in_month": days_in_month,
+        "is_current": is_current,
+        "current_day": current_day,
+        "remaining": remaining,
+        "month_sales": month_sales,
+        "prev_sales": prev_sales,
+        "mom_pct": ((month_sales - prev_sales) / prev_sales * 100) if prev_sales > 0 else None,
+        "target_sales": target_sales,
+        "fixed_costs": fixed_costs,
+        "variable_ratio": variable_ratio,
+        "breakeven": breakeven,
+        "daily_avg": daily_avg,
+        "required_daily": required_daily,
+        "forecast": forecast,
+        "breakeven_daily": breakeven_daily,
+        "target_daily": target_daily,
+        "month_df": month_df,
+        "daily_pnl": daily_pnl,
+        "weekday_summary": weekday_summary,
+        "gaps": gaps,
+        "insights": diagnosis_insights(gaps, target_daily) if not daily_pnl.empty else [],
+        "sensitivity": sensitivity_grid(base_sales, fixed_costs or 0.0, variable_ratio or 0.0),
+    }
+
+
+def _load_merged_sales(store_id: str) -> pd.DataFrame:
+    """best_available 일별 매출 + 방문자 병합 DataFrame"""
+    from src.storage_supabase import load_best_available_daily_sales, load_csv
+
+    best = load_best_available_daily_sales(store_id=store_id)
+    if best.empty:
+        sales_df = pd.DataFrame(columns=["날짜", "총매출", "카드매출", "현금매출", "is_official", "source"])
+    else:
+        sales_df = best.copy()
+        sales_df["날짜"] = pd.to_datetime(sales_df["date"])
+        sales_df["총매출"] = sales_df["total_sales"]
+        sales_df["카드매출"] = sales_df.get("card_sales", 0)
+        sales_df["현금매출"] = sales_df.get("cash_sales", 0)
+        sales_df["is_official"] = sales_df.get("is_official", True)
+        sales_df["source"] = sales_df.get("source", "daily_close")
+
+    visitors_df = load_csv("naver_visitors.csv", default_columns=["날짜", "방문자수"], store_id=store_id)
+    if not visitors_df.empty and "날짜" in visitors_df.columns:
+        visitors_df["날짜"] = pd.to_datetime(visitors_df["날짜"])
+
+    try:
+        merged = merge_sales_visitors(sales_df, visitors_df)
+    except Exception:
+        merged = pd.DataFrame()
+
+    if merged.empty and not sales_df.empty:
+        merged = sales_df.copy()
+        if "방문자수" not in merged.columns:
+            merged["방문자수"] = 0
+
+    if not merged.empty and "날짜" in merged.columns:
+        merged["날짜"] = pd.to_datetime(merged["날짜"])
+    return merged
+
+
+def _target_for_month(targets_df: pd.DataFrame, year: int, month: int) -> Optional[float]:
+    """해당 월 목표 매출 (targets 테이블에 해당 월 행이 없으면 None)"""
+    if targets_df is None or targets_df.empty:
+        return None
+    tr = targets_df[(targets_df["연도"] == year) & (targets_df["월"] == month)]
+    if tr.empty:
+        return None
+    return float(safe_get_value(tr, "목표매출", 0) or 0)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def sales_pnl_engine(
+    store_id: str,
+    year: int,
+    month: int,
+    today: date,
+    v_sales: int,
+    v_daily_close: int,
+    v_visitors: int,
+    v_cost: int,
+    v_targets: int,
+    v_settlement: int,
+) -> Dict:
+    """
+    매출 분석 손익 엔진 (캐시됨, version_token 기반)
+
+    Args:
+        store_id: 매장 ID
+        year, month: 분석 연·월
+        today: 기준일 (KST, 진행 중인 월 판단용)
+        v_sales / v_daily_close / v_visitors / v_cost / v_targets / v_settlement: 데이터 버전 토큰
+            (엔진이 읽는 매출·마감·방문자·비용·목표·실제정산 데이터 각각)
+
+    Returns:
+        dict: compute_sales_pnl 결과 + merged_df, targets_loaded, has_month_target, unofficial_days
+    """
+    from src.storage_supabase import (
+        load_csv,
+        load_monthly_sales_total,
+        count_unofficial_days_in_month,
+        get_fixed_costs,
+        get_variable_cost_ratio,
+        calculate_break_even_sales,
+    )
+
+    merged_df = _load_merged_sales(store_id)
+
+    py, pm = (year - 1, 12) if month == 1 else (year, month - 1)
+    month_sales = prev_sales = 0.0
+    try:
+        month_sales = float(load_monthly_sales_total(store_id, year, month) or 0.0)
+    except Exception:
+        pass
+    try:
+        prev_sales = float(load_monthly_sales_total(store_id, py, pm) or 0.0)
+    except Exception:
+        pass
+
+    targets_df = load_csv("targets.csv", default_columns=["연도", "월", "목표매출"], store_id=store_id)
+    month_target = _target_for_month(targets_df, year, month)
+
+    result = compute_sales_pnl(
+        merged_df,
+        year,
+        month,
+        today,
+        month_sales=month_sales,
+        prev_sales=prev_sales,
+        target_sales=month_target or 0.0,
+        fixed_costs=float(get_fixed_costs(store_id, year, month) or 0.0),
+        variable_ratio=float(get_variable_cost_ratio(store_id, year, month) or 0.0),
+        breakeven=float(calculate_break_even_sales(store_id, year, month) or 0.0),
+    )
+    result["merged_df"] = merged_df
+    result["targets_loaded"] = targets_df is not None and not targets_df.empty
+    result["has_month_target"] = month_target is not None
+    try:
+        result["unofficial_days"] = int(count_unofficial_days_in_month(store_id, year, month) or 0)
+    except Exception:
+        result["unofficial_days"] = 0
+    return result
@@ -8,109 +8,42 @@ import pandas as pd
 from typing import Dict, List, Tuple, Optional
 from src.storage_supabase import load_csv, get_read_client, get_current_store_id
 from src.auth import get_current_store_id
+from src.utils.cache_tokens import get_data_version
+from src.engine.ingredient_structure import compute_ingredient_usage, cost_concentration, empty_usage, flag_high_risk
+
+
+@st.cache_data(ttl=300)
+def _load_ingredient_usage(store_id: str, v_ingredients: int, v_recipes: int, v_menus: int, v_sales_items: int, v_close: int) -> pd.DataFrame:
+    """재료별 사용금액 (캐시됨, version_token 기반)"""
+    ingredient_df = load_csv('ingredient_master.csv', store_id=store_id, default_columns=['재료명', '단위', '단가'])
+    if ingredient_df.empty:
+        return empty_usage()
+    recipe_df = load_csv('recipes.csv', store_id=store_id, default_columns=['메뉴명', '재료명', '사용량'])
+    if recipe_df.empty:
+        return empty_usage()
+    # 판매량: 유효 판매 뷰 (v_daily_sales_items_effective, 최근 구간)
+    sales_items_df = load_csv('daily_sales_items.csv', store_id=store_id, default_columns=['날짜', '메뉴명', '판매수량'])
+    return compute_ingredient_usage(ingredient_df, recipe_df, sales_items_df)
 
 
 def calculate_ingredient_usage_cost(store_id: str) -> pd.DataFrame:
     """
     재료별 사용금액 계산
     
-    계산식: daily_sales_items × recipes × ingredients.unit_cost
+    계산식: daily_sales_items × recipes × ingredients.unit_cost (src.engine.ingredient_structure)
     
     Returns:
         DataFrame with columns: ['재료명', '총_사용금액', '원가_비중_%', '연결_메뉴_수', '연결_메뉴_목록']
     """
     try:
-        # 1. 재료 마스터 로드
-        ingredient_df = load_csv('ingredient_master.csv', store_id=store_id, default_columns=['재료명', '단위', '단가'])
-        if ingredient_df.empty:
-            return pd.DataFrame(columns=['재료명', '총_사용금액', '원가_비중_%', '연결_메뉴_수', '연결_메뉴_목록'])
-        
-        # 2. 레시피 로드
-        recipe_df = load_csv('recipes.csv', store_id=store_id, default_columns=['메뉴명', '재료명', '사용량'])
-        if recipe_df.empty:
-            return pd.DataFrame(columns=['재료명', '총_사용금액', '원가_비중_%', '연결_메뉴_수', '연결_메뉴_목록'])
-        
-        # 3. 판매량 데이터 로드 (최근 30일 또는 이번 달)
-        sales_items_df = load_csv('daily_sales_items_effective.csv', store_id=store_id, default_columns=['날짜', '메뉴명', '판매수량'])
-        if sales_items_df.empty:
-            # 판매량 데이터가 없으면 레시피 기반으로만 계산 (사용량만)
-            sales_items_df = pd.DataFrame(columns=['날짜', '메뉴명', '판매수량'])
-        
-        # 4. 재료별 사용금액 계산
-        ingredient_usage = {}
-        
-        for _, ingredient_row in ingredient_df.iterrows():
-            ingredient_name = ingredient_row['재료명']
-            unit_cost = float(ingredient_row.get('단가', 0))
-            
-            if unit_cost <= 0:
-                continue
-            
-            # 이 재료를 사용하는 메뉴 찾기
-            recipes_using = recipe_df[recipe_df['재료명'] == ingredient_name]
-            if recipes_using.empty:
-                continue
-            
-            total_cost = 0.0
-            menu_list = set()
-            
-            for _, recipe_row in recipes_using.iterrows():
-                menu_name = recipe_row['메뉴명']
-                usage_qty = float(recipe_row.get('사용량', 0))
-                
-                menu_list.add(menu_name)
-                
-                # 이 메뉴의 판매량 합계
-                if not sales_items_df.empty and '메뉴명' in sales_items_df.columns:
-                    menu_sales = sales_items_df[sales_items_df['메뉴명'] == menu_name]
-                    if not menu_sales.empty and '판매수량' in menu_sales.columns:
-                        total_qty = menu_sales['판매수량'].sum()
-                    else:
-                        # 판매량 데이터가 없으면 기본값 1 (레시피만 고려)
-                        total_qty = 1
-                else:
-                    total_qty = 1
-                
-                # 사용금액 = 판매수량 × 사용량 × 단가
-                cost = total_qty * usage_qty * unit_cost
-                total_cost += cost
-            
-            if total_cost > 0:
-                ingredient_usage[ingredient_name] = {
-                    '총_사용금액': total_cost,
-                    '연결_메뉴_수': len(menu_list),
-                    '연결_메뉴_목록': list(menu_list)
-                }
-        
-        if not ingredient_usage:
-            return pd.DataFrame(columns=['재료명', '총_사용금액', '원가_비중_%', '연결_메뉴_수', '연결_메뉴_목록'])
-        
-        # DataFrame 생성
-        result_df = pd.DataFrame([
-            {
-                '재료명': name,
-                '총_사용금액': data['총_사용금액'],
-                '연결_메뉴_수': data['연결_메뉴_수'],
-                '연결_메뉴_목록': ', '.join(data['연결_메뉴_목록'])
-            }
-            for name, data in ingredient_usage.items()
-        ])
-        
-        # 원가 비중 계산
-        total_cost = result_df['총_사용금액'].sum()
-        if total_cost > 0:
-            result_df['원가_비중_%'] = (result_df['총_사용금액'] / total_cost * 100).round(2)
-        else:
-            result_df['원가_비중_%'] = 0.0
-        
-        # 총 사용금액 내림차순 정렬
-        result_df = result_df.sort_values('총_사용금액', ascending=False).reset_index(drop=True)
-        
-        return result_df
-        
+        return _load_ingredient_usage(
+            store_id,
+            get_data_version("ingredients"), get_data_version("recipes"), get_data_version("menus"),
+            get_data_version("daily_sales_items"), get_data_version("daily_close"),
+        ).copy()
     except Exception as e:
         st.error(f"재료 사용금액 계산 중 오류: {e}")
-        return pd.DataFrame(columns=['재료명', '총_사용금액', '원가_비중_%', '연결_메뉴_수', '연결_메뉴_목록'])
+        return empty_usage()
 
 
 def calculate_cost_concentration(ingredient_usage_df: pd.DataFrame) -> Tuple[float, float]:
@@ -120,20 +53,7 @@ def calculate_cost_concentration(ingredient_usage_df: pd.DataFrame) -> Tuple[flo
     Returns:
         (top3_concentration: float, top5_concentration: float) - 비율 (%)
     """
-    if ingredient_usage_df.empty:
-        return 0.0, 0.0
-    
-    total_cost = ingredient_usage_df['총_사용금액'].sum()
-    if total_cost == 0:
-        return 0.0, 0.0
-    
-    top3_cost = ingredient_usage_df.head(3)['총_사용금액'].sum()
-    top5_cost = ingredient_usage_df.head(5)['총_사용금액'].sum()
-    
-    top3_pct = (top3_cost / total_cost * 100) if total_cost > 0 else 0.0
-    top5_pct = (top5_cost / total_cost * 100) if total_cost > 0 else 0.0
-    
-    return top3_pct, top5_pct
+    return cost_concentration(ingredient_usage_df)
 
 
 def identify_high_risk_ingredients(ingredient_usage_df: pd.DataFrame, cost_threshold: float = 20.0, menu_threshold: int = 3) -> pd.DataFrame:
@@ -151,41 +71,7 @@ def identify_high_risk_ingredients(ingredient_usage_df: pd.DataFrame, cost_thres
     Returns:
         고위험 재료 DataFrame
     """
-    if ingredient_usage_df.empty:
-        return pd.DataFrame(columns=['재료명', '총_사용금액', '원가_비중_%', '연결_메뉴_수', '연결_메뉴_목록', '위험_사유'])
-    
-    # 원가 비중 상위 threshold% 계산
-    total_cost = ingredient_usage_df['총_사용금액'].sum()
-    threshold_cost = total_cost * (cost_threshold / 100.0)
-    
-    cumulative_cost = 0.0
-    top_ingredients = []
-    
-    for _, row in ingredient_usage_df.iterrows():
-        cumulative_cost += row['총_사용금액']
-        if cumulative_cost <= threshold_cost:
-            top_ingredients.append(row['재료명'])
-        else:
-            break
-    
-    # 고위험 재료 필터링
-    high_risk = ingredient_usage_df[
-        (ingredient_usage_df['재료명'].isin(top_ingredients)) &
-        (ingredient_usage_df['연결_메뉴_수'] >= menu_threshold)
-    ].copy()
-    
-    # 위험 사유 추가
-    def get_risk_reason(row):
-        reasons = []
-        if row['원가_비중_%'] >= cost_threshold:
-            reasons.append(f"원가 비중 {row['원가_비중_%']:.1f}%")
-        if row['연결_메뉴_수'] >= menu_threshold:
-            reasons.append(f"연결 메뉴 {row['연결_메뉴_수']}개")
-        return " / ".join(reasons) if reasons else "기타"
-    
-    high_risk['위험_사유'] = high_risk.apply(get_risk_reason, axis=1)
-    
-    return high_risk
+    return flag_high_risk(ingredient_usage_df, cost_threshold, menu_threshold)
 
 
 def check_order_structure_status(store_id: str) -> Tuple[str, str]:
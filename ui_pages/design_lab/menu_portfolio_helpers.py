@@ -4,25 +4,124 @@
 from __future__ import annotations
 
 import streamlit as st
+import numpy as np
 import pandas as pd
+from dataclasses import dataclass, field, replace
 from typing import Dict, List, Tuple
 
+from src.utils.cache_tokens import get_data_version
+
+
+ROLE_OPTIONS = ("미끼", "볼륨", "마진")
+CATEGORY_OPTIONS = ("대표메뉴", "주력메뉴", "유인메뉴", "보조메뉴", "기타메뉴")
+
+
+@dataclass(frozen=True)
+class MenuIndex:
+    """
+    메뉴 인덱스 (메뉴명 ↔ menu_id, 메뉴 순서대로 역할/카테고리 배열)
+
+    roles / categories: DB 값 (없으면 None)
+    """
+    names: np.ndarray
+    ids: np.ndarray
+    roles: np.ndarray
+    categories: np.ndarray
+    has_category: bool = False
+    id_by_name: Dict[str, str] = field(default_factory=dict, repr=False)
+    name_by_id: Dict[str, str] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def build(cls, menu_df: pd.DataFrame, role_tags_by_id: Dict[str, str]) -> "MenuIndex":
+        if menu_df is None or menu_df.empty or '메뉴명' not in menu_df.columns:
+            empty = np.array([], dtype=object)
+            return cls(empty, empty, empty, empty)
+        menus = menu_df[menu_df['메뉴명'].notna() & (menu_df['메뉴명'] != '')]
+        names = menus['메뉴명'].astype(str).to_numpy(dtype=object)
+        ids = menus['id'].to_numpy(dtype=object) if 'id' in menus.columns else np.full(len(names), None, dtype=object)
+        category_col = 'category' if 'category' in menus.columns else '카테고리' if '카테고리' in menus.columns else None
+        categories = menus[category_col].to_numpy(dtype=object) if category_col else np.full(len(names), None, dtype=object)
+        roles = pd.Series(ids, dtype=object).map(role_tags_by_id or {}).to_numpy(dtype=object)
+        id_by_name = {name: menu_id for name, menu_id in zip(names, ids) if menu_id}
+        return cls(
+            names=names,
+            ids=ids,
+            roles=np.where(pd.isna(roles), None, roles),
+            categories=np.where(pd.isna(categories), None, categories),
+            has_category=category_col is not None,
+            id_by_name=id_by_name,
+            name_by_id={menu_id: name for name, menu_id in id_by_name.items()},
+        )
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def role_map(self) -> Dict[str, str]:
+        """{메뉴명: 역할} (DB에 태그가 있는 메뉴만)"""
+        return {name: role for name, role in zip(self.names, self.roles) if role}
+
+    def category_map(self) -> Dict[str, str]:
+        """{메뉴명: 카테고리} (카테고리 컬럼이 있으면 전 메뉴)"""
+        if not self.has_category:
+            return {}
+        return dict(zip(self.names, self.categories))
+
+    def with_overrides(self, roles: Dict[str, str] = None, categories: Dict[str, str] = None) -> "MenuIndex":
+        """session_state 분류를 덮어쓴 인덱스 (원본 불변)"""
+        new_roles, new_categories = self.roles, self.categories
+        if roles:
+            new_roles = pd.Series(self.names, dtype=object).map(roles).to_numpy(dtype=object)
+            new_roles = np.where(pd.isna(new_roles), self.roles, new_roles)
+        if categories:
+            new_categories = pd.Series(self.names, dtype=object).map(categories).to_numpy(dtype=object)
+            new_categories = np.where(pd.isna(new_categories), self.categories, new_categories)
+        return replace(self, roles=new_roles, categories=new_categories, has_category=self.has_category or bool(categories))
+
+    def counts(self) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """(역할 분포, 카테고리 분포) - 미분류 포함"""
+        return _portfolio_counts(self.roles, self.categories)
+
+    def balance_score(self) -> Tuple[int, str]:
+        """포트폴리오 균형 점수 (calculate_portfolio_balance_score 와 같은 기준)"""
+        role_counts, category_counts = self.counts()
+        return _balance_score(len(self), role_counts, category_counts)
+
+    def verdict(self, avg_price: float) -> Tuple[str, str, str]:
+        """포트폴리오 판결문 (get_portfolio_verdict 와 같은 기준)"""
+        role_counts, category_counts = self.counts()
+        return _portfolio_verdict(len(self), role_counts, category_counts, avg_price)
+
+
+@st.cache_data(ttl=300)
+def _load_menu_index(store_id: str, v_menus: int, v_menu_roles: int) -> MenuIndex:
+    """메뉴 인덱스 로드 (캐시됨, version_token 기반)"""
+    from src.storage_supabase import load_csv, load_menu_role_tags
+    menu_df = load_csv('menu_master.csv', store_id=store_id, default_columns=['메뉴명', '판매가'])
+    return MenuIndex.build(menu_df, load_menu_role_tags(store_id))
+
+
+def get_menu_index(store_id: str, with_session: bool = True) -> MenuIndex:
+    """
+    메뉴 인덱스 조회 (메뉴/역할 태그 버전별 캐시)
+
+    with_session: session_state 분류 반영 (역할은 DB 태그가 하나도 없을 때만, 카테고리는 항상 우선)
+    """
+    index = _load_menu_index(store_id, get_data_version("menus"), get_data_version("menu_roles"))
+    if not with_session:
+        return index
+    session_roles = st.session_state.get(f"menu_portfolio_tags::{store_id}", {})
+    session_categories = st.session_state.get(f"menu_portfolio_categories::{store_id}", {})
+    if not session_categories and (not session_roles or any(index.roles)):
+        return index
+    return index.with_overrides(
+        roles=session_roles if not any(index.roles) else None,
+        categories=session_categories,
+    )
+
 
 def _get_menu_id_map(store_id: str) -> Dict[str, str]:
-    """메뉴명 -> menu_id 매핑 생성 (캐시)"""
-    cache_key = f"menu_id_map::{store_id}"
-    if cache_key not in st.session_state:
-        from src.storage_supabase import load_csv
-        menu_df = load_csv('menu_master.csv', store_id=store_id, default_columns=['메뉴명', '판매가'])
-        menu_id_map = {}
-        if not menu_df.empty and 'id' in menu_df.columns:
-            for _, row in menu_df.iterrows():
-                menu_name = row.get('메뉴명', '')
-                menu_id = row.get('id', '')
-                if menu_name and menu_id:
-                    menu_id_map[menu_name] = menu_id
-        st.session_state[cache_key] = menu_id_map
-    return st.session_state.get(cache_key, {})
+    """메뉴명 -> menu_id 매핑 (MenuIndex)"""
+    return get_menu_index(store_id, with_session=False).id_by_name
 
 
 def get_menu_portfolio_tags(store_id: str) -> Dict[str, str]:
@@ -35,31 +134,60 @@ def get_menu_portfolio_tags(store_id: str) -> Dict[str, str]:
     if not store_id:
         return {}
     
-    # DB에서 로드
-    from src.storage_supabase import load_menu_role_tags
-    db_tags_by_id = load_menu_role_tags(store_id)
-    
-    # menu_id -> menu_name 변환
-    menu_id_map = _get_menu_id_map(store_id)
-    menu_name_map = {v: k for k, v in menu_id_map.items()}  # 역매핑
-    
-    # DB 결과를 menu_name 기준으로 변환
-    db_tags = {}
-    for menu_id, role_tag in db_tags_by_id.items():
-        menu_name = menu_name_map.get(menu_id)
-        if menu_name and role_tag:
-            db_tags[menu_name] = role_tag
+    db_tags = get_menu_index(store_id, with_session=False).role_map()
     
     # session_state 캐시 업데이트 (동기화)
     cache_key = f"menu_portfolio_tags::{store_id}"
     if db_tags:
         st.session_state[cache_key] = db_tags
-    
-    # DB 데이터가 있으면 반환, 없으면 session_state 폴백
-    if db_tags:
         return db_tags
-    else:
-        return st.session_state.get(cache_key, {})
+    return st.session_state.get(cache_key, {})
+
+
+def set_menu_portfolio_assignments(store_id: str, roles: Dict[str, str] = None, categories: Dict[str, str] = None) -> bool:
+    """
+    메뉴 역할/카테고리 일괄 저장 (역할 upsert 1회 + 카테고리별 update 1회)
+    
+    Args:
+        roles: {menu_name: role_tag}
+        categories: {menu_name: category}
+    
+    Returns:
+        bool: DB 저장 성공 여부 (실패/ID 없는 메뉴는 session_state에만 저장)
+    """
+    if not store_id or not (roles or categories):
+        return False
+    
+    from src.storage_supabase import update_menu_categories, upsert_menu_role_tags
+    id_by_name = _get_menu_id_map(store_id)
+    ok = True
+    
+    if roles:
+        # DB 성공 여부와 관계없이 session_state에도 저장 (동기화/폴백)
+        tag_key = f"menu_portfolio_tags::{store_id}"
+        st.session_state.setdefault(tag_key, {}).update(roles)
+        tags_by_id = {id_by_name[name]: role for name, role in roles.items() if name in id_by_name}
+        missing = [name for name in roles if name not in id_by_name]
+        if tags_by_id and not upsert_menu_role_tags(store_id, tags_by_id):
+            ok = False
+            if _is_dev_mode():
+                st.warning(f"DB 저장 실패, session_state에만 저장했습니다: {', '.join(roles)}")
+        if missing:
+            ok = False
+            if _is_dev_mode():
+                st.warning(f"메뉴 ID를 찾을 수 없어 session_state에만 저장했습니다: {', '.join(missing)}")
+    
+    if categories:
+        category_key = f"menu_portfolio_categories::{store_id}"
+        st.session_state.setdefault(category_key, {}).update(categories)
+        categories_by_id = {id_by_name[name]: c for name, c in categories.items() if name in id_by_name}
+        # DB 업데이트 실패해도 session_state는 저장됨
+        if not categories_by_id or not update_menu_categories(store_id, categories_by_id):
+            ok = False
+    
+    # 버전 토큰은 세션 단위이므로 다른 세션도 새 분류를 읽도록 인덱스 캐시 비움
+    _load_menu_index.clear()
+    return ok
 
 
 def set_menu_portfolio_tag(store_id: str, menu_name: str, role: str):
@@ -68,41 +196,7 @@ def set_menu_portfolio_tag(store_id: str, menu_name: str, role: str):
     """
     if not store_id or not menu_name:
         return
-    
-    # menu_id 찾기
-    menu_id_map = _get_menu_id_map(store_id)
-    menu_id = menu_id_map.get(menu_name)
-    
-    if not menu_id:
-        # menu_id를 찾을 수 없으면 session_state만 저장
-        cache_key = f"menu_portfolio_tags::{store_id}"
-        if cache_key not in st.session_state:
-            st.session_state[cache_key] = {}
-        st.session_state[cache_key][menu_name] = role
-        if _is_dev_mode():
-            st.warning(f"메뉴 ID를 찾을 수 없어 session_state에만 저장했습니다: {menu_name}")
-        return
-    
-    # DB에 저장 시도
-    from src.storage_supabase import upsert_menu_role_tag
-    success = upsert_menu_role_tag(store_id, menu_id, role)
-    
-    if success:
-        # 성공 시 session_state도 업데이트 (동기화)
-        cache_key = f"menu_portfolio_tags::{store_id}"
-        if cache_key not in st.session_state:
-            st.session_state[cache_key] = {}
-        st.session_state[cache_key][menu_name] = role
-    else:
-        # 실패 시 session_state만 저장 (폴백)
-        cache_key = f"menu_portfolio_tags::{store_id}"
-        if cache_key not in st.session_state:
-            st.session_state[cache_key] = {}
-        st.session_state[cache_key][menu_name] = role
-        if _is_dev_mode():
-            from src.auth import is_dev_mode as _is_dev_mode
-            if _is_dev_mode():
-                st.warning(f"DB 저장 실패, session_state에만 저장했습니다: {menu_name}")
+    set_menu_portfolio_assignments(store_id, roles={menu_name: role})
 
 
 def _is_dev_mode():
@@ -115,51 +209,35 @@ def _is_dev_mode():
 
 
 def get_menu_portfolio_categories(store_id: str) -> Dict[str, str]:
-    """메뉴별 카테고리 조회 (session_state, DB에서도 로드)"""
-    # DB에서 먼저 로드
-    from src.storage_supabase import load_csv
-    menu_df = load_csv('menu_master.csv', store_id=store_id, default_columns=['메뉴명', '판매가'])
-    
-    categories = {}
-    if not menu_df.empty:
-        if 'category' in menu_df.columns:
-            for _, row in menu_df.iterrows():
-                menu_name = row.get('메뉴명', '')
-                category = row.get('category', '기타메뉴')
-                if menu_name:
-                    categories[menu_name] = category
-        elif '카테고리' in menu_df.columns:
-            for _, row in menu_df.iterrows():
-                menu_name = row.get('메뉴명', '')
-                category = row.get('카테고리', '기타메뉴')
-                if menu_name:
-                    categories[menu_name] = category
-    
-    # session_state에서도 로드 (포트폴리오 분류용)
-    key = f"menu_portfolio_categories::{store_id}"
-    session_categories = st.session_state.get(key, {})
+    """메뉴별 카테고리 조회 (DB + session_state, session_state 우선)"""
+    categories = get_menu_index(store_id, with_session=False).category_map()
     
     # session_state 우선 (포트폴리오 분류가 최신)
-    for menu_name, category in session_categories.items():
-        categories[menu_name] = category
-    
+    categories.update(st.session_state.get(f"menu_portfolio_categories::{store_id}", {}))
     return categories
 
 
 def set_menu_portfolio_category(store_id: str, menu_name: str, category: str):
     """메뉴 카테고리 저장 (session_state, DB도 업데이트)"""
-    # session_state 저장
-    key = f"menu_portfolio_categories::{store_id}"
-    if key not in st.session_state:
-        st.session_state[key] = {}
-    st.session_state[key][menu_name] = category
-    
-    # DB도 업데이트 (기존 함수 사용)
-    from src.storage_supabase import update_menu_category
-    try:
-        update_menu_category(menu_name, category)
-    except Exception:
-        pass  # DB 업데이트 실패해도 session_state는 저장됨
+    if not menu_name:
+        return
+    set_menu_portfolio_assignments(store_id, categories={menu_name: category})
+
+
+def _portfolio_counts(roles, categories) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """메뉴 순서 배열 → (역할 분포, 카테고리 분포), 알 수 없는 값/None은 미분류"""
+    role_values = pd.Series(roles, dtype=object)
+    role_values = role_values.where(role_values.isin(ROLE_OPTIONS), "미분류").value_counts()
+    category_values = pd.Series(categories, dtype=object)
+    category_values = category_values.where(category_values.isin(CATEGORY_OPTIONS), "미분류").value_counts()
+    role_counts = {key: int(role_values.get(key, 0)) for key in ROLE_OPTIONS + ("미분류",)}
+    category_counts = {key: int(category_values.get(key, 0)) for key in CATEGORY_OPTIONS + ("미분류",)}
+    return role_counts, category_counts
+
+
+def _counts_for_menus(menu_df: pd.DataFrame, roles: Dict[str, str], categories: Dict[str, str]) -> Tuple[Dict[str, int], Dict[str, int]]:
+    names = menu_df['메뉴명']
+    return _portfolio_counts(names.map(roles).to_numpy(dtype=object), names.map(categories).to_numpy(dtype=object))
 
 
 def calculate_portfolio_balance_score(menu_df: pd.DataFrame, roles: Dict[str, str], categories: Dict[str, str]) -> Tuple[int, str]:
@@ -172,26 +250,11 @@ def calculate_portfolio_balance_score(menu_df: pd.DataFrame, roles: Dict[str, st
     """
     if menu_df.empty:
         return 0, "위험"
-    
-    # 역할 분포
-    role_counts = {"미끼": 0, "볼륨": 0, "마진": 0, "미분류": 0}
-    for menu_name in menu_df['메뉴명'].tolist():
-        role = roles.get(menu_name, "미분류")
-        if role in role_counts:
-            role_counts[role] += 1
-        else:
-            role_counts["미분류"] += 1
-    
-    # 카테고리 분포
-    category_counts = {"대표메뉴": 0, "주력메뉴": 0, "유인메뉴": 0, "보조메뉴": 0, "기타메뉴": 0, "미분류": 0}
-    for menu_name in menu_df['메뉴명'].tolist():
-        category = categories.get(menu_name, "미분류")
-        if category in category_counts:
-            category_counts[category] += 1
-        else:
-            category_counts["미분류"] += 1
-    
-    total_menus = len(menu_df)
+    role_counts, category_counts = _counts_for_menus(menu_df, roles, categories)
+    return _balance_score(len(menu_df), role_counts, category_counts)
+
+
+def _balance_score(total_menus: int, role_counts: Dict[str, int], category_counts: Dict[str, int]) -> Tuple[int, str]:
     if total_menus == 0:
         return 0, "위험"
     
@@ -252,23 +315,15 @@ def get_portfolio_verdict(menu_df: pd.DataFrame, roles: Dict[str, str], categori
         (verdict_text: str, action_title: str, action_target_page: str)
     """
     if menu_df.empty:
+        return _portfolio_verdict(0, {}, {}, avg_price)
+    role_counts, category_counts = _counts_for_menus(menu_df, roles, categories)
+    return _portfolio_verdict(len(menu_df), role_counts, category_counts, avg_price)
+
+
+def _portfolio_verdict(total_menus: int, role_counts: Dict[str, int], category_counts: Dict[str, int], avg_price: float) -> Tuple[str, str, str]:
+    if total_menus == 0:
         return "메뉴가 등록되지 않았습니다. 메뉴를 등록하면 포트폴리오 분석이 시작됩니다.", "메뉴 등록 시작하기", "메뉴 등록"
     
-    total_menus = len(menu_df)
-    role_counts = {"미끼": 0, "볼륨": 0, "마진": 0, "미분류": 0}
-    for menu_name in menu_df['메뉴명'].tolist():
-        role = roles.get(menu_name, "미분류")
-        if role in role_counts:
-            role_counts[role] += 1
-        else:
-            role_counts["미분류"] += 1
-    
-    category_counts = {"대표메뉴": 0, "주력메뉴": 0, "유인메뉴": 0, "보조메뉴": 0, "기타메뉴": 0}
-    for menu_name in menu_df['메뉴명'].tolist():
-        category = categories.get(menu_name, "기타메뉴")
-        if category in category_counts:
-            category_counts[category] += 1
-    
     # 판결 우선순위
     if category_counts["유인메뉴"] == 0 and total_menus >= 5:
         return "유인메뉴가 부족해 객단가 상승 장치가 약합니다.", "메뉴 수익 구조 설계실", "메뉴 수익 구조 설계실"
@@ -13,10 +13,9 @@ from typing import Dict, List, Tuple, Optional
 
 from src.bootstrap import bootstrap
 from src.ui_helpers import render_page_header
-from src.storage_supabase import (
-    load_best_available_daily_sales,
-    load_csv,
-)
+from src.storage_supabase import load_csv
+from core.timeseries_engine import METRIC_SALES, get_daily_series
+from core.change_point import get_change_point_summary
 from src.auth import get_current_store_id, is_dev_mode
 from ui_pages.design_lab.design_insights import get_design_insights
 
@@ -112,14 +111,11 @@ def _analyze_when_dropped(
 ) -> Optional[Dict]:
     """STEP 1: 언제부터 떨어졌나?"""
     try:
-        # 매출 데이터 로드 (SSOT best_available)
-        sales_df = load_best_available_daily_sales(store_id=store_id, start_date=start_date, end_date=end_date)
-        if sales_df.empty:
+        # 매출 데이터 로드 (SSOT best_available, 공용 시계열)
+        series = get_daily_series(store_id, start_date, end_date)
+        if series.empty:
             return None
         
-        sales_df['date'] = pd.to_datetime(sales_df['date']).dt.date
-        sales_df = sales_df.sort_values('date')
-        
         # 기간 구분
         recent_end = base_date
         recent_start = base_date - timedelta(days=period_days - 1)
@@ -133,45 +129,29 @@ def _analyze_when_dropped(
             compare_start = recent_start - timedelta(days=28)
             compare_end = recent_end - timedelta(days=28)
         
-        # 최근 구간
-        recent_df = sales_df[
-            (sales_df['date'] >= recent_start) & 
-            (sales_df['date'] <= recent_end)
-        ].copy()
-        
-        # 비교 구간
-        compare_df = sales_df[
-            (sales_df['date'] >= compare_start) & 
-            (sales_df['date'] <= compare_end)
-        ].copy()
-        
-        if recent_df.empty or compare_df.empty:
+        if series.count(recent_start, recent_end) == 0 or series.count(compare_start, compare_end) == 0:
             return None
         
+        # 최근 구간 / 비교 구간
+        recent_df = series.slice(recent_start, recent_end)
+        compare_df = series.slice(compare_start, compare_end)
+        
         # 평균 매출 계산
-        recent_avg = recent_df['total_sales'].mean() if 'total_sales' in recent_df.columns else 0
-        compare_avg = compare_df['total_sales'].mean() if 'total_sales' in compare_df.columns else 0
+        recent_avg = series.mean(METRIC_SALES, recent_start, recent_end) or 0
+        compare_avg = series.mean(METRIC_SALES, compare_start, compare_end) or 0
         
         # 변화율/변화액
         change_pct = ((recent_avg - compare_avg) / compare_avg * 100) if compare_avg > 0 else 0
         change_amount = recent_avg - compare_avg
         
         # 하락 시작점 추정 (rolling avg가 baseline 아래로 지속 3일 연속)
-        recent_df['rolling_avg'] = recent_df['total_sales'].rolling(window=3, min_periods=1).mean()
-        drop_start_date = None
-        for i in range(2, len(recent_df)):
-            if recent_df.iloc[i]['rolling_avg'] < compare_avg:
-                # 3일 연속 확인
-                if (recent_df.iloc[i-2]['rolling_avg'] < compare_avg and
-                    recent_df.iloc[i-1]['rolling_avg'] < compare_avg):
-                    drop_start_date = recent_df.iloc[i-2]['date']
-                    break
+        recent_df['rolling_avg'] = series.rolling_rows_mean(METRIC_SALES, recent_start, recent_end, k=3)
+        drop_start_date = series.first_sustained_below(METRIC_SALES, recent_start, recent_end, compare_avg, run=3, k=3)
         
         # 최근 추세 (최근 3일 vs 그 전 3일)
         if len(recent_df) >= 6:
-            last_3_avg = recent_df.tail(3)['total_sales'].mean()
-            prev_3_avg = recent_df.iloc[-6:-3]['total_sales'].mean()
-            trend_pct = ((last_3_avg - prev_3_avg) / prev_3_avg * 100) if prev_3_avg > 0 else 0
+            prev_3_avg, last_3_avg = series.last_two_blocks(METRIC_SALES, recent_start, recent_end, k=3)
+            trend_pct = ((last_3_avg - prev_3_avg) / prev_3_avg * 100) if prev_3_avg and prev_3_avg > 0 else 0
         else:
             trend_pct = 0
         
@@ -182,6 +162,7 @@ def _analyze_when_dropped(
             "change_amount": change_amount,
             "drop_start_date": drop_start_date,
             "trend_pct": trend_pct,
+            "change_point": get_change_point_summary(store_id),
             "recent_df": recent_df,
             "compare_df": compare_df,
             "recent_start": recent_start,
@@ -490,8 +471,19 @@ def _render_step1_result(step1_result: Dict, compare_mode: str):
             delta=f"{change_pct:.1f}%"
         )
     
-    # 하락 시작점
-    if drop_start_date:
+    # 하락 시작점 (변화점 감지 시작일이 선택한 분석 기간 안이면 우선, 아니면 기간 내 추정일)
+    change_point = step1_result.get("change_point") or {}
+    cp_start = change_point.get("drop_start_date")
+    window_start = step1_result.get("compare_start")
+    window_end = step1_result.get("recent_end")
+    if cp_start and window_start and window_end and window_start <= cp_start <= window_end:
+        magnitude = change_point.get("drop_magnitude_pct") or 0
+        label = "하락 감지" if change_point.get("alarm") else "하락 조짐"
+        st.info(
+            f"📅 {label}: {change_point['drop_start_date']}부터 {change_point['run_days']}일간 "
+            f"평소 요일 매출 대비 평균 {magnitude:.1f}%"
+        )
+    elif drop_start_date:
         st.info(f"📅 하락 시작 추정일: {drop_start_date}")
     
     # 최근 추세
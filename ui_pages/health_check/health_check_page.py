@@ -35,13 +35,18 @@ from src.health_check.questions_bank import (
     CATEGORY_LABELS,
     QUESTIONS
 )
+from src.health_check.answer_store import AnswerStore, CATEGORY_TOTALS
 
 logger = logging.getLogger(__name__)
 
 # 상수
 MIN_COMPLETION_RATIO = 0.8  # 완료 가능 최소 비율 (80%)
 TOTAL_QUESTIONS = 90  # 전체 문항 수
-AUTO_SAVE_DELAY = 2.0  # 자동 저장 지연 시간 (초)
+AUTO_SAVE_DELAY = 2.0  # 자동 저장 지연 시간 (초, 마지막 변경 후 이 시간 동안 추가 변경이 없으면 일괄 저장)
+
+ANSWER_STORE_KEY = "qsc_store"
+# 체크 입력 상태 키 (초기화 시 이 목록만 제거, 버튼 위젯 키는 session_id 포함이라 세션 간 충돌 없음)
+_STATE_KEYS = (ANSWER_STORE_KEY, "qsc_last_save_time", "qsc_category_filter", "qsc_search")
 
 
 def render_health_check_page():
@@ -131,18 +136,9 @@ def render_health_check_page():
 
 
 def _clear_session_state():
-    """세션 상태 초기화"""
-    keys_to_remove = []
-    for key in list(st.session_state.keys()):
-        if (key.startswith("hc_") or 
-            key.startswith("qsc_") or
-            key.startswith("answer_") or 
-            key.startswith("q_") or 
-            key.startswith("health_check_answer_count_")):
-            keys_to_remove.append(key)
-    for key in keys_to_remove:
-        if key in st.session_state:
-            del st.session_state[key]
+    """세션 상태 초기화 (알려진 키만 제거)"""
+    for key in _STATE_KEYS:
+        st.session_state.pop(key, None)
 
 
 def render_start_screen(store_id: str):
@@ -179,104 +175,79 @@ def render_start_screen(store_id: str):
                     """)
 
 
-def _initialize_health_check_state(store_id: str, session_id: str):
-    """매장 체크리스트 session_state 초기화 (초기 1회만 DB 로드)"""
-    hc_loaded_key = "qsc_loaded_session_id"
-    hc_answers_key = "qsc_answers"
-    hc_dirty_key = "qsc_dirty"
-    
-    # 세션이 변경되었거나 처음 로드하는 경우
-    current_loaded = st.session_state.get(hc_loaded_key)
-    if current_loaded != session_id:
-        # 기존 답변 상태 초기화
-        st.session_state[hc_answers_key] = {}
-        st.session_state[hc_dirty_key] = set()
-        
-        # 기존 session_state 키들 정리
-        keys_to_remove = []
-        for key in st.session_state.keys():
-            if (key.startswith("qsc_btn_") or 
-                key.startswith("answer_") or 
-                key.startswith("q_") or 
-                key.startswith("health_check_answer_count_")):
-                keys_to_remove.append(key)
-        for key in keys_to_remove:
-            if key in st.session_state:
-                del st.session_state[key]
-        
-        # DB에서 기존 답변 로드 (초기 1회만)
+def _initialize_health_check_state(store_id: str, session_id: str) -> AnswerStore:
+    """체크 답변 저장소 (세션이 바뀔 때만 DB에서 1회 로드)"""
+    store = st.session_state.get(ANSWER_STORE_KEY)
+    if store is None or store.session_id != session_id:
         try:
-            existing_answers = get_health_answers(session_id)
-            for ans in existing_answers:
-                category = ans.get('category')
-                question_code = ans.get('question_code')
-                raw_value = ans.get('raw_value')
-                if category and question_code and raw_value:
-                    key = (category, question_code)
-                    st.session_state[hc_answers_key][key] = raw_value
+            store = AnswerStore.from_rows(session_id, get_health_answers(session_id))
         except Exception as e:
             logger.error(f"Error loading answers: {e}")
-        
-        # 로드 완료 표시
-        st.session_state[hc_loaded_key] = session_id
+            store = AnswerStore(session_id)
+        st.session_state[ANSWER_STORE_KEY] = store
+    return store
 
 
-def _save_answers_batch(store_id: str, session_id: str) -> tuple[bool, Optional[str]]:
-    """dirty 답변 일괄 저장"""
-    hc_answers_key = "qsc_answers"
-    hc_dirty_key = "qsc_dirty"
-    
-    dirty = st.session_state.get(hc_dirty_key, set())
-    if not dirty:
+def _save_answers_batch(store_id: str, session_id: str, force: bool = True) -> tuple[bool, Optional[str]]:
+    """
+    dirty 답변 일괄 저장 (upsert 1회)
+    
+    force=False: 마지막 변경 후 AUTO_SAVE_DELAY가 지났을 때만 저장 (자동 저장 debounce)
+    """
+    store = st.session_state.get(ANSWER_STORE_KEY)
+    if store is None or store.session_id != session_id or not store.dirty_count:
+        return True, None
+    if not force and not store.is_due(AUTO_SAVE_DELAY):
         return True, None
     
-    answers = st.session_state.get(hc_answers_key, {})
-    rows = []
-    for (category, question_code) in dirty:
-        raw_value = answers.get((category, question_code))
-        if raw_value and raw_value in ["yes", "maybe", "no"]:
-            rows.append({
-                "category": category,
-                "question_code": question_code,
-                "raw_value": raw_value
-            })
-    
+    indices, rows = store.dirty_rows()
     if not rows:
         return True, None
     
     success, error_msg = upsert_health_answers_batch(store_id, session_id, rows)
     if success:
-        st.session_state[hc_dirty_key] = set()
+        store.mark_saved(indices)
+        st.session_state['qsc_last_save_time'] = store.last_save_at
+    else:
+        logger.warning(f"Auto-save failed ({len(rows)} answers): {error_msg}")
     return success, error_msg
 
 
+@st.fragment(run_every=AUTO_SAVE_DELAY)
+def _render_autosave_status(store_id: str, session_id: str):
+    """자동 저장 (AUTO_SAVE_DELAY마다 dirty 확인 → debounce 후 일괄 저장) + 저장 상태 표시"""
+    _save_answers_batch(store_id, session_id, force=False)
+    
+    store = st.session_state.get(ANSWER_STORE_KEY)
+    dirty_count = store.dirty_count if store is not None else 0
+    if dirty_count > 0:
+        ps_inline_feedback("warning", f"💾 저장 대기 중인 변경: {dirty_count}개 (자동 저장)")
+    else:
+        ps_inline_feedback("success", "✅ 모든 변경사항이 저장되었습니다.")
+    
+    last_save_time = st.session_state.get('qsc_last_save_time')
+    if last_save_time:
+        st.caption(f"마지막 저장: {datetime.fromtimestamp(last_save_time).strftime('%Y-%m-%d %H:%M:%S')}")
+
+
 def render_input_form_redesigned(store_id: str, session_id: str):
     """입력 폼 렌더링 (Phase 3: FormKit v2 + 블록 리듬)"""
-    # session_state 초기화 (초기 1회만 DB 로드)
-    _initialize_health_check_state(store_id, session_id)
+    # 답변 저장소 (초기 1회만 DB 로드)
+    store = _initialize_health_check_state(store_id, session_id)
+    # 이전 rerun에서 debounce가 지난 변경이 있으면 저장
+    _save_answers_batch(store_id, session_id, force=False)
     
-    hc_answers_key = "qsc_answers"
-    hc_dirty_key = "qsc_dirty"
-    
-    # 답변 개수 계산
-    answers = st.session_state.get(hc_answers_key, {})
-    valid_values = ["yes", "maybe", "no"]
-    answered_count = len([v for v in answers.values() if v in valid_values])
-    dirty_count = len(st.session_state.get(hc_dirty_key, set()))
+    # 답변 개수 계산 (배열 연산)
+    answered_count = store.answered_count
+    dirty_count = store.dirty_count
     
     # 영역별 진행률 계산
     category_progress = {}
-    for category in CATEGORIES_ORDER:
-        category_questions = QUESTIONS.get(category, [])
-        category_answered = 0
-        for q in category_questions:
-            key = (category, q['code'])
-            if answers.get(key) in valid_values:
-                category_answered += 1
+    for category, category_answered, total in zip(CATEGORIES_ORDER, store.category_answered().values(), CATEGORY_TOTALS.tolist()):
         category_progress[category] = {
             'answered': category_answered,
-            'total': len(category_questions),
-            'ratio': category_answered / len(category_questions) if len(category_questions) > 0 else 0
+            'total': total,
+            'ratio': category_answered / total if total > 0 else 0
         }
     
     # 진행률 계산
@@ -384,22 +355,15 @@ def render_input_form_redesigned(store_id: str, session_id: str):
     # GuideBox 내용 (입력 도구 톤)
     guide_conclusion = "9개 영역(Q, S, C, P1, P2, P3, M, H, F)에 대해 각 10문항씩 총 90문항을 답변하세요"
     guide_bullets = [
-        "답변은 자동 저장됩니다 (버튼 클릭 시 즉시 저장)",
+        f"답변은 자동 저장됩니다 (마지막 선택 후 {AUTO_SAVE_DELAY:.0f}초 안에 모아서 저장)",
         "최소 60개 문항을 답변하면 완료할 수 있습니다"
     ]
     guide_next_action = "완료 후 결과 리포트에서 상세 분석을 확인하세요"
     
     # Main Content 렌더링 함수
     def render_main_content():
-        # 진행 상황 피드백
-        if dirty_count > 0:
-            ps_inline_feedback("warning", f"💾 저장되지 않은 변경: {dirty_count}개")
-        else:
-            ps_inline_feedback("success", "✅ 모든 변경사항이 저장되었습니다.")
-        
-        last_save_time = st.session_state.get('qsc_last_save_time')
-        if last_save_time:
-            st.caption(f"마지막 저장: {datetime.fromtimestamp(last_save_time).strftime('%Y-%m-%d %H:%M:%S')}")
+        # 진행 상황 피드백 + 자동 저장 (fragment: 전체 rerun 없이 주기 실행)
+        _render_autosave_status(store_id, session_id)
         
         # 진행률 바
         st.progress(min(progress_ratio, 1.0))
@@ -522,13 +486,10 @@ def render_input_form_redesigned(store_id: str, session_id: str):
 
 def render_question_buttons(store_id: str, session_id: str, category: str, question_code: str, question_text: str):
     """질문별 버튼 그리드 렌더링"""
-    hc_answers_key = "qsc_answers"
-    hc_dirty_key = "qsc_dirty"
+    store = _initialize_health_check_state(store_id, session_id)
     
     # 현재 답변 가져오기
-    key = (category, question_code)
-    answers = st.session_state.get(hc_answers_key, {})
-    current_value = answers.get(key)
+    current_value = store.get(category, question_code)
     
     # 버튼 옵션
     options = [
@@ -557,31 +518,8 @@ def render_question_buttons(store_id: str, session_id: str, category: str, quest
                 type=button_type,
                 use_container_width=True
             ):
-                # 답변 업데이트
-                if hc_answers_key not in st.session_state:
-                    st.session_state[hc_answers_key] = {}
-                st.session_state[hc_answers_key][key] = raw_value
-                
-                # dirty에 추가
-                if hc_dirty_key not in st.session_state:
-                    st.session_state[hc_dirty_key] = set()
-                st.session_state[hc_dirty_key].add(key)
-                
-                # 즉시 저장 (단일 답변)
-                try:
-                    rows = [{
-                        "category": category,
-                        "question_code": question_code,
-                        "raw_value": raw_value
-                    }]
-                    success, error_msg = upsert_health_answers_batch(store_id, session_id, rows)
-                    if success:
-                        st.session_state[hc_dirty_key].discard(key)
-                        st.session_state['qsc_last_save_time'] = time.time()
-                    else:
-                        logger.warning(f"Auto-save failed for {question_code}: {error_msg}")
-                except Exception as e:
-                    logger.error(f"Auto-save error for {question_code}: {e}")
+                # 답변 업데이트 (저장은 debounce 후 자동 저장에서 일괄 처리)
+                store.set(category, question_code, raw_value)
                 
                 st.rerun()
 
@@ -1,6 +1,6 @@
 """
 홈 (사장 계기판) 패키지
-리팩터: home_page, home_data, home_alerts, home_rules, home_components, home_lazy
+리팩터: home_page, home_components, home_lazy (데이터/룰/이상징후/판결은 src.home 도메인 모듈)
 
 ⚠️ 주의: render_home은 이제 ui_pages/home.py에서 직접 제공됩니다.
 home_page.py의 render_home은 레거시이며 사용되지 않습니다.
@@ -17,7 +17,7 @@ from ui_pages.home.home_page import (
     get_coach_summary,
     get_month_status_summary,
 )
-from ui_pages.home.home_data import (
+from src.home.home_data import (
     get_monthly_close_stats,
     get_close_count,
     get_menu_count,
@@ -25,13 +25,13 @@ from ui_pages.home.home_data import (
     detect_data_level,
     detect_owner_day_level,
 )
-from ui_pages.home.home_rules import (
+from src.home.home_rules import (
     get_problems_top1,
     get_good_points_top1,
     get_problems_top3,
     get_good_points_top3,
 )
-from ui_pages.home.home_alerts import get_anomaly_signals_light, get_anomaly_signals
+from src.home.home_alerts import get_anomaly_signals_light, get_anomaly_signals
 from ui_pages.home.home_lazy import get_store_financial_structure
 
 __all__ = [
@@ -10,12 +10,7 @@ from datetime import datetime, date
 from zoneinfo import ZoneInfo
 
 from src.auth import get_supabase_client
-from src.storage_supabase import (
-    get_fixed_costs,
-    get_variable_cost_ratio,
-    calculate_break_even_sales,
-    get_month_settlement_status,
-)
+from src.storage_supabase import load_cost_structure
 
 
 def get_store_financial_structure(store_id: str, target_year: int, target_month: int) -> dict:
@@ -28,30 +23,15 @@ def get_store_financial_structure(store_id: str, target_year: int, target_month:
         supabase = get_supabase_client()
         if not supabase:
             return default
-        fixed_cost = get_fixed_costs(store_id, target_year, target_month)
-        variable_ratio = get_variable_cost_ratio(store_id, target_year, target_month)
-        break_even_sales = calculate_break_even_sales(store_id, target_year, target_month)
-        month_status = get_month_settlement_status(store_id, target_year, target_month)
-        source = "actual" if month_status == "final" else ("target" if (fixed_cost > 0 or variable_ratio > 0) else "none")
-        if break_even_sales <= 0:
+        structure = load_cost_structure(store_id, target_year, target_month)
+        if structure.break_even <= 0:
             return default
-        example_table = []
-        for sales in [
-            max(int(break_even_sales * 0.8), 0),
-            int(break_even_sales),
-            int(break_even_sales * 1.2),
-            int(break_even_sales * 1.5),
-        ]:
-            if sales > 0:
-                profit = sales - fixed_cost - (sales * variable_ratio)
-                margin = (profit / sales * 100) if sales > 0 else 0.0
-                example_table.append({"sales": sales, "profit": int(profit), "margin": round(margin, 1)})
         return {
-            "source": source,
-            "fixed_cost": int(fixed_cost),
-            "variable_ratio": variable_ratio,
-            "break_even_sales": int(break_even_sales),
-            "example_table": example_table,
+            "source": structure.source,
+            "fixed_cost": int(structure.fixed_costs),
+            "variable_ratio": structure.variable_ratio,
+            "break_even_sales": int(structure.break_even),
+            "example_table": structure.example_table(),
         }
     except Exception:
         return default
@@ -15,7 +15,7 @@ import streamlit as st
 
 from src.ui_helpers import render_page_header, render_section_divider
 from src.auth import get_current_store_id
-from ui_pages.home.home_data import (
+from src.home.home_data import (
     load_home_kpis,
     get_monthly_close_stats,
     get_menu_count,
@@ -24,15 +24,15 @@ from ui_pages.home.home_data import (
     detect_data_level,
     detect_owner_day_level,
 )
-from ui_pages.home.home_rules import (
+from src.home.home_rules import (
     get_problems_top1,
     get_good_points_top1,
     get_problems_top3,
     get_good_points_top3,
 )
-from ui_pages.home.home_alerts import get_anomaly_signals_light, get_anomaly_signals
+from src.home.home_alerts import get_anomaly_signals_light, get_anomaly_signals
 from ui_pages.home.home_lazy import get_monthly_memos, render_lazy_insights, get_store_financial_structure
-from ui_pages.home.home_verdict import get_coach_verdict
+from src.home.home_verdict import get_coach_verdict
 from ui_pages.coach.coach_renderer import render_verdict_card
 # get_home_coach_verdict는 순환 import 방지를 위해 함수 내부에서 import
 from ui_pages.routines.routine_state import get_routine_status
@@ -371,6 +371,9 @@ def _render_home_body(store_id: str) -> None:
                 # 모든 캐시 강제 클리어
                 st.cache_data.clear()
                 st.cache_resource.clear()
+                # HOME 스냅샷 재계산
+                from src.home.home_snapshot import refresh_home_snapshot
+                refresh_home_snapshot(store_id, reason="home_refresh")
                 # 세션 상태도 일부 클리어
                 keys_to_remove = [
                     "_home_problems_expanded", "_home_good_points_expanded", 
@@ -587,11 +590,10 @@ def _render_status_strip(store_id: str, monthly_sales: int, target_sales: int, t
     상태 해석 스트립 (KPI 바로 아래, 1줄 요약, 모던 스타일)
     """
     try:
-        from src.storage_supabase import get_fixed_costs, calculate_break_even_sales
-        from src.auth import get_supabase_client
         kst = ZoneInfo("Asia/Seoul")
         now = datetime.now(kst)
         year, month = now.year, now.month
+        snapshot = load_home_kpis(store_id, year, month)
         
         status_parts = []
         
@@ -604,17 +606,14 @@ def _render_status_strip(store_id: str, monthly_sales: int, target_sales: int, t
                 if remaining > 0:
                     status_parts.append(f"목표 대비 {target_ratio}%, 약 {remaining:,}원 남음")
         
-        # 손익분기점 정보
-        try:
-            break_even = calculate_break_even_sales(store_id, year, month)
-            if break_even > 0 and monthly_sales > 0:
-                if monthly_sales < break_even:
-                    gap = break_even - monthly_sales
-                    status_parts.append(f"손익분기점까지 약 {gap:,}원 남음")
-                else:
-                    status_parts.append("손익분기점 달성")
-        except Exception:
-            pass
+        # 손익분기점 정보 (HOME 스냅샷)
+        break_even = snapshot.get("break_even") or 0
+        if break_even > 0 and monthly_sales > 0:
+            if monthly_sales < break_even:
+                gap = int(break_even - monthly_sales)
+                status_parts.append(f"손익분기점까지 약 {gap:,}원 남음")
+            else:
+                status_parts.append("손익분기점 달성")
         
         # 마감률 상태
         if closed_days > 0:
@@ -624,28 +623,11 @@ def _render_status_strip(store_id: str, monthly_sales: int, target_sales: int, t
                 missing = total_days - closed_days
                 status_parts.append(f"마감 누락 {missing}일")
         
-        # 최근 7일 평균 매출 비교 (SSOT: best_available 사용)
-        try:
-            from src.storage_supabase import load_best_available_daily_sales
-            from datetime import timedelta
-            today = now.date()
-            seven_ago = today - timedelta(days=7)
-            start_m = f"{year}-{month:02d}-01"
-            end_m = f"{year + 1}-01-01" if month == 12 else f"{year}-{month + 1:02d}-01"
-            
-            # best_available 기반으로 조회
-            best_df = load_best_available_daily_sales(store_id=store_id, start_date=seven_ago.isoformat(), end_date=today.isoformat())
-            month_best_df = load_best_available_daily_sales(store_id=store_id, start_date=start_m, end_date=end_m)
-            
-            if not best_df.empty and not month_best_df.empty:
-                recent_avg = best_df['total_sales'].mean() if 'total_sales' in best_df.columns else 0
-                month_avg = month_best_df['total_sales'].mean() if 'total_sales' in month_best_df.columns else 0
-                if month_avg > 0:
-                    ratio = recent_avg / month_avg
-                    if ratio < 0.9:
-                        status_parts.append("최근 7일 평균이 이번 달 평균보다 낮음")
-        except Exception:
-            pass
+        # 최근 7일 평균 매출 비교 (SSOT: best_available 기반 HOME 스냅샷)
+        recent_avg = snapshot.get("recent_avg") or 0
+        month_avg = snapshot.get("month_avg") or 0
+        if recent_avg > 0 and month_avg > 0 and recent_avg / month_avg < 0.9:
+            status_parts.append("최근 7일 평균이 이번 달 평균보다 낮음")
         
         if status_parts:
             status_text = " • ".join(status_parts)
@@ -1028,23 +1010,10 @@ def _render_zone1_status_board(store_id: str, year: int, month: int, kpis: dict,
             v = f"{revenue_per_visit:,}원"
             _kpi_card_modern("객단가", v, "네이버방문자 기준", gradient="linear-gradient(135deg, #43e97b 0%, #38f9d7 100%)")
         else:
-            # 네이버방문자 누적 조회
-            try:
-                from src.auth import get_supabase_client
-                supabase = get_supabase_client()
-                if supabase:
-                    kst = ZoneInfo("Asia/Seoul")
-                    now = datetime.now(kst)
-                    start = f"{year}-{month:02d}-01"
-                    end = f"{year + 1}-01-01" if month == 12 else f"{year}-{month + 1:02d}-01"
-                    visitors_result = supabase.table("naver_visitors").select("visitors").eq("store_id", store_id).gte("date", start).lt("date", end).execute()
-                    total_visitors = sum(int(r.get("visitors", 0) or 0) for r in (visitors_result.data or []))
-                    v_text = f"{total_visitors:,}명" if total_visitors > 0 else "-"
-                    _kpi_card_modern("네이버방문자", v_text, "이번 달 누적", gradient="linear-gradient(135deg, #43e97b 0%, #38f9d7 100%)")
-                else:
-                    _kpi_card_modern("네이버방문자", "-", None, gradient="linear-gradient(135deg, #43e97b 0%, #38f9d7 100%)")
-            except Exception:
-                _kpi_card_modern("네이버방문자", "-", None, gradient="linear-gradient(135deg, #43e97b 0%, #38f9d7 100%)")
+            # 네이버방문자 누적 (HOME 스냅샷)
+            total_visitors = int(kpis.get("total_visitors") or 0)
+            v_text = f"{total_visitors:,}명" if total_visitors > 0 else "-"
+            _kpi_card_modern("네이버방문자", v_text, "이번 달 누적" if total_visitors > 0 else None, gradient="linear-gradient(135deg, #43e97b 0%, #38f9d7 100%)")
     
     # B) 상태 스트립 1줄
     missing_days = total_days - closed_days
@@ -1232,9 +1201,9 @@ def _render_zone4_design_snapshot(store_id: str, year: int, month: int) -> None:
     with col2:
         # 수익 구조 점수
         try:
-            from src.storage_supabase import get_fixed_costs, get_variable_cost_ratio, calculate_break_even_sales, load_monthly_sales_total
-            break_even = calculate_break_even_sales(store_id, year, month)
-            monthly_sales = load_monthly_sales_total(store_id, year, month) or 0
+            snapshot = load_home_kpis(store_id, year, month)
+            break_even = snapshot.get("break_even") or 0
+            monthly_sales = snapshot.get("monthly_sales") or 0
             
             if break_even > 0 and monthly_sales > 0:
                 if monthly_sales >= break_even * 1.2:
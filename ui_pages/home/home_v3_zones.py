@@ -18,8 +18,8 @@ from typing import Dict, Optional
 from ui_pages.strategy.store_state import classify_store_state
 from ui_pages.strategy.strategy_cards import build_strategy_cards
 from ui_pages.strategy.roadmap import build_weekly_roadmap
-from ui_pages.home.home_data import load_home_kpis, get_menu_count, get_close_count
-from ui_pages.home.home_rules import get_problems_top3
+from src.home.home_data import load_home_kpis, get_menu_count, get_close_count
+from src.home.home_rules import get_problems_top3
 from ui_pages.design_lab.design_state_loader import get_design_state
 
 logger = logging.getLogger(__name__)
@@ -77,9 +77,9 @@ def _render_zone0_today_instruction(store_id: str, year: int, month: int) -> Non
         else:
             # 기본 근거
             try:
-                from src.storage_supabase import load_monthly_sales_total, calculate_break_even_sales
-                monthly_sales = load_monthly_sales_total(store_id, year, month) or 0
-                break_even = calculate_break_even_sales(store_id, year, month) or 0
+                snapshot = load_home_kpis(store_id, year, month)
+                monthly_sales = snapshot.get("monthly_sales") or 0
+                break_even = snapshot.get("break_even") or 0
                 if break_even > 0:
                     ratio = (monthly_sales / break_even) * 100 if monthly_sales > 0 else 0
                     evidence_parts.append(f"손익분기점 대비 {ratio:.0f}%")
@@ -90,7 +90,7 @@ def _render_zone0_today_instruction(store_id: str, year: int, month: int) -> Non
         
         # 검진 근거 추가 (보조 근거로 1줄만)
         try:
-            from ui_pages.home.home_data import load_latest_health_diag
+            from src.home.home_data import load_latest_health_diag
             from src.health_check.health_integration import get_health_evidence_line
             health_diag = load_latest_health_diag(store_id)
             if health_diag:
@@ -24,6 +24,7 @@ from ui_pages.design_lab.menu_portfolio_helpers import (
     set_menu_portfolio_tag,
     get_menu_portfolio_categories,
     set_menu_portfolio_category,
+    set_menu_portfolio_assignments,
 )
 
 logger = logging.getLogger(__name__)
@@ -295,14 +296,17 @@ def _render_batch_input(store_id):
         
         try:
             saved_count = 0
+            new_categories, new_roles = {}, {}
             for menu in menu_data:
                 success, msg = save_menu(menu['name'], menu['price'])
                 if success:
                     if menu['category']:
-                        set_menu_portfolio_category(store_id, menu['name'], menu['category'])
+                        new_categories[menu['name']] = menu['category']
                     if menu['roles']:
-                        set_menu_portfolio_tag(store_id, menu['name'], menu['roles'][0])
+                        new_roles[menu['name']] = menu['roles'][0]
                     saved_count += 1
+            # 분류는 한 번에 저장 (역할 upsert 1회 + 카테고리별 update)
+            set_menu_portfolio_assignments(store_id, roles=new_roles, categories=new_categories)
             ui_flash_success(f"{saved_count}개 메뉴가 저장되었습니다.")
             st.rerun()
         except Exception as e:
@@ -19,8 +19,7 @@ from ui_pages.design_lab.menu_portfolio_helpers import (
     set_menu_portfolio_tag,
     get_menu_portfolio_categories,
     set_menu_portfolio_category,
-    calculate_portfolio_balance_score,
-    get_portfolio_verdict,
+    get_menu_index,
 )
 from typing import Dict
 from src.auth import get_current_store_id
@@ -46,6 +45,7 @@ def render_menu_management():
     menu_df = load_csv('menu_master.csv', store_id=store_id, default_columns=['메뉴명', '판매가'])
     roles = get_menu_portfolio_tags(store_id)
     categories = get_menu_portfolio_categories(store_id)
+    menu_index = get_menu_index(store_id)  # 점수/분포/판결 공용
     
     # ZONE A: Coach Board (Portfolio Verdict)
     cards = []
@@ -70,7 +70,7 @@ def render_menu_management():
         avg_price = 0
     
     # 3) 포트폴리오 균형 점수
-    balance_score, balance_status = calculate_portfolio_balance_score(menu_df, roles, categories)
+    balance_score, balance_status = menu_index.balance_score()
     status_emoji = "✅" if balance_status == "균형" else "⚠️" if balance_status == "주의" else "🔴"
     cards.append({
         "title": "포트폴리오 균형",
@@ -79,13 +79,7 @@ def render_menu_management():
     })
     
     # 4) 역할 분포 요약
-    role_counts = {"미끼": 0, "볼륨": 0, "마진": 0, "미분류": 0}
-    for menu_name in menu_df['메뉴명'].tolist() if not menu_df.empty else []:
-        role = roles.get(menu_name, "미분류")
-        if role in role_counts:
-            role_counts[role] += 1
-        else:
-            role_counts["미분류"] += 1
+    role_counts, _ = menu_index.counts()
     
     role_summary = f"미끼 {role_counts['미끼']} / 볼륨 {role_counts['볼륨']} / 마진 {role_counts['마진']}"
     if role_counts['미분류'] > 0:
@@ -97,7 +91,7 @@ def render_menu_management():
     })
     
     # 판결문 + 추천 액션
-    verdict_text, action_title, action_target_page = get_portfolio_verdict(menu_df, roles, categories, avg_price)
+    verdict_text, action_title, action_target_page = menu_index.verdict(avg_price)
     
     # 전략 브리핑 / 전략 실행 탭 분리
     # session_state로 초기 탭 제어 (런치패드에서 "전략 실행" 탭으로 이동 시)
@@ -9,9 +9,6 @@ from calendar import monthrange
 from zoneinfo import ZoneInfo
 from src.ui_helpers import render_page_header, render_section_divider
 from src.storage_supabase import (
-    get_fixed_costs,
-    get_variable_cost_ratio,
-    calculate_break_even_sales,
     load_monthly_sales_total,
     load_best_available_daily_sales,
     load_expense_structure,
@@ -26,6 +23,8 @@ from ui_pages.design_lab.design_lab_frame import (
 from ui_pages.design_lab.design_lab_coach_data import get_revenue_structure_design_coach_data
 from src.auth import get_current_store_id
 from src.design.baseline_loader import load_baseline_structure, get_baseline_structure
+from src.design.what_if import COST_RATE_CHANGES, PRICE_CHANGES, load_cost_model, load_profit_surface
+from src.engine.what_if import evaluate_grid
 
 # 공통 설정 적용
 bootstrap(page_title="Revenue Structure Design Lab")
@@ -72,10 +71,11 @@ def render_revenue_structure_design_lab():
     current_year = current_year_kst()
     current_month = current_month_kst()
     
-    # 데이터 로드
-    fixed_costs = get_fixed_costs(store_id, current_year, current_month)
-    variable_ratio = get_variable_cost_ratio(store_id, current_year, current_month)
-    break_even = calculate_break_even_sales(store_id, current_year, current_month)
+    # 데이터 로드 (비용 구조는 모델 1회 로드, 레버/시뮬레이터는 메모리 계산)
+    cost_model = load_cost_model(store_id, current_year, current_month)
+    fixed_costs = cost_model.fixed_costs
+    variable_ratio = cost_model.variable_ratio
+    break_even = cost_model.break_even
     monthly_sales = load_monthly_sales_total(store_id, current_year, current_month) or 0
     forecast_sales = _calculate_monthly_sales_forecast(store_id, current_year, current_month)
     
@@ -197,6 +197,7 @@ def render_revenue_structure_design_lab():
         use_var = lever_var_pct if has_levers else (variable_ratio or 0)
         use_forecast = (daily_visitors * avg_price * operating_days) if (daily_visitors and avg_price and has_levers) else forecast_sales
         use_be = (use_fixed / (1 - use_var)) if (use_var < 1 and use_fixed) else (break_even or 0)
+        lever_model = cost_model.with_levers(fixed_costs=use_fixed, variable_ratio=use_var)
         
         # ZONE D: 결과판 (3층 Impact Board) — 살아남는 구조 판정 + 구조 맵
         st.markdown("#### 📊 결과판 (Impact Board)")
@@ -218,22 +219,21 @@ def render_revenue_structure_design_lab():
             # 1) 매출 구간별 예상 이익 테이블 (레버 반영)
             st.markdown("#### 📊 매출 구간별 예상 이익")
             base_sales = use_be
+            offsets = [-10000000, -5000000, 0, 5000000, 10000000, 15000000]
+            levels = [base_sales + offset for offset in offsets if base_sales + offset > 0]
+            grid = evaluate_grid(lever_model, levels)
             sales_ranges = []
-            for offset in [-10000000, -5000000, 0, 5000000, 10000000, 15000000]:
-                sales = base_sales + offset
-                if sales > 0:
-                    variable_cost = sales * use_var
-                    total_cost = use_fixed + variable_cost
-                    profit = sales - total_cost
-                    profit_rate = (profit / sales * 100) if sales > 0 else 0
-                    sales_ranges.append({
-                        '매출': f"{int(sales):,}원",
-                        '변동비': f"{int(variable_cost):,}원",
-                        '고정비': f"{int(use_fixed):,}원",
-                        '총비용': f"{int(total_cost):,}원",
-                        '추정이익': f"{int(profit):,}원",
-                        '이익률': f"{profit_rate:.1f}%"
-                    })
+            for i, sales in enumerate(levels):
+                profit = float(grid.profit[i, 0, 0])
+                profit_rate = (profit / sales * 100) if sales > 0 else 0
+                sales_ranges.append({
+                    '매출': f"{int(sales):,}원",
+                    '변동비': f"{int(grid.variable_cost[i, 0, 0]):,}원",
+                    '고정비': f"{int(use_fixed):,}원",
+                    '총비용': f"{int(grid.total_cost[i, 0, 0]):,}원",
+                    '추정이익': f"{int(profit):,}원",
+                    '이익률': f"{profit_rate:.1f}%"
+                })
             if sales_ranges:
                 range_df = pd.DataFrame(sales_ranges)
                 st.dataframe(range_df, use_container_width=True, hide_index=True)
@@ -285,12 +285,13 @@ def render_revenue_structure_design_lab():
     with execute_tab:
         # ZONE D: Design Tools
         render_design_tools_container(
-            lambda: _render_revenue_structure_design_tools(store_id, current_year, current_month, fixed_costs, variable_ratio, break_even)
+            lambda: _render_revenue_structure_design_tools(store_id, current_year, current_month, fixed_costs, variable_ratio, break_even, cost_model)
         )
 
 
-def _render_revenue_structure_design_tools(store_id: str, year: int, month: int, fixed_costs: float, variable_ratio: float, break_even: float):
+def _render_revenue_structure_design_tools(store_id: str, year: int, month: int, fixed_costs: float, variable_ratio: float, break_even: float, cost_model=None):
     """ZONE D: 수익 구조 설계 도구"""
+    cost_model = cost_model or load_cost_model(store_id, year, month)
     
     # 1) 구조 파라미터 편집 (읽기+이동 중심)
     st.markdown("#### ⚙️ 구조 파라미터")
@@ -341,11 +342,27 @@ def _render_revenue_structure_design_tools(store_id: str, year: int, month: int,
             key="revenue_structure_simulator_sales"
         )
         
+        col_p, col_c = st.columns(2)
+        with col_p:
+            price_change = st.select_slider(
+                "가격 변화 (%)", options=list(PRICE_CHANGES), value=0.0,
+                key="revenue_structure_simulator_price",
+                help="판매량은 그대로 두고 가격만 바꿨을 때"
+            )
+        with col_c:
+            cost_change = st.select_slider(
+                "원가율 변화 (%)", options=list(COST_RATE_CHANGES), value=0.0,
+                key="revenue_structure_simulator_cost",
+                help="변동비율(재료비·수수료)이 이만큼 오르거나 내렸을 때"
+            )
+        
         if assumed_sales > 0:
-            variable_cost = assumed_sales * variable_ratio
-            total_cost = fixed_costs + variable_cost
-            estimated_profit = assumed_sales - total_cost
-            profit_rate = (estimated_profit / assumed_sales * 100) if assumed_sales > 0 else 0
+            point = evaluate_grid(cost_model, [assumed_sales], [price_change], [cost_change]).lookup(assumed_sales, price_change, cost_change)
+            variable_cost = point['variable_cost']
+            total_cost = point['total_cost']
+            estimated_profit = point['profit']
+            profit_rate = point['profit_rate']
+            scenario_break_even = point['break_even'] if (price_change or cost_change) else break_even
             
             col1, col2, col3, col4 = st.columns(4)
             with col1:
@@ -357,15 +374,25 @@ def _render_revenue_structure_design_tools(store_id: str, year: int, month: int,
             with col4:
                 st.metric("이익률", f"{profit_rate:.1f}%")
             
-            # 손익분기점과 비교
-            if break_even > 0:
-                if assumed_sales < break_even:
-                    gap = break_even - assumed_sales
+            # 손익분기점과 비교 (시나리오 매출 기준)
+            scenario_sales = point['revenue']
+            if 0 < scenario_break_even < float("inf"):
+                if scenario_sales < scenario_break_even:
+                    gap = scenario_break_even - scenario_sales
                     st.warning(f"⚠️ 손익분기점보다 {gap:,.0f}원 부족합니다. (손실 예상)")
-                elif assumed_sales == break_even:
+                elif scenario_sales == scenario_break_even:
                     st.info("📊 손익분기점과 동일합니다. (이익 0원)")
                 else:
-                    excess = assumed_sales - break_even
+                    excess = scenario_sales - scenario_break_even
                     st.success(f"✅ 손익분기점을 {excess:,.0f}원 초과합니다. (이익 예상)")
+            elif scenario_break_even == float("inf"):
+                st.error("🔴 이 가격·원가율 조합에서는 매출이 늘어도 이익이 나지 않습니다.")
+            
+            # 격자는 (매장, 월, 비용 버전)당 1회 계산 → 슬라이더 변경은 캐시된 격자 조회
+            surface = load_profit_surface(store_id, year, month, break_even if break_even > 0 else assumed_sales, model=cost_model)
+            st.markdown("**매출 수준별 손익 (선택한 가격·원가율)**")
+            st.line_chart(surface.profit_curve(price_change, cost_change))
+            with st.expander("가격 × 원가율 영업이익표 (손익분기 매출 기준)"):
+                st.dataframe(surface.profit_table(surface.sales_levels[len(surface.sales_levels) // 2]).round(0), use_container_width=True)
     else:
         st.info("고정비와 변동비율을 입력하면 시뮬레이터를 사용할 수 있습니다.")
@@ -6,8 +6,12 @@ from __future__ import annotations
 import streamlit as st
 from datetime import datetime
 from zoneinfo import ZoneInfo
-from src.storage_supabase import load_official_daily_sales
-import streamlit as st
+from src.home.close_calendar import get_close_calendar
+
+
+def _last_review_key(store_id: str) -> str:
+    """매장별 마지막 주간 점검/월간 판결 확인 기록 키"""
+    return f"routine_last_review::{store_id}"
 
 
 def get_routine_status(store_id: str) -> dict:
@@ -19,6 +23,11 @@ def get_routine_status(store_id: str) -> dict:
             "daily_close_done": bool,
             "weekly_design_check_done": bool,
             "monthly_structure_review_done": bool,
+            "close_streak": int,              # 연속 마감 일수
+            "closed_days_this_week": int,
+            "closed_days_this_month": int,
+            "last_weekly_review": str | None,  # 예: "2026-W42"
+            "last_monthly_review": str | None, # 예: "2026-10"
             "messages": {
                 "daily_close": str,
                 "weekly_design": str,
@@ -38,15 +47,9 @@ def get_routine_status(store_id: str) -> dict:
     # 이번 달 키
     month_key = f"{year}-{month:02d}"
     
-    # 1) 오늘 마감 완료 여부
-    daily_close_done = False
-    try:
-        official_df = load_official_daily_sales(store_id=store_id)
-        if not official_df.empty and 'date' in official_df.columns:
-            today_str = today.isoformat()
-            daily_close_done = today_str in official_df['date'].astype(str).values
-    except Exception:
-        pass
+    # 1) 오늘 마감 완료 여부 (마감 캘린더: 최근 구간 1회 조회, 캐시)
+    calendar = get_close_calendar(store_id, today)
+    daily_close_done = calendar.closed_today
     
     # 2) 이번 주 구조 점검 완료 여부 (session_state)
     weekly_key = f"routine_weekly_checked::{store_id}::{week_key}"
@@ -56,6 +59,8 @@ def get_routine_status(store_id: str) -> dict:
     monthly_key = f"routine_monthly_reviewed::{store_id}::{month_key}"
     monthly_structure_review_done = st.session_state.get(monthly_key, False)
     
+    last_review = st.session_state.get(_last_review_key(store_id), {})
+    
     # 메시지 생성
     messages = {
         "daily_close": "✅ 오늘 마감 완료" if daily_close_done else "⚠️ 오늘 마감 미완료",
@@ -67,6 +72,11 @@ def get_routine_status(store_id: str) -> dict:
         "daily_close_done": daily_close_done,
         "weekly_design_check_done": weekly_design_check_done,
         "monthly_structure_review_done": monthly_structure_review_done,
+        "close_streak": calendar.streak,
+        "closed_days_this_week": calendar.closed_this_week,
+        "closed_days_this_month": calendar.closed_this_month,
+        "last_weekly_review": last_review.get("weekly"),
+        "last_monthly_review": last_review.get("monthly"),
         "messages": messages
     }
 
@@ -80,6 +90,7 @@ def mark_weekly_check_done(store_id: str):
     
     key = f"routine_weekly_checked::{store_id}::{week_key}"
     st.session_state[key] = True
+    st.session_state.setdefault(_last_review_key(store_id), {})["weekly"] = week_key
 
 
 def mark_monthly_review_done(store_id: str):
@@ -91,3 +102,4 @@ def mark_monthly_review_done(store_id: str):
     
     key = f"routine_monthly_reviewed::{store_id}::{month_key}"
     st.session_state[key] = True
+    st.session_state.setdefault(_last_review_key(store_id), {})["monthly"] = month_key
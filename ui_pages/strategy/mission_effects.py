@@ -8,7 +8,7 @@ from datetime import date, datetime, timedelta
 from zoneinfo import ZoneInfo
 from typing import Dict, Optional
 
-from src.storage_supabase import load_best_available_daily_sales
+from core.timeseries_engine import get_daily_series
 
 
 @st.cache_data(ttl=300)
@@ -83,50 +83,22 @@ def compute_mission_effect(mission: Dict, store_id: str) -> Optional[Dict]:
         after_start = completed_date + timedelta(days=1)
         after_end = completed_date + timedelta(days=after_days)
         
-        # 데이터 로드
-        start_date = (baseline_start - timedelta(days=2)).isoformat()  # 여유분
-        end_date = after_end.isoformat()
+        # 데이터 로드 (공용 시계열)
+        series = get_daily_series(store_id, baseline_start - timedelta(days=2), after_end)
         
-        sales_df = load_best_available_daily_sales(
-            store_id=store_id,
-            start_date=start_date,
-            end_date=end_date
-        )
-        
-        if sales_df.empty:
+        if series.empty:
             return None
         
-        sales_df['date'] = sales_df['date'].apply(lambda x: x.date() if isinstance(x, datetime) else x)
-        
-        # Baseline 계산
-        baseline_df = sales_df[
-            (sales_df['date'] >= baseline_start) &
-            (sales_df['date'] <= baseline_end)
-        ]
-        
-        # After 계산
-        after_df = sales_df[
-            (sales_df['date'] >= after_start) &
-            (sales_df['date'] <= after_end)
-        ]
+        # Baseline vs After 비교
+        comparison = series.compare(baseline_start, baseline_end, after_start, after_end)
         
-        if baseline_df.empty or after_df.empty:
+        if comparison is None:
             return None
         
-        # 평균 계산
-        baseline_sales = baseline_df['total_sales'].mean() if 'total_sales' in baseline_df.columns else 0
-        after_sales = after_df['total_sales'].mean() if 'total_sales' in after_df.columns else 0
-        
-        baseline_visitors = baseline_df['visitors'].mean() if 'visitors' in baseline_df.columns else 0
-        after_visitors = after_df['visitors'].mean() if 'visitors' in after_df.columns else 0
-        
-        baseline_avgp = (baseline_sales / baseline_visitors) if baseline_visitors > 0 else 0
-        after_avgp = (after_sales / after_visitors) if after_visitors > 0 else 0
-        
         # 변화율 계산
-        sales_delta_pct = ((after_sales - baseline_sales) / baseline_sales * 100) if baseline_sales > 0 else 0
-        visitors_delta_pct = ((after_visitors - baseline_visitors) / baseline_visitors * 100) if baseline_visitors > 0 else 0
-        avgp_delta_pct = ((after_avgp - baseline_avgp) / baseline_avgp * 100) if baseline_avgp > 0 else 0
+        sales_delta_pct = comparison["delta"]["sales_delta_pct"]
+        visitors_delta_pct = comparison["delta"]["visitors_delta_pct"]
+        avgp_delta_pct = comparison["delta"]["avgp_delta_pct"]
         
         # 해석 생성
         interpretation = _generate_interpretation(sales_delta_pct, visitors_delta_pct, avgp_delta_pct, after_days)
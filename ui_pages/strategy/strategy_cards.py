@@ -2,18 +2,18 @@
 전략 카드 TOP3 생성 엔진 v1
 - 10-7A의 가게 상태 분류 결과 + 설계/매출 신호를 이용해서 전략 카드 3장 생성
 - v4: 건강검진 통합 + Impact/Action Plan 추가
+- 입력은 StrategyContext(src.strategy.strategy_context)를 상태 분류/가중치/Impact와 공유
 """
 from __future__ import annotations
 
+import logging
 import streamlit as st
-from datetime import datetime, date, timedelta
-from zoneinfo import ZoneInfo
 from typing import Dict, List, Optional
 
 from ui_pages.strategy.store_state import classify_store_state
-from ui_pages.design_lab.design_state_loader import get_design_state
-from ui_pages.design_lab.design_insights import get_design_insights
-from src.ui_helpers import safe_get_value
+from src.strategy.strategy_context import StrategyContext, get_strategy_context
+
+logger = logging.getLogger(__name__)
 
 
 @st.cache_data(ttl=300)
@@ -22,7 +22,8 @@ def build_strategy_cards(
     year: int,
     month: int,
     state_payload: Optional[Dict] = None,
-    use_v4: bool = True  # v4 엔진 사용 여부 (건강검진 통합)
+    use_v4: bool = True,  # v4 엔진 사용 여부 (건강검진 통합)
+    _ctx: Optional[StrategyContext] = None
 ) -> Dict:
     """
     전략 카드 TOP3 생성
@@ -32,6 +33,7 @@ def build_strategy_cards(
         year: 연도
         month: 월
         state_payload: 가게 상태 분류 결과 (없으면 자동 호출)
+        _ctx: 전략 컨텍스트 (없으면 get_strategy_context, 캐시 키에서 제외)
     
     Returns:
         {
@@ -60,29 +62,31 @@ def build_strategy_cards(
     }
     
     try:
+        ctx = _ctx or get_strategy_context(store_id, year, month)
+        
         # v4 엔진 사용 시 (건강검진 통합)
         if use_v4:
-            return _build_strategy_cards_v4(store_id, year, month, state_payload, debug)
+            return _build_strategy_cards_v4(ctx, state_payload, debug)
         
         # 기존 v1 엔진 (하위 호환)
         # 1. 가게 상태 분류 (없으면 호출)
         if state_payload is None:
-            state_payload = classify_store_state(store_id, year, month)
+            state_payload = classify_store_state(store_id, year, month, _ctx=ctx)
         
         store_state = state_payload.get("state", {})
         scores = state_payload.get("scores", {})
         state_code = store_state.get("code", "unknown")
         
         # 2. 설계 인사이트 로드
-        design_insights = get_design_insights(store_id, year, month)
-        design_state = get_design_state(store_id, year, month)
+        design_insights = ctx.design_insights
+        design_state = ctx.design_state
         
         # 3. 카드 후보 생성
         candidate_cards = []
         
         # 카드 1: 생존선 복구 (Revenue)
         if _should_show_survival_card(scores, state_payload, debug):
-            card = _build_survival_card(store_id, year, month, state_payload, design_insights)
+            card = _build_survival_card(ctx, state_payload, design_insights)
             if card:
                 candidate_cards.append(("survival", card))
                 debug["rules_fired"].append("생존선 복구 카드")
@@ -291,28 +295,11 @@ def _should_show_sales_recovery_card(scores: Dict, state_payload: Dict, debug: D
 # 카드 빌드 함수
 # ============================================
 
-def _build_survival_card(store_id: str, year: int, month: int, state_payload: Dict, design_insights: Dict) -> Optional[Dict]:
+def _build_survival_card(ctx: StrategyContext, state_payload: Dict, design_insights: Dict) -> Optional[Dict]:
     """생존선 복구 카드"""
     try:
-        from src.storage_supabase import calculate_break_even_sales, load_monthly_sales_total
-        from datetime import datetime
-        from zoneinfo import ZoneInfo
-        
-        break_even = calculate_break_even_sales(store_id, year, month)
-        monthly_sales = load_monthly_sales_total(store_id, year, month)
-        
-        kst = ZoneInfo("Asia/Seoul")
-        now = datetime.now(kst)
-        
-        if now.year == year and now.month == month:
-            days_passed = now.day
-            days_in_month = 30
-            if days_passed > 0:
-                expected_sales = (monthly_sales / days_passed) * days_in_month
-            else:
-                expected_sales = monthly_sales
-        else:
-            expected_sales = monthly_sales
+        break_even = ctx.break_even
+        expected_sales = ctx.projected_sales_30d
         
         ratio = (expected_sales / break_even) if break_even > 0 else 0.0
         gap = break_even - expected_sales if expected_sales < break_even else 0
@@ -583,34 +570,31 @@ def _build_fallback_card(store_id: Optional[str]) -> Dict:
 
 
 def _build_strategy_cards_v4(
-    store_id: str,
-    year: int,
-    month: int,
+    ctx: StrategyContext,
     state_payload: Optional[Dict],
     debug: Dict
 ) -> Dict:
     """
     v4 전략 카드 생성 (건강검진 통합)
     """
+    store_id, year, month = ctx.store_id, ctx.year, ctx.month
     try:
-        from src.health_check.profile import load_latest_health_profile
         from src.strategy.v4_strategy_engine import build_base_strategies
         from src.strategy.health_weighting import apply_health_weighting
         
         # 1. 가게 상태 분류 (없으면 호출)
         if state_payload is None:
-            state_payload = classify_store_state(store_id, year, month)
+            state_payload = classify_store_state(store_id, year, month, _ctx=ctx)
         
         store_state = state_payload.get("state", {})
         scores = state_payload.get("scores", {})
         state_code = store_state.get("code", "unknown")
         
         # 2. 건강검진 데이터 로드 (v4: 판독 결과 직접 사용)
-        from ui_pages._legacy.home_pkg_20260126.home_data import load_latest_health_diag
         from src.health_check.health_integration import health_bias_for_card, should_show_operation_qsc_card
         
-        health_diag = load_latest_health_diag(store_id)
-        health_profile = load_latest_health_profile(store_id, lookback_days=60)
+        health_diag = ctx.health_diag
+        health_profile = ctx.health_profile
         
         if health_diag:
             debug["rules_fired"].append("건강검진 판독 데이터 로드됨")
@@ -618,43 +602,14 @@ def _build_strategy_cards_v4(
             debug["rules_fired"].append("건강검진 프로필 로드됨 (판독 없음)")
         
         # 3. 컨텍스트 구성
-        from src.storage_supabase import calculate_break_even_sales, load_monthly_sales_total
-        from ui_pages.design_lab.design_insights import get_design_insights
-        
-        monthly_sales = load_monthly_sales_total(store_id, year, month) or 0
-        
-        # 디버깅: monthly_sales 값 확인
+        monthly_sales = ctx.monthly_sales
         if monthly_sales == 0:
             logger.warning(f"[STRATEGY_CARDS] monthly_sales is 0 for store_id={store_id}, year={year}, month={month}")
-            # 마감 데이터가 있는지 확인
-            try:
-                from src.storage_supabase import load_best_available_daily_sales
-                from datetime import date
-                month_start = date(year, month, 1)
-                if month == 12:
-                    month_end = date(year + 1, 1, 1)
-                else:
-                    month_end = date(year, month + 1, 1)
-                
-                daily_sales_df = load_best_available_daily_sales(
-                    store_id=store_id,
-                    start_date=month_start.isoformat(),
-                    end_date=month_end.isoformat()
-                )
-                if not daily_sales_df.empty:
-                    logger.warning(f"[STRATEGY_CARDS] daily_sales_df has {len(daily_sales_df)} rows but monthly_sales is 0")
-                    if 'total_sales' in daily_sales_df.columns:
-                        manual_total = daily_sales_df['total_sales'].sum()
-                        logger.warning(f"[STRATEGY_CARDS] manual total_sales sum = {manual_total}")
-                else:
-                    logger.warning(f"[STRATEGY_CARDS] daily_sales_df is empty for {year}-{month}")
-            except Exception as e:
-                logger.error(f"[STRATEGY_CARDS] Error checking daily sales: {e}")
         
-        break_even = calculate_break_even_sales(store_id, year, month) or 1
+        break_even = ctx.break_even or 1
         break_even_gap_ratio = (monthly_sales / break_even) if break_even > 0 else 1.0
         
-        design_insights = get_design_insights(store_id, year, month)
+        design_insights = ctx.design_insights
         menu_portfolio = design_insights.get("menu_portfolio", {})
         margin_menu_count = menu_portfolio.get("margin_menu_count", 0)
         total_menu_count = menu_portfolio.get("total_menu_count", 1)
@@ -663,29 +618,8 @@ def _build_strategy_cards_v4(
         ingredient = design_insights.get("ingredient_structure", {})
         ingredient_concentration = ingredient.get("top3_concentration", 0.0)
         
-        # 방문자 추세 (간단히)
-        visitors_trend = "unknown"
-        try:
-            from src.storage_supabase import load_best_available_daily_sales
-            from datetime import date, timedelta
-            today = date.today()
-            week_ago = today - timedelta(days=7)
-            recent_sales = load_best_available_daily_sales(
-                store_id=store_id,
-                start_date=week_ago.isoformat(),
-                end_date=today.isoformat()
-            )
-            if not recent_sales.empty and len(recent_sales) >= 2:
-                recent_avg = recent_sales.tail(3)['total_sales'].mean() if 'total_sales' in recent_sales.columns else 0
-                older_avg = recent_sales.head(3)['total_sales'].mean() if len(recent_sales) >= 6 else recent_avg
-                if recent_avg > older_avg * 1.1:
-                    visitors_trend = "up"
-                elif recent_avg < older_avg * 0.9:
-                    visitors_trend = "down"
-                else:
-                    visitors_trend = "stable"
-        except Exception:
-            pass
+        # 방문자 추세 (간단히: 최근 7일 매출 앞 3일 vs 뒤 3일)
+        visitors_trend = ctx.sales_trend
         
         context = {
             "store_state": store_state,
@@ -746,91 +680,25 @@ def _build_strategy_cards_v4(
         from src.strategy.impact_engine import estimate_impact
         from src.strategy.action_plan_engine import build_action_plan
         
-        # 컨텍스트 확장 (impact/action_plan 계산용)
-        # KPI 추가 로드
-        from datetime import date, timedelta
-        from zoneinfo import ZoneInfo
-        kst = ZoneInfo("Asia/Seoul")
-        now = datetime.now(kst)
-        today = now.date()
-        yesterday = today - timedelta(days=1)
-        
-        # 어제 매출
-        yesterday_sales = 0
-        try:
-            from src.storage_supabase import load_best_available_daily_sales
-            yesterday_df = load_best_available_daily_sales(
-                store_id=store_id,
-                start_date=yesterday.isoformat(),
-                end_date=yesterday.isoformat()
-            )
-            if not yesterday_df.empty and 'total_sales' in yesterday_df.columns:
-                yesterday_sales = int(float(safe_get_value(yesterday_df, 'total_sales', 0) or 0))
-        except Exception:
-            pass
-        
-        # 방문자 데이터 (간단히)
-        visitors_mtd = 0
-        sales_per_visitor = 0
-        try:
-            from src.auth import get_supabase_client
-            supabase = get_supabase_client()
-            if supabase:
-                # MTD 방문자 합계
-                month_start = date(year, month, 1)
-                if month == 12:
-                    month_end = date(year + 1, 1, 1)
-                else:
-                    month_end = date(year, month + 1, 1)
-                
-                visitors_result = supabase.table("naver_visitors").select("visitors").eq(
-                    "store_id", store_id
-                ).gte("date", month_start.isoformat()).lt("date", month_end.isoformat()).execute()
-                
-                if visitors_result.data:
-                    visitors_mtd = sum(int(r.get("visitors", 0)) for r in visitors_result.data)
-                    if visitors_mtd > 0 and monthly_sales > 0:
-                        sales_per_visitor = monthly_sales / visitors_mtd
-        except Exception:
-            pass
-        
-        # 경과 일수 계산 (MTD 매출 추정용)
-        if now.year == year and now.month == month:
-            month_start_date = date(year, month, 1)
-            elapsed_days = max(1, (today - month_start_date).days + 1)
-        else:
-            # 과거 월이면 실제 일수 사용
-            if month == 12:
-                next_month = date(year + 1, 1, 1)
-            else:
-                next_month = date(year, month + 1, 1)
-            month_start_date = date(year, month, 1)
-            elapsed_days = (next_month - month_start_date).days
-        
-        # mtd_sales는 현재 월이면 경과 일수까지의 누적, 과거 월이면 월 전체 합계
-        # load_monthly_sales_total은 월 전체 합계를 반환하므로, 현재 월이면 경과 일수까지만 계산 필요
-        # 하지만 이미 월 전체 합계를 반환하므로, 현재 월일 때는 경과 일수로 나눠서 일평균을 구한 후 다시 곱해야 함
-        # 실제로는 load_monthly_sales_total이 경과 일수까지의 누적을 반환하는지 확인 필요
-        # 일단 monthly_sales를 그대로 사용하되, 현재 월이면 경과 일수 기반으로 예상치 계산
-        
-        # 디버깅: monthly_sales 값 확인
+        # 컨텍스트 확장 (impact/action_plan 계산용, KPI는 StrategyContext에서 memoize)
         if st.session_state.get("_dev_mode", False):
-            logger.info(f"[DEBUG] monthly_sales={monthly_sales}, elapsed_days={elapsed_days}, year={year}, month={month}, now={now.year}/{now.month}")
+            logger.info(f"[DEBUG] monthly_sales={monthly_sales}, elapsed_days={ctx.elapsed_days}, year={year}, month={month}")
         
         full_context = {
             "store_id": store_id,
             "period": {"year": year, "month": month},
+            "strategy_context": ctx,
             "kpi": {
                 "mtd_sales": monthly_sales,  # 월 전체 합계 또는 경과 일수까지의 누적
-                "avg_daily_sales": monthly_sales / elapsed_days if elapsed_days > 0 else 0,
-                "yesterday_sales": yesterday_sales,
-                "visitors_mtd": visitors_mtd,
-                "sales_per_visitor": sales_per_visitor
+                "avg_daily_sales": monthly_sales / ctx.elapsed_days,
+                "yesterday_sales": ctx.yesterday_sales,
+                "visitors_mtd": ctx.visitors_mtd,
+                "sales_per_visitor": ctx.sales_per_visitor
             },
             "revenue": {
                 "break_even_sales": break_even,
                 "break_even_gap_ratio": break_even_gap_ratio,
-                "variable_cost_rate": None,  # impact_engine에서 계산
+                "variable_cost_rate": ctx.variable_cost_rate,
                 "fixed_cost": None
             },
             "menu": {
@@ -915,37 +783,36 @@ def _build_strategy_cards_v4(
     except Exception as e:
         debug["notes"].append(f"v4 카드 생성 오류: {str(e)}")
         # Fallback: 기존 v1 엔진 사용
-        return _build_strategy_cards_v1_fallback(store_id, year, month, state_payload, debug)
+        return _build_strategy_cards_v1_fallback(ctx, state_payload, debug)
 
 
 def _build_strategy_cards_v1_fallback(
-    store_id: str,
-    year: int,
-    month: int,
+    ctx: StrategyContext,
     state_payload: Optional[Dict],
     debug: Dict
 ) -> Dict:
     """v1 엔진 fallback (기존 로직 재사용)"""
+    store_id, year, month = ctx.store_id, ctx.year, ctx.month
     # 기존 v1 로직 실행 (아래 코드 블록 재사용)
     try:
         # 1. 가게 상태 분류 (없으면 호출)
         if state_payload is None:
-            state_payload = classify_store_state(store_id, year, month)
+            state_payload = classify_store_state(store_id, year, month, _ctx=ctx)
         
         store_state = state_payload.get("state", {})
         scores = state_payload.get("scores", {})
         state_code = store_state.get("code", "unknown")
         
         # 2. 설계 인사이트 로드
-        design_insights = get_design_insights(store_id, year, month)
-        design_state = get_design_state(store_id, year, month)
+        design_insights = ctx.design_insights
+        design_state = ctx.design_state
         
         # 3. 카드 후보 생성
         candidate_cards = []
         
         # 카드 1: 생존선 복구 (Revenue)
         if _should_show_survival_card(scores, state_payload, debug):
-            card = _build_survival_card(store_id, year, month, state_payload, design_insights)
+            card = _build_survival_card(ctx, state_payload, design_insights)
             if card:
                 candidate_cards.append(("survival", card))
                 debug["rules_fired"].append("생존선 복구 카드")
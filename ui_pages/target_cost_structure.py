@@ -26,11 +26,9 @@ from src.storage_supabase import (
     delete_expense_item,
     copy_expense_structure_from_previous_month,
     save_targets,
-    get_fixed_costs,
-    get_variable_cost_ratio,
-    calculate_break_even_sales,
     load_monthly_sales_total,
 )
+from src.design.what_if import load_cost_model
 from src.utils.crud_guard import run_write
 from src.auth import get_current_store_id
 
@@ -55,10 +53,10 @@ def render_target_cost_structure():
     # SummaryStrip용 값 계산 (기존 로직 사용)
     selected_year = st.session_state.get("expense_year", current_year)
     selected_month = st.session_state.get("expense_month", current_month)
-    expense_df = load_expense_structure(selected_year, selected_month, store_id)
-    fixed_costs = get_fixed_costs(store_id, selected_year, selected_month) if store_id else 0.0
-    variable_cost_ratio = get_variable_cost_ratio(store_id, selected_year, selected_month) if store_id else 0.0
-    breakeven_sales = calculate_break_even_sales(store_id, selected_year, selected_month) if store_id else 0.0
+    cost_model = load_cost_model(store_id, selected_year, selected_month)
+    fixed_costs = cost_model.fixed_costs
+    variable_cost_ratio = cost_model.variable_ratio
+    breakeven_sales = cost_model.break_even
     
     # SummaryStrip 항목 구성 (기존 값 사용)
     summary_items = [
@@ -191,9 +189,11 @@ def _render_revenue_design_tools(year: int, month: int, store_id: str):
     # 공식 엔진 함수 사용 (헌법 준수)
     expense_df = load_expense_structure(selected_year, selected_month, store_id)
     
-    fixed_costs = get_fixed_costs(store_id, selected_year, selected_month) if store_id else 0.0
-    variable_cost_ratio = get_variable_cost_ratio(store_id, selected_year, selected_month) if store_id else 0.0
-    breakeven_sales = calculate_break_even_sales(store_id, selected_year, selected_month) if store_id else 0.0
+    # 고정비/변동비율/손익분기점: 비용 구조 모델 (SummaryStrip과 같은 캐시 항목)
+    cost_model = load_cost_model(store_id, selected_year, selected_month)
+    fixed_costs = cost_model.fixed_costs
+    variable_cost_ratio = cost_model.variable_ratio
+    breakeven_sales = cost_model.break_even
     monthly_sales = load_monthly_sales_total(store_id, selected_year, selected_month) or 0
     
     # 변동비율을 % 단위로 변환 (UI 표시용)